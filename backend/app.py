@@ -13,9 +13,12 @@ Last Updated: 2024
 
 import os
 import logging
-from flask import Flask, jsonify, request
+import threading
+from contextlib import nullcontext
+from flask import Blueprint, Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
+from werkzeug.local import LocalProxy
 import structlog
 import json
 from datetime import datetime
@@ -23,68 +26,149 @@ from datetime import datetime
 # Load environment variables
 load_dotenv()
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
 logger = structlog.get_logger()
 
 # Import database manager and Restaurant model
-from database.database_manager_v3 import EnhancedDatabaseManager, Restaurant
+from database.database_manager_v3 import EnhancedDatabaseManager, Restaurant, LISTING_COLUMNS
+from utils.timezone_resolver import resolve_timezone
 
 # Import Google Places functionality
-import requests
 import time
 
-# Initialize Flask app
-app = Flask(__name__)
-
-# Load configuration
 from config.config import get_config
-app.config.from_object(get_config())
+from utils.logging_config import configure_logging
+from utils.json_encoding import FastJSONProvider, assemble_listing, json_bytes_response
+from utils.catalog_export import EXPORT_FORMATS, export_chunks
+from utils.metrics import RequestMetrics, external_get
+from utils.query_profiler import query_profiler
+from utils.compression import ResponseCompressor
+from utils.health import health
+from utils.rate_limit import rate_limiter
+from utils.image_proxy import image_proxy
+from utils.scheduler import scheduler
+from utils.snapshot import catalog_snapshot
+from utils.catalog_replica import catalog_replica
 
-# Initialize CORS with configuration
-CORS(app, 
-     origins=app.config.get('CORS_ORIGINS', ['*']),
-     methods=app.config.get('CORS_METHODS', ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']),
-     allow_headers=app.config.get('CORS_ALLOW_HEADERS', ['Content-Type', 'Authorization', 'Accept', 'Origin', 'X-Requested-With']),
-     supports_credentials=True)
+# All endpoints are registered on this blueprint; create_app() mounts it
+api = Blueprint('api', __name__)
 
-# Initialize database manager
-db_manager = None
+# Prometheus request metrics at /metrics (bound before compression so
+# response sizes are measured after compression)
+metrics = RequestMetrics()
+
+# Compress large responses (gzip/brotli)
+compressor = ResponseCompressor()
+
+def create_app(config_object=None) -> Flask:
+    """
+    Create and configure the Flask application.
+    
+    Building the app has no side effects: the database is connected on
+    first use (see get_db_manager) and the schema is managed by
+    database/migrations/migrate.py, which startup.sh runs before the server.
+    
+    Args:
+        config_object: Configuration object (defaults to get_config())
+    """
+    configure_logging()
+    
+    app = Flask(__name__)
+    
+    # Use the fast JSON encoder for all jsonify responses
+    app.json = FastJSONProvider(app)
+    
+    # Load configuration
+    app.config.from_object(config_object or get_config())
+    
+    # Initialize CORS with configuration
+    CORS(app, 
+         origins=app.config.get('CORS_ORIGINS', ['*']),
+         methods=app.config.get('CORS_METHODS', ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']),
+         allow_headers=app.config.get('CORS_ALLOW_HEADERS', ['Content-Type', 'Authorization', 'Accept', 'Origin', 'X-Requested-With']),
+         supports_credentials=True)
+    
+    metrics.init_app(app)
+    
+    # Per-client token buckets; rejects with 429 before any database work
+    rate_limiter.init_app(app)
+    
+    # SQL profiling, enabled per request with the X-Profile-SQL header
+    query_profiler.init_app(app)
+    
+    compressor.init_app(app)
+    
+    # Cached restaurant thumbnails at /img/<hash>/<width>
+    image_proxy.init_app(app)
+    
+    # Read-only catalog snapshot for database outages and edge instances
+    catalog_snapshot.init_app(app)
+    
+    # In-memory catalog replica for the read endpoints (REPLICA_ENABLED)
+    catalog_replica.init_app(app, get_db_manager)
+    
+    # Liveness/readiness probes and the background deep health check
+    health.init_app(app, get_db_manager)
+    
+    # Periodic jobs; each gunicorn worker starts the scheduler after forking
+    # (config/gunicorn.conf.py) and the elected leader runs them
+    scheduler.init_app(app)
+    
+    app.register_blueprint(api)
+    return app
+
+# Database manager, connected on first use (or by the gunicorn post_fork hook)
+_db_manager = None
+_db_manager_lock = threading.Lock()
 
 def init_database():
-    """Initialize database connection."""
-    global db_manager
+    """Connect a new database manager. Returns None if the database is unavailable."""
     try:
-        db_manager = EnhancedDatabaseManager()
-        db_manager.connect()
+        manager = EnhancedDatabaseManager()
+        if not manager.connect(create_tables=False):
+            return None
+        metrics.instrument_engine(manager.engine)
+        query_profiler.instrument_engine(manager.engine)
+        catalog_snapshot.instrument_engine(manager.engine)
         logger.info("Database connection established")
-        return True
+        return manager
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False
+        return None
 
-# Initialize database on app startup
-with app.app_context():
-    init_database()
+def get_db_manager():
+    """
+    Get the shared database manager, connecting it on first use.
+    
+    Reads go to the catalog snapshot instead (see utils/snapshot.py) with
+    SNAPSHOT_MODE=always, and with SNAPSHOT_MODE=fallback while the database
+    is unreachable.
+    """
+    global _db_manager
+    if catalog_snapshot.mode == 'always':
+        return catalog_snapshot.manager()
+    if catalog_snapshot.primary_available():
+        if _db_manager is None:
+            with _db_manager_lock:
+                if _db_manager is None:
+                    _db_manager = init_database()
+                    if _db_manager is None:
+                        catalog_snapshot.primary_failed()
+        if _db_manager is not None:
+            return _db_manager
+    if catalog_snapshot.mode == 'fallback':
+        return catalog_snapshot.manager() or _db_manager
+    return _db_manager
+
+def get_catalog_reader():
+    """Get the reader for catalog reads: the in-memory replica once it is loaded, else the database manager."""
+    return catalog_replica.reader() or get_db_manager()
+
+# Endpoints use db_manager directly; the proxy resolves (and connects) lazily
+db_manager = LocalProxy(get_db_manager)
+# Read endpoints use catalog_reader (same read methods as db_manager)
+catalog_reader = LocalProxy(get_catalog_reader)
 
-@app.route('/', methods=['GET'])
+@api.route('/', methods=['GET'])
 def root():
     """Root endpoint - redirect to health check or return API info."""
     return jsonify({
@@ -93,35 +177,37 @@ def root():
         'status': 'running',
         'endpoints': {
             'health': '/health',
+            'liveness': '/livez',
+            'readiness': '/readyz',
+            'health_deep': '/health/deep',
             'restaurants': '/api/restaurants',
             'search': '/api/restaurants/search',
+            'nearby': '/api/restaurants/nearby',
+            'specials': '/api/specials',
             'statistics': '/api/statistics'
         }
     }), 200
 
-@app.route('/health', methods=['GET'])
+@api.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (cached readiness; no per-probe table scan)."""
     try:
-        if db_manager:
-            # Test database connection
-            from database.database_manager_v3 import Restaurant
-            session = db_manager.get_session()
-            total_restaurants = session.query(Restaurant).count()
-            session.close()
-            
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
-                'restaurants_count': total_restaurants,
-                'version': '3.0'
-            }), 200
-        else:
+        ready = health.readiness()
+        
+        if ready['status'] != 'ready':
             return jsonify({
                 'status': 'unhealthy',
-                'database': 'disconnected',
-                'error': 'Database not initialized'
+                'database': ready['database'],
+                'error': ready.get('error')
             }), 500
+        
+        deep = health.cached_deep() or {}
+        return jsonify({
+            'status': 'healthy',
+            'database': 'connected',
+            'restaurants_count': deep.get('restaurants_count'),
+            'version': '3.0'
+        }), 200
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({
@@ -129,7 +215,35 @@ def health_check():
             'error': str(e)
         }), 500
 
-@app.route('/api/restaurants', methods=['GET'])
+@api.route('/livez', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is serving requests (no I/O)."""
+    return jsonify(health.liveness()), 200
+
+@api.route('/readyz', methods=['GET'])
+def readiness_check():
+    """Readiness probe: pooled SELECT 1 with a short timeout, cached for a few seconds."""
+    ready = health.readiness()
+    return jsonify(ready), 200 if ready['status'] == 'ready' else 503
+
+@api.route('/health/deep', methods=['GET'])
+def deep_health_check():
+    """Detailed health report, computed in the background and served from cache."""
+    try:
+        report = health.deep()
+        report.pop('checked_at_epoch', None)
+        if catalog_snapshot.mode != 'off':
+            report['snapshot'] = catalog_snapshot.status()
+        status_code = 200 if report.get('status') in ('healthy', 'pending') else 503
+        return jsonify(report), status_code
+    except Exception as e:
+        logger.error(f"Deep health check failed: {e}")
+        return jsonify({
+            'status': 'unhealthy',
+            'error': str(e)
+        }), 500
+
+@api.route('/api/restaurants', methods=['GET'])
 def get_restaurants():
     """Get all restaurants with optional filtering."""
     try:
@@ -139,28 +253,66 @@ def get_restaurants():
         # Support both kosher_type and kosher_category parameters for frontend compatibility
         kosher_category = request.args.get('kosher_category')
         state = request.args.get('state')
-        
-        # Get restaurants from database
-        restaurants = db_manager.get_all_places(
-            limit=limit,
-            offset=offset
-        )
-        
-        # Apply filters
-        if kosher_category:
-            restaurants = [r for r in restaurants if r.get('kosher_category') == kosher_category]
-        
-        if state:
-            restaurants = [r for r in restaurants if r.get('state') == state]
-        
-        logger.info(f"Retrieved {len(restaurants)} restaurants")
-        
-        return jsonify({
-            'restaurants': restaurants,
-            'total': len(restaurants),
-            'limit': limit,
-            'offset': offset
-        }), 200
+        # Sparse fieldsets: ?fields=id,name,... or ?view=summary|detail
+        fields = request.args.get('fields')
+        view = request.args.get('view')
+        # Facet counts for the filtered result set: ?facets=true
+        include_facets = request.args.get('facets', 'false').lower() == 'true'
+        # The listing and its facet counts are read from one snapshot of the catalog
+        reader = get_catalog_reader()
+        with reader.read_snapshot() if include_facets else nullcontext():
+            facets = reader.get_facets(kosher_category=kosher_category, state=state) if include_facets else None
+            
+            if fields or view == 'summary':
+                try:
+                    field_list = db_manager.resolve_fields(fields, view or 'summary')
+                except ValueError as e:
+                    return jsonify({
+                        'error': 'Invalid fields parameter',
+                        'message': str(e)
+                    }), 400
+            
+                # Lightweight column-projected path (filters applied in SQL)
+                restaurants = reader.get_places_projected(
+                    field_list,
+                    limit=limit,
+                    offset=offset,
+                    kosher_category=kosher_category,
+                    state=state
+                )
+            
+                logger.info(f"Retrieved {len(restaurants)} restaurants (projected)")
+            
+                response = {
+                    'restaurants': restaurants,
+                    'total': len(restaurants),
+                    'limit': limit,
+                    'offset': offset
+                }
+                if facets is not None:
+                    response['facets'] = facets
+                return jsonify(response), 200
+            
+            if view and view != 'detail':
+                return jsonify({
+                    'error': 'Invalid view parameter',
+                    'message': f"Unknown view: {view}"
+                }), 400
+            
+            # Get restaurants as pre-encoded fragments (static part cached per updated_at)
+            fragments = reader.get_all_places_encoded(
+                limit=limit,
+                offset=offset,
+                kosher_category=kosher_category,
+                state=state
+            )
+            
+            logger.info(f"Retrieved {len(fragments)} restaurants")
+            
+            meta = {'total': len(fragments), 'limit': limit, 'offset': offset}
+            if facets is not None:
+                meta['facets'] = facets
+            return json_bytes_response(assemble_listing('restaurants', fragments, **meta))
         
     except Exception as e:
         logger.error(f"Error getting restaurants: {e}")
@@ -169,7 +321,7 @@ def get_restaurants():
             'message': str(e)
         }), 500
 
-@app.route('/api/restaurants/search', methods=['GET'])
+@api.route('/api/restaurants/search', methods=['GET'])
 def search_restaurants():
     """Search restaurants by name or location."""
     try:
@@ -182,22 +334,31 @@ def search_restaurants():
                 'error': 'Query parameter "q" is required'
             }), 400
         
-        # Search restaurants
-        results = db_manager.search_places(
-            query=query,
-            limit=limit,
-            offset=offset
-        )
+        include_facets = request.args.get('facets', 'false').lower() == 'true'
+        
+        # Search restaurants (and count facets of the matches from the same snapshot)
+        reader = get_catalog_reader()
+        with reader.read_snapshot() if include_facets else nullcontext():
+            results = reader.search_places(
+                query=query,
+                limit=limit,
+                offset=offset
+            )
+            facets = reader.get_facets(query=query) if include_facets else None
         
         logger.info(f"Search for '{query}' returned {len(results)} results")
         
-        return jsonify({
+        response = {
             'restaurants': results,
             'query': query,
             'total': len(results),
             'limit': limit,
             'offset': offset
-        }), 200
+        }
+        # Facet counts for the matching result set: ?facets=true
+        if facets is not None:
+            response['facets'] = facets
+        return jsonify(response), 200
         
     except Exception as e:
         logger.error(f"Error searching restaurants: {e}")
@@ -206,11 +367,104 @@ def search_restaurants():
             'message': str(e)
         }), 500
 
-@app.route('/api/restaurants/<int:restaurant_id>', methods=['GET'])
+@api.route('/api/restaurants/nearby', methods=['GET'])
+def get_nearby_restaurants():
+    """Get restaurants within a radius (miles) of a point, nearest first."""
+    try:
+        latitude = request.args.get('lat', type=float)
+        longitude = request.args.get('lng', type=float)
+        radius = request.args.get('radius', 10, type=float)
+        limit = request.args.get('limit', 50, type=int)
+        
+        if latitude is None or longitude is None:
+            return jsonify({
+                'error': 'Query parameters "lat" and "lng" are required'
+            }), 400
+        
+        try:
+            field_list = db_manager.resolve_fields(request.args.get('fields'), request.args.get('view', 'summary'))
+        except ValueError as e:
+            return jsonify({
+                'error': 'Invalid fields parameter',
+                'message': str(e)
+            }), 400
+        
+        restaurants = catalog_reader.get_places_nearby(latitude, longitude, radius=radius, fields=field_list, limit=limit)
+        
+        return jsonify({
+            'restaurants': restaurants,
+            'total': len(restaurants),
+            'latitude': latitude,
+            'longitude': longitude,
+            'radius': radius,
+            'limit': limit
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting nearby restaurants: {e}")
+        return jsonify({
+            'error': 'Failed to retrieve nearby restaurants',
+            'message': str(e)
+        }), 500
+
+@api.route('/api/specials', methods=['GET'])
+def get_specials():
+    """
+    Get paid specials with their restaurant.
+    
+    Query parameters:
+        active: '1' (default) for specials active now, '0' for all paid specials
+        near: 'lat,lng' to only return specials within ``radius`` miles, nearest first
+        radius: Search radius in miles (default 10)
+        restaurant_id: Only specials of this restaurant
+        limit, offset: Pagination
+    """
+    try:
+        active = request.args.get('active', '1').lower() not in ('0', 'false')
+        radius = request.args.get('radius', 10, type=float)
+        restaurant_id = request.args.get('restaurant_id', None, type=int)
+        limit = request.args.get('limit', 50, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        
+        latitude = longitude = None
+        near = request.args.get('near')
+        if near:
+            try:
+                latitude, longitude = (float(part) for part in near.split(','))
+            except ValueError:
+                return jsonify({
+                    'error': 'Invalid near parameter',
+                    'message': 'near must be "lat,lng"'
+                }), 400
+        
+        specials = db_manager.get_specials(
+            active=active, latitude=latitude, longitude=longitude, radius=radius,
+            restaurant_id=restaurant_id, limit=limit, offset=offset
+        )
+        
+        response = {
+            'specials': specials,
+            'total': len(specials),
+            'active': active,
+            'limit': limit,
+            'offset': offset
+        }
+        if near:
+            response.update(latitude=latitude, longitude=longitude, radius=radius)
+        return jsonify(response), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting specials: {e}")
+        return jsonify({
+            'error': 'Failed to retrieve specials',
+            'message': str(e)
+        }), 500
+
+@api.route('/api/restaurants/<int:restaurant_id>', methods=['GET'])
 def get_restaurant(restaurant_id):
     """Get a specific restaurant by ID."""
     try:
-        restaurant = db_manager.get_place_by_id(restaurant_id)
+        restaurant = catalog_reader.get_place_by_id(restaurant_id)
         
         if not restaurant:
             return jsonify({
@@ -226,7 +480,134 @@ def get_restaurant(restaurant_id):
             'message': str(e)
         }), 500
 
-@app.route('/api/statistics', methods=['GET'])
+@api.route('/api/export', methods=['GET'])
+def export_catalog():
+    """
+    Stream the restaurant catalog as NDJSON or CSV.
+    
+    Rows are streamed in id order from a server-side cursor with constant
+    memory. The export ends with a trailer (see utils/catalog_export.py)
+    saying whether it is complete, with the row count and last id; to resume
+    an incomplete export, pass that last id as ``after_id``.
+    
+    Query parameters:
+        format: 'ndjson' (default) or 'csv'
+        fields: Comma-separated columns (default: all stored columns)
+        kosher_category, state, city, certifying_agency, listing_type: Equality filters
+        updated_since: ISO timestamp; only rows updated at or after it
+        after_id: Resume cursor (export rows with id greater than this)
+        limit: Maximum number of rows
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'error': 'Invalid format parameter',
+                'message': f"Supported formats: {', '.join(EXPORT_FORMATS)}"
+            }), 400
+        
+        fields = request.args.get('fields')
+        if fields:
+            columns = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [c for c in columns if c not in LISTING_COLUMNS]
+            if unknown:
+                return jsonify({
+                    'error': 'Invalid fields parameter',
+                    'message': f"Unknown fields: {', '.join(unknown)}"
+                }), 400
+            # The id is always exported so clients can resume
+            if 'id' not in columns:
+                columns.insert(0, 'id')
+        else:
+            columns = list(LISTING_COLUMNS)
+        
+        filters = {}
+        for key in ('kosher_category', 'state', 'city', 'certifying_agency', 'listing_type'):
+            if request.args.get(key):
+                filters[key] = request.args.get(key)
+        
+        updated_since = request.args.get('updated_since')
+        if updated_since:
+            try:
+                filters['updated_since'] = datetime.fromisoformat(updated_since)
+            except ValueError:
+                return jsonify({
+                    'error': 'Invalid updated_since parameter',
+                    'message': 'updated_since must be an ISO 8601 timestamp'
+                }), 400
+        
+        after_id = request.args.get('after_id', 0, type=int)
+        limit = request.args.get('limit', None, type=int)
+        
+        batches = db_manager.iter_export_batches(columns, filters, after_id=after_id, limit=limit)
+        
+        logger.info(f"Starting {export_format} export", after_id=after_id, filters=list(filters))
+        
+        response = Response(
+            stream_with_context(export_chunks(export_format, batches, columns)),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="restaurants.{export_format}"'
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error exporting catalog: {e}")
+        return jsonify({
+            'error': 'Failed to export catalog',
+            'message': str(e)
+        }), 500
+
+@api.route('/api/changes', methods=['GET'])
+def get_changes():
+    """
+    Incremental catalog sync: restaurant upserts and deletes after a version.
+    
+    Clients keep a local copy, apply the changes in order and pass the
+    returned ``next_since`` on their next call (repeat while ``has_more``).
+    Starting from since=0 returns the whole catalog; ``reset`` means the
+    client is ahead of the server's log and must start over from 0.
+    
+    Query parameters:
+        since: Last version applied (default 0)
+        limit: Maximum number of changes (default 500, max 5000)
+        fields: Comma-separated fields of upserted restaurants (default: all stored columns)
+    """
+    try:
+        # Parsed explicitly: type=int would turn a malformed since into 0 (a full resync)
+        try:
+            since = int(request.args.get('since', 0))
+            limit = int(request.args.get('limit', 500))
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'since and limit must be integers'
+            }), 400
+        if since < 0 or not 1 <= limit <= 5000:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'since must be >= 0 and limit between 1 and 5000'
+            }), 400
+        
+        fields = None
+        if request.args.get('fields'):
+            try:
+                fields = db_manager.resolve_fields(request.args.get('fields'))
+            except ValueError as e:
+                return jsonify({
+                    'error': 'Invalid fields parameter',
+                    'message': str(e)
+                }), 400
+        
+        return jsonify(db_manager.get_changes(since=since, limit=limit, fields=fields)), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting changes: {e}")
+        return jsonify({
+            'error': 'Failed to retrieve changes',
+            'message': str(e)
+        }), 500
+
+@api.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """Get database statistics."""
     try:
@@ -240,43 +621,17 @@ def get_statistics():
             'message': str(e)
         }), 500
 
-@app.route('/api/kosher-types', methods=['GET'])
+@api.route('/api/kosher-types', methods=['GET'])
 def get_kosher_types():
     """Get available kosher types and counts."""
     try:
-        session = db_manager.get_session()
-        
-        # Get kosher type distribution
-        from database.database_manager_v3 import Restaurant
-        from sqlalchemy import func
-        
-        kosher_types = session.query(
-            Restaurant.kosher_category,
-            func.count(Restaurant.kosher_category)
-        ).group_by(Restaurant.kosher_category).all()
-        
-        # Get Chalav Yisroel/Stam counts
-        chalav_yisroel_count = session.query(Restaurant).filter(
-            Restaurant.is_cholov_yisroel == True
-        ).count()
-        
-        chalav_stam_count = session.query(Restaurant).filter(
-            Restaurant.is_cholov_yisroel == False,
-            Restaurant.kosher_category == 'dairy'
-        ).count()
-        
-        # Get Pas Yisroel count
-        pas_yisroel_count = session.query(Restaurant).filter(
-            Restaurant.is_pas_yisroel == True
-        ).count()
-        
-        session.close()
+        stats = db_manager.get_statistics()
         
         return jsonify({
-            'kosher_types': dict(kosher_types),
-            'chalav_yisroel': chalav_yisroel_count,
-            'chalav_stam': chalav_stam_count,
-            'pas_yisroel': pas_yisroel_count
+            'kosher_types': stats.get('kosher_types', {}),
+            'chalav_yisroel': stats.get('chalav_yisroel', 0),
+            'chalav_stam': stats.get('chalav_stam', 0),
+            'pas_yisroel': stats.get('pas_yisroel', 0)
         }), 200
         
     except Exception as e:
@@ -286,98 +641,56 @@ def get_kosher_types():
             'message': str(e)
         }), 500
 
-@app.route('/api/remove-duplicates', methods=['POST'])
+@api.route('/api/remove-duplicates', methods=['POST'])
 def remove_duplicates():
-    """Remove duplicate restaurants from the database."""
+    """
+    Find fuzzy duplicate restaurants and report or apply the merge plan.
+    
+    Duplicates are matched on normalized names, phone numbers, addresses and
+    location (see utils/dedupe.py). Each group keeps its best-enriched
+    restaurant; the others are merged into it and deleted.
+    
+    Parameters (JSON body or query string):
+        dry_run: true (default) to only report the plan, false to apply it
+            in a single transaction
+    """
     try:
-        session = db_manager.get_session()
-        
-        # Find duplicates using SQL
-        from sqlalchemy import text
-        
-        duplicate_query = text("""
-            WITH duplicates AS (
-                SELECT 
-                    name,
-                    MIN(id) as keep_id,
-                    COUNT(*) as count
-                FROM restaurants 
-                GROUP BY name 
-                HAVING COUNT(*) > 1
-            )
-            SELECT 
-                d.name,
-                d.keep_id,
-                d.count,
-                array_agg(r.id ORDER BY r.id) as all_ids
-            FROM duplicates d
-            JOIN restaurants r ON r.name = d.name
-            GROUP BY d.name, d.keep_id, d.count
-            ORDER BY d.name
-        """)
-        
-        result = session.execute(duplicate_query)
-        duplicates = result.fetchall()
-        
-        if not duplicates:
-            return jsonify({
-                'message': 'No duplicates found in database',
-                'removed_count': 0
-            }), 200
-        
-        total_removed = 0
-        removed_details = []
-        
-        for duplicate in duplicates:
-            name = duplicate.name
-            keep_id = duplicate.keep_id
-            count = duplicate.count
-            all_ids = duplicate.all_ids
-            
-            # Remove all except the oldest (lowest ID)
-            ids_to_remove = [id for id in all_ids if id != keep_id]
-            
-            # Delete the duplicates
-            delete_query = text("DELETE FROM restaurants WHERE id = ANY(:ids)")
-            session.execute(delete_query, {"ids": ids_to_remove})
-            
-            total_removed += len(ids_to_remove)
-            
-            removed_details.append({
-                'name': name,
-                'kept_id': keep_id,
-                'removed_ids': ids_to_remove,
-                'total_duplicates': count
-            })
-        
-        # Commit the changes
-        session.commit()
-        
-        # Get updated count
-        verify_query = text("SELECT COUNT(*) as total FROM restaurants")
-        result = session.execute(verify_query)
-        total_restaurants = result.fetchone().total
+        data = request.get_json(silent=True) or {}
+        dry_run = data.get('dry_run', request.args.get('dry_run', 'true'))
+        if isinstance(dry_run, str):
+            dry_run = dry_run.lower() not in ('0', 'false', 'no')
+        
+        result = db_manager.find_duplicates()
+        plan = result['plan']
+        duplicate_count = sum(len(group['remove_ids']) for group in plan)
+        
+        response = {
+            'dry_run': bool(dry_run),
+            'duplicate_groups': len(plan),
+            'duplicate_count': duplicate_count,
+            'stats': result['stats'],
+            'plan': plan
+        }
         
-        session.close()
+        if dry_run:
+            response['message'] = f'Found {duplicate_count} duplicate restaurants in {len(plan)} groups (dry run)'
+            response['removed_count'] = 0
+            return jsonify(response), 200
         
-        return jsonify({
-            'message': f'Successfully removed {total_removed} duplicate restaurants',
-            'removed_count': total_removed,
-            'total_restaurants_after': total_restaurants,
-            'removed_details': removed_details
-        }), 200
+        removed = db_manager.apply_merge_plan(plan)
+        response['message'] = f'Successfully removed {removed} duplicate restaurants'
+        response['removed_count'] = removed
+        response['total_restaurants_after'] = db_manager.get_statistics().get('total_restaurants')
+        return jsonify(response), 200
         
     except Exception as e:
         logger.error(f"Error removing duplicates: {e}")
-        if 'session' in locals():
-            session.rollback()
-            session.close()
         return jsonify({
             'error': 'Failed to remove duplicates',
             'message': str(e)
         }), 500
 
-@app.route('/api/migrate', methods=['GET', 'POST'])
+@api.route('/api/migrate', methods=['GET', 'POST'])
 def run_migration():
     """Run database migration to add missing columns."""
     try:
@@ -440,7 +753,7 @@ def run_migration():
             'error': f'Migration failed: {str(e)}'
         }), 500
 
-@app.route('/fix', methods=['GET'])
+@api.route('/fix', methods=['GET'])
 def fix_database():
     """Simple endpoint to fix database schema."""
     try:
@@ -526,7 +839,7 @@ def search_google_places(restaurant_name: str, address: str) -> str:
         }
         
         logger.info(f"Searching Google Places for: {query}")
-        response = requests.get(search_url, params=search_params, timeout=10)
+        response = external_get('google_places', search_url, params=search_params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -543,7 +856,7 @@ def search_google_places(restaurant_name: str, address: str) -> str:
             }
             
             logger.info(f"Getting place details for place_id: {place_id}")
-            details_response = requests.get(details_url, params=details_params, timeout=10)
+            details_response = external_get('google_places', details_url, params=details_params, timeout=10)
             details_response.raise_for_status()
             
             details_data = details_response.json()
@@ -564,7 +877,7 @@ def search_google_places(restaurant_name: str, address: str) -> str:
         logger.error(f"Error searching Google Places for {restaurant_name}: {e}")
         return ""
 
-@app.route('/api/restaurants/<int:restaurant_id>/fetch-website', methods=['POST'])
+@api.route('/api/restaurants/<int:restaurant_id>/fetch-website', methods=['POST'])
 def fetch_restaurant_website(restaurant_id):
     """Fetch website information for a specific restaurant using Google Places API."""
     try:
@@ -627,7 +940,7 @@ def fetch_restaurant_website(restaurant_id):
         if 'session' in locals():
             session.close()
 
-@app.route('/api/restaurants/fetch-missing-websites', methods=['POST'])
+@api.route('/api/restaurants/fetch-missing-websites', methods=['POST'])
 def fetch_missing_websites():
     """
     Fetch website links for all restaurants that don't have them.
@@ -716,7 +1029,7 @@ def search_google_places_hours(restaurant_name: str, address: str) -> str:
         }
         
         logger.info(f"Searching Google Places for hours: {query}")
-        response = requests.get(search_url, params=search_params, timeout=10)
+        response = external_get('google_places', search_url, params=search_params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -733,7 +1046,7 @@ def search_google_places_hours(restaurant_name: str, address: str) -> str:
             }
             
             logger.info(f"Getting place details for hours, place_id: {place_id}")
-            details_response = requests.get(details_url, params=details_params, timeout=10)
+            details_response = external_get('google_places', details_url, params=details_params, timeout=10)
             details_response.raise_for_status()
             
             details_data = details_response.json()
@@ -788,7 +1101,7 @@ def format_hours_from_places_api(opening_hours: dict) -> str:
     
     return ', '.join(formatted_hours)
 
-@app.route('/api/restaurants/<int:restaurant_id>/fetch-hours', methods=['POST'])
+@api.route('/api/restaurants/<int:restaurant_id>/fetch-hours', methods=['POST'])
 def fetch_restaurant_hours(restaurant_id):
     """
     Fetch opening hours for a specific restaurant using Google Places API.
@@ -839,7 +1152,7 @@ def fetch_restaurant_hours(restaurant_id):
         logger.error(f"Error fetching hours for restaurant {restaurant_id}: {e}")
         return jsonify({'error': f'Error fetching hours: {str(e)}'}), 500
 
-@app.route('/api/restaurants/fetch-missing-hours', methods=['POST'])
+@api.route('/api/restaurants/fetch-missing-hours', methods=['POST'])
 def fetch_missing_hours():
     """
     Fetch opening hours for all restaurants that don't have them.
@@ -906,7 +1219,7 @@ def fetch_missing_hours():
         logger.error(f"Error in bulk hours update: {e}")
         return jsonify({'error': f'Error in bulk hours update: {str(e)}'        }), 500
 
-@app.route('/api/update-database', methods=['POST'])
+@api.route('/api/update-database', methods=['POST'])
 def update_database():
     """Update database with real ORB data."""
     try:
@@ -942,40 +1255,20 @@ def update_database():
         if businesses:  # businesses is now a boolean indicating success
             logger.info("ORB scraper completed successfully")
             
-            # Step 3: Verify the data (scraper already saved to database)
-            final_count = session.query(Restaurant).count()
+            # Step 3: Rebuild statistics (the bulk delete bypassed the incremental counters)
+            stats = db_manager.refresh_statistics()
+            final_count = stats.get('total_restaurants', 0)
             logger.info(f"Final restaurant count: {final_count}")
             
-            # Show final statistics
-            from sqlalchemy import func
-            kosher_types = session.query(
-                Restaurant.kosher_category,
-                func.count(Restaurant.kosher_category)
-            ).group_by(Restaurant.kosher_category).all()
-            
-            # Show Chalav Yisroel statistics
-            chalav_yisroel_count = session.query(Restaurant).filter(
-                Restaurant.is_cholov_yisroel == True
-            ).count()
-            
-            chalav_stam_count = session.query(Restaurant).filter(
-                Restaurant.is_cholov_yisroel == False,
-                Restaurant.kosher_category == 'dairy'
-            ).count()
-            
-            pas_yisroel_count = session.query(Restaurant).filter(
-                Restaurant.is_pas_yisroel == True
-            ).count()
-            
             return jsonify({
                 'message': f'Successfully updated database with ORB restaurants',
                 'deleted_count': deleted_count,
                 'saved_count': final_count,
                 'final_count': final_count,
-                'kosher_types': dict(kosher_types),
-                'chalav_yisroel': chalav_yisroel_count,
-                'chalav_stam': chalav_stam_count,
-                'pas_yisroel': pas_yisroel_count
+                'kosher_types': stats.get('kosher_types', {}),
+                'chalav_yisroel': stats.get('chalav_yisroel', 0),
+                'chalav_stam': stats.get('chalav_stam', 0),
+                'pas_yisroel': stats.get('pas_yisroel', 0)
             }), 200
         else:
             logger.error("ORB scraper failed")
@@ -991,7 +1284,7 @@ def update_database():
             'message': str(e)
         }), 500
 
-@app.route('/api/admin/update-hours', methods=['POST'])
+@api.route('/api/admin/update-hours', methods=['POST'])
 def update_restaurant_hours():
     """Update restaurant hours using Google Places API."""
     try:
@@ -1026,7 +1319,7 @@ def update_restaurant_hours():
             'key': google_api_key
         }
         
-        response = requests.get(url, params=params)
+        response = external_get('google_places', url, params=params)
         data = response.json()
         
         if data.get('status') != 'OK':
@@ -1038,21 +1331,23 @@ def update_restaurant_hours():
         # Extract hours data
         periods = opening_hours.get('periods', [])
         weekday_text = opening_hours.get('weekday_text', [])
-        utc_offset = result.get('utc_offset_minutes', 0)
-        
-        # Convert UTC offset to timezone
-        timezone = offset_to_timezone(utc_offset)
-        
-        # Update restaurant hours
-        restaurant.hours_of_operation = '\n'.join(weekday_text)
-        restaurant.hours_json = json.dumps(periods)
-        restaurant.hours_last_updated = datetime.utcnow()
-        restaurant.timezone = timezone
-        restaurant.hours_parsed = True
+        # None when Places has no offset (not 0, which would resolve to UTC)
+        utc_offset = result.get('utc_offset_minutes')
+        
+        # Resolve timezone from location, falling back to the reported UTC offset
+        timezone = resolve_timezone(
+            restaurant.latitude,
+            restaurant.longitude,
+            restaurant.state,
+            utc_offset_minutes=utc_offset
+        )
         
-        session.commit()
         session.close()
         
+        # Update restaurant hours (and the statistics summary row)
+        if not db.update_restaurant_hours(restaurant_id, '\n'.join(weekday_text), json.dumps(periods), timezone):
+            return jsonify({'error': 'Failed to update restaurant hours'}), 500
+        
         return jsonify({
             'success': True,
             'message': 'Hours updated successfully',
@@ -1065,21 +1360,27 @@ def update_restaurant_hours():
         logger.error(f"Error updating restaurant hours: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/admin/specials', methods=['GET'])
+@api.route('/api/admin/specials', methods=['GET'])
 def get_admin_specials():
-    """API endpoint for getting all specials (admin only)."""
+    """API endpoint for getting all specials, paid or not (admin only)."""
     try:
-        # Simple test response first
+        specials = db_manager.get_specials(
+            active=False,
+            restaurant_id=request.args.get('restaurant_id', None, type=int),
+            paid_only=False,
+            limit=request.args.get('limit', 500, type=int),
+            offset=request.args.get('offset', 0, type=int)
+        )
         return jsonify({
             'success': True,
-            'specials': [],
-            'message': 'Admin specials endpoint is working'
+            'specials': specials,
+            'total': len(specials)
         })
     except Exception as e:
         logger.error(f"API error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/admin/specials-test', methods=['GET'])
+@api.route('/api/admin/specials-test', methods=['GET'])
 def get_admin_specials_test():
     """Test endpoint for admin specials."""
     return jsonify({
@@ -1087,7 +1388,7 @@ def get_admin_specials_test():
         'message': 'Test endpoint is working'
     })
 
-@app.route('/api/admin/specials/<int:special_id>/payment', methods=['PUT'])
+@api.route('/api/admin/specials/<int:special_id>/payment', methods=['PUT'])
 def update_special_payment(special_id):
     """API endpoint for updating special payment status."""
     try:
@@ -1106,22 +1407,77 @@ def update_special_payment(special_id):
         logger.error(f"API error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-def offset_to_timezone(offset_minutes):
-    """Convert UTC offset to timezone name."""
-    # Simple mapping for common US timezones
-    offset_hours = offset_minutes / 60
-    if offset_hours == -5:
-        return 'America/New_York'
-    elif offset_hours == -6:
-        return 'America/Chicago'
-    elif offset_hours == -7:
-        return 'America/Denver'
-    elif offset_hours == -8:
-        return 'America/Los_Angeles'
-    else:
-        return 'UTC'
+@api.route('/api/admin/link-health', methods=['GET'])
+def get_link_health():
+    """
+    API endpoint for the cached website and image link checks.
+    
+    Links are checked by scripts/check_links.py (never while serving); this
+    reports the counts per status and the restaurants with broken links.
+    
+    Parameters:
+        limit: Maximum number of broken links listed (default 100)
+    """
+    try:
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        return jsonify({'success': True, **db_manager.get_link_health(limit=limit)})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        logger.error(f"API error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/admin/jobs', methods=['GET'])
+def get_scheduled_jobs():
+    """
+    API endpoint for the periodic jobs and their run history.
+    
+    Parameters:
+        job: Only list runs of this job
+        limit: Maximum number of runs listed (default 50)
+    """
+    try:
+        limit = min(int(request.args.get('limit', 50)), 1000)
+        return jsonify({
+            'success': True,
+            'jobs': scheduler.status(),
+            'runs': scheduler.history(limit=limit, job_name=request.args.get('job')),
+        })
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        logger.error(f"API error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/admin/sources', methods=['GET'])
+def get_ingestion_sources():
+    """
+    API endpoint for the certifier ingestion sources.
+    
+    Sources are synced by their <name>_sync jobs (see /api/admin/jobs); this
+    reports each source's listings, linked restaurants and page errors.
+    """
+    try:
+        return jsonify({'success': True, **db_manager.get_ingestion_status()})
+    except Exception as e:
+        logger.error(f"API error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.errorhandler(404)
+@api.route('/api/admin/replica', methods=['GET'])
+def get_replica_status():
+    """
+    API endpoint for the in-memory catalog replica of this worker.
+    
+    Reports whether the replica serves reads, its catalog version, when it
+    was loaded and last checked, and its memory footprint.
+    """
+    try:
+        return jsonify({'success': True, **catalog_replica.status(), 'memory': catalog_replica.memory_report()})
+    except Exception as e:
+        logger.error(f"API error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     return jsonify({
@@ -1129,7 +1485,7 @@ def not_found(error):
         'message': 'The requested endpoint does not exist'
     }), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error(f"Internal server error: {error}")
@@ -1138,9 +1494,12 @@ def internal_error(error):
         'message': 'An unexpected error occurred'
     }), 500
 
+# WSGI entry point (gunicorn app:app)
+app = create_app()
+
 if __name__ == '__main__':
     # Initialize database
-    if init_database():
+    if get_db_manager():
         logger.info("Starting JewGo Backend API Server")
         
         # Determine if we're in production
@@ -1153,4 +1512,4 @@ if __name__ == '__main__':
         )
     else:
         logger.error("Failed to initialize database. Exiting.")
-        exit(1) # Force redeploy - Thu Jul 31 19:36:41 AST 2025
+        exit(1) # Force redeploy - Thu Jul 31 19:36:41 AST 2025
\ No newline at end of file
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+JewGo Backend API Server - ASGI Entry Point
+===========================================
+
+Async serving mode. The hot read endpoints are served natively on an
+asyncpg-backed pool (database/async_catalog.py), so one worker process
+keeps serving while hundreds of requests wait on the database. Every other
+route (admin, Places and scraper endpoints, export, /metrics) is the
+existing Flask app, mounted as WSGI and run in a thread pool. CORS is
+applied in front of both, from the same CORS_* settings Flask-CORS uses.
+
+Read sources: the native endpoints read only the database. The in-memory
+catalog replica (REPLICA_ENABLED, utils/catalog_replica.py) and the catalog
+snapshot (SNAPSHOT_MODE fallback/always, utils/snapshot.py) are served by
+the Flask endpoints, so when either is configured the native routes are not
+registered and those paths go to the mounted Flask app, which reads from
+them without waiting on the database.
+
+Usage:
+    uvicorn asgi:app --port 8081
+    SERVER_MODE=async ./startup.sh   # gunicorn with uvicorn workers
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import time
+from contextlib import asynccontextmanager, nullcontext
+from functools import wraps
+
+import structlog
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from app import app as flask_app
+from database.async_catalog import AsyncCatalogReader
+from utils.json_encoding import assemble_listing, dumps_bytes
+from utils.metrics import observe_request
+from utils.rate_limit import rate_limiter
+
+logger = structlog.get_logger()
+
+JSON_MEDIA_TYPE = 'application/json'
+
+# Connected in the lifespan handler (one pool per worker process)
+catalog = AsyncCatalogReader(
+    pool_size=flask_app.config.get('ASYNC_DB_POOL_SIZE'),
+    max_overflow=flask_app.config.get('ASYNC_DB_MAX_OVERFLOW'),
+)
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Encode a payload with the fast JSON encoder."""
+    return Response(dumps_bytes(payload), status_code=status, media_type=JSON_MEDIA_TYPE)
+
+
+def _int_arg(request: Request, name: str, default: int) -> int:
+    """Read an integer query parameter (invalid values fall back to the default, as in Flask)."""
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _float_arg(request: Request, name: str, default=None):
+    """Read a float query parameter (invalid values fall back to the default, as in Flask)."""
+    try:
+        return float(request.query_params[name])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+async def _rate_limited(request: Request, endpoint_name: str):
+    """Spend the request's rate limit tokens; returns a 429 response if the client is out of them."""
+    client = request.client.host if request.client else None
+    result = await run_in_threadpool(
+        rate_limiter.check, request.method, request.url.path, endpoint_name, request.headers, client,
+        request.query_params
+    )
+    if result is None:
+        return None, None
+    wait, remaining, capacity = result
+    headers = {'X-RateLimit-Limit': str(capacity), 'X-RateLimit-Remaining': str(int(remaining))}
+    if wait:
+        body, retry_after = rate_limiter.too_many_requests(wait)
+        response = json_response(body, 429)
+        response.headers['Retry-After'] = str(retry_after)
+        return response, headers
+    return None, headers
+
+
+def endpoint(rule: str):
+    """
+    Record request metrics for an async endpoint under the Flask rule of the same path,
+    and apply the Flask app's rate limits (same endpoint names, so the same route costs).
+    """
+    def decorator(handler):
+        endpoint_name = f'api.{handler.__name__}'
+
+        @wraps(handler)
+        async def wrapper(request: Request) -> Response:
+            start = time.perf_counter()
+            rejection, rate_headers = await _rate_limited(request, endpoint_name)
+            response = rejection or await handler(request)
+            if rate_headers:
+                response.headers.update(rate_headers)
+            observe_request(request.method, rule, response.status_code, time.perf_counter() - start,
+                            len(response.body))
+            return response
+        return wrapper
+    return decorator
+
+
+@endpoint('/api/restaurants')
+async def get_restaurants(request: Request) -> Response:
+    """Get all restaurants with optional filtering."""
+    try:
+        limit = _int_arg(request, 'limit', 100)
+        offset = _int_arg(request, 'offset', 0)
+        kosher_category = request.query_params.get('kosher_category')
+        state = request.query_params.get('state')
+        fields = request.query_params.get('fields')
+        view = request.query_params.get('view')
+        include_facets = request.query_params.get('facets', 'false').lower() == 'true'
+        # The listing and its facet counts are read from one snapshot of the catalog
+        async with catalog.read_snapshot() if include_facets else nullcontext():
+            facets = await catalog.get_facets(kosher_category=kosher_category, state=state) if include_facets else None
+
+            if fields or view == 'summary':
+                try:
+                    field_list = catalog.catalog.resolve_fields(fields, view or 'summary')
+                except ValueError as e:
+                    return json_response({'error': 'Invalid fields parameter', 'message': str(e)}, 400)
+
+                restaurants = await catalog.get_places_projected(
+                    field_list, limit=limit, offset=offset, kosher_category=kosher_category, state=state
+                )
+                response = {'restaurants': restaurants, 'total': len(restaurants), 'limit': limit, 'offset': offset}
+                if facets is not None:
+                    response['facets'] = facets
+                return json_response(response)
+
+            if view and view != 'detail':
+                return json_response({'error': 'Invalid view parameter', 'message': f"Unknown view: {view}"}, 400)
+
+            fragments = await catalog.get_all_places_encoded(
+                limit=limit, offset=offset, kosher_category=kosher_category, state=state
+            )
+            meta = {'total': len(fragments), 'limit': limit, 'offset': offset}
+            if facets is not None:
+                meta['facets'] = facets
+            return Response(assemble_listing('restaurants', fragments, **meta), media_type=JSON_MEDIA_TYPE)
+
+    except Exception as e:
+        logger.error(f"Error getting restaurants: {e}")
+        return json_response({'error': 'Failed to retrieve restaurants', 'message': str(e)}, 500)
+
+
+@endpoint('/api/restaurants/search')
+async def search_restaurants(request: Request) -> Response:
+    """Search restaurants by name."""
+    try:
+        query = request.query_params.get('q', '')
+        limit = _int_arg(request, 'limit', 50)
+        offset = _int_arg(request, 'offset', 0)
+
+        if not query:
+            return json_response({'error': 'Query parameter "q" is required'}, 400)
+
+        include_facets = request.query_params.get('facets', 'false').lower() == 'true'
+        async with catalog.read_snapshot() if include_facets else nullcontext():
+            results = await catalog.search_places(query=query, limit=limit, offset=offset)
+            facets = await catalog.get_facets(query=query) if include_facets else None
+        response = {'restaurants': results, 'query': query, 'total': len(results), 'limit': limit, 'offset': offset}
+        if facets is not None:
+            response['facets'] = facets
+        return json_response(response)
+
+    except Exception as e:
+        logger.error(f"Error searching restaurants: {e}")
+        return json_response({'error': 'Failed to search restaurants', 'message': str(e)}, 500)
+
+
+@endpoint('/api/restaurants/nearby')
+async def get_nearby_restaurants(request: Request) -> Response:
+    """Get restaurants within a radius (miles) of a point, nearest first."""
+    try:
+        latitude = _float_arg(request, 'lat')
+        longitude = _float_arg(request, 'lng')
+        radius = _float_arg(request, 'radius', 10)
+        limit = _int_arg(request, 'limit', 50)
+
+        if latitude is None or longitude is None:
+            return json_response({'error': 'Query parameters "lat" and "lng" are required'}, 400)
+
+        try:
+            field_list = catalog.catalog.resolve_fields(
+                request.query_params.get('fields'), request.query_params.get('view', 'summary')
+            )
+        except ValueError as e:
+            return json_response({'error': 'Invalid fields parameter', 'message': str(e)}, 400)
+
+        restaurants = await catalog.get_places_nearby(latitude, longitude, radius=radius, fields=field_list, limit=limit)
+        return json_response({
+            'restaurants': restaurants,
+            'total': len(restaurants),
+            'latitude': latitude,
+            'longitude': longitude,
+            'radius': radius,
+            'limit': limit,
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting nearby restaurants: {e}")
+        return json_response({'error': 'Failed to retrieve nearby restaurants', 'message': str(e)}, 500)
+
+
+@endpoint('/api/restaurants/<int:restaurant_id>')
+async def get_restaurant(request: Request) -> Response:
+    """Get a specific restaurant by ID."""
+    restaurant_id = request.path_params['restaurant_id']
+    try:
+        restaurant = await catalog.get_place_by_id(restaurant_id)
+        if not restaurant:
+            return json_response({'error': 'Restaurant not found'}, 404)
+        return json_response(restaurant)
+
+    except Exception as e:
+        logger.error(f"Error getting restaurant {restaurant_id}: {e}")
+        return json_response({'error': 'Failed to retrieve restaurant', 'message': str(e)}, 500)
+
+
+@endpoint('/api/statistics')
+async def get_statistics(request: Request) -> Response:
+    """Get database statistics."""
+    try:
+        return json_response(await catalog.get_statistics())
+
+    except Exception as e:
+        logger.error(f"Error getting statistics: {e}")
+        return json_response({'error': 'Failed to retrieve statistics', 'message': str(e)}, 500)
+
+
+@endpoint('/api/kosher-types')
+async def get_kosher_types(request: Request) -> Response:
+    """Get available kosher types and counts."""
+    try:
+        stats = await catalog.get_statistics()
+        return json_response({
+            'kosher_types': stats.get('kosher_types', {}),
+            'chalav_yisroel': stats.get('chalav_yisroel', 0),
+            'chalav_stam': stats.get('chalav_stam', 0),
+            'pas_yisroel': stats.get('pas_yisroel', 0),
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting kosher types: {e}")
+        return json_response({'error': 'Failed to retrieve kosher types', 'message': str(e)}, 500)
+
+
+def serves_native_reads(wsgi_app) -> bool:
+    """Whether the read endpoints are served natively (the database is their only read source)."""
+    return not wsgi_app.config.get('REPLICA_ENABLED') and wsgi_app.config.get('SNAPSHOT_MODE', 'off') == 'off'
+
+
+@asynccontextmanager
+async def lifespan(application):
+    """Open the async pool when the worker starts and close it on shutdown."""
+    if not application.state.native_reads:
+        yield
+        return
+    await catalog.connect()
+    try:
+        yield
+    finally:
+        await catalog.disconnect()
+
+
+def cors_middleware(wsgi_app) -> Middleware:
+    """CORS for the native routes, configured like Flask-CORS in app.create_app."""
+    config = wsgi_app.config
+    origins = config.get('CORS_ORIGINS', ['*'])
+    return Middleware(
+        CORSMiddleware,
+        # With credentials, Flask-CORS echoes the request origin instead of '*'
+        allow_origins=[] if '*' in origins else origins,
+        allow_origin_regex='.*' if '*' in origins else None,
+        allow_methods=config.get('CORS_METHODS', ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']),
+        allow_headers=config.get('CORS_ALLOW_HEADERS', ['Content-Type', 'Authorization', 'Accept', 'Origin', 'X-Requested-With']),
+        allow_credentials=True,
+    )
+
+
+def create_asgi_app(wsgi_app=flask_app) -> Starlette:
+    """Create the ASGI application: async read endpoints, with the Flask app mounted for the rest."""
+    native_reads = serves_native_reads(wsgi_app)
+    routes = [
+        Route('/api/restaurants', get_restaurants, methods=['GET']),
+        Route('/api/restaurants/search', search_restaurants, methods=['GET']),
+        Route('/api/restaurants/nearby', get_nearby_restaurants, methods=['GET']),
+        Route('/api/restaurants/{restaurant_id:int}', get_restaurant, methods=['GET']),
+        Route('/api/statistics', get_statistics, methods=['GET']),
+        Route('/api/kosher-types', get_kosher_types, methods=['GET']),
+    ] if native_reads else []
+    if not native_reads:
+        logger.info("Catalog replica or snapshot configured; read endpoints are served by the Flask app")
+    # Everything else, including POST on the paths above and /metrics
+    routes.append(Mount('/', app=WSGIMiddleware(wsgi_app, workers=wsgi_app.config.get('ASYNC_WSGI_THREADS', 10))))
+    # Flask responses arrive already compressed and are passed through unchanged
+    middleware = [
+        cors_middleware(wsgi_app),
+        Middleware(GZipMiddleware, minimum_size=wsgi_app.config.get('COMPRESS_MIN_SIZE', 1024)),
+    ]
+    application = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+    application.state.native_reads = native_reads
+    return application
+
+
+# ASGI entry point (uvicorn asgi:app)
+app = create_asgi_app()
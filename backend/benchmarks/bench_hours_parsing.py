@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Hours Parsing Benchmark
+=======================
+
+Measures, per hours format in benchmarks/hours_corpus.py:
+
+1. Parse throughput of RestaurantStatusCalculator._parse_business_hours
+2. Parse success rate (anything parsed) and week coverage rate (exactly the
+   open days of the week recognized, closed days not taken as open)
+3. Status-evaluation throughput of get_restaurant_status (timezone, parse
+   and open/closed check, as done for every listed restaurant)
+4. Throughput and success rate (no exception, non-empty output) of
+   standardize_hours_format.parse_hours_string
+
+Every run also checks the open/closed/unknown verdicts of STATUS_CASES at
+their fixed local times and fails (exit 1) on any mismatch. Results can be
+saved as a baseline; later runs fail when a rate drops or throughput
+regresses beyond the tolerance, so parser and status-engine changes are
+measured and guarded.
+
+Usage:
+    python benchmarks/bench_hours_parsing.py
+    python benchmarks/bench_hours_parsing.py --per-format 500 --save-baseline benchmarks/baselines/hours.json
+    python benchmarks/bench_hours_parsing.py --baseline benchmarks/baselines/hours.json
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import json
+import logging
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.hours_corpus import FORMATS, STATUS_CASES, generate_corpus
+from utils.restaurant_status import RestaurantStatusCalculator
+from standardize_hours_format import parse_hours_string
+
+ALL_DAYS = {'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'}
+
+
+def week_coverage(parsed_hours: List[Dict[str, Any]]) -> int:
+    """Count the distinct days of the week a parse has hours for."""
+    return len({entry['day'] for entry in parsed_hours} & ALL_DAYS)
+
+
+def status_at(calculator: RestaurantStatusCalculator, hours: str, at: str) -> str:
+    """Status ('open', 'closed' or 'unknown') of hours at a local time."""
+    ok, parsed = calculator._parse_business_hours(hours)
+    if not ok:
+        return 'unknown'
+    is_open, _, _ = calculator._check_if_open(parsed, datetime.fromisoformat(at))
+    return 'open' if is_open else 'closed'
+
+
+def check_status_cases(calculator: RestaurantStatusCalculator) -> List[str]:
+    """Get the STATUS_CASES whose verdict is wrong."""
+    failures = []
+    for case in STATUS_CASES:
+        status = status_at(calculator, case['hours'], case['at'])
+        if status != case['status']:
+            hours = case['hours'].replace('\n', ' | ')
+            failures.append(f"{case['at']} {hours!r}: expected {case['status']}, got {status}")
+    return failures
+
+
+def throughput(func: Callable[[Any], Any], items: List[Any], repeat: int) -> float:
+    """Best-of-``repeat`` calls per second of func over items."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(items) / best if best else 0.0
+
+
+def standardize(hours: str):
+    """Run parse_hours_string, returning None when it raises."""
+    try:
+        return parse_hours_string(hours)
+    except Exception:
+        return None
+
+
+def run_benchmark(corpus: List[Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark every format in the corpus."""
+    calculator = RestaurantStatusCalculator()
+    results = {}
+
+    for fmt in FORMATS:
+        samples = [s for s in corpus if s['format'] == fmt]
+        if not samples:
+            continue
+        hours = [s['hours'] for s in samples]
+        restaurants = [
+            {'hours_of_operation': h, 'latitude': 25.79, 'longitude': -80.13, 'state': 'FL',
+             'timezone': 'America/New_York'}
+            for h in hours
+        ]
+
+        parsed_count = 0
+        covered_count = 0
+        for sample in samples:
+            ok, parsed = calculator._parse_business_hours(sample['hours'])
+            if ok:
+                parsed_count += 1
+                if week_coverage(parsed) == sample['open_days']:
+                    covered_count += 1
+
+        standardized_count = sum(1 for h in hours if standardize(h))
+
+        results[fmt] = {
+            'samples': len(samples),
+            'parse_success_rate': round(parsed_count / len(samples), 4),
+            'week_coverage_rate': round(covered_count / len(samples), 4),
+            'standardize_success_rate': round(standardized_count / len(samples), 4),
+            'parse_per_sec': round(throughput(calculator._parse_business_hours, hours, repeat)),
+            'status_per_sec': round(throughput(calculator.get_restaurant_status, restaurants, repeat)),
+            'standardize_per_sec': round(throughput(standardize, hours, repeat)),
+        }
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float) -> List[str]:
+    """Get regressions: lower rates, or throughput below the baseline by more than the tolerance."""
+    regressions = []
+    for fmt, current in results.items():
+        previous = baseline.get(fmt)
+        if not previous:
+            continue
+        for key in ('parse_success_rate', 'week_coverage_rate', 'standardize_success_rate'):
+            if current[key] < previous[key]:
+                regressions.append(f"{fmt}: {key} {previous[key]:.1%} -> {current[key]:.1%}")
+        for key in ('parse_per_sec', 'status_per_sec', 'standardize_per_sec'):
+            if previous[key] and current[key] < previous[key] * (1 - tolerance):
+                regressions.append(f"{fmt}: {key} {previous[key]:,} -> {current[key]:,}")
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark hours parsing and status calculation')
+    parser.add_argument('--per-format', type=int, default=200, help='Generated samples per format')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed throughput regression (fraction)')
+    args = parser.parse_args()
+
+    # Parse failures are expected for some formats; keep the output readable
+    logging.disable(logging.CRITICAL)
+
+    corpus = generate_corpus(args.per_format, args.seed)
+    print(f"📊 Hours corpus: {len(corpus)} samples ({args.per_format} generated per format + real samples)")
+    results = run_benchmark(corpus, args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    header = (f"{'format':<16}{'n':>6}{'parsed':>9}{'covered':>9}{'std ok':>9}"
+              f"{'parse/s':>11}{'status/s':>11}{'standardize/s':>15}")
+    print(header)
+    print("=" * len(header))
+    for fmt, r in results.items():
+        print(f"{fmt:<16}{r['samples']:>6}{r['parse_success_rate']:>9.1%}{r['week_coverage_rate']:>9.1%}"
+              f"{r['standardize_success_rate']:>9.1%}"
+              f"{r['parse_per_sec']:>11,}{r['status_per_sec']:>11,}{r['standardize_per_sec']:>15,}")
+
+    failures = check_status_cases(RestaurantStatusCalculator())
+    print(f"\n🕒 Status verdicts: {len(STATUS_CASES) - len(failures)}/{len(STATUS_CASES)} correct")
+    for failure in failures:
+        print(f"   - {failure}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'per_format': args.per_format,
+                'seed': args.seed,
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if failures:
+        print("\n❌ Wrong status verdicts")
+        sys.exit(1)
+
+    if baseline:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Image Proxy Benchmark
+=====================
+
+Fetches a set of synthetic source photos (served by an in-process mock
+transport, like full-size ORB images and Places photos) through the image
+pipeline (utils/image_proxy.py), then serves the card thumbnails from
+/img/<hash>/<width> through the Flask app:
+
+- Pipeline throughput (fetch + decode + WebP encode at every width)
+- Bytes per card image: source vs the IMAGE_DEFAULT_WIDTH thumbnail
+- /img request latency and the share of 304 responses to revalidation
+
+Usage:
+    python benchmarks/bench_image_proxy.py --images 200
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import io
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from flask import Flask
+from PIL import Image, ImageDraw
+
+from utils.image_proxy import DEFAULT_SETTINGS, ImagePipeline, ImageProxy, proxy_image_url
+
+
+def synthetic_photo(rng: random.Random, width: int, height: int) -> bytes:
+    """Generate a JPEG with enough detail to compress like a photo."""
+    image = Image.new('RGB', (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(300):
+        x, y = rng.randrange(width), rng.randrange(height)
+        size = rng.randrange(10, width // 4)
+        draw.ellipse([x, y, x + size, y + size], fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the image pipeline and /img serving')
+    parser.add_argument('--images', type=int, default=200, help='Source images')
+    parser.add_argument('--requests', type=int, default=2000, help='/img requests to time')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sizes = [(1600, 1200), (2048, 1536), (4032, 3024), (800, 600)]
+    sources = {f"https://images.example-kosher.com/{index}.jpg": synthetic_photo(rng, *rng.choice(sizes))
+               for index in range(args.images)}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=sources[str(request.url)], headers={'Content-Type': 'image/jpeg'})
+
+    cache_dir = tempfile.mkdtemp(prefix='jewgo-image-bench-')
+    try:
+        pipeline = ImagePipeline(transport=httpx.MockTransport(handler), IMAGE_CACHE_DIR=cache_dir)
+        start = time.perf_counter()
+        results = asyncio.run(pipeline.cache_urls(sources))
+        elapsed = time.perf_counter() - start
+        failed = [result for result in results if result['content_hash'] is None]
+
+        width = DEFAULT_SETTINGS['IMAGE_DEFAULT_WIDTH']
+        source_bytes = sum(len(data) for data in sources.values())
+        card_bytes = sum(os.path.getsize(pipeline.store.path(result['content_hash'], width))
+                         for result in results if result['content_hash'])
+        print(f"📊 {len(sources):,} source images ({source_bytes / len(sources) / 1024:,.0f} KB average)")
+        print(f"   pipeline:          {elapsed:.2f}s ({len(sources) / elapsed:,.1f} images/s), {len(failed)} failed")
+        print(f"   card image:        {card_bytes / max(len(results) - len(failed), 1) / 1024:,.1f} KB "
+              f"({source_bytes / max(card_bytes, 1):,.0f}x smaller than the source)")
+
+        app = Flask(__name__)
+        app.config['IMAGE_CACHE_DIR'] = cache_dir
+        ImageProxy(app)
+        client = app.test_client()
+        urls = [proxy_image_url(result['content_hash']) for result in results if result['content_hash']]
+
+        latencies, not_modified = [], 0
+        for index in range(args.requests):
+            url = rng.choice(urls)
+            headers = {'If-None-Match': f'"{url.split("/")[2]}-{width}"'} if index % 2 else {}
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            not_modified += response.status_code == 304
+        latencies.sort()
+        print(f"   /img latency:      p50 {statistics.median(latencies):.2f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms ({not_modified:,} of {args.requests:,} were 304)")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if failed:
+        print(f"❌ {len(failed)} images failed: {failed[0]['error']}")
+        sys.exit(1)
+    print("✅ Image pipeline completed")
+
+
+if __name__ == "__main__":
+    main()
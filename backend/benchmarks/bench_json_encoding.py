@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+JSON Encoding Benchmark
+=======================
+
+Compares the time to encode a /api/restaurants listing of 1,000 restaurants:
+
+1. Flask's default JSON provider (stdlib json, sorted keys)
+2. The fast JSON provider (orjson when installed)
+3. Fragment assembly from the per-restaurant fragment cache (warm), where only
+   the dynamic status fields are encoded per request
+
+No database is needed; restaurants are generated with the same shape as
+EnhancedDatabaseManager._restaurant_to_unified_dict.
+
+Usage:
+    python benchmarks/bench_json_encoding.py
+    python benchmarks/bench_json_encoding.py --count 1000 --repeat 20
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import json
+import random
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils import json_encoding
+from utils.json_encoding import FastJSONProvider, FragmentCache, assemble_listing, dumps_bytes, merge_fragment
+
+DYNAMIC_FIELDS = ('status', 'is_open', 'status_reason', 'next_open_time', 'current_time_local', 'timezone', 'hours_parsed')
+
+
+def make_restaurant(i: int) -> dict:
+    """Generate one restaurant in the unified dict format."""
+    now = datetime(2024, 7, 31, 12, 0, 0) - timedelta(minutes=i)
+    return {
+        'id': i,
+        'name': f"Kosher Restaurant {i}",
+        'address': f"{1000 + i} Hollywood Blvd",
+        'city': random.choice(['Hollywood', 'Miami', 'Boca Raton', 'Fort Lauderdale']),
+        'state': 'FL',
+        'zip_code': '33020',
+        'phone_number': f"(954) 555-{i % 10000:04d}",
+        'website': f"https://restaurant{i}.example.com",
+        'kosher_category': random.choice(['dairy', 'meat', 'pareve']),
+        'listing_type': 'restaurant',
+        'hours_of_operation': 'Mon 11:00 AM – 10:00 PM, Tue 11:00 AM – 10:00 PM, Wed 11:00 AM – 10:00 PM, '
+                              'Thu 11:00 AM – 10:00 PM, Fri 11:00 AM – 2:00 PM, Sat Closed, Sun 11:00 AM – 10:00 PM',
+        'hours_json': {'periods': [{'open': {'day': d, 'time': '1100'}, 'close': {'day': d, 'time': '2200'}} for d in range(7)]},
+        'hours_last_updated': now.isoformat(),
+        'short_description': 'Kosher restaurant with a full menu of dairy dishes, sushi and smoothies. ' * 3,
+        'price_range': '$$',
+        'image_url': f"https://images.example.com/{i}.jpg",
+        'latitude': 26.0 + random.random(),
+        'longitude': -80.2 + random.random(),
+        'specials': [{'id': i * 10 + 1, 'title': 'Lunch special', 'is_paid': bool(i % 2)}],
+        'is_cholov_yisroel': random.random() < 0.9,
+        'is_pas_yisroel': random.random() < 0.2,
+        'certifying_agency': 'ORB',
+        'google_listing_url': f"https://maps.google.com/?cid={i}",
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat(),
+        'current_time_local': now.isoformat(),
+        'timezone': 'America/New_York',
+        'hours_parsed': True,
+        'status': 'open',
+        'is_open': True,
+        'status_reason': 'Currently open',
+        'next_open_time': None,
+    }
+
+
+def time_it(func, repeat: int) -> list:
+    """Run func repeat times and return timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark listing JSON encoding')
+    parser.add_argument('--count', type=int, default=1000, help='Number of restaurants')
+    parser.add_argument('--repeat', type=int, default=20, help='Repetitions per strategy')
+    args = parser.parse_args()
+
+    random.seed(42)
+    restaurants = [make_restaurant(i) for i in range(1, args.count + 1)]
+    payload = {'restaurants': restaurants, 'total': len(restaurants), 'limit': args.count, 'offset': 0}
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    # Warm the fragment cache with the static part of every restaurant
+    cache = FragmentCache()
+    statuses = []
+    for restaurant in restaurants:
+        static = {k: v for k, v in restaurant.items() if k not in DYNAMIC_FIELDS}
+        cache.put(restaurant['id'], restaurant['updated_at'], dumps_bytes(static))
+        statuses.append({k: restaurant[k] for k in DYNAMIC_FIELDS})
+
+    def encode_fragments():
+        fragments = [
+            merge_fragment(cache.get(r['id'], r['updated_at']), status)
+            for r, status in zip(restaurants, statuses)
+        ]
+        return assemble_listing('restaurants', fragments, total=len(fragments), limit=args.count, offset=0)
+
+    # Sanity check: every strategy produces the same document
+    reference = json.loads(default_provider.dumps(payload))
+    assert json.loads(fast_provider.dumps(payload)) == reference
+    assert json.loads(encode_fragments()) == reference
+
+    strategies = [
+        ('flask default (stdlib json)', lambda: default_provider.dumps(payload)),
+        ('fast provider', lambda: fast_provider.dumps(payload)),
+        ('fragment assembly (warm)', encode_fragments),
+    ]
+
+    encoder = 'orjson' if json_encoding.orjson is not None else 'stdlib json (orjson not installed)'
+    print(f"📊 Encoding {args.count} restaurants, {args.repeat} runs each, fast encoder: {encoder}")
+    print("=" * 72)
+
+    baseline = None
+    for name, func in strategies:
+        timings = time_it(func, args.repeat)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<32} median {median:8.2f} ms   min {min(timings):8.2f} ms   {baseline / median:5.1f}x")
+
+    print(f"\nResponse size: {len(encode_fragments()) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
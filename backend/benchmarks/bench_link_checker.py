@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Link Checker Benchmark
+======================
+
+Runs the concurrent link checker (utils/link_checker.py) over a synthetic
+set of links served by an in-process mock transport, so the sweep time
+reflects the checker's concurrency rather than the network:
+
+- Every host answers after a random 20-300 ms delay
+- Some hosts reject HEAD (405), redirect to www./https, answer 404 or 403,
+  refuse connections or time out
+
+Reports the sweep time, the peak number of requests per host (must not
+exceed LINK_CHECK_PER_HOST) and whether every link got its expected status.
+Exits non-zero on a misclassified link, a per-host limit violation or a
+sweep slower than --max-seconds.
+
+Usage:
+    python benchmarks/bench_link_checker.py --links 10000 --hosts 2000
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from utils.link_checker import LinkChecker, classify
+
+# Host behaviour -> expected status after one check; weights follow production link data
+BEHAVIOURS = {
+    'ok': ('ok', 0.70),
+    'head_not_allowed': ('ok', 0.08),
+    'redirect': ('redirected', 0.08),
+    'not_found': ('failing', 0.05),
+    'forbidden': ('blocked', 0.04),
+    'refused': ('failing', 0.03),
+    'timeout': ('failing', 0.02),
+}
+
+
+class MockSites:
+    """Mock transport handler with per-host behaviour and concurrency tracking."""
+
+    def __init__(self, hosts: int, timeout: float, seed: int):
+        rng = random.Random(seed)
+        names, weights = zip(*[(name, weight) for name, (_, weight) in BEHAVIOURS.items()])
+        self.behaviours = {f"site{index}.example-kosher.com": rng.choices(names, weights)[0] for index in range(hosts)}
+        self.delays = {host: rng.uniform(0.02, 0.3) for host in self.behaviours}
+        self.timeout = timeout
+        self.active = Counter()
+        self.peak = Counter()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        behaviour = self.behaviours.get(host[4:] if host.startswith('www.') else host, 'ok')
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        try:
+            if behaviour == 'refused':
+                raise httpx.ConnectError("Connection refused", request=request)
+            if behaviour == 'timeout':
+                await asyncio.sleep(self.timeout)
+                raise httpx.ReadTimeout("Timed out", request=request)
+            await asyncio.sleep(self.delays.get(host.replace('www.', ''), 0.05))
+            if behaviour == 'head_not_allowed' and request.method == 'HEAD':
+                return httpx.Response(405)
+            if behaviour == 'redirect' and not host.startswith('www.'):
+                return httpx.Response(301, headers={'Location': f"https://www.{host}/home"})
+            if behaviour == 'not_found':
+                return httpx.Response(404)
+            if behaviour == 'forbidden':
+                return httpx.Response(403)
+            return httpx.Response(200)
+        finally:
+            self.active[host] -= 1
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the concurrent link checker')
+    parser.add_argument('--links', type=int, default=10000, help='Links to check')
+    parser.add_argument('--hosts', type=int, default=2000, help='Distinct hosts')
+    parser.add_argument('--concurrency', type=int, help='Override LINK_CHECK_CONCURRENCY')
+    parser.add_argument('--per-host', type=int, help='Override LINK_CHECK_PER_HOST')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Simulated timeout (seconds)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--max-seconds', type=float, default=30.0, help='Fail when the sweep takes longer')
+    args = parser.parse_args()
+
+    sites = MockSites(args.hosts, args.timeout, args.seed)
+    hosts = list(sites.behaviours)
+    rng = random.Random(args.seed)
+    urls = list(dict.fromkeys(f"http://{rng.choice(hosts)}/menu/{index}" for index in range(args.links)))
+    print(f"📊 {len(urls):,} links on {len(hosts):,} hosts")
+
+    checker = LinkChecker(
+        transport=httpx.MockTransport(sites),
+        LINK_CHECK_CONCURRENCY=args.concurrency,
+        LINK_CHECK_PER_HOST=args.per_host,
+        LINK_CHECK_TIMEOUT=args.timeout,
+    )
+    start = time.perf_counter()
+    results = asyncio.run(checker.check_urls(urls))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter()
+    wrong = []
+    for result in results:
+        classify(result)
+        statuses[result['status']] += 1
+        expected = BEHAVIOURS[sites.behaviours[httpx.URL(result['url']).host]][0]
+        if result['status'] != expected:
+            wrong.append((result['url'], expected, result['status']))
+
+    per_host = checker.settings['LINK_CHECK_PER_HOST']
+    peak = max(sites.peak.values()) if sites.peak else 0
+    latencies = sorted(r['latency_ms'] for r in results if r['latency_ms'] is not None)
+    print(f"   time:              {elapsed:.2f}s ({len(urls) / elapsed:,.0f} links/s)")
+    print(f"   latency p50/p95:   {latencies[len(latencies) // 2]} / {latencies[int(len(latencies) * 0.95)]} ms")
+    print(f"   peak per host:     {peak} (limit {per_host})")
+    print(f"   statuses:          {dict(sorted(statuses.items()))}")
+    print(f"   misclassified:     {len(wrong)}")
+
+    failures = []
+    if wrong:
+        failures.append(f"{len(wrong)} misclassified links (e.g. {wrong[0]})")
+    if peak > per_host:
+        failures.append(f"per-host peak {peak} > {per_host}")
+    if elapsed > args.max_seconds:
+        failures.append(f"sweep took {elapsed:.1f}s > {args.max_seconds}s")
+    if failures:
+        print(f"❌ {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ Link checker within limits")
+
+
+if __name__ == "__main__":
+    main()
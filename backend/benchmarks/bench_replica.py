@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Catalog Replica Benchmark
+=========================
+
+Loads a synthetic catalog into a temporary SQLite database and compares the
+read methods of EnhancedDatabaseManager with the catalog replica
+(utils/catalog_replica.py), both as a per-process copy and mapped from the
+shared catalog file (REPLICA_SOURCE=mmap, utils/mapped_catalog.py):
+
+- get_all_places (a page of full restaurants)
+- search_places (name substring)
+- get_place_by_id
+- get_places_projected (summary fields, filtered by kosher category)
+
+All paths must return the same places; the load and map times, the version
+check time and the memory footprints are reported too.
+
+Usage:
+    python benchmarks/bench_replica.py
+    python benchmarks/bench_replica.py --count 5000 --repeat 20
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_catalog import load_catalog
+from database.database_manager_v3 import SUMMARY_FIELDS, EnhancedDatabaseManager
+from utils.catalog_replica import CatalogReplica, catalog_version
+from utils.mapped_catalog import MappedState
+
+# Time-dependent fields that may differ between two calls
+CLOCK_FIELDS = ('current_time_local', 'next_open_time', 'status', 'is_open', 'status_reason')
+
+
+def time_it(func, repeat: int) -> list:
+    """Run func repeat times and return timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def comparable(places):
+    """Drop the clock-dependent fields from a result."""
+    if isinstance(places, dict):
+        return {key: value for key, value in places.items() if key not in CLOCK_FIELDS}
+    return [comparable(place) for place in places or []]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory catalog replica')
+    parser.add_argument('--count', type=int, default=5000, help='Number of restaurants')
+    parser.add_argument('--repeat', type=int, default=20, help='Repetitions per read')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='jewgo-replica-bench-')
+    database_url = f"sqlite:///{os.path.join(work_dir, 'catalog.db')}"
+    db_manager = EnhancedDatabaseManager(database_url)
+    try:
+        print(f"📦 Loading {args.count:,} synthetic restaurants...")
+        load_catalog(database_url, args.count, seed=args.seed)
+        if not db_manager.connect():
+            print("❌ Failed to connect to the benchmark database")
+            sys.exit(1)
+
+        replica = CatalogReplica(get_db_manager=lambda: db_manager, REPLICA_ENABLED=True)
+        start = time.perf_counter()
+        replica.refresh()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        mapped_path = os.path.join(work_dir, 'catalog.map')
+        mapped = CatalogReplica(get_db_manager=lambda: db_manager, REPLICA_ENABLED=True, REPLICA_SOURCE='mmap',
+                                REPLICA_MMAP_PATH=mapped_path)
+        start = time.perf_counter()
+        mapped.refresh()  # builds the file, then maps it
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        MappedState(db_manager, mapped_path)  # what a new worker does
+        map_ms = (time.perf_counter() - start) * 1000
+        with db_manager.engine.connect() as conn:
+            check_ms = statistics.median(time_it(lambda: catalog_version(conn), args.repeat))
+
+        rng = random.Random(args.seed)
+        place_ids = [rng.randrange(1, args.count + 1) for _ in range(100)]
+        reads = [
+            ('get_all_places (100)', lambda reader: reader.get_all_places(limit=100, offset=200)),
+            ('search_places', lambda reader: reader.search_places(query='grill', limit=50)),
+            ('get_place_by_id (x100)', lambda reader: [reader.get_place_by_id(place_id) for place_id in place_ids]),
+            ('get_places_projected', lambda reader: reader.get_places_projected(
+                list(SUMMARY_FIELDS), limit=100, kosher_category='dairy')),
+        ]
+
+        print(f"📊 {args.count:,} restaurants, {args.repeat} runs each")
+        print("=" * 72)
+        for name, read in reads:
+            expected = comparable(read(db_manager))
+            if comparable(read(replica)) != expected or comparable(read(mapped)) != expected:
+                print(f"❌ {name}: the replica returned different places")
+                sys.exit(1)
+            database = statistics.median(time_it(lambda: read(db_manager), args.repeat))
+            memory = statistics.median(time_it(lambda: read(replica), args.repeat))
+            shared = statistics.median(time_it(lambda: read(mapped), args.repeat))
+            print(f"{name:<24} database {database:8.2f} ms   memory {memory:8.2f} ms   mmap {shared:8.2f} ms")
+
+        report = replica.memory_report()
+        mapped_report = mapped.memory_report()
+        print(f"\nMemory replica: loaded in {load_ms:.0f} ms, {report['total_bytes'] / 1024 / 1024:.1f} MB per worker "
+              f"({report['bytes_per_restaurant']:,} bytes per restaurant, "
+              f"indexes {sum(report['index_bytes'].values()) / 1024:.0f} KB)")
+        print(f"Mapped replica: built in {build_ms:.0f} ms, mapped in {map_ms:.1f} ms, "
+              f"{mapped_report['mapped_bytes'] / 1024 / 1024:.1f} MB shared per host "
+              f"+ {mapped_report['process_bytes'] / 1024:.0f} KB per worker")
+        print(f"Version check: {check_ms:.2f} ms")
+    finally:
+        db_manager.disconnect()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("✅ Replica benchmark completed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Application Startup Benchmark
+=============================
+
+Measures cold start of the API in fresh interpreter processes:
+
+1. Import time of app.py (building the app with create_app())
+2. Time to the first served request, including the lazy database connection
+3. Modules imported by app.py that should stay lazy (scrapers, Places, requests,
+   and the optional image, ingestion and Redis dependencies)
+
+The run fails (exit 1) when the median import time or the median import +
+first-request time exceeds its target, or when a module that should be lazy
+is imported at startup, so startup regressions are caught before they reach
+a deploy.
+
+Usage:
+    DATABASE_URL=sqlite:////tmp/jewgo_bench.db python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --target 0.8 --import-target 0.5 --path /api/restaurants?limit=1
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only specific endpoints need; importing them at startup is a regression
+LAZY_MODULES = (
+    'requests',
+    'playwright',
+    'scrapers.orb_scraper_v2',
+    'utils.google_places_helper',
+    'database.google_places_manager',
+    'utils.dedupe',
+    'PIL',
+    'httpx',
+    'redis',
+    'rapidfuzz',
+    'bs4',
+)
+
+# Runs in a fresh interpreter and prints one JSON line of timings
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get(sys.argv[1])
+served = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "first_request_s": served - imported,
+    "status": response.status_code,
+    "lazy_imported": [name for name in sys.argv[2:] if name in sys.modules],
+}))
+'''
+
+
+def run_probe(path: str) -> Dict[str, Any]:
+    """Start one fresh interpreter, import the app and serve one request."""
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, path, *LAZY_MODULES],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Median and worst of each timing, in seconds."""
+    summary = {}
+    for key in ('import_s', 'first_request_s'):
+        values = [sample[key] for sample in samples]
+        summary[f"{key}_median"] = round(statistics.median(values), 4)
+        summary[f"{key}_max"] = round(max(values), 4)
+    summary['total_s_median'] = round(summary['import_s_median'] + summary['first_request_s_median'], 4)
+    return summary
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark API cold start')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes to start')
+    parser.add_argument('--path', default='/health', help='First request to serve')
+    parser.add_argument('--target', type=float, default=1.0, help='Max median import + first request (seconds)')
+    parser.add_argument('--import-target', type=float, default=0.6, help='Max median import of app.py (seconds)')
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL must be set')
+
+    print(f"🚀 Starting the API {args.runs} times (first request: {args.path})")
+    samples = []
+    for run in range(args.runs):
+        sample = run_probe(args.path)
+        samples.append(sample)
+        print(f"   run {run + 1}: import {sample['import_s'] * 1000:.0f} ms, "
+              f"first request {sample['first_request_s'] * 1000:.0f} ms (HTTP {sample['status']})")
+
+    summary = summarize(samples)
+    print(f"\n📊 Median import {summary['import_s_median'] * 1000:.0f} ms, "
+          f"first request {summary['first_request_s_median'] * 1000:.0f} ms, "
+          f"total {summary['total_s_median'] * 1000:.0f} ms (target {args.target * 1000:.0f} ms)")
+
+    failures = []
+    if summary['import_s_median'] > args.import_target:
+        failures.append(f"import {summary['import_s_median']:.3f}s exceeds target {args.import_target:.3f}s")
+    if summary['total_s_median'] > args.target:
+        failures.append(f"cold start {summary['total_s_median']:.3f}s exceeds target {args.target:.3f}s")
+    lazy_imported = sorted({name for sample in samples for name in sample['lazy_imported']})
+    if lazy_imported:
+        failures.append(f"imported at startup: {', '.join(lazy_imported)}")
+
+    if failures:
+        print("\n❌ Startup regressions:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+    print("\n✅ Startup within target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Business Hours Corpus
+=====================
+
+Hours strings in every format the backend ingests, for benchmarking the hours
+parser and status engine:
+
+- orb_text: ORB listing text ("Sun-Thu 11AM-10PM, Fri 11AM-2PM, Sat Closed")
+- weekday_text: Google Places weekday_text joined by newlines
+- periods: Google Places opening_hours.periods (stored in hours_json)
+- clock_24h: 24-hour clock ("Monday 9:00-22:00")
+- open_24_hours: always-open listings ("Open 24 hours", "Daily: 24 hours")
+- overnight: closing time after midnight
+- split_shift: two ranges per day (lunch and dinner)
+
+Each sample records how many days a week the place is open, so a benchmark
+can check that a parse covered exactly the open days and not only matched
+something. REAL_SAMPLES come from production data and the existing status
+tests; generate_corpus() adds seeded variations of each format.
+STATUS_CASES pin the open/closed/unknown verdict of real hours strings at fixed
+local times.
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import json
+import random
+from typing import Any, Dict, List
+
+FORMATS = ('orb_text', 'weekday_text', 'periods', 'clock_24h', 'open_24_hours', 'overnight', 'split_shift')
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Google returns U+2009 around the dash and U+202F before AM/PM in newer responses
+THIN_SPACE = '\u2009'
+NARROW_NBSP = '\u202f'
+
+REAL_SAMPLES: List[Dict[str, Any]] = [
+    {'format': 'orb_text', 'open_days': 6, 'hours': 'Sun-Thu 11AM-10PM, Fri 11AM-2PM, Sat Closed'},
+    {'format': 'orb_text', 'open_days': 5, 'hours': 'Mon-Fri 8AM-6PM'},
+    {'format': 'orb_text', 'open_days': 7,
+     'hours': 'Mon 9AM-10PM, Tue 9AM-10PM, Wed 9AM-10PM, Thu 9AM-10PM, Fri 9AM-10PM, Sat 10AM-11PM, Sun 10AM-9PM'},
+    {'format': 'orb_text', 'open_days': 6,
+     'hours': 'Sun 12PM-9PM, Mon 11AM-9PM, Tue 11AM-9PM, Wed 11AM-9PM, Thu 11AM-10PM, Fri 10AM-2PM'},
+    {'format': 'weekday_text', 'open_days': 7,
+     'hours': 'Monday: 9:00 AM - 10:00 PM\nTuesday: 9:00 AM - 10:00 PM\nWednesday: 9:00 AM - 10:00 PM\n'
+              'Thursday: 9:00 AM - 10:00 PM\nFriday: 9:00 AM - 10:00 PM\nSaturday: 10:00 AM - 11:00 PM\n'
+              'Sunday: 10:00 AM - 9:00 PM'},
+    {'format': 'weekday_text', 'open_days': 6,
+     'hours': 'Monday: 11:00 AM – 10:00 PM\nTuesday: 11:00 AM – 10:00 PM\nWednesday: 11:00 AM – 10:00 PM\n'
+              'Thursday: 11:00 AM – 10:00 PM\nFriday: 11:00 AM – 2:00 PM\nSaturday: Closed\n'
+              'Sunday: 11:00 AM – 10:00 PM'},
+    {'format': 'weekday_text', 'open_days': 6,
+     'hours': f'Monday: 7:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}9:00{NARROW_NBSP}PM\n'
+              f'Tuesday: 7:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}9:00{NARROW_NBSP}PM\n'
+              f'Wednesday: 7:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}9:00{NARROW_NBSP}PM\n'
+              f'Thursday: 7:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}9:00{NARROW_NBSP}PM\n'
+              f'Friday: 7:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}2:00{NARROW_NBSP}PM\n'
+              f'Saturday: Closed\n'
+              f'Sunday: 8:00{NARROW_NBSP}AM{THIN_SPACE}–{THIN_SPACE}9:00{NARROW_NBSP}PM'},
+    {'format': 'open_24_hours', 'open_days': 7, 'hours': 'Daily: 24 hours'},
+    {'format': 'open_24_hours', 'open_days': 7, 'hours': 'Open 24 hours'},
+    {'format': 'overnight', 'open_days': 7,
+     'hours': 'Monday: 6:00 PM - 2:00 AM\nTuesday: 6:00 PM - 2:00 AM\nWednesday: 6:00 PM - 2:00 AM\n'
+              'Thursday: 6:00 PM - 2:00 AM\nFriday: 6:00 PM - 3:00 AM\nSaturday: 6:00 PM - 3:00 AM\n'
+              'Sunday: 6:00 PM - 2:00 AM'},
+    {'format': 'split_shift', 'open_days': 6,
+     'hours': 'Monday: 11:30 AM – 2:30 PM, 5:00 – 10:00 PM\nTuesday: 11:30 AM – 2:30 PM, 5:00 – 10:00 PM\n'
+              'Wednesday: 11:30 AM – 2:30 PM, 5:00 – 10:00 PM\nThursday: 11:30 AM – 2:30 PM, 5:00 – 10:00 PM\n'
+              'Friday: 11:00 AM – 2:00 PM\nSaturday: Closed\nSunday: 12:00 – 9:00 PM'},
+]
+
+
+# Status verdicts at fixed local times (2024-06-02 is a Sunday)
+STATUS_CASES: List[Dict[str, Any]] = [
+    {'hours': 'Sunday: Closed\nMonday: 9:00 AM – 9:00 PM', 'at': '2024-06-02T12:00', 'status': 'closed'},
+    {'hours': 'Sunday: Closed\nMonday: 9:00 AM – 9:00 PM', 'at': '2024-06-03T12:00', 'status': 'open'},
+    {'hours': 'Sunday: Closed\nMonday: 9:00 AM – 9:00 PM', 'at': '2024-06-03T21:30', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[5]['hours'], 'at': '2024-06-08T12:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[5]['hours'], 'at': '2024-06-07T13:00', 'status': 'open'},
+    {'hours': REAL_SAMPLES[5]['hours'], 'at': '2024-06-07T15:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[6]['hours'], 'at': '2024-06-08T10:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[6]['hours'], 'at': '2024-06-09T08:30', 'status': 'open'},
+    {'hours': REAL_SAMPLES[6]['hours'], 'at': '2024-06-03T06:30', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[0]['hours'], 'at': '2024-06-08T12:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[0]['hours'], 'at': '2024-06-02T12:00', 'status': 'open'},
+    {'hours': REAL_SAMPLES[0]['hours'], 'at': '2024-06-07T15:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[1]['hours'], 'at': '2024-06-02T12:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[10]['hours'], 'at': '2024-06-03T16:00', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[10]['hours'], 'at': '2024-06-03T19:00', 'status': 'open'},
+    {'hours': REAL_SAMPLES[10]['hours'], 'at': '2024-06-02T12:30', 'status': 'open'},
+    {'hours': REAL_SAMPLES[10]['hours'], 'at': '2024-06-08T12:30', 'status': 'closed'},
+    {'hours': REAL_SAMPLES[9]['hours'], 'at': '2024-06-04T01:00', 'status': 'open'},
+    {'hours': REAL_SAMPLES[9]['hours'], 'at': '2024-06-04T04:00', 'status': 'closed'},
+    {'hours': 'Monday: 6:00 PM – 2:00 AM\nTuesday: Closed', 'at': '2024-06-04T01:00', 'status': 'open'},
+    {'hours': 'Monday: 6:00 PM – 2:00 AM\nTuesday: Closed', 'at': '2024-06-04T20:00', 'status': 'closed'},
+    {'hours': 'Monday 9:00-22:00, Saturday Closed', 'at': '2024-06-03T21:00', 'status': 'open'},
+    {'hours': 'Monday 9:00-22:00, Saturday Closed', 'at': '2024-06-08T12:00', 'status': 'closed'},
+    {'hours': 'Open 24 hours', 'at': '2024-06-08T03:00', 'status': 'open'},
+    # No days listed: the status is unknown, not assumed daily
+    {'hours': '9:00 AM – 5:00 PM', 'at': '2024-06-02T12:00', 'status': 'unknown'},
+]
+
+
+def _format_12h(hour: int, minute: int = 0, compact: bool = False, google: bool = False) -> str:
+    """Format an hour (0-23) as 12-hour time."""
+    suffix = 'AM' if hour % 24 < 12 else 'PM'
+    display = hour % 12 or 12
+    if compact:
+        return f"{display}{suffix}"
+    return f"{display}:{minute:02d}{NARROW_NBSP if google else ' '}{suffix}"
+
+
+def _weekly_schedule(rng: random.Random, closed_days: int) -> List[Any]:
+    """Pick open/close hours per day, with Saturday (or random days) closed."""
+    open_hour = rng.choice([7, 8, 9, 10, 11, 12])
+    close_hour = rng.choice([15, 20, 21, 22, 23])
+    closed = {'Saturday'} if closed_days == 1 else set(rng.sample(DAYS, closed_days)) if closed_days else set()
+    schedule = []
+    for day in DAYS:
+        if day in closed:
+            schedule.append((day, None))
+        elif day == 'Friday':
+            schedule.append((day, (open_hour, rng.choice([13, 14, 15]))))
+        else:
+            schedule.append((day, (open_hour, close_hour)))
+    return schedule
+
+
+def _generate(fmt: str, rng: random.Random) -> Dict[str, Any]:
+    """Generate one sample of the given format."""
+    closed_days = rng.choice([0, 1, 1, 1, 2])
+    schedule = _weekly_schedule(rng, closed_days)
+    open_days = 7 - closed_days
+
+    if fmt == 'orb_text':
+        hours = ', '.join(
+            f"{day[:3]} Closed" if span is None else
+            f"{day[:3]} {_format_12h(span[0], compact=True)}-{_format_12h(span[1], compact=True)}"
+            for day, span in schedule
+        )
+    elif fmt == 'weekday_text':
+        google = rng.random() < 0.5
+        dash = f"{THIN_SPACE}–{THIN_SPACE}" if google else ' – '
+        hours = '\n'.join(
+            f"{day}: Closed" if span is None else
+            f"{day}: {_format_12h(span[0], google=google)}{dash}{_format_12h(span[1], google=google)}"
+            for day, span in schedule
+        )
+    elif fmt == 'periods':
+        # Google day numbering: 0 = Sunday
+        periods = []
+        for day, span in schedule:
+            if span is None:
+                continue
+            google_day = (DAYS.index(day) + 1) % 7
+            periods.append({
+                'open': {'day': google_day, 'time': f"{span[0]:02d}00"},
+                'close': {'day': google_day, 'time': f"{span[1]:02d}00"},
+            })
+        hours = json.dumps(periods)
+    elif fmt == 'clock_24h':
+        hours = ', '.join(
+            f"{day} Closed" if span is None else f"{day} {span[0]}:00-{span[1]}:00"
+            for day, span in schedule
+        )
+    elif fmt == 'open_24_hours':
+        hours = rng.choice(['Open 24 hours', 'Daily: 24 hours', '24 hours', 'Open 24 Hours'])
+        open_days = 7
+    elif fmt == 'overnight':
+        late_close = rng.choice([1, 2, 3])
+        hours = '\n'.join(
+            f"{day}: Closed" if span is None else
+            f"{day}: {_format_12h(rng.choice([17, 18, 19]))} – {_format_12h(late_close)}"
+            for day, span in schedule
+        )
+    elif fmt == 'split_shift':
+        hours = '\n'.join(
+            f"{day}: Closed" if span is None else
+            f"{day}: {_format_12h(span[0])} – {_format_12h(14, 30)}, {_format_12h(17)} – {_format_12h(span[1])}"
+            for day, span in schedule
+        )
+    else:
+        raise ValueError(f"Unknown hours format: {fmt}")
+
+    return {'format': fmt, 'open_days': open_days, 'hours': hours}
+
+
+def generate_corpus(per_format: int = 200, seed: int = 42, include_real: bool = True) -> List[Dict[str, Any]]:
+    """
+    Build the benchmark corpus.
+
+    Args:
+        per_format: Generated samples per format
+        seed: Random seed (same seed, same corpus)
+        include_real: Include REAL_SAMPLES
+
+    Returns:
+        List of {'format', 'open_days', 'hours', 'source'} samples
+    """
+    rng = random.Random(seed)
+    corpus = [dict(sample, source='real') for sample in REAL_SAMPLES] if include_real else []
+    for fmt in FORMATS:
+        for _ in range(per_format):
+            corpus.append(dict(_generate(fmt, rng), source='generated'))
+    return corpus
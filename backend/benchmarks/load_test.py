@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+API Load Test
+=============
+
+Drives the read endpoints at a fixed concurrency and reports latency
+percentiles and throughput per scenario:
+
+- restaurants: /api/restaurants (random page of 100)
+- restaurants_summary: /api/restaurants?view=summary
+- search: /api/restaurants/search?q=<name word>
+- detail: /api/restaurants/<id>
+- stats: /api/statistics and /api/kosher-types
+
+Results can be saved as a baseline and later runs diffed against it; the run
+exits non-zero when p95 latency or throughput regress beyond the tolerance,
+so it can gate a deploy. Load a reproducible catalog first with
+benchmarks/synthetic_catalog.py.
+
+Usage:
+    # Against a running server
+    python benchmarks/load_test.py --base-url http://localhost:8081 --concurrency 16 --duration 30
+
+    # In-process (Flask test client, no server needed)
+    DATABASE_URL=sqlite:////tmp/jewgo_bench.db python benchmarks/load_test.py --in-process
+
+    # Store a baseline, then compare later runs against it
+    python benchmarks/load_test.py --save-baseline benchmarks/baselines/local.json
+    python benchmarks/load_test.py --baseline benchmarks/baselines/local.json --tolerance 0.15
+
+The API is rate limited per client: start the server with
+RATELIMIT_ENABLED=false, or pass one of its RATELIMIT_API_KEYS with --api-key.
+In-process runs disable the limiter.
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import json
+import math
+import random
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+SCENARIOS = ('restaurants', 'restaurants_summary', 'search', 'detail', 'stats')
+SEARCH_TERMS = ['Shalom', 'Grill', 'Pizza', 'Sushi', 'Deli', 'Golden', 'Cafe', 'Bagels', 'Kitchen', 'Royal']
+
+
+class HTTPClient:
+    """Minimal GET client over either a live server or the Flask test client."""
+
+    def __init__(self, base_url: Optional[str] = None, flask_app=None, api_key: Optional[str] = None):
+        """Initialize the client."""
+        self.base_url = (base_url or '').rstrip('/')
+        self.flask_app = flask_app
+        self.headers = {'X-API-Key': api_key} if api_key else {}
+        self._local = threading.local()
+
+    def get(self, path: str) -> tuple:
+        """GET a path and return (status code, body size)."""
+        if self.flask_app is not None:
+            response = self.flask_app.test_client().get(path, headers={'Accept-Encoding': 'gzip, br'})
+            return response.status_code, len(response.data)
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        response = session.get(self.base_url + path, timeout=30)
+        return response.status_code, len(response.content)
+
+    def get_json(self, path: str) -> dict:
+        """GET a path and decode the JSON body."""
+        if self.flask_app is not None:
+            return self.flask_app.test_client().get(path).get_json()
+        return requests.get(self.base_url + path, headers=self.headers, timeout=30).json()
+
+
+def build_scenarios(client: HTTPClient, rng: random.Random) -> Dict[str, Callable[[], str]]:
+    """Build a path generator per scenario, sampling ids and totals from the catalog."""
+    stats = client.get_json('/api/statistics') or {}
+    total = max(stats.get('total_restaurants', 100), 1)
+    listing = client.get_json('/api/restaurants?view=summary&fields=id&limit=1000') or {}
+    ids = [r['id'] for r in listing.get('restaurants', [])] or [1]
+    max_offset = max(total - 100, 0)
+
+    return {
+        'restaurants': lambda: f"/api/restaurants?limit=100&offset={rng.randint(0, max_offset)}",
+        'restaurants_summary': lambda: f"/api/restaurants?view=summary&limit=100&offset={rng.randint(0, max_offset)}",
+        'search': lambda: f"/api/restaurants/search?q={rng.choice(SEARCH_TERMS)}&limit=50",
+        'detail': lambda: f"/api/restaurants/{rng.choice(ids)}",
+        'stats': lambda: rng.choice(['/api/statistics', '/api/kosher-types']),
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def run_load(client: HTTPClient, scenario_paths: Dict[str, Callable[[], str]], concurrency: int,
+             duration: float, warmup: float) -> Dict[str, Dict[str, float]]:
+    """
+    Run a closed-loop load test: each worker issues requests back to back,
+    cycling through the scenarios, for warmup + duration seconds.
+    Requests completed during warmup are discarded.
+    """
+    names = list(scenario_paths)
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def worker(worker_index: int):
+        position = worker_index
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                return
+            name = names[position % len(names)]
+            position += 1
+            path = scenario_paths[name]()
+            request_start = time.perf_counter()
+            try:
+                status, _ = client.get(path)
+                failed = status >= 400
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - request_start
+            if request_start < measure_from:
+                continue
+            with lock:
+                if failed:
+                    errors[name] += 1
+                else:
+                    samples[name].append(elapsed * 1000)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, i) for i in range(concurrency)]:
+            future.result()
+
+    results = {}
+    for name in names:
+        latencies = sorted(samples[name])
+        results[name] = {
+            'requests': len(latencies),
+            'errors': errors[name],
+            'throughput_rps': round(len(latencies) / duration, 2),
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+        }
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float) -> List[str]:
+    """Get regressions: p95 above or throughput below the baseline by more than the tolerance."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms")
+        if previous['throughput_rps'] and current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current['errors'] > previous.get('errors', 0):
+            regressions.append(f"{name}: errors {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None):
+    """Print a results table (with p95 change against the baseline when given)."""
+    header = f"{'scenario':<22}{'req':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if baseline:
+        header += f"{'p95 Δ':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:<22}{r['requests']:>8}{r['errors']:>6}{r['throughput_rps']:>10.1f}"
+                f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+        previous = (baseline or {}).get(name)
+        if previous and previous['p95_ms']:
+            line += f"{(r['p95_ms'] / previous['p95_ms'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Load test the JewGo API')
+    parser.add_argument('--base-url', default='http://localhost:8081', help='Server to test')
+    parser.add_argument('--in-process', action='store_true', help='Use the Flask test client instead of HTTP')
+    parser.add_argument('--api-key', default=os.environ.get('LOAD_TEST_API_KEY'),
+                        help='Key sent as X-API-Key (for the higher API key rate limit)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent workers')
+    parser.add_argument('--duration', type=float, default=20, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='Warmup seconds (not measured)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for request parameters')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed regression (fraction)')
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    if args.in_process:
+        os.environ['RATELIMIT_ENABLED'] = 'false'
+        from app import app as flask_app
+        client = HTTPClient(flask_app=flask_app)
+        target = 'in-process'
+    else:
+        client = HTTPClient(base_url=args.base_url, api_key=args.api_key)
+        target = args.base_url
+
+    rng = random.Random(args.seed)
+    scenario_paths = {name: path for name, path in build_scenarios(client, rng).items() if name in scenarios}
+
+    print(f"🚀 Load testing {target}: {', '.join(scenarios)}, concurrency {args.concurrency}, "
+          f"{args.duration:.0f}s (+{args.warmup:.0f}s warmup)")
+    results = run_load(client, scenario_paths, args.concurrency, args.duration, args.warmup)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print()
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'target': target,
+                'concurrency': args.concurrency,
+                'duration': args.duration,
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if baseline:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
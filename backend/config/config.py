@@ -18,10 +18,76 @@ class Config:
     CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
     CORS_ALLOW_HEADERS = ['Content-Type', 'Authorization', 'Accept', 'Origin', 'X-Requested-With']
     
-    # Rate Limiting
-    RATELIMIT_DEFAULT = "200 per day;50 per hour;10 per minute"
-    RATELIMIT_STORAGE_URL = "memory://"
+    # Rate Limiting (token buckets per API key or client IP; see utils/rate_limit.py)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    RATELIMIT_DEFAULT = os.environ.get('RATELIMIT_DEFAULT', "60 per minute;1000 per hour")
+    RATELIMIT_API_KEY_LIMIT = os.environ.get('RATELIMIT_API_KEY_LIMIT', "600 per minute;20000 per hour")
+    RATELIMIT_API_KEYS = [k.strip() for k in os.environ.get('RATELIMIT_API_KEYS', '').split(',') if k.strip()]
+    # memory:// buckets are per worker process: with N gunicorn workers a client
+    # gets up to N times the limits above. Use redis:// in production so all
+    # workers and hosts share one budget (gunicorn logs a warning otherwise).
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL', "memory://")
+    RATELIMIT_PROXY_COUNT = int(os.environ.get('RATELIMIT_PROXY_COUNT', 1))  # proxies appending to X-Forwarded-For
     
+    # Response Compression
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # bytes
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))  # gzip 1-9
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', 5))  # brotli 0-11
+    
+    # Request Metrics (Prometheus /metrics)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # SQL Profiler (send the token in the X-Profile-SQL header to profile a request)
+    SQL_PROFILER_ALWAYS = os.environ.get('SQL_PROFILER_ALWAYS', 'false').lower() == 'true'
+    SQL_PROFILER_TOKEN = os.environ.get('SQL_PROFILER_TOKEN')
+    SQL_PROFILER_SLOW_MS = int(os.environ.get('SQL_PROFILER_SLOW_MS', 100))
+    SQL_PROFILER_N_PLUS_ONE = int(os.environ.get('SQL_PROFILER_N_PLUS_ONE', 5))
+    
+    # Health Checks (/readyz, /health/deep)
+    HEALTH_READY_TIMEOUT = float(os.environ.get('HEALTH_READY_TIMEOUT', 2.0))  # seconds
+    HEALTH_READY_CACHE_SECONDS = float(os.environ.get('HEALTH_READY_CACHE_SECONDS', 5))
+    HEALTH_DEEP_INTERVAL = int(os.environ.get('HEALTH_DEEP_INTERVAL', 60))  # seconds
+    GOOGLE_PLACES_DAILY_QUOTA = int(os.environ['GOOGLE_PLACES_DAILY_QUOTA']) if os.environ.get('GOOGLE_PLACES_DAILY_QUOTA') else None
+    
+    # Async Serving Mode (asgi.py under uvicorn workers)
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+    ASYNC_DB_MAX_OVERFLOW = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 20))
+    ASYNC_WSGI_THREADS = int(os.environ.get('ASYNC_WSGI_THREADS', 10))  # threads for the mounted Flask routes
+    
+    # Link Health (scripts/check_links.py fills website_status / image_status)
+    HIDE_DEAD_LINKS = os.environ.get('HIDE_DEAD_LINKS', 'false').lower() == 'true'  # return dead links as null
+    
+    # Image Cache (the image_cache job or scripts/cache_images.py fills it; /img/<hash>/<width> serves it)
+    IMAGE_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR', '/tmp/jewgo-image-cache')  # shared by all workers
+    IMAGE_CACHE_MAX_BYTES = int(os.environ.get('IMAGE_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+    IMAGE_PROXY_BASE_URL = os.environ.get('IMAGE_PROXY_BASE_URL', '')  # public API URL for image_url (empty: relative)
+
+    # Periodic Jobs (run by the elected scheduler worker; see utils/scheduler.py)
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_TIMEZONE = os.environ.get('SCHEDULER_TIMEZONE', 'America/New_York')  # cron times are local here
+    GOOGLE_PLACES_REFRESH_CRON = os.environ.get('GOOGLE_PLACES_REFRESH_CRON', '15 * * * *')  # empty to disable
+    GOOGLE_PLACES_REFRESH_BATCH_SIZE = int(os.environ.get('GOOGLE_PLACES_REFRESH_BATCH_SIZE', 10))
+    ORB_SYNC_CRON = os.environ.get('ORB_SYNC_CRON', '0 4 * * 1')  # empty to disable
+    IMAGE_CACHE_CRON = os.environ.get('IMAGE_CACHE_CRON', '45 */6 * * *')  # image cache refresh; empty to disable
+    STATISTICS_REFRESH_CRON = os.environ.get('STATISTICS_REFRESH_CRON', '30 * * * *')  # statistics row rebuild; empty to disable
+    
+    # Certifier Ingestion (one SourceAdapter per agency; see utils/ingestion.py)
+    INGESTION_SOURCES = tuple(s.strip() for s in os.environ.get('INGESTION_SOURCES', 'scrapers.orb_source.ORBSource').split(',') if s.strip())
+
+    # Catalog Snapshot (read-only SQLite copy; see utils/snapshot.py)
+    SNAPSHOT_MODE = os.environ.get('SNAPSHOT_MODE', 'off')  # off, fallback (database unreachable) or always (edge)
+    SNAPSHOT_PATH = os.environ.get('SNAPSHOT_PATH', '')  # local file; the scheduler rebuilds it when set
+    SNAPSHOT_BUILD_CRON = os.environ.get('SNAPSHOT_BUILD_CRON', '*/10 * * * *')  # skipped while the catalog is unchanged
+    SNAPSHOT_RETRY_SECONDS = int(os.environ.get('SNAPSHOT_RETRY_SECONDS', 30))  # snapshot reads after a database failure
+    SNAPSHOT_MMAP_BYTES = int(os.environ.get('SNAPSHOT_MMAP_BYTES', 256 * 1024 * 1024))
+
+    # Catalog Replica (in-memory copy per worker; see utils/catalog_replica.py)
+    REPLICA_ENABLED = os.environ.get('REPLICA_ENABLED', 'false').lower() == 'true'
+    REPLICA_REFRESH_SECONDS = float(os.environ.get('REPLICA_REFRESH_SECONDS', 5))  # catalog version check interval
+    REPLICA_SOURCE = os.environ.get('REPLICA_SOURCE', 'memory')  # memory (per worker) or mmap (one shared file per host)
+    REPLICA_MMAP_PATH = os.environ.get('REPLICA_MMAP_PATH', '/tmp/jewgo-catalog.map')
+
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     
@@ -1,19 +1,29 @@
 # Gunicorn configuration file for JewGo Backend
 # Updated for new file structure for production deployment
 import os
+import shutil
 import multiprocessing
 
+# Prometheus multiprocess mode: each worker writes its metrics to this
+# directory and /metrics aggregates them. It must exist (and be emptied of
+# files from previous runs) before the app is preloaded.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/jewgo-prometheus')
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '8081')}"
 backlog = 2048
 
 # Worker processes
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# "sync" for app:app; "uvicorn.workers.UvicornWorker" for asgi:app (SERVER_MODE=async)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 50
 timeout = 30
+graceful_timeout = 30
 keepalive = 2
 
 # Restart workers after this many requests, to help prevent memory leaks
@@ -45,4 +55,58 @@ limit_request_fields = 100
 limit_request_field_size = 8190
 
 # Performance
-worker_tmp_dir = "/dev/shm" 
\ No newline at end of file
+worker_tmp_dir = "/dev/shm" 
+
+# Server hooks
+def child_exit(server, worker):
+    """Drop live gauges of exited workers from the aggregated metrics."""
+    try:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+    except ImportError:
+        pass
+
+def on_starting(server):
+    """Build the shared catalog file in the master (REPLICA_SOURCE=mmap), so
+    every worker maps the same copy and starts warm (see utils/mapped_catalog.py),
+    and warn when rate limit buckets are per worker (memory:// storage).
+    
+    The master's database connection is closed before any worker forks.
+    """
+    from config.config import get_config
+    config = get_config()
+    if config.RATELIMIT_ENABLED and config.RATELIMIT_STORAGE_URL.startswith('memory://') and server.cfg.workers > 1:
+        server.log.warning(
+            f"Rate limits use memory:// storage with {server.cfg.workers} workers: each worker keeps its own "
+            f"buckets, so clients get up to {server.cfg.workers}x the configured limits; set RATELIMIT_STORAGE_URL "
+            f"to a redis:// URL to share them"
+        )
+    if config.REPLICA_ENABLED and config.REPLICA_SOURCE == 'mmap':
+        from utils.mapped_catalog import build_catalog_file
+        build_catalog_file(config.REPLICA_MMAP_PATH)
+
+def post_fork(server, worker):
+    """Connect each worker to the database before it accepts requests, start
+    loading its catalog replica (REPLICA_ENABLED; with REPLICA_SOURCE=mmap it
+    maps the file the master built) and start its scheduler thread (the
+    worker holding the leader lock, across all hosts, runs the periodic jobs).
+    
+    The replica wait is short and well inside the worker timeout, so a cold
+    database cannot get workers killed during boot; until the first load
+    finishes, reads go to the database.
+    
+    The app is preloaded in the master without a database connection, so no
+    connection is shared across the fork.
+    """
+    from app import get_db_manager
+    from utils.catalog_replica import catalog_replica
+    from utils.scheduler import scheduler
+    get_db_manager()
+    catalog_replica.start(timeout=timeout / 6)
+    scheduler.start()
+
+def worker_exit(server, worker):
+    """Let a running job finish (within the graceful timeout) and release
+    scheduler leadership so another worker takes over."""
+    from utils.scheduler import scheduler
+    scheduler.stop(timeout=max(graceful_timeout - 5, 1))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Async Catalog Reader for JewGo App
+==================================
+
+Read-only access to the restaurants catalog for the ASGI serving mode
+(asgi.py). Queries run on a SQLAlchemy asyncio engine backed by an asyncpg
+connection pool, so a worker waiting on the database keeps serving other
+requests instead of blocking.
+
+The statements and row conversions are the ones EnhancedDatabaseManager
+uses for the same endpoints, so both serving modes return the same
+response bodies; only the execution is async. Converting a page of rows computes
+each restaurant's open/closed status, which is CPU work, so page conversions
+run in the thread pool instead of on the event loop.
+
+Key Features:
+- asyncpg pool (PostgreSQL) or aiosqlite (local SQLite)
+- Listings (projected and pre-encoded), search, detail, nearby, facets
+- Specials batch-loaded per page, as in the sync manager
+- Statistics from the precomputed summary row
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import os
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.concurrency import run_in_threadpool
+
+from database.database_manager_v3 import (
+    EnhancedDatabaseManager, Restaurant, RestaurantStatistics, SUMMARY_FIELDS, _STATISTICS_ROW_ID
+)
+from utils.logging_config import configure_logging
+
+logger = structlog.get_logger()
+
+# libpq query parameters asyncpg does not accept as-is
+_LIBPQ_ONLY_PARAMETERS = ('sslmode', 'channel_binding')
+
+# Connection of the read_snapshot() block the current task is in
+_snapshot_connection: ContextVar = ContextVar('async_catalog_snapshot', default=None)
+
+
+def async_database_url(database_url: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Translate a psycopg2/SQLite database URL for the async drivers.
+
+    Returns:
+        (async URL, connect_args); ``sslmode`` becomes asyncpg's ``ssl`` argument
+    """
+    url = make_url(database_url)
+    connect_args = {}
+
+    if url.get_backend_name() == 'sqlite':
+        return url.set(drivername='sqlite+aiosqlite').render_as_string(hide_password=False), connect_args
+
+    if url.get_backend_name() in ('postgres', 'postgresql'):
+        sslmode = url.query.get('sslmode')
+        if sslmode and sslmode not in ('disable', 'allow'):
+            connect_args['ssl'] = sslmode
+        url = url.set(drivername='postgresql+asyncpg').difference_update_query(_LIBPQ_ONLY_PARAMETERS)
+        return url.render_as_string(hide_password=False), connect_args
+
+    return database_url, connect_args
+
+
+class AsyncCatalogReader:
+    """Async, read-only counterpart of the EnhancedDatabaseManager read methods."""
+
+    def __init__(self, database_url: str = None, pool_size: int = None, max_overflow: int = None):
+        """Initialize the reader (call connect() before use)."""
+        configure_logging()
+        self.database_url = database_url or os.environ.get('DATABASE_URL')
+        if not self.database_url:
+            raise ValueError("DATABASE_URL environment variable is required")
+
+        self.pool_size = pool_size or int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+        self.max_overflow = max_overflow if max_overflow is not None else int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 20))
+        self.engine = None
+
+        # Statement builders and row conversion (this manager is never connected)
+        self.catalog = EnhancedDatabaseManager(self.database_url)
+
+    async def connect(self) -> None:
+        """Create the async engine and its connection pool."""
+        url, connect_args = async_database_url(self.database_url)
+        options = {'pool_pre_ping': True, 'connect_args': connect_args}
+        if not url.startswith('sqlite'):
+            options.update(pool_size=self.pool_size, max_overflow=self.max_overflow)
+
+        self.engine = create_async_engine(url, **options)
+        logger.info("Async database pool created", pool_size=self.pool_size, max_overflow=self.max_overflow)
+
+    async def disconnect(self) -> None:
+        """Close every pooled connection."""
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    @asynccontextmanager
+    async def read_snapshot(self):
+        """Async EnhancedDatabaseManager.read_snapshot: the reads inside the block share one connection and snapshot."""
+        if _snapshot_connection.get() is not None:
+            yield self
+            return
+        async with self.engine.connect() as conn:
+            if conn.dialect.name == 'postgresql':
+                conn = await conn.execution_options(isolation_level='REPEATABLE READ', postgresql_readonly=True)
+            async with conn.begin():
+                token = _snapshot_connection.set(conn)
+                try:
+                    yield self
+                finally:
+                    _snapshot_connection.reset(token)
+
+    @asynccontextmanager
+    async def _connection(self):
+        """Get a connection: the read_snapshot() one inside such a block, else one from the pool."""
+        conn = _snapshot_connection.get()
+        if conn is not None:
+            yield conn
+            return
+        async with self.engine.connect() as conn:
+            yield conn
+
+    async def _fetch(self, statement) -> list:
+        """Execute a statement and return its rows as mappings."""
+        async with self._connection() as conn:
+            result = await conn.execute(statement)
+            return result.mappings().all()
+    
+    async def _specials_by_restaurant(self, conn, restaurant_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Async EnhancedDatabaseManager._specials_by_restaurant."""
+        if not restaurant_ids:
+            return {}
+        result = await conn.execute(self.catalog._specials_statement(restaurant_ids))
+        return self.catalog._group_specials(result.mappings().all())
+    
+    async def _child_fields(self, conn, rows, fields: List[str]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """Async EnhancedDatabaseManager._child_fields."""
+        if 'specials' not in fields:
+            return None
+        return await self._specials_by_restaurant(conn, [row['id'] for row in rows])
+
+    async def get_places_projected(self, fields: List[str], limit: int = 100, offset: int = 0,
+                                   kosher_category: str = None, state: str = None) -> List[Dict[str, Any]]:
+        """Async EnhancedDatabaseManager.get_places_projected."""
+        statement, wants_status = self.catalog._projected_statement(fields, limit, offset, kosher_category, state)
+        async with self._connection() as conn:
+            rows = (await conn.execute(statement)).mappings().all()
+            specials = await self._child_fields(conn, rows, fields)
+        return await run_in_threadpool(
+            lambda: [self.catalog._row_to_fields(row, fields, wants_status, specials) for row in rows]
+        )
+
+    async def get_all_places_encoded(self, limit: int = 100, offset: int = 0,
+                                     kosher_category: str = None, state: str = None) -> List[bytes]:
+        """Async EnhancedDatabaseManager.get_all_places_encoded (shares its fragment cache)."""
+        rows = await self._fetch(self.catalog._encoded_index_statement(limit, offset, kosher_category, state))
+        fragments, misses = self.catalog._cached_fragments(rows)
+
+        if misses:
+            table = Restaurant.__table__
+            async with self._connection() as conn:
+                specials = await self._specials_by_restaurant(conn, misses)
+                restaurants = (await conn.execute(select(table).where(table.c.id.in_(misses)))).all()
+            await run_in_threadpool(lambda: [
+                self.catalog._encode_fragment(restaurant, fragments, specials.get(restaurant.id, []))
+                for restaurant in restaurants
+            ])
+
+        return await run_in_threadpool(self.catalog._merge_fragments, rows, fragments)
+
+    async def search_places(self, query: str = None, category: str = None, state: str = None,
+                            limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Async EnhancedDatabaseManager.search_places."""
+        statement = select(Restaurant.__table__).where(
+            *self.catalog._search_conditions(query, category, state)
+        ).limit(limit).offset(offset)
+
+        async with self._connection() as conn:
+            restaurants = (await conn.execute(statement)).all()
+            specials = await self._specials_by_restaurant(conn, [restaurant.id for restaurant in restaurants])
+        return await run_in_threadpool(lambda: [
+            self.catalog._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, []))
+            for restaurant in restaurants
+        ])
+
+    async def get_place_by_id(self, place_id: int) -> Optional[Dict[str, Any]]:
+        """Async EnhancedDatabaseManager.get_place_by_id."""
+        table = Restaurant.__table__
+        async with self._connection() as conn:
+            result = await conn.execute(select(table).where(table.c.id == place_id))
+            restaurant = result.first()
+            if restaurant is None:
+                return None
+            specials = await self._specials_by_restaurant(conn, [place_id])
+        return self.catalog._restaurant_to_unified_dict(restaurant, specials.get(place_id, []))
+
+    async def get_places_nearby(self, latitude: float, longitude: float, radius: float = 10,
+                                fields: List[str] = SUMMARY_FIELDS, limit: int = 50) -> List[Dict[str, Any]]:
+        """Async EnhancedDatabaseManager.get_places_nearby."""
+        statement, wants_status = self.catalog._nearby_statement(latitude, longitude, radius, fields, limit)
+        async with self._connection() as conn:
+            rows = (await conn.execute(statement)).mappings().all()
+            specials = await self._child_fields(conn, rows, fields)
+        return await run_in_threadpool(
+            self.catalog._nearby_results, rows, latitude, longitude, radius, fields, wants_status, specials
+        )
+
+    async def get_facets(self, kosher_category: str = None, state: str = None, query: str = None) -> Dict[str, Dict[str, int]]:
+        """Async EnhancedDatabaseManager.get_facets."""
+        rows = await self._fetch(self.catalog._facets_statement(kosher_category, state, query))
+        return self.catalog._rollup_facets(rows)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """
+        Async EnhancedDatabaseManager.get_statistics.
+
+        If the summary row has not been built yet, the summary is computed
+        for this response only; the sync manager persists it on its next read.
+        """
+        table = RestaurantStatistics.__table__
+        async with self._connection() as conn:
+            result = await conn.execute(select(table).where(table.c.id == _STATISTICS_ROW_ID))
+            row = result.first()
+            if row is None:
+                result = await conn.execute(self.catalog._statistics_statement())
+                return self.catalog._summarize_statistics(result.mappings().all())
+
+        summary = json.loads(row.summary)
+        summary['last_updated'] = row.computed_at.isoformat()
+        return summary
@@ -31,13 +31,19 @@ Last Updated: 2024
 import os
 import logging
 import json
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, text
+import math
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint, DDL, event, text, select, func, and_, or_, bindparam
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 import structlog
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 # Import the dynamic status calculation module
 try:
@@ -50,24 +56,17 @@ except ImportError:
     def is_restaurant_open(restaurant_data):
         return False
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+# Import the offline timezone resolver (used to persist timezone at write time)
+try:
+    from utils.timezone_resolver import resolve_timezone
+except ImportError:
+    # Fallback for when utils module is not available
+    def resolve_timezone(latitude=None, longitude=None, state=None, utc_offset_minutes=None):
+        return None
+
+from utils.image_proxy import proxy_image_url
+from utils.json_encoding import dumps_bytes, merge_fragment, restaurant_fragment_cache
+from utils.logging_config import configure_logging
 
 logger = structlog.get_logger()
 
@@ -132,7 +131,10 @@ class Restaurant(Base):
     
     # 🖼️ Display/UX
     image_url = Column(String(500))  # Optional — fallback to placeholder
-    specials = Column(Text)  # JSONB[] or child table - Admin-managed only, frontend only
+    website_status = Column(String(20))  # Link health of website (see LinkCheck), None until checked
+    image_status = Column(String(20))  # Link health of image_url
+    image_hash = Column(String(32))  # Cached thumbnails of image_url (see CachedImage), served at /img/<hash>/<width>
+    specials = Column(Text)  # Legacy JSON list, superseded by the specials table (RestaurantSpecial)
     
     # 🗑️ Removed Fields (commented out for reference)
     # detail_url = Column(String(500))  # ❌ delete
@@ -145,26 +147,414 @@ class Restaurant(Base):
     # ❓ Field Needing Clarification
     # status = Column(String(50), default='approved')  # Should be enum: ["pending", "approved", "rejected"] or remove if unused
 
+class RestaurantSpecial(Base):
+    """
+    A restaurant special (admin-managed, shown on the frontend when paid).
+    
+    Specials used to be a JSON list in ``restaurants.specials``; they now live
+    in this child table so payment updates and the active-specials query hit
+    an index instead of parsing every restaurant's JSON. Keys of the original
+    JSON objects without a column of their own are kept in ``extra``.
+    """
+    __tablename__ = 'specials'
+    __table_args__ = (
+        Index('ix_specials_is_paid_valid_until', 'is_paid', 'valid_until'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer, ForeignKey('restaurants.id', ondelete='CASCADE'), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text)
+    special_type = Column(String(20))  # 'discount', 'promotion' or 'event'
+    discount_percent = Column(Float)
+    discount_amount = Column(Float)
+    priority = Column(Integer, default=0, nullable=False)
+    valid_from = Column(DateTime)  # start_date (None: no start)
+    valid_until = Column(DateTime)  # end_date (None: open-ended)
+    is_active = Column(Boolean, default=True, nullable=False)
+    is_paid = Column(Boolean, default=False, nullable=False)
+    payment_status = Column(String(20), default='unpaid', nullable=False)
+    extra = Column(Text)  # JSON object with any other keys
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+class LinkCheck(Base):
+    """
+    Cached result of the last check of a website or image link.
+    
+    One row per distinct URL in restaurants.website / restaurants.image_url,
+    written by EnhancedDatabaseManager.check_links (see utils/link_checker.py)
+    and copied to the restaurants' website_status / image_status, so reads
+    never check links themselves.
+    """
+    __tablename__ = 'link_checks'
+    
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False, unique=True, index=True)  # As stored on the restaurant
+    status = Column(String(20), nullable=False)  # ok, redirected, blocked, failing or dead
+    status_code = Column(Integer)  # Final HTTP status (None on connection errors)
+    final_url = Column(String(1000))  # After redirects
+    latency_ms = Column(Integer)
+    method = Column(String(4))  # HEAD or GET (fallback)
+    error = Column(String(255))
+    failures = Column(Integer, default=0, nullable=False)  # Consecutive failed checks
+    checked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+class CachedImage(Base):
+    """
+    A source image fetched into the local image cache (utils/image_proxy.py).
+    
+    One row per distinct restaurant image source (image_url, or the Google
+    Places primary photo of restaurants without one), written by
+    EnhancedDatabaseManager.cache_images; content_hash names the WebP
+    thumbnails on disk and is copied to restaurants.image_hash.
+    """
+    __tablename__ = 'images'
+    
+    id = Column(Integer, primary_key=True)
+    source_url = Column(String(500), nullable=False, unique=True, index=True)  # As stored (without the Places API key)
+    content_hash = Column(String(32), index=True)  # None while the source cannot be fetched
+    width = Column(Integer)  # Source dimensions
+    height = Column(Integer)
+    bytes = Column(Integer)  # Source size
+    error = Column(String(255))
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class JobRun(Base):
+    """
+    One run of a periodic job (utils/scheduler.py).
+    
+    scheduled_for is the schedule slot the run is for (the start time for
+    manual runs); the unique (job_name, scheduled_for) pair lets each slot
+    run once however many workers and hosts run a scheduler.
+    """
+    __tablename__ = 'job_runs'
+    __table_args__ = (
+        UniqueConstraint('job_name', 'scheduled_for', name='uq_job_runs_job_name_scheduled_for'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    job_name = Column(String(100), nullable=False)
+    scheduled_for = Column(DateTime, nullable=False)
+    trigger = Column(String(20), nullable=False)  # schedule, catch_up or manual
+    status = Column(String(20), nullable=False)  # running, succeeded, failed, missed or interrupted
+    host = Column(String(255))  # hostname:pid of the runner
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at = Column(DateTime)
+    duration_ms = Column(Integer)
+    result = Column(Text)  # JSON returned by the job
+    error = Column(Text)
+
+class SourceListing(Base):
+    """
+    A listing as last published by an ingestion source (utils/ingestion.py).
+    
+    Provenance and change tracking per source: content_hash is the hash of
+    the normalized listing, so EnhancedDatabaseManager.ingest_sources only
+    writes restaurants whose listing changed. restaurant_id is the catalog
+    row the listing was matched to or created as.
+    """
+    __tablename__ = 'source_listings'
+    __table_args__ = (
+        UniqueConstraint('source', 'source_key', name='uq_source_listings_source_source_key'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    source = Column(String(50), nullable=False)  # SourceAdapter.name
+    source_key = Column(String(64), nullable=False)  # Stable key of the listing within the source
+    restaurant_id = Column(Integer, ForeignKey('restaurants.id', ondelete='SET NULL'), index=True)
+    page_url = Column(String(500))
+    content_hash = Column(String(32), nullable=False)
+    data = Column(Text, nullable=False)  # JSON of the normalized fields
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    removed_at = Column(DateTime)  # No longer published by the source
+
+class SourcePage(Base):
+    """
+    HTTP validators of a page fetched by an ingestion source.
+    
+    Sent back as If-None-Match / If-Modified-Since, and compared with the
+    body hash, so pages that did not change are neither downloaded nor parsed.
+    """
+    __tablename__ = 'source_pages'
+    __table_args__ = (
+        UniqueConstraint('source', 'url', name='uq_source_pages_source_url'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    source = Column(String(50), nullable=False)
+    url = Column(String(500), nullable=False)
+    etag = Column(String(255))
+    last_modified = Column(String(64))
+    content_hash = Column(String(32))  # Hash of the last body parsed
+    status_code = Column(Integer)
+    error = Column(String(255))
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class CatalogChange(Base):
+    """
+    Change log of the restaurants table, read by /api/changes.
+    
+    Rows are written by triggers on the restaurants table (see
+    _CHANGE_LOG_DDL), so every write path is logged: this manager,
+    ingestion, GooglePlacesManager, scripts and raw SQL alike. Versions only
+    grow; each restaurant keeps only its latest change (an upsert, or a
+    delete tombstone), so the log stays the size of the catalog and reading
+    it from version 0 returns a full snapshot.
+    """
+    __tablename__ = 'catalog_changes'
+    __table_args__ = {'sqlite_autoincrement': True}  # never reuse a version
+    
+    version = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer, nullable=False, index=True)  # No foreign key: tombstones outlive the row
+    op = Column(String(10), nullable=False)  # upsert or delete
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+# Triggers filling catalog_changes, created (and the existing catalog logged
+# as upserts) together with the table. On Postgres, writers to restaurants
+# take a transaction-level advisory lock before logging, so versions are
+# assigned in commit order and a reader never sees version N before N - 1.
+# SQLite serializes writers already.
+_CHANGE_LOG_DDL = {
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION log_restaurant_change() RETURNS trigger AS $$
+        DECLARE
+            changed_id integer;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('catalog_changes'));
+            IF TG_OP = 'DELETE' THEN
+                changed_id := OLD.id;
+            ELSE
+                changed_id := NEW.id;
+            END IF;
+            DELETE FROM catalog_changes WHERE restaurant_id = changed_id;
+            INSERT INTO catalog_changes (restaurant_id, op, changed_at)
+            VALUES (changed_id, CASE WHEN TG_OP = 'DELETE' THEN 'delete' ELSE 'upsert' END,
+                    now() AT TIME ZONE 'utc');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER restaurants_change_log AFTER INSERT OR UPDATE OR DELETE ON restaurants
+        FOR EACH ROW EXECUTE PROCEDURE log_restaurant_change()
+        """,
+        """
+        INSERT INTO catalog_changes (restaurant_id, op, changed_at)
+        SELECT id, 'upsert', now() AT TIME ZONE 'utc' FROM restaurants ORDER BY id
+        """,
+    ],
+    'sqlite': [
+        f"""
+        CREATE TRIGGER restaurants_change_log_{event_name} AFTER {event_name.upper()} ON restaurants
+        BEGIN
+            DELETE FROM catalog_changes WHERE restaurant_id = {row}.id;
+            INSERT INTO catalog_changes (restaurant_id, op, changed_at) VALUES ({row}.id, '{op}', CURRENT_TIMESTAMP);
+        END
+        """
+        for event_name, row, op in (('insert', 'NEW', 'upsert'), ('update', 'NEW', 'upsert'), ('delete', 'OLD', 'delete'))
+    ] + [
+        """
+        INSERT INTO catalog_changes (restaurant_id, op, changed_at)
+        SELECT id, 'upsert', CURRENT_TIMESTAMP FROM restaurants ORDER BY id
+        """,
+    ],
+}
+
+CatalogChange.__table__.add_is_dependent_on(Restaurant.__table__)
+for _dialect, _statements in _CHANGE_LOG_DDL.items():
+    for _statement in _statements:
+        event.listen(CatalogChange.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
+class RestaurantStatistics(Base):
+    """
+    Precomputed catalog statistics (single row).
+    
+    Kept current by EnhancedDatabaseManager whenever it writes restaurants, so
+    statistics endpoints read one row instead of scanning the catalog. Writes
+    that bypass it (bulk loaders, raw SQL) are caught up by the scheduled
+    statistics_refresh job (utils/scheduler.py).
+    """
+    __tablename__ = 'restaurant_statistics'
+    
+    id = Column(Integer, primary_key=True)
+    total_restaurants = Column(Integer, default=0, nullable=False)
+    summary = Column(Text, nullable=False)  # JSON document with every breakdown
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+# Statistics breakdowns: summary key -> grouped column
+STATISTICS_BREAKDOWNS = {
+    'kosher_types': 'kosher_category',
+    'certifying_agencies': 'certifying_agency',
+    'cities': 'city',
+    'states': 'state',
+    'listing_types': 'listing_type',
+}
+
+# Statistics counters: summary key -> FILTER condition
+STATISTICS_COUNTERS = {
+    'chalav_yisroel': Restaurant.is_cholov_yisroel == True,
+    'chalav_stam': and_(Restaurant.is_cholov_yisroel == False, Restaurant.kosher_category == 'dairy'),
+    'pas_yisroel': Restaurant.is_pas_yisroel == True,
+    'with_hours': and_(Restaurant.hours_of_operation.isnot(None), Restaurant.hours_of_operation != ''),
+    'hours_parsed': Restaurant.hours_parsed == True,
+}
+
+_STATISTICS_ROW_ID = 1
+
+# Facet columns returned with listings (``facets=true``)
+FACET_COLUMNS = ('kosher_category', 'certifying_agency', 'is_cholov_yisroel', 'is_pas_yisroel', 'city', 'listing_type')
+
+# Fields computed from business hours at read time (not stored columns)
+STATUS_FIELDS = ('status', 'is_open', 'status_reason', 'next_open_time')
+
+# Stored columns exposed by the API (same keys as _restaurant_to_unified_dict)
+LISTING_COLUMNS = (
+    'id', 'name', 'address', 'city', 'state', 'zip_code', 'phone_number', 'website',
+    'kosher_category', 'listing_type', 'hours_of_operation', 'hours_json', 'hours_last_updated',
+    'short_description', 'price_range', 'image_url', 'latitude', 'longitude', 'specials',
+    'is_cholov_yisroel', 'is_pas_yisroel', 'certifying_agency', 'google_listing_url',
+    'created_at', 'updated_at', 'current_time_local', 'timezone', 'hours_parsed',
+    'website_status', 'image_status'
+)
+
+# Fields returned for list cards (``view=summary``)
+SUMMARY_FIELDS = (
+    'id', 'name', 'address', 'city', 'state', 'zip_code', 'phone_number', 'website',
+    'kosher_category', 'listing_type', 'certifying_agency', 'price_range', 'image_url',
+    'latitude', 'longitude', 'is_cholov_yisroel', 'is_pas_yisroel', 'hours_of_operation',
+    'status', 'is_open'
+)
+
+# Columns the status calculation reads
+_STATUS_INPUT_COLUMNS = ('hours_of_operation', 'latitude', 'longitude', 'city', 'state', 'timezone')
+
+# Unified dict keys overwritten by the status calculation on every read
+_DYNAMIC_FIELDS = STATUS_FIELDS + ('current_time_local', 'timezone', 'hours_parsed')
+
+# Link fields -> their link health column (values hidden when dead and hide_dead_links is set)
+_LINK_STATUS_COLUMNS = {
+    'website': 'website_status',
+    'image_url': 'image_status',
+}
+
+# Fields loaded from the specials child table (one batched query per page)
+CHILD_FIELDS = ('specials',)
+
+# Special keys stored in their own columns: JSON key -> column
+SPECIAL_COLUMNS = {
+    'id': 'id',
+    'restaurant_id': 'restaurant_id',
+    'title': 'title',
+    'description': 'description',
+    'special_type': 'special_type',
+    'discount_percent': 'discount_percent',
+    'discount_amount': 'discount_amount',
+    'priority': 'priority',
+    'start_date': 'valid_from',
+    'end_date': 'valid_until',
+    'is_active': 'is_active',
+    'is_paid': 'is_paid',
+    'payment_status': 'payment_status',
+    'created_date': 'created_at',
+    'updated_date': 'updated_at',
+}
+
+# Alternative JSON keys accepted when importing specials
+_SPECIAL_KEY_ALIASES = {
+    'valid_from': 'start_date',
+    'valid_until': 'end_date',
+    'created_at': 'created_date',
+    'updated_at': 'updated_date',
+}
+
+_MILES_PER_DEGREE = 69.0
+_EARTH_RADIUS_MILES = 3958.8
+
+def _haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in miles."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+class _lower_by_code_point(FunctionElement):
+    """lower(expression), compared by code point whatever the column collation."""
+    type = String()
+    name = 'lower'
+    inherit_cache = True
+
+@compiles(_lower_by_code_point)
+def _compile_lower_by_code_point(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+@compiles(_lower_by_code_point, 'postgresql')
+def _compile_lower_by_code_point_postgresql(element, compiler, **kw):
+    # en_US and similar collations ignore spaces and punctuation; "C" compares code points, like Python
+    return f'lower({compiler.process(element.clauses, **kw)}) COLLATE "C"'
+
+def name_order(table) -> tuple:
+    """
+    ORDER BY clauses for listings in name order: case-insensitive name, then id.
+    
+    The catalog replica and the in-page sorts use name_order_key, which gives
+    the same order, so every read path pages identically. (SQLite's lower()
+    only folds ASCII letters.)
+    """
+    return (_lower_by_code_point(table.c.name), table.c.id)
+
+def name_order_key(name: str, restaurant_id: int) -> tuple:
+    """Python sort key for name_order."""
+    return (name.lower(), restaurant_id)
+
 class EnhancedDatabaseManager:
     """Enhanced database manager with SQLAlchemy 1.4 support for consolidated restaurants table."""
     
-    def __init__(self, database_url: str = None):
-        """Initialize database manager with connection string."""
+    def __init__(self, database_url: str = None, hide_dead_links: bool = None, image_base_url: str = None):
+        """
+        Initialize database manager with connection string.
+        
+        Args:
+            database_url: Database URL (defaults to DATABASE_URL)
+            hide_dead_links: Return dead websites and images (see check_links)
+                as None instead of only flagging them (defaults to HIDE_DEAD_LINKS)
+            image_base_url: Public base URL of the /img routes for cached
+                images (see cache_images; defaults to IMAGE_PROXY_BASE_URL,
+                empty for URLs relative to the API host)
+        """
+        configure_logging()
         self.database_url = database_url or os.environ.get('DATABASE_URL')
         
         # Validate that DATABASE_URL is provided
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
         
+        if hide_dead_links is None:
+            hide_dead_links = os.environ.get('HIDE_DEAD_LINKS', 'false').lower() == 'true'
+        self.hide_dead_links = hide_dead_links
+        self.image_base_url = image_base_url if image_base_url is not None else os.environ.get('IMAGE_PROXY_BASE_URL', '')
+        
         # Initialize SQLAlchemy components
         self.engine = None
         self.SessionLocal = None
         self.session = None
+        # Connection of the read_snapshot() block running in this thread
+        self._snapshot = threading.local()
         
         logger.info("Database manager initialized", database_url=self.database_url[:50] + "...")
     
-    def connect(self) -> bool:
-        """Connect to the database and create tables if they don't exist."""
+    def connect(self, create_tables: bool = True) -> bool:
+        """
+        Connect to the database.
+        
+        Args:
+            create_tables: Also create missing tables. The API server passes
+                False and leaves schema changes to database/migrations/migrate.py.
+        """
         try:
             # Create the engine with SQLAlchemy 1.4 + psycopg2-binary
             self.engine = create_engine(
@@ -182,9 +572,8 @@ class EnhancedDatabaseManager:
             # Create session factory
             self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
             
-            # Create tables if they don't exist
-            Base.metadata.create_all(bind=self.engine)
-            logger.info("Database tables created/verified")
+            if create_tables:
+                self.ensure_schema()
             
             return True
             
@@ -192,12 +581,54 @@ class EnhancedDatabaseManager:
             logger.error("Failed to connect to database", error=str(e), database_url=self.database_url[:50] + "...")
             return False
     
+    def ensure_schema(self) -> None:
+        """Create tables that don't exist yet (no-op for existing tables)."""
+        Base.metadata.create_all(bind=self.engine)
+        logger.info("Database tables created/verified")
+    
     def get_session(self) -> Session:
-        """Get a new database session."""
+        """Get a new database session (on the read_snapshot() connection inside such a block)."""
         if not self.SessionLocal:
             raise RuntimeError("Database not connected. Call connect() first.")
+        conn = getattr(self._snapshot, 'conn', None)
+        if conn is not None:
+            return self.SessionLocal(bind=conn)
         return self.SessionLocal()
     
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Run the catalog reads inside the block on one connection and one snapshot.
+        
+        A listing and its facet counts (get_facets) are separate queries; in a
+        read_snapshot() block they share a REPEATABLE READ read-only
+        transaction on PostgreSQL, so the counts describe exactly the catalog
+        the listing was read from even if a write commits in between.
+        Nested blocks join the outer one.
+        """
+        if getattr(self._snapshot, 'conn', None) is not None:
+            yield self
+            return
+        with self.engine.connect() as conn:
+            if conn.dialect.name == 'postgresql':
+                conn = conn.execution_options(isolation_level='REPEATABLE READ', postgresql_readonly=True)
+            with conn.begin():
+                self._snapshot.conn = conn
+                try:
+                    yield self
+                finally:
+                    self._snapshot.conn = None
+    
+    @contextmanager
+    def _read_connection(self):
+        """Get a connection for a read: the read_snapshot() one inside such a block, else a new one."""
+        conn = getattr(self._snapshot, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self.engine.connect() as conn:
+            yield conn
+    
     def add_restaurant(self, restaurant_data: Dict[str, Any]) -> bool:
         """Add a new restaurant to the database."""
         try:
@@ -216,14 +647,24 @@ class EnhancedDatabaseManager:
             restaurant_data.setdefault('updated_at', datetime.utcnow())
             restaurant_data.setdefault('hours_parsed', False)
             
-            # Handle specials field (convert to JSON string if it's a list)
-            if 'specials' in restaurant_data and isinstance(restaurant_data['specials'], list):
-                import json
-                restaurant_data['specials'] = json.dumps(restaurant_data['specials'])
+            # Resolve timezone from location so status calculation never has to guess
+            if not restaurant_data.get('timezone'):
+                restaurant_data['timezone'] = resolve_timezone(
+                    restaurant_data.get('latitude'),
+                    restaurant_data.get('longitude'),
+                    restaurant_data.get('state')
+                )
+            
+            # Specials go to the specials table (list or legacy JSON string)
+            specials = self._parse_specials_field(restaurant_data.pop('specials', None))
             
             # Create new restaurant object
             restaurant = Restaurant(**restaurant_data)
             session.add(restaurant)
+            session.flush()
+            for special in specials:
+                session.add(RestaurantSpecial(**self.special_columns(special, restaurant.id)))
+            self._apply_statistics_delta(session, None, self._statistics_values(restaurant))
             session.commit()
             
             logger.info("Restaurant added successfully", restaurant_id=restaurant.id, name=restaurant.name)
@@ -258,12 +699,13 @@ class EnhancedDatabaseManager:
             restaurants = session.query(Restaurant).limit(limit).offset(offset).all()
             
             logger.info(f"Found {len(restaurants)} restaurants in database")
+            specials = self._specials_by_restaurant(session, [restaurant.id for restaurant in restaurants])
             
             # Convert to unified format
             all_places = []
             for restaurant in restaurants:
                 try:
-                    place_dict = self._restaurant_to_unified_dict(restaurant)
+                    place_dict = self._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, []))
                     all_places.append(place_dict)
                 except Exception as e:
                     logger.error(f"Error converting restaurant {restaurant.name}: {e}")
@@ -272,7 +714,7 @@ class EnhancedDatabaseManager:
             logger.info(f"Successfully converted {len(all_places)} restaurants")
             
             # Sort by name
-            all_places.sort(key=lambda x: x['name'])
+            all_places.sort(key=lambda x: name_order_key(x['name'], x['id']))
             return all_places
             
         except Exception as e:
@@ -282,29 +724,320 @@ class EnhancedDatabaseManager:
             if session:
                 session.close()
     
+    def resolve_fields(self, fields: Optional[str] = None, view: str = 'summary') -> List[str]:
+        """
+        Resolve a sparse fieldset from a ``fields`` parameter or a named view.
+        
+        Args:
+            fields: Comma-separated field names (takes precedence over view)
+            view: 'summary' or 'detail'
+            
+        Returns:
+            Ordered list of field names (always including 'id')
+            
+        Raises:
+            ValueError: If a field or view name is unknown
+        """
+        if fields:
+            requested = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in requested if f not in LISTING_COLUMNS and f not in STATUS_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            if 'id' not in requested:
+                requested.insert(0, 'id')
+            return list(dict.fromkeys(requested))
+        
+        if view == 'summary':
+            return list(SUMMARY_FIELDS)
+        if view == 'detail':
+            return list(LISTING_COLUMNS + STATUS_FIELDS)
+        raise ValueError(f"Unknown view: {view}")
+    
+    def get_places_projected(self, fields: List[str], limit: int = 100, offset: int = 0,
+                             kosher_category: str = None, state: str = None) -> List[Dict[str, Any]]:
+        """
+        Get places using a column-projected Core select.
+        
+        Only the columns needed for the requested fields are read, and rows are
+        returned as plain dictionaries without ORM hydration. Filters and the
+        name ordering are applied in SQL so pagination is stable.
+        """
+        try:
+            statement, wants_status = self._projected_statement(fields, limit, offset, kosher_category, state)
+            
+            with self._read_connection() as conn:
+                rows = conn.execute(statement).mappings().all()
+                specials = self._child_fields(conn, rows, fields)
+            
+            return [self._row_to_fields(row, fields, wants_status, specials) for row in rows]
+            
+        except Exception as e:
+            logger.error("Failed to get projected places", error=str(e))
+            return []
+    
+    def _projected_statement(self, fields: List[str], limit: int, offset: int,
+                             kosher_category: str = None, state: str = None):
+        """Build the get_places_projected select; returns (statement, wants_status)."""
+        wants_status = any(f in STATUS_FIELDS for f in fields)
+        column_names = self._with_link_inputs([f for f in fields if f in LISTING_COLUMNS and f not in CHILD_FIELDS])
+        if wants_status:
+            column_names += [c for c in _STATUS_INPUT_COLUMNS if c not in column_names]
+        
+        table = Restaurant.__table__
+        statement = select(*[table.c[name] for name in column_names])
+        if kosher_category:
+            statement = statement.where(table.c.kosher_category == kosher_category)
+        if state:
+            statement = statement.where(table.c.state == state)
+        statement = statement.order_by(*name_order(table)).limit(limit).offset(offset)
+        return statement, wants_status
+    
+    def _with_link_inputs(self, column_names: List[str]) -> List[str]:
+        """Add the columns _live_link needs for the selected link fields."""
+        if 'image_url' in column_names and 'image_hash' not in column_names:
+            column_names.append('image_hash')
+        if self.hide_dead_links:
+            column_names += [_LINK_STATUS_COLUMNS[name] for name in list(column_names)
+                             if name in _LINK_STATUS_COLUMNS and _LINK_STATUS_COLUMNS[name] not in column_names]
+        return column_names
+    
+    def _live_link(self, url: Optional[str], status: Optional[str], image_hash: str = None) -> Optional[str]:
+        """
+        Get a link for the response: the image proxy URL of a cached image
+        (see cache_images), else the link itself (None if it is dead and
+        hide_dead_links is set).
+        """
+        if image_hash:
+            return proxy_image_url(image_hash, base_url=self.image_base_url)
+        if self.hide_dead_links and status == 'dead':
+            return None
+        return url
+    
+    def _child_fields(self, conn, rows, fields: List[str]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """Batch-load the specials of the rows if requested (None otherwise)."""
+        if 'specials' not in fields:
+            return None
+        return self._specials_by_restaurant(conn, [row['id'] for row in rows])
+    
+    def _row_to_fields(self, row, fields: List[str], wants_status: bool,
+                       specials: Dict[int, List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Convert a projected row mapping to a response dictionary with only the requested fields."""
+        place = {}
+        for field in fields:
+            if field in STATUS_FIELDS:
+                continue
+            if field == 'specials':
+                place[field] = (specials or {}).get(row['id'], [])
+                continue
+            value = row[field]
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif field == 'hours_json':
+                value = self._parse_hours_json_field(value)
+            elif field in _LINK_STATUS_COLUMNS:
+                value = self._live_link(value, row.get(_LINK_STATUS_COLUMNS[field]),
+                                        row.get('image_hash') if field == 'image_url' else None)
+            place[field] = value
+        
+        if wants_status:
+            try:
+                status_info = get_restaurant_status(dict(row))
+            except Exception as e:
+                logger.error(f"Error calculating dynamic status for restaurant {row['id']}: {e}")
+                status_info = {'status': 'unknown', 'is_open': False,
+                               'status_reason': f'Dynamic status calculation failed: {str(e)}'}
+            for field in fields:
+                if field in STATUS_FIELDS:
+                    place[field] = status_info.get(field)
+        
+        return place
+    
+    def get_changes(self, since: int = 0, limit: int = 500, fields: List[str] = None) -> Dict[str, Any]:
+        """
+        Get the restaurant changes after a version, in version order.
+        
+        Clients keep a local copy of the catalog and pass the ``next_since``
+        of their last page; version 0 returns the whole catalog as upserts.
+        Business-hours status fields are not included (they change with the
+        clock, not with the data; compute them from the hours).
+        
+        Args:
+            since: Last version the client has applied
+            limit: Maximum number of changes returned
+            fields: Fields of upserted restaurants (default: every listing column)
+            
+        Returns:
+            {'changes': [{'version', 'op', 'id', 'restaurant'}], 'since',
+            'next_since', 'has_more', 'latest_version', 'reset'}; reset is set
+            when since is ahead of the log (the database was rebuilt) and the
+            client must start over from version 0
+        """
+        fields = [f for f in (fields or LISTING_COLUMNS) if f not in STATUS_FIELDS]
+        column_names = self._with_link_inputs([f for f in fields if f not in CHILD_FIELDS])
+        changes = CatalogChange.__table__
+        restaurants = Restaurant.__table__
+        
+        with self.engine.connect() as conn:
+            latest_version = conn.execute(select(func.max(changes.c.version))).scalar() or 0
+            rows = conn.execute(
+                select(changes.c.version, changes.c.op, changes.c.restaurant_id)
+                .where(changes.c.version > since).order_by(changes.c.version).limit(limit + 1)
+            ).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            upsert_ids = [row.restaurant_id for row in rows if row.op == 'upsert']
+            places = {}
+            for index in range(0, len(upsert_ids), 500):
+                for place in conn.execute(
+                    select(*[restaurants.c[name] for name in column_names])
+                    .where(restaurants.c.id.in_(upsert_ids[index:index + 500]))
+                ).mappings():
+                    places[place['id']] = place
+            specials = self._child_fields(conn, list(places.values()), fields)
+        
+        result = []
+        for row in rows:
+            place = places.get(row.restaurant_id) if row.op == 'upsert' else None
+            # Deleted after the change was logged; its tombstone follows
+            op = 'upsert' if place is not None else 'delete'
+            result.append({
+                'version': row.version,
+                'op': op,
+                'id': row.restaurant_id,
+                'restaurant': self._row_to_fields(place, fields, False, specials) if place is not None else None,
+            })
+        
+        return {
+            'changes': result,
+            'since': since,
+            'next_since': rows[-1].version if rows else min(since, latest_version),
+            'has_more': has_more,
+            'latest_version': latest_version,
+            'reset': since > latest_version,
+        }
+    
+    def iter_export_batches(self, columns: List[str], filters: Dict[str, Any] = None, after_id: int = 0,
+                            limit: int = None, batch_size: int = 500):
+        """
+        Stream restaurant rows for export in id order, in batches.
+        
+        Rows are read through a server-side cursor (stream_results + yield_per),
+        so memory stays constant regardless of catalog size. Ordering by id with
+        an ``id > after_id`` predicate makes the export resumable: a client
+        restarts from the last id it received.
+        
+        Args:
+            columns: Column names to select (must be in LISTING_COLUMNS)
+            filters: Equality filters on columns, plus optional 'updated_since' datetime
+            after_id: Only export rows with id greater than this
+            limit: Maximum number of rows to export (None for all)
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Lists of row mappings (dictionaries with a ``specials`` list when requested)
+        """
+        table = Restaurant.__table__
+        column_names = [name for name in columns if name not in CHILD_FIELDS]
+        if 'id' not in column_names:
+            column_names.insert(0, 'id')
+        statement = select(*[table.c[name] for name in column_names]).where(table.c.id > after_id)
+        for key, value in (filters or {}).items():
+            if key == 'updated_since':
+                statement = statement.where(table.c.updated_at >= value)
+            else:
+                statement = statement.where(table.c[key] == value)
+        statement = statement.order_by(table.c.id)
+        if limit:
+            statement = statement.limit(limit)
+        
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(statement)
+            if 'specials' not in columns:
+                for partition in result.mappings().partitions(batch_size):
+                    yield partition
+                return
+            
+            # Specials are read per batch on a second connection (the first one is streaming)
+            with self.engine.connect() as specials_conn:
+                for partition in result.mappings().partitions(batch_size):
+                    specials = self._specials_by_restaurant(specials_conn, [row['id'] for row in partition])
+                    yield [dict(row, specials=specials.get(row['id'], [])) for row in partition]
+    
+    def get_facets(self, kosher_category: str = None, state: str = None, query: str = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get facet counts for the result set matching the given filters.
+        
+        Counts are computed with a single aggregate query grouped by every facet
+        column at once (the number of distinct combinations is small), then
+        rolled up per facet, so the cost is one index-friendly scan of the
+        matching rows regardless of how many facets are returned. Call it in
+        the same read_snapshot() block as the listing it describes.
+        
+        Args:
+            kosher_category: Equality filter (as in get_all_places_encoded)
+            state: Equality filter (as in get_all_places_encoded)
+            query: Name substring filter (as in search_places)
+            
+        Returns:
+            Dictionary of facet column -> {value: count}; boolean values are
+            keyed 'true'/'false'
+        """
+        try:
+            statement = self._facets_statement(kosher_category, state, query)
+            
+            with self._read_connection() as conn:
+                rows = conn.execute(statement).mappings().all()
+            
+            return self._rollup_facets(rows)
+            
+        except Exception as e:
+            logger.error("Failed to get facets", error=str(e))
+            return {}
+    
+    def _facets_statement(self, kosher_category: str = None, state: str = None, query: str = None):
+        """Build the get_facets aggregate, grouped by every facet column."""
+        table = Restaurant.__table__
+        group_columns = [table.c[name] for name in FACET_COLUMNS]
+        statement = select(*group_columns, func.count().label('total'))
+        if kosher_category:
+            statement = statement.where(table.c.kosher_category == kosher_category)
+        if state:
+            statement = statement.where(table.c.state == state)
+        if query:
+            statement = statement.where(table.c.name.ilike(f'%{query}%'))
+        return statement.group_by(*group_columns)
+    
+    def _rollup_facets(self, rows) -> Dict[str, Dict[str, int]]:
+        """Roll the grouped facet rows up into per-column counts."""
+        facets = {name: {} for name in FACET_COLUMNS}
+        for row in rows:
+            for name in FACET_COLUMNS:
+                value = row[name]
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = 'true' if value else 'false'
+                facets[name][value] = facets[name].get(value, 0) + row['total']
+        return facets
+    
     def search_places(self, query: str = None, category: str = None, state: str = None, 
                      limit: int = 50, offset: int = 0, is_kosher: bool = None) -> List[Dict[str, Any]]:
         """Search places from the consolidated restaurants table."""
         try:
             session = self.get_session()
-            restaurant_query = session.query(Restaurant)
+            restaurant_query = session.query(Restaurant).filter(*self._search_conditions(query, category, state))
             
-            if query:
-                restaurant_query = restaurant_query.filter(Restaurant.name.ilike(f'%{query}%'))
-            if category:
-                restaurant_query = restaurant_query.filter(Restaurant.listing_type.ilike(f'%{category}%'))
-            if state:
-                restaurant_query = restaurant_query.filter(Restaurant.state.ilike(f'%{state}%'))
             if is_kosher is not None:
                 # All restaurants in our database are kosher, so this filter is not needed
                 pass
             
             restaurants = restaurant_query.limit(limit).offset(offset).all()
+            specials = self._specials_by_restaurant(session, [restaurant.id for restaurant in restaurants])
             
             # Convert to unified format
             all_places = []
             for restaurant in restaurants:
-                place_dict = self._restaurant_to_unified_dict(restaurant)
+                place_dict = self._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, []))
                 all_places.append(place_dict)
             
             return all_places
@@ -316,12 +1049,24 @@ class EnhancedDatabaseManager:
             if session:
                 session.close()
     
+    def _search_conditions(self, query: str = None, category: str = None, state: str = None) -> list:
+        """Build the search_places filter conditions."""
+        conditions = []
+        if query:
+            conditions.append(Restaurant.name.ilike(f'%{query}%'))
+        if category:
+            conditions.append(Restaurant.listing_type.ilike(f'%{category}%'))
+        if state:
+            conditions.append(Restaurant.state.ilike(f'%{state}%'))
+        return conditions
+    
     def search_restaurants(self, limit: int = 1000, offset: int = 0) -> List[Dict[str, Any]]:
         """Search restaurants and return as list of dictionaries."""
         try:
             session = self.get_session()
             restaurants = session.query(Restaurant).limit(limit).offset(offset).all()
-            return [self._restaurant_to_unified_dict(restaurant) for restaurant in restaurants]
+            specials = self._specials_by_restaurant(session, [restaurant.id for restaurant in restaurants])
+            return [self._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, [])) for restaurant in restaurants]
         except Exception as e:
             logger.error(f"Error searching restaurants: {e}")
             return []
@@ -373,13 +1118,76 @@ class EnhancedDatabaseManager:
             if session:
                 session.close()
     
+    def get_places_nearby(self, latitude: float, longitude: float, radius: float = 10,
+                          fields: List[str] = SUMMARY_FIELDS, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get places within ``radius`` miles of a point, nearest first.
+        
+        A bounding box on latitude/longitude narrows the candidates in SQL and
+        orders them by an equirectangular distance approximation; the exact
+        great-circle distance is then computed for the returned rows only.
+        
+        Returns:
+            Places with the requested fields plus ``distance_miles``
+        """
+        try:
+            statement, wants_status = self._nearby_statement(latitude, longitude, radius, fields, limit)
+            
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement).mappings().all()
+                specials = self._child_fields(conn, rows, fields)
+            
+            return self._nearby_results(rows, latitude, longitude, radius, fields, wants_status, specials)
+            
+        except Exception as e:
+            logger.error("Failed to get nearby places", error=str(e))
+            return []
+    
+    def _nearby_statement(self, latitude: float, longitude: float, radius: float, fields: List[str], limit: int):
+        """Build the get_places_nearby select; returns (statement, wants_status)."""
+        wants_status = any(f in STATUS_FIELDS for f in fields)
+        column_names = self._with_link_inputs([f for f in fields if f in LISTING_COLUMNS and f not in CHILD_FIELDS])
+        column_names += [c for c in ('id', 'latitude', 'longitude') if c not in column_names]
+        if wants_status:
+            column_names += [c for c in _STATUS_INPUT_COLUMNS if c not in column_names]
+        
+        lat_delta = radius / _MILES_PER_DEGREE
+        lng_scale = max(math.cos(math.radians(latitude)), 0.01)
+        lng_delta = lat_delta / lng_scale
+        
+        table = Restaurant.__table__
+        approximate_distance = (
+            (table.c.latitude - latitude) * (table.c.latitude - latitude)
+            + (table.c.longitude - longitude) * (table.c.longitude - longitude) * (lng_scale * lng_scale)
+        )
+        statement = select(*[table.c[name] for name in column_names]).where(
+            table.c.latitude.between(latitude - lat_delta, latitude + lat_delta),
+            table.c.longitude.between(longitude - lng_delta, longitude + lng_delta),
+        ).order_by(approximate_distance, table.c.id).limit(limit)
+        return statement, wants_status
+    
+    def _nearby_results(self, rows, latitude: float, longitude: float, radius: float, fields: List[str],
+                        wants_status: bool, specials: Dict[int, List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Add the great-circle distance to the candidate rows and drop those outside the radius."""
+        places = []
+        for row in rows:
+            distance = _haversine_miles(latitude, longitude, row['latitude'], row['longitude'])
+            if distance > radius:
+                continue
+            place = self._row_to_fields(row, fields, wants_status, specials)
+            place['distance_miles'] = round(distance, 2)
+            places.append(place)
+        places.sort(key=lambda place: place['distance_miles'])
+        return places
+    
     def get_place_by_id(self, place_id: int) -> Optional[Dict[str, Any]]:
         """Get a place by ID from the consolidated restaurants table."""
         try:
             session = self.get_session()
             restaurant = session.query(Restaurant).filter(Restaurant.id == place_id).first()
             if restaurant:
-                place_dict = self._restaurant_to_unified_dict(restaurant)
+                specials = self._specials_by_restaurant(session, [restaurant.id])
+                place_dict = self._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, []))
                 return place_dict
             return None
             
@@ -391,43 +1199,165 @@ class EnhancedDatabaseManager:
                 session.close()
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics from the consolidated restaurants table."""
+        """Get catalog statistics from the precomputed summary row."""
+        session = None
         try:
             session = self.get_session()
+            row = session.query(RestaurantStatistics).filter(RestaurantStatistics.id == _STATISTICS_ROW_ID).first()
             
-            # Count total restaurants
-            total_count = session.query(Restaurant).count()
+            if row is None:
+                # Summary not built yet (fresh database)
+                session.close()
+                session = None
+                return self.refresh_statistics()
             
-            # Count kosher restaurants
-            kosher_count = session.query(Restaurant).filter(Restaurant.is_kosher == True).count()
+            summary = json.loads(row.summary)
+            summary['last_updated'] = row.computed_at.isoformat()
+            return summary
             
-            # Get unique states
-            states = session.query(Restaurant.state).distinct().filter(Restaurant.state.isnot(None)).all()
-            state_list = [state[0] for state in states if state[0]]
+        except Exception as e:
+            logger.error("Failed to get statistics", error=str(e))
+            return {}
+        finally:
+            if session:
+                session.close()
+    
+    def compute_statistics(self, session: Session) -> Dict[str, Any]:
+        """
+        Compute every statistics breakdown with a single aggregate query.
+        
+        Rows are grouped by all breakdown columns at once and each counter is a
+        ``count(*) FILTER (WHERE ...)`` aggregate, so the table is scanned once.
+        The per-column breakdowns are rolled up from the grouped rows.
+        """
+        return self._summarize_statistics(session.execute(self._statistics_statement()).mappings())
+    
+    def _statistics_statement(self):
+        """Build the compute_statistics aggregate."""
+        group_columns = [getattr(Restaurant, column) for column in STATISTICS_BREAKDOWNS.values()]
+        return select(
+            *group_columns,
+            func.count().label('total'),
+            *[func.count().filter(condition).label(name) for name, condition in STATISTICS_COUNTERS.items()]
+        ).group_by(*group_columns)
+    
+    def _summarize_statistics(self, rows) -> Dict[str, Any]:
+        """Roll the grouped statistics rows up into the summary document."""
+        summary = self._empty_statistics()
+        for row in rows:
+            self._accumulate_statistics(summary, row, row['total'], {name: row[name] for name in STATISTICS_COUNTERS})
+        return summary
+    
+    def refresh_statistics(self) -> Dict[str, Any]:
+        """Recompute the statistics summary row from the restaurants table."""
+        session = None
+        try:
+            session = self.get_session()
+            summary = self.compute_statistics(session)
+            computed_at = datetime.utcnow()
             
-            # Get unique categories
-            categories = session.query(Restaurant.cuisine_type).distinct().filter(Restaurant.cuisine_type.isnot(None)).all()
-            category_list = [cat[0] for cat in categories if cat[0]]
+            session.merge(RestaurantStatistics(
+                id=_STATISTICS_ROW_ID,
+                total_restaurants=summary['total_restaurants'],
+                summary=json.dumps(summary),
+                computed_at=computed_at
+            ))
+            session.commit()
             
-            return {
-                'total_restaurants': total_count,
-                'total_kosher_restaurants': kosher_count,
-                'states': state_list,
-                'categories': category_list,
-                'last_updated': datetime.utcnow().isoformat()
-            }
+            logger.info("Statistics refreshed", total_restaurants=summary['total_restaurants'])
+            summary['last_updated'] = computed_at.isoformat()
+            return summary
             
         except Exception as e:
-            logger.error("Failed to get statistics", error=str(e))
+            logger.error("Failed to refresh statistics", error=str(e))
+            if session:
+                session.rollback()
             return {}
         finally:
             if session:
                 session.close()
     
-    def _restaurant_to_unified_dict(self, restaurant: Restaurant) -> Dict[str, Any]:
-        """Convert restaurant object to unified dictionary format."""
-        # Create base restaurant data dictionary
-        restaurant_data = {
+    def _empty_statistics(self) -> Dict[str, Any]:
+        """Get a statistics summary with every counter at zero."""
+        summary = {'total_restaurants': 0}
+        summary.update({key: {} for key in STATISTICS_BREAKDOWNS})
+        summary.update({name: 0 for name in STATISTICS_COUNTERS})
+        return summary
+    
+    def _accumulate_statistics(self, summary: Dict[str, Any], values, total: int, counters: Dict[str, int]):
+        """Add (or, with negative counts, remove) restaurants sharing the same breakdown values."""
+        summary['total_restaurants'] += total
+        
+        for key, column in STATISTICS_BREAKDOWNS.items():
+            value = values[column]
+            if value is None:
+                continue
+            breakdown = summary[key]
+            breakdown[value] = breakdown.get(value, 0) + total
+            if breakdown[value] <= 0:
+                del breakdown[value]
+        
+        for name, count in counters.items():
+            summary[name] += count
+    
+    def _statistics_values(self, restaurant: Restaurant) -> Dict[str, Any]:
+        """Snapshot the columns a restaurant contributes to the statistics."""
+        columns = tuple(STATISTICS_BREAKDOWNS.values()) + ('is_cholov_yisroel', 'is_pas_yisroel', 'hours_of_operation', 'hours_parsed')
+        return {column: getattr(restaurant, column) for column in columns}
+    
+    def _statistics_counters(self, values: Dict[str, Any]) -> Dict[str, int]:
+        """Evaluate STATISTICS_COUNTERS for a single restaurant."""
+        return {
+            'chalav_yisroel': int(values['is_cholov_yisroel'] is True),
+            'chalav_stam': int(values['is_cholov_yisroel'] is False and values['kosher_category'] == 'dairy'),
+            'pas_yisroel': int(values['is_pas_yisroel'] is True),
+            'with_hours': int(bool(values['hours_of_operation'])),
+            'hours_parsed': int(values['hours_parsed'] is True),
+        }
+    
+    def _apply_statistics_delta(self, session: Session, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """
+        Incrementally update the statistics summary within a write transaction.
+        
+        Args:
+            session: Session performing the write (committed by the caller)
+            before: Statistics values before the write (None for inserts)
+            after: Statistics values after the write (None for deletes)
+        """
+        try:
+            row = session.query(RestaurantStatistics).filter(
+                RestaurantStatistics.id == _STATISTICS_ROW_ID
+            ).with_for_update().first()
+            if row is None:
+                # Built from scratch on the next read
+                return
+            
+            summary = json.loads(row.summary)
+            if before:
+                counters = self._statistics_counters(before)
+                self._accumulate_statistics(summary, before, -1, {name: -count for name, count in counters.items()})
+            if after:
+                self._accumulate_statistics(summary, after, 1, self._statistics_counters(after))
+            
+            row.summary = json.dumps(summary)
+            row.total_restaurants = summary['total_restaurants']
+            row.computed_at = datetime.utcnow()
+            
+        except Exception as e:
+            logger.error("Failed to update statistics", error=str(e))
+    
+    def _restaurant_to_unified_dict(self, restaurant: Restaurant, specials: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Convert restaurant object (and its specials, see _specials_by_restaurant) to unified dictionary format."""
+        restaurant_data = self._restaurant_static_dict(restaurant, specials)
+        
+        # Calculate dynamic status based on business hours and current time
+        restaurant_data.update(self._restaurant_status_fields(restaurant_data, restaurant.name))
+        
+        return restaurant_data
+    
+    def _restaurant_static_dict(self, restaurant: Restaurant, specials: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Convert the stored columns of a restaurant object (plus its specials) to a dictionary."""
+        return {
             'id': restaurant.id,
             'name': restaurant.name,
             'address': restaurant.address,
@@ -435,7 +1365,7 @@ class EnhancedDatabaseManager:
             'state': restaurant.state,
             'zip_code': restaurant.zip_code,
             'phone_number': restaurant.phone_number,
-            'website': restaurant.website,
+            'website': self._live_link(restaurant.website, restaurant.website_status),
             'kosher_category': restaurant.kosher_category,
             'listing_type': restaurant.listing_type,
             'hours_of_operation': restaurant.hours_of_operation,
@@ -443,10 +1373,10 @@ class EnhancedDatabaseManager:
             'hours_last_updated': restaurant.hours_last_updated.isoformat() if restaurant.hours_last_updated else None,
             'short_description': restaurant.short_description,
             'price_range': restaurant.price_range,
-            'image_url': restaurant.image_url,
+            'image_url': self._live_link(restaurant.image_url, restaurant.image_status, restaurant.image_hash),
             'latitude': restaurant.latitude,
             'longitude': restaurant.longitude,
-            'specials': self._parse_specials_field(restaurant.specials),
+            'specials': specials or [],
             'is_cholov_yisroel': restaurant.is_cholov_yisroel,
             'is_pas_yisroel': restaurant.is_pas_yisroel,
             'certifying_agency': restaurant.certifying_agency,
@@ -455,13 +1385,16 @@ class EnhancedDatabaseManager:
             'updated_at': restaurant.updated_at.isoformat() if restaurant.updated_at else None,
             'current_time_local': restaurant.current_time_local.isoformat() if restaurant.current_time_local else None,
             'timezone': restaurant.timezone,
-            'hours_parsed': restaurant.hours_parsed
+            'hours_parsed': restaurant.hours_parsed,
+            'website_status': restaurant.website_status,
+            'image_status': restaurant.image_status
         }
-        
-        # Calculate dynamic status based on business hours and current time
+    
+    def _restaurant_status_fields(self, restaurant_data: Dict[str, Any], name: str = None) -> Dict[str, Any]:
+        """Calculate the dynamic (time-dependent) status fields for a restaurant."""
         try:
             status_info = get_restaurant_status(restaurant_data)
-            restaurant_data.update({
+            return {
                 'status': status_info.get('status', 'unknown'),
                 'is_open': status_info.get('is_open', False),
                 'status_reason': status_info.get('status_reason', 'Status calculation failed'),
@@ -469,11 +1402,11 @@ class EnhancedDatabaseManager:
                 'current_time_local': status_info.get('current_time_local'),
                 'timezone': status_info.get('timezone', 'UTC'),
                 'hours_parsed': status_info.get('hours_parsed', False)
-            })
+            }
         except Exception as e:
-            logger.error(f"Error calculating dynamic status for restaurant {restaurant.name}: {e}")
+            logger.error(f"Error calculating dynamic status for restaurant {name}: {e}")
             # Fallback to stored status if dynamic calculation fails
-            restaurant_data.update({
+            return {
                 'status': 'unknown',
                 'is_open': False,
                 'status_reason': f'Dynamic status calculation failed: {str(e)}',
@@ -481,9 +1414,85 @@ class EnhancedDatabaseManager:
                 'current_time_local': None,
                 'timezone': 'UTC',
                 'hours_parsed': False
-            })
+            }
+    
+    def get_all_places_encoded(self, limit: int = 100, offset: int = 0,
+                               kosher_category: str = None, state: str = None) -> List[bytes]:
+        """
+        Get all places as pre-encoded JSON fragments (same shape as get_all_places).
         
-        return restaurant_data
+        The static part of each restaurant is encoded once per updated_at and
+        served from the fragment cache; only the dynamic status fields are
+        encoded per request. Full rows are loaded only for cache misses.
+        """
+        try:
+            statement = self._encoded_index_statement(limit, offset, kosher_category, state)
+            
+            with self._read_connection() as conn:
+                rows = conn.execute(statement).mappings().all()
+            
+            fragments, misses = self._cached_fragments(rows)
+            
+            if misses:
+                session = self.get_session()
+                try:
+                    specials = self._specials_by_restaurant(session, misses)
+                    for restaurant in session.query(Restaurant).filter(Restaurant.id.in_(misses)):
+                        self._encode_fragment(restaurant, fragments, specials.get(restaurant.id, []))
+                finally:
+                    session.close()
+            
+            encoded = self._merge_fragments(rows, fragments)
+            logger.info(f"Encoded {len(encoded)} restaurants ({len(misses)} cache misses)")
+            return encoded
+            
+        except Exception as e:
+            logger.error("Failed to get encoded places", error=str(e))
+            return []
+    
+    def _encoded_index_statement(self, limit: int, offset: int, kosher_category: str = None, state: str = None):
+        """Build the get_all_places_encoded select (cache keys and status inputs only)."""
+        table = Restaurant.__table__
+        statement = select(*[table.c[name] for name in ('id', 'name', 'updated_at') + _STATUS_INPUT_COLUMNS])
+        if kosher_category:
+            statement = statement.where(table.c.kosher_category == kosher_category)
+        if state:
+            statement = statement.where(table.c.state == state)
+        return statement.limit(limit).offset(offset)
+    
+    def _cached_fragments(self, rows):
+        """Look rows up in the fragment cache; returns (fragments by id, missing ids)."""
+        fragments = {}
+        misses = []
+        for row in rows:
+            fragment = restaurant_fragment_cache.get(row['id'], row['updated_at'])
+            if fragment is None:
+                misses.append(row['id'])
+            else:
+                fragments[row['id']] = fragment
+        return fragments, misses
+    
+    def _encode_fragment(self, restaurant, fragments: Dict[int, bytes], specials: List[Dict[str, Any]] = None) -> None:
+        """Encode and cache the static part of a restaurant (ORM object or Core row) with its specials."""
+        try:
+            static = self._restaurant_static_dict(restaurant, specials)
+            for key in _DYNAMIC_FIELDS:
+                static.pop(key, None)
+            fragment = dumps_bytes(static)
+            restaurant_fragment_cache.put(restaurant.id, restaurant.updated_at, fragment)
+            fragments[restaurant.id] = fragment
+        except Exception as e:
+            logger.error(f"Error converting restaurant {restaurant.name}: {e}")
+    
+    def _merge_fragments(self, rows, fragments: Dict[int, bytes]) -> List[bytes]:
+        """Merge the status fields into each cached fragment, sorted by name."""
+        encoded = []
+        for row in sorted(rows, key=lambda r: name_order_key(r['name'], r['id'])):
+            fragment = fragments.get(row['id'])
+            if fragment is None:
+                continue
+            encoded.append(merge_fragment(fragment, self._restaurant_status_fields(dict(row), row['name'])))
+        return encoded
     
     def _parse_specials_field(self, specials_data) -> List[Dict[str, Any]]:
         """Parse the specials field from JSON string to list of dictionaries."""
@@ -553,7 +1562,8 @@ class EnhancedDatabaseManager:
             session = self.get_session()
             restaurant = session.query(Restaurant).filter(Restaurant.name == name).first()
             if restaurant:
-                return self._restaurant_to_unified_dict(restaurant)
+                specials = self._specials_by_restaurant(session, [restaurant.id])
+                return self._restaurant_to_unified_dict(restaurant, specials.get(restaurant.id, []))
             return None
         except Exception as e:
             logger.error(f"Error getting restaurant by name {name}: {e}")
@@ -567,6 +1577,7 @@ class EnhancedDatabaseManager:
             session = self.get_session()
             restaurant = session.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
             if restaurant:
+                statistics_before = self._statistics_values(restaurant)
                 restaurant.address = address
                 restaurant.kosher_category = kosher_category
                 restaurant.certifying_agency = certifying_agency
@@ -582,6 +1593,7 @@ class EnhancedDatabaseManager:
                         restaurant.is_cholov_yisroel = False
                 
                 restaurant.updated_at = datetime.utcnow()
+                self._apply_statistics_delta(session, statistics_before, self._statistics_values(restaurant))
                 session.commit()
                 logger.info(f"Updated restaurant {restaurant_id} with ORB data")
                 return True
@@ -593,6 +1605,31 @@ class EnhancedDatabaseManager:
         finally:
             session.close()
     
+    def update_restaurant_hours(self, restaurant_id: int, hours_of_operation: str, hours_json: str, timezone: Optional[str]) -> bool:
+        """Update restaurant hours (Google Places weekday_text and periods) and its timezone."""
+        try:
+            session = self.get_session()
+            restaurant = session.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
+            if restaurant:
+                statistics_before = self._statistics_values(restaurant)
+                restaurant.hours_of_operation = hours_of_operation
+                restaurant.hours_json = hours_json
+                restaurant.hours_last_updated = datetime.utcnow()
+                restaurant.timezone = timezone
+                restaurant.hours_parsed = True
+                restaurant.updated_at = datetime.utcnow()
+                self._apply_statistics_delta(session, statistics_before, self._statistics_values(restaurant))
+                session.commit()
+                logger.info(f"Updated restaurant {restaurant_id} hours")
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Error updating restaurant {restaurant_id} hours: {e}")
+            session.rollback()
+            return False
+        finally:
+            session.close()
+    
     def add_restaurant_simple(self, name: str, address: str = None, phone_number: str = None, 
                       kosher_category: str = None, certifying_agency: str = None, extra_kosher_info: str = None, source: str = 'orb') -> bool:
         """Add a new restaurant with basic information (simplified version)."""
@@ -636,52 +1673,904 @@ class EnhancedDatabaseManager:
     def get_restaurant_specials(self, restaurant_id: int, paid_only: bool = False) -> List[Dict[str, Any]]:
         """Get specials for a specific restaurant."""
         try:
-            session = self.get_session()
-            restaurant = session.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
-            if restaurant and restaurant.specials:
-                specials = self._parse_specials_field(restaurant.specials)
-                if paid_only:
-                    specials = [s for s in specials if s.get('is_paid', False)]
-                return specials
-            return []
+            statement = self._specials_statement([restaurant_id], paid_only=paid_only)
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement).mappings().all()
+            return [self._special_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting specials for restaurant {restaurant_id}: {e}")
             return []
-        finally:
-            session.close()
+    
+    def get_specials(self, active: bool = True, latitude: float = None, longitude: float = None,
+                     radius: float = 10, restaurant_id: int = None, paid_only: bool = True,
+                     limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get specials with their restaurant, optionally only active ones near a point.
+        
+        Active specials are paid, enabled and within their validity window;
+        the (is_paid, valid_until) index serves that filter. With a location,
+        restaurants are narrowed by a bounding box, ordered nearest first and
+        each special gets ``distance_miles``.
+        
+        Args:
+            active: Only specials that are active now
+            latitude, longitude: Center point (both or neither)
+            radius: Search radius in miles (with a center point)
+            restaurant_id: Only specials of this restaurant
+            paid_only: Only paid specials (public listings)
+        """
+        try:
+            statement = self._specials_query_statement(active, latitude, longitude, radius, restaurant_id,
+                                                       paid_only, limit, offset)
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement).mappings().all()
+            return self._specials_query_results(rows, latitude, longitude, radius)
+        except Exception as e:
+            logger.error("Failed to get specials", error=str(e))
+            return []
+    
+    def _specials_query_statement(self, active: bool, latitude: float, longitude: float, radius: float,
+                                  restaurant_id: int, paid_only: bool, limit: int, offset: int):
+        """Build the get_specials select (specials joined with their restaurant)."""
+        specials = RestaurantSpecial.__table__
+        restaurants = Restaurant.__table__
+        statement = select(
+            specials,
+            restaurants.c.name.label('restaurant_name'),
+            restaurants.c.city.label('restaurant_city'),
+            restaurants.c.state.label('restaurant_state'),
+            restaurants.c.latitude.label('restaurant_latitude'),
+            restaurants.c.longitude.label('restaurant_longitude'),
+        ).join(restaurants, restaurants.c.id == specials.c.restaurant_id)
+        
+        if paid_only or active:
+            statement = statement.where(specials.c.is_paid == True)
+        if active:
+            now = datetime.utcnow()
+            statement = statement.where(
+                specials.c.is_active == True,
+                or_(specials.c.valid_until.is_(None), specials.c.valid_until >= now),
+                or_(specials.c.valid_from.is_(None), specials.c.valid_from <= now),
+            )
+        if restaurant_id is not None:
+            statement = statement.where(specials.c.restaurant_id == restaurant_id)
+        
+        if latitude is not None and longitude is not None:
+            lat_delta = radius / _MILES_PER_DEGREE
+            lng_scale = max(math.cos(math.radians(latitude)), 0.01)
+            lng_delta = lat_delta / lng_scale
+            approximate_distance = (
+                (restaurants.c.latitude - latitude) * (restaurants.c.latitude - latitude)
+                + (restaurants.c.longitude - longitude) * (restaurants.c.longitude - longitude) * (lng_scale * lng_scale)
+            )
+            statement = statement.where(
+                restaurants.c.latitude.between(latitude - lat_delta, latitude + lat_delta),
+                restaurants.c.longitude.between(longitude - lng_delta, longitude + lng_delta),
+            ).order_by(approximate_distance, specials.c.priority, specials.c.id)
+        else:
+            statement = statement.order_by(specials.c.priority, specials.c.valid_until, specials.c.id)
+        
+        return statement.limit(limit).offset(offset)
+    
+    def _specials_query_results(self, rows, latitude: float = None, longitude: float = None,
+                                radius: float = None) -> List[Dict[str, Any]]:
+        """Convert get_specials rows, adding the restaurant and (with a center point) the distance."""
+        results = []
+        for row in rows:
+            special = self._special_to_dict(row)
+            special['restaurant'] = {
+                'id': row['restaurant_id'],
+                'name': row['restaurant_name'],
+                'city': row['restaurant_city'],
+                'state': row['restaurant_state'],
+                'latitude': row['restaurant_latitude'],
+                'longitude': row['restaurant_longitude'],
+            }
+            if latitude is not None and longitude is not None:
+                distance = _haversine_miles(latitude, longitude, row['restaurant_latitude'], row['restaurant_longitude'])
+                if distance > radius:
+                    continue
+                special['distance_miles'] = round(distance, 2)
+            results.append(special)
+        if latitude is not None and longitude is not None:
+            results.sort(key=lambda special: special['distance_miles'])
+        return results
     
     def update_special_payment_status(self, special_id: int, is_paid: bool, payment_status: str = 'paid') -> bool:
         """Update payment status for a special."""
+        session = None
         try:
             session = self.get_session()
-            # Find the restaurant that contains this special
-            restaurants = session.query(Restaurant).all()
+            special = session.query(RestaurantSpecial).filter(RestaurantSpecial.id == special_id).first()
+            if special is None:
+                logger.warning(f"Special {special_id} not found")
+                return False
             
-            for restaurant in restaurants:
-                if restaurant.specials:
-                    specials = self._parse_specials_field(restaurant.specials)
-                    for special in specials:
-                        if special.get('id') == special_id:
-                            # Update the special
-                            special['is_paid'] = is_paid
-                            special['payment_status'] = payment_status
-                            special['updated_at'] = datetime.utcnow().isoformat()
-                            
-                            # Save back to database
-                            restaurant.specials = json.dumps(specials)
-                            restaurant.updated_at = datetime.utcnow()
-                            session.commit()
-                            logger.info(f"Updated special {special_id} payment status")
-                            return True
-            
-            logger.warning(f"Special {special_id} not found")
-            return False
+            now = datetime.utcnow()
+            special.is_paid = is_paid
+            special.payment_status = payment_status
+            special.updated_at = now
+            
+            # Listings cache each restaurant (with its specials) by updated_at
+            session.query(Restaurant).filter(Restaurant.id == special.restaurant_id).update(
+                {Restaurant.updated_at: now}, synchronize_session=False
+            )
+            session.commit()
+            logger.info(f"Updated special {special_id} payment status")
+            return True
         except Exception as e:
             logger.error(f"Error updating special {special_id} payment status: {e}")
-            session.rollback()
+            if session:
+                session.rollback()
             return False
         finally:
-            session.close()
+            if session:
+                session.close()
+    
+    def _specials_statement(self, restaurant_ids: List[int], paid_only: bool = False):
+        """Build the select for the specials of some restaurants (in creation order)."""
+        table = RestaurantSpecial.__table__
+        statement = select(table).where(table.c.restaurant_id.in_(restaurant_ids))
+        if paid_only:
+            statement = statement.where(table.c.is_paid == True)
+        return statement.order_by(table.c.restaurant_id, table.c.id)
+    
+    def _specials_by_restaurant(self, conn, restaurant_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Load the specials of a page of restaurants in one query (conn: Connection or Session)."""
+        if not restaurant_ids:
+            return {}
+        rows = conn.execute(self._specials_statement(restaurant_ids)).mappings().all()
+        return self._group_specials(rows)
+    
+    def _group_specials(self, rows) -> Dict[int, List[Dict[str, Any]]]:
+        """Group special rows by restaurant id."""
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row['restaurant_id'], []).append(self._special_to_dict(row))
+        return grouped
+    
+    def _special_to_dict(self, row) -> Dict[str, Any]:
+        """Convert a specials row mapping to the API dictionary (same keys as the legacy JSON)."""
+        special = {}
+        for key, column in SPECIAL_COLUMNS.items():
+            value = row[column]
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            special[key] = value
+        if row['extra']:
+            try:
+                special.update(json.loads(row['extra']))
+            except ValueError as e:
+                logger.error(f"Failed to parse extra fields of special {row['id']}: {e}")
+        return special
+    
+    def special_columns(self, special: Dict[str, Any], restaurant_id: int) -> Dict[str, Any]:
+        """
+        Convert a special dictionary (API or legacy JSON shape) to specials column values.
+        
+        Date strings are parsed as ISO 8601; a date-only ``end_date`` is valid
+        through the end of that day. Keys without a column go to ``extra``.
+        """
+        values = {'restaurant_id': restaurant_id}
+        extra = {}
+        for key, value in special.items():
+            key = _SPECIAL_KEY_ALIASES.get(key, key)
+            column = SPECIAL_COLUMNS.get(key)
+            if column is None:
+                extra[key] = value
+            elif column != 'restaurant_id':
+                values[column] = value
+        
+        for column in ('valid_from', 'valid_until', 'created_at', 'updated_at'):
+            value = values.get(column)
+            if isinstance(value, str):
+                values[column] = self._parse_special_datetime(value, end_of_day=column == 'valid_until')
+            elif value is None:
+                values.pop(column, None)
+        
+        values['title'] = values.get('title') or 'Special'
+        values['is_paid'] = bool(values.get('is_paid', False))
+        values['payment_status'] = values.get('payment_status') or ('paid' if values['is_paid'] else 'unpaid')
+        values['is_active'] = bool(values.get('is_active', True))
+        values['priority'] = values.get('priority') or 0
+        if not isinstance(values.get('id'), int):
+            values.pop('id', None)
+        values['extra'] = json.dumps(extra) if extra else None
+        return values
+    
+    def _parse_special_datetime(self, value: str, end_of_day: bool = False) -> Optional[datetime]:
+        """Parse an ISO date or timestamp from a special (naive UTC; None if unparseable)."""
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            logger.warning(f"Invalid special date: {value!r}")
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        if end_of_day and len(value.strip()) == 10:
+            parsed = parsed.replace(hour=23, minute=59, second=59)
+        return parsed
+    
+    def find_duplicates(self, **settings) -> Dict[str, Any]:
+        """
+        Find fuzzy duplicate restaurants and build a merge plan (see utils/dedupe.py).
+        
+        Records are streamed with only the columns detection needs, together
+        with per-restaurant counts of Google Places rows and specials (which
+        count towards keeping a record).
+        
+        Returns:
+            {'plan': [...], 'stats': {...}}
+        """
+        from utils.dedupe import DuplicateDetector, ENRICHMENT_COLUMNS, RECORD_COLUMNS
+        
+        table = Restaurant.__table__
+        column_names = list(dict.fromkeys(RECORD_COLUMNS + ENRICHMENT_COLUMNS))
+        
+        with self.engine.connect() as conn:
+            specials = dict(conn.execute(
+                select(RestaurantSpecial.restaurant_id, func.count()).group_by(RestaurantSpecial.restaurant_id)
+            ).all())
+            places = self._google_places_counts(conn)
+            
+            result = conn.execution_options(stream_results=True).execute(
+                select(*[table.c[name] for name in column_names])
+            )
+            records = []
+            for row in result.mappings():
+                record = dict(row)
+                record['google_places'] = places.get(record['id'], 0)
+                record['specials'] = specials.get(record['id'], 0)
+                records.append(record)
+        
+        detector = DuplicateDetector(**settings)
+        plan = detector.merge_plan(detector.find_groups(records))
+        return {'plan': plan, 'stats': detector.stats}
+    
+    def _google_places_counts(self, conn) -> Dict[int, int]:
+        """Count google_places_data rows per restaurant (empty if the table does not exist)."""
+        from database.google_places_manager import GooglePlacesData
+        
+        if not self.engine.dialect.has_table(conn, GooglePlacesData.__tablename__):
+            return {}
+        return dict(conn.execute(
+            select(GooglePlacesData.restaurant_id, func.count()).group_by(GooglePlacesData.restaurant_id)
+        ).all())
+    
+    def apply_merge_plan(self, plan: List[Dict[str, Any]]) -> int:
+        """
+        Apply a duplicate merge plan in a single transaction.
+        
+        For every group, the kept restaurant gets the planned fill values,
+        specials and source listings of the removed restaurants move to it,
+        and so does their Google Places data if the kept restaurant has none
+        (otherwise it is deleted); the removed restaurants are then deleted.
+        Nothing is changed if any step fails.
+        
+        Returns:
+            Number of restaurants removed
+        """
+        from database.google_places_manager import GooglePlacesData
+        
+        restaurants = Restaurant.__table__
+        specials = RestaurantSpecial.__table__
+        listings = SourceListing.__table__
+        places = GooglePlacesData.__table__
+        removed = 0
+        
+        with self.engine.begin() as conn:
+            has_places = self.engine.dialect.has_table(conn, places.name)
+            for group in plan:
+                keep_id, remove_ids = group['keep_id'], group['remove_ids']
+                if not remove_ids:
+                    continue
+                now = datetime.utcnow()
+                
+                conn.execute(restaurants.update().where(restaurants.c.id == keep_id).values(
+                    updated_at=now, **group.get('fill', {})
+                ))
+                conn.execute(specials.update().where(specials.c.restaurant_id.in_(remove_ids)).values(
+                    restaurant_id=keep_id, updated_at=now
+                ))
+                conn.execute(listings.update().where(listings.c.restaurant_id.in_(remove_ids)).values(
+                    restaurant_id=keep_id
+                ))
+                
+                if has_places:
+                    kept_places = conn.execute(
+                        select(func.count()).select_from(places).where(places.c.restaurant_id == keep_id)
+                    ).scalar()
+                    moved_place = None
+                    if not kept_places:
+                        moved_place = conn.execute(
+                            select(places.c.id).where(places.c.restaurant_id.in_(remove_ids))
+                            .order_by(places.c.last_updated.desc()).limit(1)
+                        ).scalar()
+                    if moved_place is not None:
+                        conn.execute(places.update().where(places.c.id == moved_place).values(restaurant_id=keep_id))
+                    conn.execute(places.delete().where(places.c.restaurant_id.in_(remove_ids)))
+                
+                removed += conn.execute(restaurants.delete().where(restaurants.c.id.in_(remove_ids))).rowcount
+        
+        logger.info("Duplicate merge plan applied", groups=len(plan), removed=removed)
+        self.refresh_statistics()
+        return removed
+    
+    def check_links(self, force: bool = False, **settings) -> Dict[str, Any]:
+        """
+        Check the website and image links that are due and cache the results.
+        
+        A link is due when it has no result in link_checks yet, or its result
+        is older than LINK_CHECK_TTL_HOURS (healthy links) or
+        LINK_CHECK_RETRY_HOURS (failing and dead links). Due links are checked
+        concurrently (see utils/link_checker.py), results of links no
+        restaurant uses any more are dropped, and website_status /
+        image_status of the restaurants are synced from link_checks (touching
+        updated_at, so cached responses are rebuilt).
+        
+        Args:
+            force: Check every link regardless of its cached result
+            **settings: LinkChecker settings (LINK_CHECK_*)
+            
+        Returns:
+            {'links', 'due', 'statuses', 'elapsed_seconds', 'flags_updated'}
+        """
+        import asyncio
+        from utils.link_checker import LinkChecker, HEALTHY_STATUSES, classify
+        
+        checker = LinkChecker(**settings)
+        links = LinkCheck.__table__
+        now = datetime.utcnow()
+        healthy_before = now - timedelta(hours=checker.settings['LINK_CHECK_TTL_HOURS'])
+        failing_before = now - timedelta(hours=checker.settings['LINK_CHECK_RETRY_HOURS'])
+        
+        with self.engine.connect() as conn:
+            urls = self._link_urls(conn)
+            cached = {row.url: row for row in conn.execute(
+                select(links.c.url, links.c.status, links.c.failures, links.c.checked_at)
+            )}
+        
+        due = []
+        for url in sorted(urls):
+            previous = cached.get(url)
+            if force or previous is None:
+                due.append(url)
+            elif previous.checked_at < (healthy_before if previous.status in HEALTHY_STATUSES else failing_before):
+                due.append(url)
+        
+        start = time.perf_counter()
+        results = asyncio.run(checker.check_urls(due)) if due else []
+        elapsed = time.perf_counter() - start
+        for result in results:
+            previous = cached.get(result['url'])
+            classify(result, previous.failures if previous else 0, checker.settings['LINK_CHECK_DEAD_AFTER'])
+        
+        with self.engine.begin() as conn:
+            self._save_link_checks(conn, results, cached, now)
+            unused = [url for url in cached if url not in urls]
+            for index in range(0, len(unused), 500):
+                conn.execute(links.delete().where(links.c.url.in_(unused[index:index + 500])))
+            flags_updated = self._sync_link_statuses(conn, now)
+        
+        statuses = {}
+        for result in results:
+            statuses[result['status']] = statuses.get(result['status'], 0) + 1
+        summary = {
+            'links': len(urls),
+            'due': len(due),
+            'statuses': statuses,
+            'elapsed_seconds': round(elapsed, 2),
+            'flags_updated': flags_updated,
+        }
+        logger.info("Link check completed", **summary)
+        return summary
+    
+    def _link_urls(self, conn) -> set:
+        """Get the distinct non-empty links of all restaurants."""
+        table = Restaurant.__table__
+        urls = set()
+        for column in _LINK_STATUS_COLUMNS:
+            urls.update(conn.execute(
+                select(table.c[column]).distinct().where(table.c[column].isnot(None), table.c[column] != '')
+            ).scalars())
+        return urls
+    
+    def _save_link_checks(self, conn, results: List[Dict[str, Any]], cached: Dict[str, Any], now: datetime) -> None:
+        """Insert or update the link_checks rows of classified check results."""
+        links = LinkCheck.__table__
+        inserts, updates = [], []
+        for result in results:
+            values = {
+                'status': result['status'],
+                'status_code': result['status_code'],
+                'final_url': (result['final_url'] or '')[:1000] or None,
+                'latency_ms': result['latency_ms'],
+                'method': result['method'],
+                'error': result['error'],
+                'failures': result['failures'],
+                'checked_at': now,
+            }
+            if result['url'] in cached:
+                updates.append(dict(values, link_url=result['url']))
+            else:
+                inserts.append(dict(values, url=result['url']))
+        
+        if inserts:
+            conn.execute(links.insert(), inserts)
+        if updates:
+            conn.execute(links.update().where(links.c.url == bindparam('link_url')), updates)
+    
+    def _sync_link_statuses(self, conn, now: datetime) -> int:
+        """Copy link_checks statuses to the restaurants whose flags differ; returns the number of flags changed."""
+        restaurants = Restaurant.__table__
+        links = LinkCheck.__table__
+        updated = 0
+        for column, status_column in _LINK_STATUS_COLUMNS.items():
+            status = select(links.c.status).where(links.c.url == restaurants.c[column]).scalar_subquery()
+            updated += conn.execute(
+                restaurants.update().where(restaurants.c[status_column].is_distinct_from(status))
+                .values({status_column: status, 'updated_at': now})
+            ).rowcount
+        return updated
+    
+    def get_link_health(self, limit: int = 100) -> Dict[str, Any]:
+        """
+        Summarize the cached link checks.
+        
+        Returns:
+            Link counts per status, the last check time, the average latency
+            and up to ``limit`` restaurants with a dead or failing link
+        """
+        links = LinkCheck.__table__
+        restaurants = Restaurant.__table__
+        broken = ('dead', 'failing')
+        
+        with self.engine.connect() as conn:
+            statuses = dict(conn.execute(select(links.c.status, func.count()).group_by(links.c.status)).all())
+            last_checked, average_latency = conn.execute(
+                select(func.max(links.c.checked_at), func.avg(links.c.latency_ms))
+            ).one()
+            rows = conn.execute(
+                select(restaurants.c.id, restaurants.c.name, restaurants.c.website, restaurants.c.website_status,
+                       restaurants.c.image_url, restaurants.c.image_status)
+                .where(or_(restaurants.c.website_status.in_(broken), restaurants.c.image_status.in_(broken)))
+                .order_by(*name_order(restaurants)).limit(limit)
+            ).mappings().all()
+            details = {row.url: row for row in conn.execute(
+                select(links.c.url, links.c.status_code, links.c.error, links.c.failures, links.c.checked_at)
+                .where(links.c.url.in_([row[c] for row in rows for c in _LINK_STATUS_COLUMNS if row[c]]))
+            )}
+        
+        broken_links = []
+        for row in rows:
+            for column, status_column in _LINK_STATUS_COLUMNS.items():
+                if row[status_column] not in broken:
+                    continue
+                detail = details.get(row[column])
+                broken_links.append({
+                    'restaurant_id': row['id'],
+                    'name': row['name'],
+                    'field': column,
+                    'url': row[column],
+                    'status': row[status_column],
+                    'status_code': detail.status_code if detail else None,
+                    'error': detail.error if detail else None,
+                    'failures': detail.failures if detail else None,
+                    'checked_at': detail.checked_at.isoformat() if detail else None,
+                })
+        
+        return {
+            'links': sum(statuses.values()),
+            'statuses': statuses,
+            'last_checked_at': last_checked.isoformat() if last_checked else None,
+            'average_latency_ms': round(average_latency) if average_latency is not None else None,
+            'broken_links': broken_links,
+        }
+    
+    def cache_images(self, force: bool = False, **settings) -> Dict[str, Any]:
+        """
+        Fetch the restaurant images that are due into the local image cache.
+        
+        The image of a restaurant is its image_url, or, when it has none, the
+        primary photo of its active Google Places data (a photo reference
+        URL; the pipeline adds GOOGLE_PLACES_API_KEY when fetching it, so the
+        key never reaches browsers). An image is due when its source has not been fetched yet, was
+        fetched more than IMAGE_REFRESH_DAYS ago, failed more than
+        IMAGE_RETRY_HOURS ago, or its thumbnails were evicted from the cache.
+        Due sources are fetched concurrently and resized (see
+        utils/image_proxy.py); rows of sources no restaurant uses any more
+        are dropped, and restaurants.image_hash is synced from the images
+        table (touching updated_at, so cached responses pick up the /img URLs).
+        Run on a schedule by the image_cache job (utils/scheduler.py).
+        
+        Args:
+            force: Refetch every image regardless of its cached result
+            **settings: ImagePipeline settings (IMAGE_*)
+            
+        Returns:
+            {'images', 'due', 'cached', 'failed', 'elapsed_seconds', 'restaurants_updated'}
+        """
+        import asyncio
+        from utils.image_proxy import ImagePipeline
+        
+        pipeline = ImagePipeline(**settings)
+        images = CachedImage.__table__
+        restaurants = Restaurant.__table__
+        now = datetime.utcnow()
+        refresh_before = now - timedelta(days=pipeline.settings['IMAGE_REFRESH_DAYS'])
+        retry_before = now - timedelta(hours=pipeline.settings['IMAGE_RETRY_HOURS'])
+        widths = pipeline.settings['IMAGE_WIDTHS']
+        
+        with self.engine.connect() as conn:
+            image_source = self._image_source(conn)
+            urls = set(conn.execute(
+                select(image_source).distinct().where(image_source.isnot(None), image_source != '')
+            ).scalars())
+            cached = {row.source_url: row for row in conn.execute(select(images))}
+        
+        due = []
+        for url in sorted(urls):
+            previous = cached.get(url)
+            if force or previous is None:
+                due.append(url)
+            elif previous.content_hash is None:
+                if previous.fetched_at < retry_before:
+                    due.append(url)
+            elif previous.fetched_at < refresh_before or not pipeline.store.has(previous.content_hash, widths):
+                due.append(url)
+        
+        start = time.perf_counter()
+        results = asyncio.run(pipeline.cache_urls(due)) if due else []
+        elapsed = time.perf_counter() - start
+        
+        with self.engine.begin() as conn:
+            inserts, updates = [], []
+            for result in results:
+                previous = cached.get(result['url'])
+                source = result
+                if result['content_hash'] is None and previous is not None and previous.content_hash \
+                        and pipeline.store.has(previous.content_hash, widths):
+                    # A failed refresh keeps serving the thumbnails already cached
+                    source = dict(previous._mapping, error=result['error'])
+                values = {key: source[key] for key in ('content_hash', 'width', 'height', 'bytes', 'error')}
+                values['fetched_at'] = now
+                if previous is not None:
+                    updates.append(dict(values, image_source_url=result['url']))
+                else:
+                    inserts.append(dict(values, source_url=result['url']))
+            if inserts:
+                conn.execute(images.insert(), inserts)
+            if updates:
+                conn.execute(images.update().where(images.c.source_url == bindparam('image_source_url')), updates)
+            
+            unused = [url for url in cached if url not in urls]
+            for index in range(0, len(unused), 500):
+                conn.execute(images.delete().where(images.c.source_url.in_(unused[index:index + 500])))
+            
+            image_hash = select(images.c.content_hash).where(images.c.source_url == image_source).scalar_subquery()
+            restaurants_updated = conn.execute(
+                restaurants.update().where(restaurants.c.image_hash.is_distinct_from(image_hash))
+                .values(image_hash=image_hash, updated_at=now)
+            ).rowcount
+        
+        failed = sum(1 for result in results if result['content_hash'] is None)
+        summary = {
+            'images': len(urls),
+            'due': len(due),
+            'cached': len(results) - failed,
+            'failed': failed,
+            'elapsed_seconds': round(elapsed, 2),
+            'restaurants_updated': restaurants_updated,
+        }
+        logger.info("Image cache refreshed", **summary)
+        return summary
+    
+    def _image_source(self, conn):
+        """
+        SQL expression of each restaurant's image source: its image_url, else
+        the primary photo of its active Google Places data (when that table exists).
+        """
+        from database.google_places_manager import GooglePlacesData
+        
+        restaurants = Restaurant.__table__
+        image_url = func.nullif(restaurants.c.image_url, '')
+        if not conn.dialect.has_table(conn, GooglePlacesData.__tablename__):
+            return image_url
+        places = GooglePlacesData.__table__
+        photo = (
+            select(func.nullif(places.c.primary_photo_url, ''))
+            .where(places.c.restaurant_id == restaurants.c.id, places.c.is_active == True)
+            .order_by(places.c.last_updated.desc()).limit(1)
+            .correlate(restaurants).scalar_subquery()
+        )
+        return func.coalesce(image_url, photo)
+    
+    def ingest_sources(self, names: List[str] = None, force: bool = False, sources: list = None,
+                       transport=None, **settings) -> Dict[str, Any]:
+        """
+        Sync the catalog with the listings published by the certifier sources.
+        
+        Every source runs concurrently (see utils/ingestion.py); pages that
+        did not change since the last sync are skipped. Per source, listings
+        whose content hash did not change only get last_seen_at touched;
+        new listings are matched to an existing restaurant (same normalized
+        name and street address or phone) or added as a restaurant, and
+        changed listings update the source fields that changed on their
+        restaurant. Listings missing from a page that parsed are marked
+        removed (their restaurants are kept for review). Statistics are
+        refreshed when restaurants changed.
+        
+        Args:
+            names: Sources to sync (default: all)
+            force: Fetch and parse every page regardless of its validators
+            sources: SourceAdapter instances to use instead of INGESTION_SOURCES
+            transport: httpx transport to use instead of the network (benchmarks)
+            **settings: IngestionRunner settings (INGESTION_*) and adapter overrides
+                (e.g. REQUESTS_PER_SECOND)
+        
+        Returns:
+            {'sources': [per-source summary], 'elapsed_seconds', 'restaurants_changed'}
+        
+        Raises:
+            ValueError: If a name is not a configured source
+        """
+        import asyncio
+        from utils.ingestion import DEFAULT_SETTINGS as INGESTION_SETTINGS, IngestionRunner, load_sources
+        
+        if sources is None:
+            sources = load_sources(settings.get('INGESTION_SOURCES') or INGESTION_SETTINGS['INGESTION_SOURCES'], **settings)
+        if names:
+            unknown = set(names) - {source.name for source in sources}
+            if unknown:
+                raise ValueError(f"Unknown ingestion sources: {', '.join(sorted(unknown))}")
+            sources = [source for source in sources if source.name in names]
+        
+        pages = SourcePage.__table__
+        with self.engine.connect() as conn:
+            stored_pages = {}
+            for row in conn.execute(select(pages).where(pages.c.source.in_([source.name for source in sources]))):
+                stored_pages.setdefault(row.source, {})[row.url] = dict(row._mapping)
+        validators = {} if force else stored_pages
+        
+        start = time.perf_counter()
+        runner = IngestionRunner(sources, transport=transport, **settings)
+        results = asyncio.run(runner.run(validators))
+        
+        summaries = [self._store_source_result(result, stored_pages.get(result['source'], {})) for result in results]
+        restaurants_changed = sum(summary['added'] + summary['matched'] + summary['updated'] for summary in summaries)
+        if restaurants_changed:
+            self.refresh_statistics()
+        
+        elapsed = round(time.perf_counter() - start, 2)
+        logger.info("Sources ingested", sources=len(summaries), restaurants_changed=restaurants_changed,
+                    elapsed_seconds=elapsed)
+        return {'sources': summaries, 'elapsed_seconds': elapsed, 'restaurants_changed': restaurants_changed}
+    
+    def _store_source_result(self, result: Dict[str, Any], stored_pages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Write one source's listings, restaurants and page validators in a transaction."""
+        source = result['source']
+        listings = SourceListing.__table__
+        pages = SourcePage.__table__
+        now = datetime.utcnow()
+        counts = {'added': 0, 'matched': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        
+        with self.engine.begin() as conn:
+            existing = {row.source_key: row for row in conn.execute(
+                select(listings.c.id, listings.c.source_key, listings.c.restaurant_id, listings.c.page_url,
+                       listings.c.content_hash, listings.c.data, listings.c.removed_at)
+                .where(listings.c.source == source)
+            )}
+            
+            new_records = [record for record in result['records'] if record['source_key'] not in existing]
+            candidates = self._ingestion_candidates(conn, new_records)
+            seen_ids, inserts, updates = [], [], []
+            for record in result['records']:
+                previous = existing.get(record['source_key'])
+                fields = record['fields']
+                values = {'page_url': record['page_url'], 'content_hash': record['content_hash'],
+                          'data': json.dumps(fields, sort_keys=True), 'last_seen_at': now}
+                
+                if previous is not None and previous.content_hash == record['content_hash'] \
+                        and previous.page_url == record['page_url'] and previous.removed_at is None:
+                    seen_ids.append(previous.id)
+                    counts['unchanged'] += 1
+                    continue
+                
+                restaurant_id = previous.restaurant_id if previous is not None else None
+                if restaurant_id is None:
+                    restaurant_id = self._match_ingested(candidates, fields)
+                    if restaurant_id is not None:
+                        self._fill_ingested(conn, restaurant_id, fields, now)
+                        counts['matched'] += 1
+                    else:
+                        restaurant_id = self._insert_ingested(conn, fields, now)
+                        counts['added'] += 1
+                else:
+                    changed = self._update_ingested(conn, restaurant_id, json.loads(previous.data), fields, now)
+                    counts['updated'] += changed
+                
+                values.update(restaurant_id=restaurant_id, last_changed_at=now, removed_at=None)
+                if previous is not None:
+                    updates.append(dict(values, listing_id=previous.id))
+                else:
+                    inserts.append(dict(values, source=source, source_key=record['source_key'], first_seen_at=now))
+            
+            if inserts:
+                conn.execute(listings.insert(), inserts)
+            if updates:
+                conn.execute(listings.update().where(listings.c.id == bindparam('listing_id')), updates)
+            for index in range(0, len(seen_ids), 500):
+                conn.execute(listings.update().where(listings.c.id.in_(seen_ids[index:index + 500]))
+                             .values(last_seen_at=now))
+            
+            # Listings of pages that did not change are still published
+            unchanged_pages = [page['url'] for page in result['pages'] if page['unchanged']]
+            if unchanged_pages:
+                conn.execute(listings.update().where(
+                    listings.c.source == source, listings.c.page_url.in_(unchanged_pages), listings.c.removed_at.is_(None)
+                ).values(last_seen_at=now))
+            
+            # A parsed page without any listing is more likely a layout change than an empty directory
+            published = {record['source_key'] for record in result['records']}
+            complete_pages = {record['page_url'] for record in result['records']}
+            removed = [row.id for key, row in existing.items()
+                       if key not in published and row.removed_at is None and row.page_url in complete_pages]
+            for index in range(0, len(removed), 500):
+                conn.execute(listings.update().where(listings.c.id.in_(removed[index:index + 500])).values(removed_at=now))
+            counts['removed'] = len(removed)
+            
+            page_inserts, page_updates = [], []
+            for page in result['pages']:
+                values = {key: page[key] for key in ('etag', 'last_modified', 'content_hash', 'status_code', 'error')}
+                values['fetched_at'] = now
+                if page['url'] in stored_pages:
+                    page_updates.append(dict(values, page_url=page['url']))
+                else:
+                    page_inserts.append(dict(values, source=source, url=page['url']))
+            if page_inserts:
+                conn.execute(pages.insert(), page_inserts)
+            if page_updates:
+                conn.execute(pages.update().where(pages.c.source == source, pages.c.url == bindparam('page_url')),
+                             page_updates)
+        
+        summary = {
+            'source': source,
+            'pages': len(result['pages']),
+            'pages_unchanged': sum(1 for page in result['pages'] if page['unchanged']),
+            'requests': result['requests'],
+            'listings': len(result['records']),
+            **counts,
+            'errors': result['errors'],
+            'fetch_seconds': result.get('fetch_seconds'),
+        }
+        logger.info("Source ingested", **{key: value for key, value in summary.items() if key != 'errors'},
+                    errors=len(result['errors']))
+        return summary
+    
+    def _ingestion_candidates(self, conn, records: List[Dict[str, Any]]) -> Dict[str, Dict[tuple, int]]:
+        """Index the restaurants sharing a ZIP code or phone with new listings by name and address / phone."""
+        from utils.dedupe import normalize_address, normalize_name, normalize_phone
+        from utils.ingestion import split_address
+        
+        restaurants = Restaurant.__table__
+        zips = sorted({record['fields']['zip_code'] for record in records if record['fields']['zip_code']})
+        phones = sorted({record['fields']['phone_number'] for record in records if record['fields']['phone_number']})
+        candidates = {'address': {}, 'phone': {}}
+        columns = (restaurants.c.id, restaurants.c.name, restaurants.c.address, restaurants.c.city,
+                   restaurants.c.phone_number)
+        for column, values in ((restaurants.c.zip_code, zips), (restaurants.c.phone_number, phones)):
+            for index in range(0, len(values), 500):
+                for row in conn.execute(select(*columns).where(column.in_(values[index:index + 500]))):
+                    name = normalize_name(row.name, row.city)
+                    street = split_address(row.address or '').get('address', row.address)
+                    candidates['address'].setdefault((name, normalize_address(street)), row.id)
+                    phone = normalize_phone(row.phone_number)
+                    if phone:
+                        candidates['phone'].setdefault((name, phone), row.id)
+        return candidates
+    
+    def _match_ingested(self, candidates: Dict[str, Dict[tuple, int]], fields: Dict[str, Any]) -> Optional[int]:
+        """Find the restaurant a new listing describes (None if there is none)."""
+        from utils.dedupe import normalize_address, normalize_name, normalize_phone
+        
+        name = normalize_name(fields['name'], fields['city'])
+        if not name:
+            return None
+        address = normalize_address(fields['address'])
+        if address and (name, address) in candidates['address']:
+            return candidates['address'][(name, address)]
+        phone = normalize_phone(fields['phone_number'])
+        return candidates['phone'].get((name, phone)) if phone else None
+    
+    def _insert_ingested(self, conn, fields: Dict[str, Any], now: datetime) -> int:
+        """Add a restaurant for a new listing."""
+        values = {key: value for key, value in fields.items() if value is not None}
+        values.update(created_at=now, updated_at=now, hours_parsed=False,
+                      timezone=resolve_timezone(None, None, fields['state']))
+        return conn.execute(Restaurant.__table__.insert().values(**values)).inserted_primary_key[0]
+    
+    def _fill_ingested(self, conn, restaurant_id: int, fields: Dict[str, Any], now: datetime) -> None:
+        """Fill the empty columns of a restaurant a new listing was matched to."""
+        restaurants = Restaurant.__table__
+        row = conn.execute(select(restaurants).where(restaurants.c.id == restaurant_id)).mappings().one()
+        values = {key: value for key, value in fields.items()
+                  if key != 'certifying_agency' and value not in (None, '') and row[key] in (None, '')}
+        if values:
+            conn.execute(restaurants.update().where(restaurants.c.id == restaurant_id).values(updated_at=now, **values))
+    
+    def _update_ingested(self, conn, restaurant_id: int, previous: Dict[str, Any], fields: Dict[str, Any],
+                         now: datetime) -> int:
+        """
+        Apply the fields of a changed listing to its restaurant.
+        
+        Only fields that differ from the source's previous version of the
+        listing are written, so edits made in the catalog to fields the
+        source did not change are kept. The certifying agency of an existing
+        restaurant is never changed by a source.
+        
+        Returns:
+            1 if the restaurant was updated, else 0
+        """
+        values = {key: value for key, value in fields.items()
+                  if key != 'certifying_agency' and value not in (None, '') and previous.get(key) != value}
+        if not values:
+            return 0
+        restaurants = Restaurant.__table__
+        return conn.execute(
+            restaurants.update().where(restaurants.c.id == restaurant_id).values(updated_at=now, **values)
+        ).rowcount
+    
+    def get_ingestion_status(self) -> Dict[str, Any]:
+        """
+        Summarize the listings and pages of every ingestion source.
+        
+        Returns:
+            Per source: active and removed listings, linked restaurants, the
+            last time a listing was seen and changed, and pages with errors
+        """
+        listings = SourceListing.__table__
+        pages = SourcePage.__table__
+        
+        with self.engine.connect() as conn:
+            listing_rows = conn.execute(
+                select(listings.c.source,
+                       func.count().filter(listings.c.removed_at.is_(None)).label('active'),
+                       func.count(listings.c.removed_at).label('removed'),
+                       func.count(listings.c.restaurant_id.distinct()).label('restaurants'),
+                       func.max(listings.c.last_seen_at).label('last_seen_at'),
+                       func.max(listings.c.last_changed_at).label('last_changed_at'))
+                .group_by(listings.c.source)
+            ).all()
+            page_rows = conn.execute(
+                select(pages.c.source, pages.c.url, pages.c.status_code, pages.c.error, pages.c.fetched_at)
+                .order_by(pages.c.source, pages.c.url)
+            ).all()
+        
+        sources = {}
+        for row in listing_rows:
+            sources[row.source] = {
+                'listings': row.active,
+                'removed': row.removed,
+                'restaurants': row.restaurants,
+                'last_seen_at': row.last_seen_at.isoformat() if row.last_seen_at else None,
+                'last_changed_at': row.last_changed_at.isoformat() if row.last_changed_at else None,
+                'pages': 0,
+                'page_errors': [],
+            }
+        for row in page_rows:
+            source = sources.setdefault(row.source, {
+                'listings': 0, 'removed': 0, 'restaurants': 0, 'last_seen_at': None, 'last_changed_at': None,
+                'pages': 0, 'page_errors': [],
+            })
+            source['pages'] += 1
+            if row.error:
+                source['page_errors'].append({
+                    'url': row.url,
+                    'status_code': row.status_code,
+                    'error': row.error,
+                    'fetched_at': row.fetched_at.isoformat(),
+                })
+        return {'sources': sources}
     
     def disconnect(self):
         """Disconnect from the database."""
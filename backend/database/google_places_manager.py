@@ -22,7 +22,6 @@ Last Updated: 2024
 import os
 import json
 import time
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, JSON
@@ -31,24 +30,8 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 import structlog
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+from utils.logging_config import configure_logging
+from utils.metrics import external_get
 
 logger = structlog.get_logger()
 
@@ -114,6 +97,7 @@ class GooglePlacesManager:
     
     def __init__(self, database_url: str = None):
         """Initialize the Google Places manager."""
+        configure_logging()
         self.database_url = database_url or os.getenv('DATABASE_URL')
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
@@ -278,7 +262,14 @@ class GooglePlacesManager:
         return "\n".join(opening_hours['weekday_text'])
     
     def _get_primary_photo_url(self, photos: List[Dict[str, Any]]) -> str:
-        """Get the primary photo URL from photos array."""
+        """
+        Get the primary photo URL from photos array.
+        
+        The URL carries no API key: it is only fetched server-side by the
+        image cache (utils/image_proxy.py adds the key), which serves the
+        resized photo at /img/<hash>/<width> instead of browsers calling
+        the billable Places photo endpoint.
+        """
         if not photos:
             return ""
         
@@ -287,8 +278,8 @@ class GooglePlacesManager:
         if not photo_ref:
             return ""
         
-        # Build photo URL
-        return f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo_ref}&key={self.api_key}"
+        # Build photo URL (large enough for the widest thumbnail)
+        return f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photoreference={photo_ref}"
     
     def get_place_data(self, restaurant_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -399,7 +390,7 @@ class GooglePlacesManager:
                 'key': self.api_key
             }
             
-            response = requests.get(details_url, params=params, timeout=10)
+            response = external_get('google_places', details_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
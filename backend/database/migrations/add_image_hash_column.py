@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the ``image_hash`` column to the restaurants table.
+It names the cached thumbnails of the restaurant's image_url and is filled
+from the images table (created by create_all) by
+EnhancedDatabaseManager.cache_images. Run by migrate.py after the tables are
+created; skipped if the column already exists.
+"""
+
+import os
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+import structlog
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from utils.logging_config import configure_logging
+
+configure_logging()
+
+logger = structlog.get_logger()
+
+def add_image_hash_column(engine) -> bool:
+    """
+    Add the image_hash column to the restaurants table if it is missing.
+
+    Returns:
+        True if the column was added
+    """
+    existing = {column['name'] for column in inspect(engine).get_columns('restaurants')}
+    if 'image_hash' in existing:
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE restaurants ADD COLUMN image_hash VARCHAR(32)"))
+
+    logger.info("Added restaurants.image_hash")
+    return True
+
+def run_migration():
+    """Run the migration to add the image_hash column."""
+    database_url = os.environ.get('DATABASE_URL')
+
+    if not database_url:
+        logger.error("DATABASE_URL environment variable is required")
+        return False
+
+    try:
+        from database.database_manager_v3 import Base
+
+        engine = create_engine(database_url)
+        try:
+            Base.metadata.create_all(bind=engine)
+            add_image_hash_column(engine)
+        finally:
+            engine.dispose()
+
+        logger.info("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    sys.exit(0 if success else 1)
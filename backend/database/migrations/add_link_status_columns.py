@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the link health columns ``website_status`` and
+``image_status`` to the restaurants table. They are filled from the
+link_checks table (created by create_all) by
+EnhancedDatabaseManager.check_links. Run by migrate.py after the tables are
+created; columns that already exist are skipped.
+"""
+
+import os
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+import structlog
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from utils.logging_config import configure_logging
+
+configure_logging()
+
+logger = structlog.get_logger()
+
+LINK_STATUS_COLUMNS = ('website_status', 'image_status')
+
+def add_link_status_columns(engine) -> int:
+    """
+    Add the missing link health columns to the restaurants table.
+
+    Returns:
+        Number of columns added
+    """
+    existing = {column['name'] for column in inspect(engine).get_columns('restaurants')}
+    missing = [name for name in LINK_STATUS_COLUMNS if name not in existing]
+
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE restaurants ADD COLUMN {name} VARCHAR(20)"))
+
+    if missing:
+        logger.info(f"Added link health columns: {', '.join(missing)}")
+    return len(missing)
+
+def run_migration():
+    """Run the migration to add the link health columns."""
+    database_url = os.environ.get('DATABASE_URL')
+
+    if not database_url:
+        logger.error("DATABASE_URL environment variable is required")
+        return False
+
+    try:
+        from database.database_manager_v3 import Base
+
+        engine = create_engine(database_url)
+        try:
+            Base.metadata.create_all(bind=engine)
+            add_link_status_columns(engine)
+        finally:
+            engine.dispose()
+
+        logger.info("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Migration script to backfill the timezone column of the restaurants table.
+New restaurants get their timezone resolved at write time; this resolves it
+for existing rows from their coordinates (falling back to state) using the
+bundled offline timezone index.
+"""
+
+import os
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, text
+import structlog
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from utils.timezone_resolver import resolve_timezone
+
+# Configure logging
+structlog.configure(
+    processors=[
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        structlog.processors.JSONRenderer()
+    ],
+    context_class=dict,
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True,
+)
+
+logger = structlog.get_logger()
+
+def run_migration(overwrite: bool = False):
+    """Run the migration to backfill restaurant timezones."""
+    database_url = os.environ.get('DATABASE_URL')
+
+    if not database_url:
+        logger.error("DATABASE_URL environment variable is required")
+        return False
+
+    try:
+        # Create engine
+        engine = create_engine(database_url)
+
+        with engine.begin() as conn:
+            where_clause = "" if overwrite else "WHERE timezone IS NULL OR timezone = '' OR timezone = 'UTC'"
+            rows = conn.execute(text(f"""
+                SELECT id, latitude, longitude, state, timezone
+                FROM restaurants
+                {where_clause}
+            """)).fetchall()
+
+            logger.info(f"Resolving timezones for {len(rows)} restaurants")
+
+            updates = []
+            for row in rows:
+                timezone = resolve_timezone(row.latitude, row.longitude, row.state)
+                if timezone != row.timezone:
+                    updates.append({'id': row.id, 'timezone': timezone})
+
+            if updates:
+                conn.execute(text("UPDATE restaurants SET timezone = :timezone WHERE id = :id"), updates)
+
+            logger.info(f"Updated timezone for {len(updates)} restaurants")
+
+        logger.info("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = run_migration(overwrite='--overwrite' in sys.argv)
+    sys.exit(0 if success else 1)
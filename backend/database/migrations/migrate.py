@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Schema migration step run before the API server starts (see startup.sh).
+Creates any missing tables for the models of database_manager_v3 and
+google_places_manager (creating catalog_changes also installs its triggers
+on restaurants and logs the existing catalog), adds the link health and image cache columns to
+existing restaurants tables (add_link_status_columns.py,
+add_image_hash_column.py) and moves any legacy specials JSON into the
+specials table (split_specials_table.py). The API server no longer
+checks the schema itself, so application startup does not pay for it on
+every worker boot.
+"""
+
+import os
+import sys
+from pathlib import Path
+import structlog
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from utils.logging_config import configure_logging
+
+configure_logging()
+
+logger = structlog.get_logger()
+
+def run_migration():
+    """Create missing tables and columns, and split legacy specials."""
+    database_url = os.environ.get('DATABASE_URL')
+
+    if not database_url:
+        logger.error("DATABASE_URL environment variable is required")
+        return False
+
+    try:
+        from sqlalchemy import create_engine
+        from database.database_manager_v3 import Base as RestaurantsBase
+        from database.google_places_manager import Base as GooglePlacesBase
+        from database.migrations.add_image_hash_column import add_image_hash_column
+        from database.migrations.add_link_status_columns import add_link_status_columns
+        from database.migrations.split_specials_table import split_specials
+
+        engine = create_engine(database_url)
+        try:
+            RestaurantsBase.metadata.create_all(bind=engine)
+            GooglePlacesBase.metadata.create_all(bind=engine)
+            add_link_status_columns(engine)
+            add_image_hash_column(engine)
+            split_specials(engine)
+        finally:
+            engine.dispose()
+
+        logger.info("Database tables created/verified")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Migration script to move restaurant specials from the JSON text column
+``restaurants.specials`` into the ``specials`` table (RestaurantSpecial).
+Each restaurant's JSON list is split into one row per special, keeping the
+special ids the admin UI already refers to, and the legacy column is then
+cleared so the split runs once per restaurant. Run by migrate.py after the
+tables are created.
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import create_engine, select, text, update, func
+import structlog
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from utils.logging_config import configure_logging
+
+configure_logging()
+
+logger = structlog.get_logger()
+
+def split_specials(engine) -> int:
+    """
+    Split the legacy specials JSON of every restaurant into specials rows.
+
+    Returns:
+        Number of specials inserted
+    """
+    from database.database_manager_v3 import EnhancedDatabaseManager, Restaurant, RestaurantSpecial
+
+    restaurants = Restaurant.__table__
+    specials = RestaurantSpecial.__table__
+    converter = EnhancedDatabaseManager(str(engine.url))
+    columns = [column.name for column in specials.columns if column.name != 'id']
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        legacy = conn.execute(
+            select(restaurants.c.id, restaurants.c.specials).where(restaurants.c.specials.isnot(None))
+        ).all()
+
+        used_ids = set(conn.execute(select(specials.c.id)).scalars())
+        with_id, without_id = [], []
+        for restaurant_id, specials_json in legacy:
+            for special in converter._parse_specials_field(specials_json):
+                if not isinstance(special, dict):
+                    continue
+                values = converter.special_columns(special, restaurant_id)
+                row = {column: values.get(column) for column in columns}
+                row['created_at'] = row['created_at'] or now
+                row['updated_at'] = row['updated_at'] or now
+                special_id = values.get('id')
+                if special_id is not None and special_id not in used_ids:
+                    used_ids.add(special_id)
+                    with_id.append(dict(row, id=special_id))
+                else:
+                    without_id.append(row)
+
+        if with_id:
+            conn.execute(specials.insert(), with_id)
+            if conn.dialect.name == 'postgresql':
+                # Continue the id sequence after the ids carried over
+                conn.execute(text("SELECT setval(pg_get_serial_sequence('specials', 'id'), :max_id)"),
+                             {'max_id': conn.execute(select(func.max(specials.c.id))).scalar()})
+        if without_id:
+            conn.execute(specials.insert(), without_id)
+
+        if legacy:
+            conn.execute(update(restaurants).where(restaurants.c.specials.isnot(None)).values(specials=None))
+
+    inserted = len(with_id) + len(without_id)
+    logger.info(f"Split specials of {len(legacy)} restaurants into {inserted} rows")
+    return inserted
+
+def run_migration():
+    """Run the migration to split restaurant specials into the specials table."""
+    database_url = os.environ.get('DATABASE_URL')
+
+    if not database_url:
+        logger.error("DATABASE_URL environment variable is required")
+        return False
+
+    try:
+        from database.database_manager_v3 import Base
+
+        engine = create_engine(database_url)
+        try:
+            Base.metadata.create_all(bind=engine)
+            split_specials(engine)
+        finally:
+            engine.dispose()
+
+        logger.info("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+ORB Kosher Source
+=================
+
+Ingestion source adapter (see utils/ingestion.py) for the ORB Kosher
+directory (https://www.orbkosher.com). The category pages are server
+rendered, so the adapter fetches them with plain HTTP requests instead of
+the headless browser used by orb_scraper_v2.py, and parses them with the
+same selectors:
+
+- /category/restaurants/: one .section-col-miami column per
+  "Restaurants » Dairy" / "Restaurants » Meat" header
+- /category/fish/: pareve fish businesses
+
+ORB supervision is Chalav Yisroel unless the restaurant is on the Chalav
+Stam list; the Chalav Stam and Pas Yisroel lists are in scrapers/data/orb.json.
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.ingestion import SourceAdapter, kosher_category
+
+
+class ORBSource(SourceAdapter):
+    """ORB Kosher restaurant and fish listings (South Florida)."""
+
+    name = 'orb'
+    agency = 'ORB'
+    region = 'South Florida'
+    base_url = 'https://www.orbkosher.com'
+    schedule = '0 4 * * 1'
+    requests_per_second = 0.5
+    concurrency = 1
+
+    def urls(self) -> List[str]:
+        """Category pages of the directory."""
+        return [f"{self.base_url}/category/restaurants/", f"{self.base_url}/category/fish/"]
+
+    def parse(self, page: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Extract the business listings of a category page."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(page['text'], 'lxml')
+        if '/category/restaurants/' in page['url']:
+            for section in soup.select('.section-col-miami'):
+                header = section.find('h3')
+                title = header.get_text(' ', strip=True) if header else ''
+                if 'Restaurants' not in title:
+                    continue
+                for listing in section.select('.business-listing'):
+                    yield self._parse_listing(listing, title, 'restaurant')
+        else:
+            for listing in soup.select('.business-listing'):
+                yield self._parse_listing(listing, 'Fish', 'business')
+
+    def _parse_listing(self, listing, category: str, listing_type: str) -> Dict[str, Any]:
+        """Extract the fields of one .business-listing element."""
+        def text(selector: str) -> Optional[str]:
+            element = listing.select_one(selector)
+            return element.get_text(' ', strip=True) if element else None
+
+        def attribute(selector: str, name: str) -> Optional[str]:
+            element = listing.select_one(selector)
+            return element.get(name) if element else None
+
+        return {
+            'name': text('.logoTitle'),
+            'category': category,
+            'listing_type': listing_type,
+            'image_url': attribute('a img', 'src'),
+            'phone': text('.phone a[href^="tel:"]'),
+            'address': text('.address a:not([href$=".pdf"])'),
+            'website': attribute('a[href^="http"]', 'href'),
+            'certificate_url': attribute('.address a[href$=".pdf"]', 'href'),
+        }
+
+    def normalize(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map a listing to restaurant fields."""
+        category = kosher_category(record['category'])
+        if not record['name'] or category is None:
+            return None
+        return {
+            'name': record['name'],
+            'address': record['address'],
+            'state': 'FL',
+            'phone_number': record['phone'],
+            'website': record['website'],
+            'image_url': record['image_url'],
+            'kosher_category': category,
+            'listing_type': record['listing_type'],
+            'is_cholov_yisroel': True if category == 'dairy' else None,
+            'is_pas_yisroel': False,
+            'short_description': f"Kosher {category} {record['listing_type']} certified by ORB",
+        }
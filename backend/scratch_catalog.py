@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Scratch catalogs for the test scripts.
+
+Builds a throwaway SQLite catalog through EnhancedDatabaseManager, so the
+test scripts exercise the same schema, defaults and change log as the app.
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager_v3 import EnhancedDatabaseManager
+
+
+def scratch_catalog(path, restaurants):
+    """Create a catalog of ``restaurants`` in a new SQLite file and return its connected manager.
+
+    Each entry is merged over a Miami dairy listing certified by ORB, so
+    tests only spell out the fields they check. Restaurants get ids 1..n.
+    """
+    manager = EnhancedDatabaseManager(f"sqlite:///{path}")
+    assert manager.connect()
+    for index, restaurant in enumerate(restaurants):
+        assert manager.add_restaurant(dict({
+            'address': f"{index} Main St",
+            'city': 'Miami',
+            'state': 'FL',
+            'zip_code': '33101',
+            'phone_number': f"305-555-010{index}",
+            'kosher_category': 'dairy',
+            'listing_type': 'restaurant',
+            'certifying_agency': 'ORB',
+        }, **restaurant))
+    return manager
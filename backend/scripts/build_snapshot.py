@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Build Catalog Snapshot Script
+=============================
+
+This script builds the read-only SQLite snapshot of the catalog
+(utils/snapshot.py) from DATABASE_URL and publishes it atomically at
+SNAPSHOT_PATH (or --output). Workers running with SNAPSHOT_MODE=fallback or
+SNAPSHOT_MODE=always pick up the new file within SNAPSHOT_CHECK_SECONDS.
+The scheduler rebuilds the snapshot on SNAPSHOT_BUILD_CRON; use this script
+to build one by hand, e.g. to ship it to an edge instance.
+
+Usage:
+    python scripts/build_snapshot.py --output /var/lib/jewgo/catalog.sqlite
+    python scripts/build_snapshot.py --force
+    python scripts/build_snapshot.py --info
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+import json
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import get_config
+from database.database_manager_v3 import EnhancedDatabaseManager
+from utils.snapshot import build_snapshot, read_snapshot_meta
+
+
+def print_meta(path, meta):
+    """Print the metadata of a snapshot file."""
+    print(f"📊 {path}: format {meta['format']}, catalog version {meta['catalog_version']}, "
+          f"built at {meta['built_at']}")
+    for table, count in json.loads(meta['counts']).items():
+        print(f"   {table}: {count:,} rows")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build the read-only catalog snapshot')
+    parser.add_argument('--output', default=get_config().SNAPSHOT_PATH, help='Snapshot file (default SNAPSHOT_PATH)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the catalog did not change')
+    parser.add_argument('--info', action='store_true', help='Only print the metadata of the snapshot file')
+    args = parser.parse_args()
+
+    if not args.output:
+        print("❌ Set SNAPSHOT_PATH or pass --output")
+        sys.exit(1)
+
+    if args.info:
+        meta = read_snapshot_meta(args.output)
+        if not meta:
+            print(f"❌ No readable snapshot at {args.output}")
+            sys.exit(1)
+        print_meta(args.output, meta)
+        return
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        meta = build_snapshot(db_manager.engine, args.output, force=args.force)
+    except Exception as e:
+        print(f"❌ Snapshot build failed: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.disconnect()
+
+    if meta['skipped']:
+        print(f"⏭️  Catalog unchanged since the last snapshot (version {meta['catalog_version']})")
+    else:
+        print(f"✅ Snapshot built in {meta['elapsed_seconds']}s ({meta['bytes']:,} bytes)")
+    print_meta(args.output, meta)
+
+
+if __name__ == "__main__":
+    main()
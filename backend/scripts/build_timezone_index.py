@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Build Timezone Index Script
+===========================
+
+This script preprocesses timezone boundary polygons (GeoJSON) into the compact,
+grid-bucketed index bundled with the backend at utils/data/timezone_index.json.
+
+The input is a GeoJSON FeatureCollection where every feature carries a ``tzid``
+property (the format published by timezone-boundary-builder). Each polygon ring
+is simplified, rounded, and registered in every grid cell its bounding box
+touches, so lookups only test the handful of polygons near a point.
+
+Usage:
+    python scripts/build_timezone_index.py boundaries.geojson
+    python scripts/build_timezone_index.py boundaries.geojson --cell-size 0.5 --tolerance 0.01
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import json
+import math
+import argparse
+from typing import Dict, List, Tuple
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.timezone_resolver import DEFAULT_INDEX_PATH
+
+Point = Tuple[float, float]
+
+
+def _perpendicular_distance(point: Point, start: Point, end: Point) -> float:
+    """Distance from point to the segment start-end, in degrees."""
+    if start == end:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    return abs(dy * point[0] - dx * point[1] + end[0] * start[1] - end[1] * start[0]) / math.hypot(dx, dy)
+
+
+def simplify_ring(ring: List[Point], tolerance: float) -> List[Point]:
+    """Simplify a polygon ring with the Douglas-Peucker algorithm."""
+    if tolerance <= 0 or len(ring) < 4:
+        return ring
+
+    keep = [False] * len(ring)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, first
+        for i in range(first + 1, last):
+            distance = _perpendicular_distance(ring[i], ring[first], ring[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    simplified = [point for point, kept in zip(ring, keep) if kept]
+    # A ring needs at least a triangle to be useful for point-in-polygon tests
+    return simplified if len(simplified) >= 4 else ring
+
+
+def _feature_polygons(geometry: Dict) -> List[List[List[Point]]]:
+    """Return the polygons of a Polygon/MultiPolygon geometry as lists of rings."""
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def build_index(geojson: Dict, cell_size: float, tolerance: float, precision: int) -> Dict:
+    """Convert a GeoJSON FeatureCollection into the bundled index format."""
+    zones: List[str] = []
+    zone_ids: Dict[str, int] = {}
+    polygons = []
+    grid: Dict[str, List[int]] = {}
+
+    for feature in geojson.get('features', []):
+        tzid = feature.get('properties', {}).get('tzid')
+        if not tzid or not feature.get('geometry'):
+            continue
+        if tzid not in zone_ids:
+            zone_ids[tzid] = len(zones)
+            zones.append(tzid)
+
+        for rings in _feature_polygons(feature['geometry']):
+            rings = [
+                [[round(x, precision), round(y, precision)] for x, y in simplify_ring([tuple(p[:2]) for p in ring], tolerance)]
+                for ring in rings
+            ]
+            xs = [p[0] for p in rings[0]]
+            ys = [p[1] for p in rings[0]]
+            bbox = [min(xs), min(ys), max(xs), max(ys)]
+
+            polygon_id = len(polygons)
+            polygons.append({'zone': zone_ids[tzid], 'bbox': bbox, 'rings': rings})
+
+            for cx in range(math.floor(bbox[0] / cell_size), math.floor(bbox[2] / cell_size) + 1):
+                for cy in range(math.floor(bbox[1] / cell_size), math.floor(bbox[3] / cell_size) + 1):
+                    grid.setdefault(f"{cx},{cy}", []).append(polygon_id)
+
+    return {
+        'version': 1,
+        'cell_size': cell_size,
+        'zones': zones,
+        'polygons': polygons,
+        'grid': grid,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build the bundled timezone boundary index')
+    parser.add_argument('geojson', help='GeoJSON FeatureCollection with a tzid property per feature')
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help='Output path for the index')
+    parser.add_argument('--cell-size', type=float, default=1.0, help='Grid cell size in degrees')
+    parser.add_argument('--tolerance', type=float, default=0.01, help='Simplification tolerance in degrees')
+    parser.add_argument('--precision', type=int, default=3, help='Decimal places kept per coordinate')
+    args = parser.parse_args()
+
+    with open(args.geojson, 'r', encoding='utf-8') as f:
+        geojson = json.load(f)
+
+    index = build_index(geojson, args.cell_size, args.tolerance, args.precision)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+
+    print(f"✅ Wrote {len(index['polygons'])} polygons for {len(index['zones'])} zones "
+          f"in {len(index['grid'])} grid cells to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Cache Restaurant Images Script
+==============================
+
+This script fetches every restaurant image in the catalog (DATABASE_URL)
+into the local image cache (utils/image_proxy.py): the image_url, or the
+Google Places primary photo of restaurants without one. Each source image is
+downloaded once, resized to WebP thumbnails and served by the API at
+/img/<hash>/<width>. Sources with a fresh cached result are skipped, so a
+run only fetches new, changed, expired or evicted images, and Google Places
+photos are requested once per photo refresh instead of once per card view.
+The scheduler runs the same refresh as the image_cache job (IMAGE_CACHE_CRON);
+use this script to fill the cache by hand.
+
+Run it on the host (or volume) the API serves IMAGE_CACHE_DIR from.
+
+Usage:
+    python scripts/cache_images.py
+    python scripts/cache_images.py --force --concurrency 32
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import get_config
+from database.database_manager_v3 import EnhancedDatabaseManager
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Fetch restaurant images into the local image cache')
+    parser.add_argument('--force', action='store_true', help='Refetch images with a fresh cached result')
+    parser.add_argument('--concurrency', type=int, help='Override IMAGE_FETCH_CONCURRENCY')
+    args = parser.parse_args()
+
+    config = get_config()
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        summary = db_manager.cache_images(
+            force=args.force,
+            IMAGE_CACHE_DIR=config.IMAGE_CACHE_DIR,
+            IMAGE_CACHE_MAX_BYTES=config.IMAGE_CACHE_MAX_BYTES,
+            GOOGLE_PLACES_API_KEY=config.GOOGLE_PLACES_API_KEY,
+            IMAGE_FETCH_CONCURRENCY=args.concurrency,
+        )
+    finally:
+        db_manager.disconnect()
+
+    print(f"📊 {summary['images']:,} images, {summary['due']:,} due")
+    print(f"✅ Cached {summary['cached']:,} in {summary['elapsed_seconds']}s "
+          f"({summary['restaurants_updated']:,} restaurants updated)")
+    if summary['failed']:
+        print(f"⚠️  {summary['failed']:,} images could not be fetched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check Restaurant Links Script
+=============================
+
+This script sweeps every restaurant website and image URL in the catalog
+(DATABASE_URL) with the concurrent link checker (utils/link_checker.py).
+Links with a fresh cached result in link_checks are skipped, so a scheduled
+run only checks new and expired links. Results are copied to the
+restaurants' website_status / image_status, which the API flags (and hides
+with HIDE_DEAD_LINKS=true) without checking links while serving.
+
+Usage:
+    python scripts/check_links.py
+    python scripts/check_links.py --force --concurrency 200 --per-host 8
+    python scripts/check_links.py --report
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database_manager_v3 import EnhancedDatabaseManager
+
+
+def print_report(health):
+    """Print the cached link health summary."""
+    print(f"📊 {health['links']:,} links, last checked {health['last_checked_at'] or 'never'}")
+    for status, count in sorted(health['statuses'].items()):
+        print(f"   {status:<11} {count:,}")
+    if health['average_latency_ms'] is not None:
+        print(f"   average latency: {health['average_latency_ms']} ms")
+
+    if health['broken_links']:
+        print("\n❌ Broken links:")
+        print("-" * 60)
+        for link in health['broken_links']:
+            print(f"🍽️  {link['name']} ({link['field']}, {link['status']})")
+            print(f"   🔗 {link['url']}")
+            print(f"   ❌ {link['error'] or link['status_code']}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Check restaurant website and image links')
+    parser.add_argument('--force', action='store_true', help='Recheck links with a fresh cached result')
+    parser.add_argument('--concurrency', type=int, help='Override LINK_CHECK_CONCURRENCY')
+    parser.add_argument('--per-host', type=int, help='Override LINK_CHECK_PER_HOST')
+    parser.add_argument('--timeout', type=float, help='Override LINK_CHECK_TIMEOUT (seconds)')
+    parser.add_argument('--report', action='store_true', help='Only print the cached results')
+    args = parser.parse_args()
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        if not args.report:
+            summary = db_manager.check_links(
+                force=args.force,
+                LINK_CHECK_CONCURRENCY=args.concurrency,
+                LINK_CHECK_PER_HOST=args.per_host,
+                LINK_CHECK_TIMEOUT=args.timeout,
+            )
+            print(f"✅ Checked {summary['due']:,} of {summary['links']:,} links in {summary['elapsed_seconds']}s "
+                  f"({summary['flags_updated']:,} restaurant flags changed)")
+        print_report(db_manager.get_link_health())
+    finally:
+        db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
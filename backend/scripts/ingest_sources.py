@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Ingest Certifier Sources Script
+===============================
+
+This script syncs the catalog (DATABASE_URL) with the listings of the
+certifier sources in INGESTION_SOURCES (utils/ingestion.py). The sources are
+fetched concurrently, each at its own request rate; pages that did not
+change since the last sync are skipped, and only new or changed listings
+write to the restaurants table. The scheduler runs the same sync per source
+(<name>_sync jobs); use this script to sync by hand or to inspect the
+sources.
+
+Usage:
+    python scripts/ingest_sources.py
+    python scripts/ingest_sources.py --source orb --force
+    python scripts/ingest_sources.py --status
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import get_config
+from database.database_manager_v3 import EnhancedDatabaseManager
+
+
+def print_status(status):
+    """Print the listings and page errors of every source."""
+    for name, source in sorted(status['sources'].items()):
+        print(f"📊 {name}: {source['listings']:,} listings ({source['removed']:,} removed), "
+              f"{source['restaurants']:,} restaurants, {source['pages']:,} pages")
+        print(f"   last seen {source['last_seen_at'] or 'never'}, last changed {source['last_changed_at'] or 'never'}")
+        for error in source['page_errors']:
+            print(f"   ❌ {error['url']}: {error['error']}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Sync the catalog with the certifier sources')
+    parser.add_argument('--source', action='append', metavar='NAME', help='Only sync this source (repeatable)')
+    parser.add_argument('--force', action='store_true', help='Fetch and parse pages that did not change')
+    parser.add_argument('--status', action='store_true', help='Only print the sources')
+    args = parser.parse_args()
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect():
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        if not args.status:
+            try:
+                result = db_manager.ingest_sources(
+                    args.source, force=args.force, INGESTION_SOURCES=getattr(get_config(), 'INGESTION_SOURCES', None)
+                )
+            except ValueError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            for summary in result['sources']:
+                print(f"✅ {summary['source']}: {summary['listings']:,} listings on {summary['pages']} pages "
+                      f"({summary['pages_unchanged']} unchanged, {summary['requests']} requests) - "
+                      f"{summary['added']} added, {summary['matched']} matched, {summary['updated']} updated, "
+                      f"{summary['unchanged']} unchanged, {summary['removed']} removed")
+                for error in summary['errors']:
+                    print(f"   ❌ {error}")
+            print(f"⏱️  {result['elapsed_seconds']}s, {result['restaurants_changed']} restaurants changed")
+        print_status(db_manager.get_ingestion_status())
+    finally:
+        db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Periodic Jobs Script
+====================
+
+This script lists, runs and schedules the periodic jobs of utils/scheduler.py
+(the Google Places refresh and the certifier source syncs). The API workers already run
+the scheduler; use this script to run a job by hand (it takes the job's
+lock and skips it while a run is in progress), to inspect the run history, or
+to run the scheduler in the foreground on a host without API workers (it
+takes part in the same leader election).
+
+Usage:
+    python scripts/run_scheduler.py --list
+    python scripts/run_scheduler.py --run google_places_refresh
+    python scripts/run_scheduler.py --history 20
+    python scripts/run_scheduler.py
+
+Author: JewGo Development Team
+Version: 1.0
+Last Updated: 2024
+"""
+
+import sys
+import os
+import argparse
+import json
+import signal
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import get_config
+from utils.logging_config import configure_logging
+from utils.scheduler import DEFAULT_SETTINGS, Scheduler
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='List, run or schedule the periodic jobs')
+    parser.add_argument('--list', action='store_true', help='List the jobs with their next and last runs')
+    parser.add_argument('--run', metavar='JOB', help='Run a job now')
+    parser.add_argument('--history', type=int, metavar='N', help='Show the last N runs')
+    args = parser.parse_args()
+
+    configure_logging()
+    config = get_config()
+    scheduler = Scheduler(**{key: getattr(config, key, None) for key in DEFAULT_SETTINGS})
+    scheduler.add_default_jobs()
+    try:
+        scheduler.connect(config.DATABASE_URL)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.list:
+        for job in scheduler.status():
+            last = job['last_run']
+            print(f"📅 {job['name']}: {job['schedule']} ({job['timezone']}) - {job['description']}")
+            print(f"   next run: {job['next_run']} UTC")
+            if last:
+                print(f"   last run: {last['started_at']} UTC, {last['status']} ({last['trigger']})")
+        return
+
+    if args.history:
+        for run in scheduler.history(limit=args.history):
+            print(f"{run['started_at']}  {run['job_name']:<24} {run['status']:<12} {run['trigger']:<9} "
+                  f"{run['duration_ms'] or 0:>8} ms  {run['error'] or ''}")
+        return
+
+    if args.run:
+        if args.run not in scheduler.jobs:
+            print(f"❌ Unknown job: {args.run} (jobs: {', '.join(scheduler.jobs) or 'none'})")
+            sys.exit(1)
+        run = scheduler.run_job(args.run)
+        if run is None:
+            print(f"⚠️  {args.run} is already running")
+            sys.exit(1)
+        print(json.dumps(run, indent=2))
+        sys.exit(0 if run['status'] == 'succeeded' else 1)
+
+    print(f"🕐 Running the scheduler ({', '.join(scheduler.jobs)}); Ctrl+C to stop")
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
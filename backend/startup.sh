@@ -1,9 +1,25 @@
 #!/bin/bash
 
-# Install Playwright browsers with dependencies
-echo "Installing Playwright browsers..."
-playwright install chromium --with-deps
+# Install Playwright browsers with dependencies (only the ORB scraper endpoint
+# needs them; skip the install when a Chromium build is already present)
+BROWSERS_PATH="${PLAYWRIGHT_BROWSERS_PATH:-$HOME/.cache/ms-playwright}"
+if ls -d "$BROWSERS_PATH"/chromium-* >/dev/null 2>&1; then
+    echo "Playwright Chromium already installed, skipping install"
+else
+    echo "Installing Playwright browsers..."
+    playwright install chromium --with-deps
+fi
 
-# Start the application
-echo "Starting Gunicorn..."
-gunicorn --config config/gunicorn.conf.py app:app 
\ No newline at end of file
+# Create missing tables (the API server itself does not touch the schema)
+echo "Running database migrations..."
+python database/migrations/migrate.py || echo "⚠️  Database migration failed, starting anyway"
+
+# Start the application (SERVER_MODE=async serves the read endpoints from
+# asgi.py on uvicorn workers, with the Flask routes mounted alongside)
+if [ "$SERVER_MODE" = "async" ]; then
+    echo "Starting Gunicorn (uvicorn workers)..."
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn --config config/gunicorn.conf.py asgi:app
+else
+    echo "Starting Gunicorn..."
+    gunicorn --config config/gunicorn.conf.py app:app
+fi
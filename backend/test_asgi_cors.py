@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for CORS in async serving mode (asgi.py).
+
+This script requests the natively served read endpoints from a browser
+origin and checks that they send the same CORS headers as the Flask routes
+of the same paths, for simple requests and for preflights.
+"""
+
+import sys
+import os
+import tempfile
+
+from starlette.testclient import TestClient
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scratch_catalog import scratch_catalog
+
+ORIGIN = 'https://app.jewgo.example'
+
+PATHS = [
+    '/api/restaurants?limit=2',
+    '/api/restaurants/search?q=CORS',
+    '/api/restaurants/nearby?lat=25.79&lng=-80.13',
+    '/api/restaurants/1',
+    '/api/statistics',
+    '/api/kosher-types',
+]
+
+
+def cors_headers(response):
+    """The CORS headers of a response, lower-cased, with Vary reduced to whether it names Origin."""
+    headers = {name.lower(): value for name, value in response.headers.items()
+               if name.lower().startswith('access-control-allow-') and name.lower() != 'access-control-allow-headers'}
+    if 'access-control-allow-methods' in headers:
+        headers['access-control-allow-methods'] = sorted(headers['access-control-allow-methods'].split(', '))
+    vary = ', '.join(value for name, value in response.headers.items() if name.lower() == 'vary')
+    headers['vary-origin'] = 'origin' in vary.lower()
+    return headers
+
+
+def test_native_routes_match_flask_cors():
+    """Test that the native ASGI read routes send the Flask routes' CORS headers."""
+
+    print("🧪 Testing CORS headers in async mode")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cors.db')
+        manager = scratch_catalog(path, [{'name': f"CORS Test {index}", 'latitude': 25.79, 'longitude': -80.13}
+                                         for index in range(3)])
+        os.environ.setdefault('DATABASE_URL', f"sqlite:///{path}")
+        import app as flask_module
+        import asgi
+        from database.async_catalog import AsyncCatalogReader
+
+        # Both sides read the scratch catalog, whichever database the app was imported with
+        previous = flask_module._db_manager, asgi.catalog
+        flask_module._db_manager, asgi.catalog = manager, AsyncCatalogReader(f"sqlite:///{path}")
+        try:
+            application = asgi.create_asgi_app()
+            assert application.state.native_reads
+            flask_client = flask_module.app.test_client()
+            with TestClient(application) as asgi_client:
+                for url in PATHS:
+                    request = {'Origin': ORIGIN}
+                    expected = flask_client.get(url, headers=request)
+                    actual = asgi_client.get(url, headers=request)
+                    assert actual.status_code == expected.status_code == 200, url
+                    assert cors_headers(actual) == cors_headers(expected), url
+                    assert actual.headers['Access-Control-Allow-Origin'] == ORIGIN
+
+                    preflight = dict(request, **{'Access-Control-Request-Method': 'GET',
+                                                 'Access-Control-Request-Headers': 'Content-Type'})
+                    expected = flask_client.options(url, headers=preflight)
+                    actual = asgi_client.options(url, headers=preflight)
+                    assert actual.status_code == expected.status_code == 200, url
+                    assert cors_headers(actual) == cors_headers(expected), url
+                    assert 'content-type' in actual.headers['Access-Control-Allow-Headers'].lower()
+                    print(f"✅ {url.split('?')[0]}: same CORS headers as Flask")
+        finally:
+            flask_module._db_manager, asgi.catalog = previous
+            manager.disconnect()
+
+
+if __name__ == "__main__":
+    try:
+        test_native_routes_match_flask_cors()
+        print("\n🎉 All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
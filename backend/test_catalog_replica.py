@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory catalog replica (REPLICA_ENABLED).
+
+This script loads a replica of a scratch catalog whose names differ in case
+and punctuation, and checks that its listing pages hold the same
+restaurants in the same order as the database paths.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scratch_catalog import scratch_catalog
+from utils.catalog_replica import CatalogReplica
+
+NAMES = ['banana Bakery', 'Apple Grill', 'apple grill', 'Kosher-Mart', 'Kosher Mart', 'KosherMart',
+         'Ëmek Café', 'zaatar', 'Zion Deli', '123 Pizza']
+
+
+def ids(places):
+    """The restaurant ids of a page of dicts or encoded fragments."""
+    return [json.loads(place)['id'] if isinstance(place, bytes) else place['id'] for place in places]
+
+
+def test_replica_pages_match_database():
+    """Test that replica pages and database pages list the same restaurants in the same order."""
+
+    print("🧪 Testing replica page order against the database")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = scratch_catalog(os.path.join(directory, 'replica.db'), [{'name': name} for name in NAMES])
+        try:
+            replica = CatalogReplica(get_db_manager=lambda: manager, REPLICA_ENABLED=True)
+            assert replica.refresh(force=True)
+
+            expected = ids(manager.get_places_projected(['id'], limit=len(NAMES)))
+            names = [NAMES[place_id - 1] for place_id in expected]
+            assert names[:3] == ['123 Pizza', 'Apple Grill', 'apple grill'], names
+            assert names.index('banana Bakery') < names.index('Kosher Mart') < names.index('zaatar')
+            print(f"✅ Database order: {names}")
+
+            for limit in (1, 3, 4):
+                for offset in range(0, len(NAMES), limit):
+                    assert ids(replica.get_places_projected(['id'], limit=limit, offset=offset)) == \
+                        ids(manager.get_places_projected(['id'], limit=limit, offset=offset)), (limit, offset)
+            print("✅ Projected pages match at page sizes 1, 3 and 4")
+
+            # These page in id order and sort each page by name
+            assert ids(replica.get_all_places_encoded(limit=6)) == ids(manager.get_all_places_encoded(limit=6))
+            assert ids(replica.get_all_places(limit=6)) == ids(manager.get_all_places(limit=6))
+            print("✅ Encoded and full listings match")
+        finally:
+            manager.disconnect()
+
+
+if __name__ == "__main__":
+    try:
+        test_replica_pages_match_database()
+        print("\n🎉 All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental catalog sync (/api/changes).
+
+This script builds a scratch SQLite catalog, pages through its change log
+and checks that updates and deletes (tombstones) are reported in version
+order, and that the endpoint rejects malformed versions.
+"""
+
+import sys
+import os
+import tempfile
+
+from sqlalchemy import text
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scratch_catalog import scratch_catalog
+
+
+def feed_catalog(path, count=5):
+    """Create a catalog of ``count`` restaurants in a new SQLite file."""
+    return scratch_catalog(path, [{'name': f"Feed Test {index}"} for index in range(count)])
+
+
+def read_feed(manager, since, limit):
+    """Page through the change log from ``since``; returns (changes, last next_since, pages)."""
+    changes, pages = [], 0
+    while True:
+        page = manager.get_changes(since=since, limit=limit)
+        pages += 1
+        changes.extend(page['changes'])
+        since = page['next_since']
+        if not page['has_more']:
+            return changes, since, pages
+
+
+def test_change_feed_paging():
+    """Test that version paging returns every change once, with has_more until the end."""
+
+    print("🧪 Testing change feed paging")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = feed_catalog(os.path.join(directory, 'feed.db'))
+        try:
+            first = manager.get_changes(since=0, limit=2)
+            assert len(first['changes']) == 2 and first['has_more']
+            assert first['next_since'] == first['changes'][-1]['version']
+
+            changes, since, pages = read_feed(manager, 0, 2)
+            versions = [change['version'] for change in changes]
+            assert pages == 3
+            assert versions == sorted(versions) and len(set(versions)) == 5
+            assert all(change['op'] == 'upsert' and change['restaurant']['id'] == change['id'] for change in changes)
+            assert since == manager.get_changes(since=since)['latest_version']
+            print(f"✅ {len(changes)} upserts in {pages} pages, caught up at version {since}")
+
+            # Nothing new: an empty page at the same version
+            idle = manager.get_changes(since=since)
+            assert idle['changes'] == [] and not idle['has_more'] and idle['next_since'] == since
+        finally:
+            manager.disconnect()
+
+
+def test_change_feed_tombstones():
+    """Test that updates are re-sent as upserts and deletes as tombstones, in version order."""
+
+    print("🧪 Testing change feed updates and deletes")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = feed_catalog(os.path.join(directory, 'feed.db'))
+        try:
+            _, since, _ = read_feed(manager, 0, 100)
+
+            assert manager.update_restaurant_orb_data(2, '2 Main St', 'meat', 'ORB')
+            with manager.engine.begin() as conn:
+                conn.execute(text("DELETE FROM restaurants WHERE id = 4"))
+
+            changes, latest, _ = read_feed(manager, since, 1)
+            assert [(change['op'], change['id']) for change in changes] == [('upsert', 2), ('delete', 4)]
+            assert changes[0]['restaurant']['kosher_category'] == 'meat'
+            assert changes[1]['restaurant'] is None
+            print(f"✅ Update and tombstone after version {since}")
+
+            # A full resync no longer includes the deleted restaurant
+            ids = {change['id'] for change in read_feed(manager, 0, 100)[0] if change['op'] == 'upsert'}
+            assert ids == {1, 2, 3, 5}
+
+            # A client ahead of the log (database rebuilt) must start over
+            assert manager.get_changes(since=latest + 10)['reset']
+        finally:
+            manager.disconnect()
+
+
+def test_changes_rejects_malformed_since():
+    """Test that /api/changes returns 400 instead of resyncing from 0 on a malformed version."""
+
+    print("🧪 Testing /api/changes parameter validation")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'feed.db')
+        feed_catalog(path).disconnect()
+        os.environ.setdefault('DATABASE_URL', f"sqlite:///{path}")
+        from app import app
+
+        client = app.test_client()
+        for query in ('since=abc', 'since=1.5', 'since=-1', 'limit=x', 'limit=0'):
+            response = client.get(f"/api/changes?{query}")
+            assert response.status_code == 400, query
+            print(f"✅ ?{query}: HTTP 400")
+
+
+if __name__ == "__main__":
+    try:
+        test_change_feed_paging()
+        test_change_feed_tombstones()
+        test_changes_rejects_malformed_since()
+        print("\n🎉 All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped catalog file (REPLICA_SOURCE=mmap).
+
+This script writes a scratch catalog to a mapped file, maps it back and
+checks that every record read through record() and rows() matches the
+in-memory replica it was written from, including nulls, booleans,
+timestamps, coordinates and specials.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager_v3 import RestaurantSpecial
+from scratch_catalog import scratch_catalog
+from utils.catalog_replica import ReplicaState, catalog_version, load_records
+from utils.mapped_catalog import MappedState, build_mapped_catalog, read_mapped_meta, write_mapped_catalog
+
+RESTAURANTS = [
+    {'name': 'Mapped Dairy', 'latitude': 25.79, 'longitude': -80.13, 'is_cholov_yisroel': True,
+     'hours_of_operation': 'Mon-Thu 11am-10pm'},
+    {'name': 'Mapped Meat', 'latitude': 25.95, 'longitude': -80.14, 'is_cholov_yisroel': False,
+     'hours_of_operation': None},
+    {'name': 'Café Ünicode', 'latitude': None, 'longitude': None, 'is_cholov_yisroel': None,
+     'hours_of_operation': ''},
+    {'name': 'Another Place', 'latitude': 40.71, 'longitude': -74.0, 'is_cholov_yisroel': None,
+     'hours_of_operation': 'Daily 9am-5pm'},
+]
+
+
+def mapped_catalog(path):
+    """Create a small catalog (with a special) in a new SQLite file."""
+    manager = scratch_catalog(path, RESTAURANTS)
+    with manager.engine.begin() as conn:
+        conn.execute(RestaurantSpecial.__table__.insert().values(
+            restaurant_id=2, title='Lunch deal', discount_percent=10.0, priority=1,
+            valid_until=datetime(2030, 1, 1, 12, 0),
+        ))
+    return manager
+
+
+def test_mapped_round_trip():
+    """Test write -> map -> record()/rows() returns the records the file was written from."""
+
+    print("🧪 Testing mapped catalog round trip")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = mapped_catalog(os.path.join(directory, 'catalog.db'))
+        try:
+            with manager.engine.connect() as conn:
+                state = ReplicaState(manager, load_records(manager, conn), catalog_version(conn), 0.5)
+
+            path = os.path.join(directory, 'catalog.map')
+            meta = write_mapped_catalog(state, path)
+            assert meta['rows'] == len(RESTAURANTS) == read_mapped_meta(path)['rows']
+
+            mapped = MappedState(manager, path)
+            assert mapped.count == state.count and mapped.version == state.version
+            assert list(mapped.id_positions) == list(state.id_positions)
+
+            columns = state.records[0].columns
+            rows = mapped.rows(range(mapped.count))
+            for expected, actual in zip(state.records, rows):
+                for column in columns:
+                    assert actual[column] == getattr(expected, column), (expected.id, column)
+                assert actual.specials == expected.specials
+                assert mapped.record(expected.id)['name'] == expected.name
+            assert mapped.record(2).specials[0]['title'] == 'Lunch deal'
+            assert mapped.record(999) is None
+            print(f"✅ {mapped.count} records x {len(columns)} columns match after mapping")
+
+            # Same positions and pages as the in-memory copy
+            assert list(mapped.positions(state='FL')) == list(state.positions(state='FL'))
+            assert sorted(mapped.within_box(25.9, -80.1, 1, 1)) == sorted(state.within_box(25.9, -80.1, 1, 1))
+        finally:
+            manager.disconnect()
+
+
+def test_mapped_build_skips_current_file():
+    """Test that build_mapped_catalog rewrites the file only when the catalog version changes."""
+
+    print("🧪 Testing mapped catalog rebuilds")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = mapped_catalog(os.path.join(directory, 'catalog.db'))
+        try:
+            path = os.path.join(directory, 'catalog.map')
+            assert not build_mapped_catalog(manager, path)['skipped']
+            assert build_mapped_catalog(manager, path)['skipped']
+
+            assert manager.update_restaurant_orb_data(1, '9 New St', 'meat', 'ORB')
+            assert not build_mapped_catalog(manager, path)['skipped']
+            assert MappedState(manager, path).record(1)['address'] == '9 New St'
+            print("✅ Rebuilt only after the catalog changed")
+        finally:
+            manager.disconnect()
+
+
+if __name__ == "__main__":
+    try:
+        test_mapped_round_trip()
+        test_mapped_build_skips_current_file()
+        print("\n🎉 All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
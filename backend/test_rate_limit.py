@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the API rate limiter token buckets.
+
+This script drains in-memory token buckets on a controlled clock and checks
+that requests are refused until the buckets refill, and that the Flask
+extension answers 429 with Retry-After once a client is out of tokens.
+"""
+
+import sys
+import os
+
+from flask import Flask
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils.rate_limit as rate_limit
+from utils.rate_limit import MemoryBucketStore, RateLimiter, parse_rates
+
+
+class FakeClock:
+    """Stands in for the time module in utils.rate_limit, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def with_clock(test):
+    """Run a test with utils.rate_limit reading a FakeClock."""
+    def run():
+        clock, real_time = FakeClock(), rate_limit.time
+        rate_limit.time = clock
+        try:
+            test(clock)
+        finally:
+            rate_limit.time = real_time
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@with_clock
+def test_bucket_runs_out_and_refills(clock):
+    """Test that a bucket refuses requests once empty and refills at its rate, up to its capacity."""
+
+    print("🧪 Testing token bucket drain and refill")
+    store, rates = MemoryBucketStore(), parse_rates('5 per second')
+
+    for _ in range(5):
+        assert store.consume(['client'], rates, 1)[0]
+    allowed, wait, remaining = store.consume(['client'], rates, 1)
+    assert not allowed and abs(wait - 0.2) < 1e-9 and remaining == 0
+    print(f"✅ Empty after 5 requests; next token in {wait:.1f}s")
+
+    clock.advance(0.2)
+    assert store.consume(['client'], rates, 1)[0]
+    assert not store.consume(['client'], rates, 1)[0]
+
+    # A long idle period refills to capacity, not beyond
+    clock.advance(60)
+    results = [store.consume(['client'], rates, 1)[0] for _ in range(6)]
+    assert results == [True] * 5 + [False]
+    print("✅ Refilled to capacity after idling")
+
+
+@with_clock
+def test_tightest_bucket_limits(clock):
+    """Test that every rate is enforced and a refused request takes no tokens."""
+
+    print("🧪 Testing several rates per client")
+    store, rates = MemoryBucketStore(), parse_rates('10 per second;12 per minute')
+    keys = ['client:1', 'client:60']
+
+    assert store.consume(keys, rates, 10)[0]
+    # Both buckets are short; the wait is the longer refill (3 tokens at 12 per minute)
+    allowed, wait, _ = store.consume(keys, rates, 5)
+    assert not allowed and abs(wait - 15.0) < 1e-9
+
+    # The per-second bucket is full again, but the per-minute one only has 2.2 tokens
+    clock.advance(1)
+    allowed, wait, _ = store.consume(keys, rates, 5)
+    assert not allowed and abs(wait - 14.0) < 1e-9
+    assert store.consume(keys, rates, 2)[0]
+    print("✅ Per-minute bucket limits after the per-second one refills")
+
+
+@with_clock
+def test_flask_429_with_retry_after(clock):
+    """Test that the extension answers 429 with Retry-After and rate limit headers."""
+
+    print("🧪 Testing 429 responses")
+    app = Flask(__name__)
+    app.config.update(RATELIMIT_DEFAULT='2 per minute', RATELIMIT_STORAGE_URL='memory://', RATELIMIT_PROXY_COUNT=0)
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    RateLimiter(app)
+    client = app.test_client()
+
+    responses = [client.get('/ping') for _ in range(3)]
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[0].headers['X-RateLimit-Limit'] == '2'
+    assert responses[1].headers['X-RateLimit-Remaining'] == '0'
+    assert responses[2].headers['Retry-After'] == '30'
+    assert responses[2].get_json()['retry_after'] == 30
+
+    clock.advance(30)
+    assert client.get('/ping').status_code == 200
+    print("✅ 429 with Retry-After: 30, then allowed after 30s")
+
+
+if __name__ == "__main__":
+    try:
+        test_bucket_runs_out_and_refills()
+        test_tightest_bucket_limits()
+        test_flask_429_with_retry_after()
+        print("\n🎉 All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -130,6 +130,36 @@ def test_timezone_mapping():
         timezone = calculator._get_timezone(lat, lng, city, state)
         print(f"📍 {city}, {state or 'Unknown'}: {timezone}")
 
+def test_offset_timezones():
+    """Test that reported UTC offsets resolve with daylight saving taken into account."""
+    from utils.timezone_resolver import resolve_timezone, timezone_for_offset
+    
+    print("\n🕐 Testing UTC Offset Timezones")
+    print("-" * 30)
+    
+    summer = datetime(2024, 7, 1, 16, 0, tzinfo=pytz.utc)
+    winter = datetime(2024, 1, 15, 16, 0, tzinfo=pytz.utc)
+    cases = [
+        (-240, summer, 'America/New_York'),
+        (-300, summer, 'America/Chicago'),
+        (-300, winter, 'America/New_York'),
+        (-360, winter, 'America/Chicago'),
+        (-420, summer, 'America/Los_Angeles'),
+        (-420, winter, 'America/Denver'),
+        (-480, winter, 'America/Los_Angeles'),
+        (-600, summer, 'Pacific/Honolulu'),
+        (-240, winter, 'America/Puerto_Rico'),
+        (120, winter, None),
+    ]
+    for offset, at, expected in cases:
+        timezone = timezone_for_offset(offset, at)
+        print(f"{'✅' if timezone == expected else '❌'} {offset:+d} min on {at.date()}: {timezone}")
+        assert timezone == expected
+    
+    # Location wins over the offset; a missing offset is not UTC+0
+    assert resolve_timezone(None, None, 'FL', utc_offset_minutes=0) == 'America/New_York'
+    assert resolve_timezone(None, None, None, utc_offset_minutes=None) == 'UTC'
+
 def test_hours_parsing():
     """Test business hours parsing functionality."""
     
@@ -156,11 +186,28 @@ def test_hours_parsing():
         else:
             print("❌ Failed to parse")
 
+def test_status_verdicts():
+    """Test open/closed/unknown verdicts of the hours corpus at fixed local times."""
+    
+    print("\n🕒 Testing Status Verdicts")
+    print("-" * 26)
+    
+    from benchmarks.bench_hours_parsing import check_status_cases
+    from benchmarks.hours_corpus import STATUS_CASES
+    
+    failures = check_status_cases(RestaurantStatusCalculator())
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"✅ {len(STATUS_CASES) - len(failures)}/{len(STATUS_CASES)} verdicts correct")
+    assert not failures
+
 if __name__ == "__main__":
     try:
         test_status_calculation()
         test_timezone_mapping()
+        test_offset_timezones()
         test_hours_parsing()
+        test_status_verdicts()
         print("\n🎉 All tests completed successfully!")
     except Exception as e:
         print(f"\n❌ Test failed with error: {e}")
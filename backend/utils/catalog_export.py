@@ -0,0 +1,138 @@
+"""
+Catalog Export Module
+
+This module turns batches of restaurant rows into streamed NDJSON or CSV
+chunks for the /api/export endpoint. Each batch is encoded into a single
+chunk, so the response is produced with constant memory no matter how
+large the catalog is.
+
+The status line is sent before the first row, so an error while streaming
+cannot turn into an error response. Every export therefore ends with a
+trailer recording whether it is complete, how many rows were sent and the
+last id (the ``after_id`` to resume from):
+
+- NDJSON: a final ``{"_export": {"complete": true, "rows": 305, "last_id": 305}}``
+  line (``"complete": false`` and an ``"error"`` message if it was cut short)
+- CSV: a final ``#export,complete=true,rows=305,last_id=305`` row
+  (``complete=false`` and ``error=...`` if it was cut short)
+
+An export without a trailer was truncated in transit.
+
+Features:
+- NDJSON output with specials/hours_json decoded into JSON values
+- CSV output with a header row, ISO-formatted timestamps and JSON-encoded specials
+- Completion trailer with the row count and resume cursor
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List
+
+from utils.json_encoding import dumps_bytes
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Text columns that hold JSON documents
+JSON_TEXT_COLUMNS = ('specials', 'hours_json')
+
+# NDJSON trailer key / first cell of the CSV trailer row
+EXPORT_TRAILER = '_export'
+CSV_TRAILER = '#export'
+
+
+def _decode_json_text(value: Any) -> Any:
+    """Decode a JSON text column, leaving undecodable values as-is."""
+    if not value or not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _csv_value(value: Any) -> Any:
+    """Format a value for a CSV cell (timestamps as ISO 8601, lists such as specials as JSON)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def ndjson_chunks(batches: Iterable[List[Dict[str, Any]]], columns: List[str]) -> Iterator[bytes]:
+    """Encode row batches as newline-delimited JSON, one chunk per batch."""
+    json_columns = [c for c in columns if c in JSON_TEXT_COLUMNS]
+    for batch in batches:
+        lines = []
+        for row in batch:
+            record = dict(row)
+            for column in json_columns:
+                record[column] = _decode_json_text(record[column])
+            lines.append(dumps_bytes(record))
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+
+def csv_chunks(batches: Iterable[List[Dict[str, Any]]], columns: List[str]) -> Iterator[bytes]:
+    """Encode row batches as CSV (header first), one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate(0)
+        for row in batch:
+            writer.writerow([_csv_value(row[column]) for column in columns])
+        yield buffer.getvalue().encode('utf-8')
+
+
+def ndjson_trailer(trailer: Dict[str, Any]) -> bytes:
+    """Encode the export trailer as the last NDJSON line."""
+    return dumps_bytes({EXPORT_TRAILER: trailer}) + b'\n'
+
+
+def csv_trailer(trailer: Dict[str, Any]) -> bytes:
+    """Encode the export trailer as the last CSV row (``#export,key=value,...``)."""
+    buffer = io.StringIO()
+    cells = [f"{key}={str(value).lower() if isinstance(value, bool) else value}" for key, value in trailer.items()]
+    csv.writer(buffer).writerow([CSV_TRAILER] + cells)
+    return buffer.getvalue().encode('utf-8')
+
+
+def export_chunks(export_format: str, batches: Iterable[List[Dict[str, Any]]], columns: List[str]) -> Iterator[bytes]:
+    """
+    Encode row batches in the requested export format, followed by the trailer.
+
+    Errors raised while streaming are logged and end the export with a
+    ``complete: false`` trailer carrying the error, so a cut-short export
+    never looks complete; the client resumes from its ``last_id``.
+    """
+    encoder, encode_trailer = (ndjson_chunks, ndjson_trailer) if export_format == 'ndjson' else (csv_chunks, csv_trailer)
+    trailer = {'complete': False, 'rows': 0, 'last_id': None}
+
+    def counted():
+        for batch in batches:
+            yield batch
+            # Resumed only after the encoder has yielded this batch's chunk
+            if batch:
+                trailer['rows'] += len(batch)
+                trailer['last_id'] = batch[-1].get('id')
+
+    try:
+        yield from encoder(counted(), columns)
+        trailer['complete'] = True
+    except Exception as e:
+        logger.error(f"Error streaming {export_format} export: {e}")
+        trailer['error'] = str(e)
+    yield encode_trailer(trailer)
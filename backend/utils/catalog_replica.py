@@ -0,0 +1,585 @@
+"""
+Catalog Replica Module
+
+This module keeps an in-memory replica of the restaurant catalog in each
+worker, so the listing, search and detail endpoints answer without a
+database round trip or ORM hydration. The catalog is a few thousand rows,
+so a full copy costs a few megabytes per worker.
+
+Every restaurant is held as a ``__slots__`` record (no per-object dict,
+low-cardinality strings interned) with its specials attached. Records are
+kept in name order (name_order_key, the order the database paths sort by),
+with secondary indexes on id, kosher_category, state, city,
+certifying_agency and a geo cell grid. Results are built with the same
+EnhancedDatabaseManager helpers as the database paths, so pages hold the
+same restaurants in the same order; the time-dependent status fields are
+computed per request.
+
+A background thread loads the replica when the worker starts (or on first
+use) and checks the catalog version every REPLICA_REFRESH_SECONDS: the
+latest catalog_changes version plus the specials count and last update,
+one cheap aggregate query. When it changed the catalog is reloaded and
+swapped in atomically; requests in flight finish on the previous copy.
+Until the first load completes, and with REPLICA_ENABLED off, reads go to
+the database.
+
+With REPLICA_SOURCE=mmap the replica is not copied into every worker:
+the same state is written to a flat file (utils/mapped_catalog.py) that
+the gunicorn master builds before forking and every worker memory-maps
+read-only, so all workers of a host share one physical copy and new
+workers start warm. A worker that sees a newer catalog version rebuilds
+the file under a host-wide lock; every worker remaps the new file when it
+lands.
+
+Features:
+- Slotted records with interned strings and name-ordered secondary indexes
+- Geo cell index for nearby queries
+- Version-checked background refresh with atomic swap
+- Optional fork-shared memory-mapped copy (REPLICA_SOURCE=mmap)
+- Memory footprint report (records, values and indexes)
+"""
+
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from utils.json_encoding import dumps_bytes, merge_fragment
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'REPLICA_ENABLED': False,
+    'REPLICA_REFRESH_SECONDS': 5,  # seconds between catalog version checks
+    'REPLICA_GEO_CELL_DEGREES': 0.5,  # side of a geo index cell (about 35 miles of latitude)
+    'REPLICA_SOURCE': 'memory',  # memory (copy per worker) or mmap (shared file, see utils/mapped_catalog.py)
+    'REPLICA_MMAP_PATH': '/tmp/jewgo-catalog.map',  # shared file for REPLICA_SOURCE=mmap
+}
+
+REPLICA_SOURCES = ('memory', 'mmap')
+
+# Secondary indexes: index name -> record attribute
+INDEXED_COLUMNS = {
+    'kosher_category': 'kosher_category',
+    'state': 'state',
+    'city': 'city',
+    'agency': 'certifying_agency',
+}
+
+# Repeated values shared across records (sys.intern)
+_INTERNED_COLUMNS = ('city', 'state', 'zip_code', 'kosher_category', 'listing_type', 'price_range',
+                     'certifying_agency', 'timezone', 'website_status', 'image_status')
+
+
+class CatalogRecord:
+    """
+    One restaurant: the restaurants columns plus its specials.
+
+    Slots are set per column in _record_class; records also read as a
+    mapping (record['name'], record.get(...), dict(record)) so the row-based
+    manager helpers accept them.
+    """
+
+    __slots__ = ()
+    columns = ()
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.columns
+
+
+def _record_class():
+    """Create the slotted record class for the current restaurants columns."""
+    from database.database_manager_v3 import Restaurant
+
+    columns = tuple(column.name for column in Restaurant.__table__.columns)
+    slots = columns + tuple(name for name in ('specials',) if name not in columns)
+    return type('RestaurantRecord', (CatalogRecord,), {'__slots__': slots, 'columns': columns})
+
+
+def catalog_version(conn) -> str:
+    """Version of everything the replica holds: the restaurants change log and the specials."""
+    from database.database_manager_v3 import RestaurantSpecial
+    from utils.snapshot import catalog_version as restaurants_version
+
+    count, updated = conn.execute(select(func.count(), func.max(RestaurantSpecial.updated_at))).one()
+    return f"{restaurants_version(conn)}/{count}:{updated.isoformat() if updated else ''}"
+
+
+def load_records(db_manager, conn) -> List[CatalogRecord]:
+    """Read every restaurant, with its specials (the specials attribute), into a record."""
+    from database.database_manager_v3 import Restaurant, RestaurantSpecial
+
+    record_class = _record_class()
+    columns = record_class.columns
+    interned = [column for column in _INTERNED_COLUMNS if column in columns]
+    records = []
+    for row in conn.execute(select(Restaurant.__table__)):
+        record = record_class()
+        for column, value in zip(columns, row):
+            setattr(record, column, value)
+        for column in interned:
+            value = getattr(record, column)
+            if value is not None:
+                setattr(record, column, sys.intern(value))
+        records.append(record)
+
+    table = RestaurantSpecial.__table__
+    specials = db_manager._group_specials(
+        conn.execute(select(table).order_by(table.c.restaurant_id, table.c.id)).mappings()
+    )
+    for record in records:
+        record.specials = specials.get(record.id, [])
+    return records
+
+
+class ReplicaState:
+    """
+    One loaded copy of the catalog (never modified after it is built).
+
+    Reads select row positions (indexes into records, which are in name
+    order) and only build the records of the page they return.
+
+    Attributes:
+        records: Records sorted by name_order_key (case-insensitive name, then id)
+        by_id: Record by restaurant id
+        id_positions: Positions sorted by restaurant id
+        indexes: Index name -> {value: positions, ascending}
+        cells: Geo cell (lat, lng) -> positions
+    """
+
+    def __init__(self, manager, records: List[CatalogRecord], version: str, cell_degrees: float):
+        """Build the indexes over the loaded records."""
+        from database.database_manager_v3 import name_order_key
+
+        self.manager = manager
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self.cell_degrees = cell_degrees
+        self.records = sorted(records, key=lambda record: name_order_key(record.name, record.id))
+        self.count = len(self.records)
+        self.by_id = {record.id: record for record in self.records}
+        self.id_positions = tuple(sorted(range(self.count), key=lambda position: self.records[position].id))
+        self.indexes = {name: {} for name in INDEXED_COLUMNS}
+        self.cells = {}
+        for position, record in enumerate(self.records):
+            for name, attribute in INDEXED_COLUMNS.items():
+                value = getattr(record, attribute)
+                if value is not None:
+                    self.indexes[name].setdefault(value, []).append(position)
+            if record.latitude is not None and record.longitude is not None:
+                self.cells.setdefault(self.cell(record.latitude, record.longitude), []).append(position)
+        self.indexes = {name: {value: tuple(positions) for value, positions in index.items()}
+                        for name, index in self.indexes.items()}
+        self.cells = {cell: tuple(positions) for cell, positions in self.cells.items()}
+        self.fragments: Dict[int, bytes] = {}
+
+    def value(self, name: str, position: int):
+        """Get one column value of the record at a position."""
+        return getattr(self.records[position], name)
+
+    def rows(self, positions) -> List[CatalogRecord]:
+        """Get the records at some positions."""
+        return [self.records[position] for position in positions]
+
+    def record(self, place_id: int) -> Optional[CatalogRecord]:
+        """Get the record of a restaurant id (None if there is none)."""
+        return self.by_id.get(place_id)
+
+    def fragment(self, record: CatalogRecord) -> bytes:
+        """Get the encoded static part of a record (encoded on first use)."""
+        from database.database_manager_v3 import _DYNAMIC_FIELDS
+
+        fragment = self.fragments.get(record.id)
+        if fragment is None:
+            static = self.manager._restaurant_static_dict(record, record.specials)
+            for key in _DYNAMIC_FIELDS:
+                static.pop(key, None)
+            fragment = self.fragments[record.id] = dumps_bytes(static)
+        return fragment
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Get the approximate memory held by this copy.
+
+        Values shared between records (interned strings, small ints) are
+        counted once; index bytes include the index structures only, not the
+        records they point to.
+        """
+        seen = set(id(record) for record in self.records)
+        record_bytes = sum(sys.getsizeof(record) for record in self.records)
+        value_bytes = sum(
+            _deep_size(getattr(record, slot), seen) for record in self.records for slot in type(record).__slots__
+        )
+        index_bytes = {
+            'records': sys.getsizeof(self.records),
+            'id': sys.getsizeof(self.by_id) + _deep_size(self.id_positions, seen),
+            'geo_cell': _deep_size(self.cells, seen),
+        }
+        for name, index in self.indexes.items():
+            index_bytes[name] = _deep_size(index, seen)
+        fragment_bytes = _deep_size(self.fragments, seen)
+        total = record_bytes + value_bytes + sum(index_bytes.values()) + fragment_bytes
+        return {
+            'source': 'memory',
+            'restaurants': self.count,
+            'record_bytes': record_bytes,
+            'value_bytes': value_bytes,
+            'index_bytes': index_bytes,
+            'fragment_bytes': fragment_bytes,
+            'total_bytes': total,
+            'bytes_per_restaurant': round(total / self.count) if self.count else 0,
+        }
+
+    def cell(self, latitude: float, longitude: float) -> tuple:
+        """Geo cell of a point."""
+        return (math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees))
+
+    def positions(self, **filters):
+        """
+        Get the positions of the records equal to every filter (None filters are ignored), in name order.
+
+        Filters are INDEXED_COLUMNS names; the shortest matching posting list
+        is scanned and checked against the other filters.
+        """
+        filters = {name: value for name, value in filters.items() if value is not None}
+        if not filters:
+            return range(self.count)
+        postings = min((self.indexes[name].get(value, ()) for name, value in filters.items()), key=len)
+        if len(filters) == 1:
+            return postings
+        checks = [(INDEXED_COLUMNS[name], value) for name, value in filters.items()]
+        return [position for position in postings
+                if all(self.value(attribute, position) == value for attribute, value in checks)]
+
+    def in_id_order(self, positions):
+        """Order positions by restaurant id (the database's unordered scan order)."""
+        if isinstance(positions, range) and len(positions) == self.count:
+            return self.id_positions
+        return sorted(positions, key=lambda position: self.value('id', position))
+
+    def within_box(self, latitude: float, longitude: float, lat_delta: float, lng_delta: float) -> List[int]:
+        """Get the positions of the records inside a latitude/longitude box, from the geo cells it covers."""
+        low_lat, low_lng = self.cell(latitude - lat_delta, longitude - lng_delta)
+        high_lat, high_lng = self.cell(latitude + lat_delta, longitude + lng_delta)
+        if (high_lat - low_lat + 1) * (high_lng - low_lng + 1) > len(self.cells):
+            cells = [cell for cell in self.cells if low_lat <= cell[0] <= high_lat and low_lng <= cell[1] <= high_lng]
+        else:
+            cells = [(cell_lat, cell_lng) for cell_lat in range(low_lat, high_lat + 1)
+                     for cell_lng in range(low_lng, high_lng + 1)]
+        positions = []
+        for cell in cells:
+            for position in self.cells.get(cell, ()):
+                if abs(self.value('latitude', position) - latitude) <= lat_delta \
+                        and abs(self.value('longitude', position) - longitude) <= lng_delta:
+                    positions.append(position)
+        return positions
+
+
+def _contains(value: Optional[str], needle: str) -> bool:
+    """Case-insensitive substring match (ILIKE '%needle%'; never matches None)."""
+    return value is not None and needle in value.lower()
+
+
+def _deep_size(value, seen: set) -> int:
+    """Approximate memory of a value and what it references (shared objects counted once)."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_size(item, seen) for item in value)
+    elif isinstance(value, CatalogRecord):
+        size += sum(_deep_size(getattr(value, slot), seen) for slot in type(value).__slots__)
+    return size
+
+
+class CatalogReplica:
+    """
+    Flask extension serving catalog reads from an in-memory replica.
+
+    The read methods have the signatures and results of the
+    EnhancedDatabaseManager methods of the same name.
+
+    Usage:
+        catalog_replica = CatalogReplica()
+        catalog_replica.init_app(app, get_db_manager)
+        reader = catalog_replica.reader() or db_manager  # None until loaded
+    """
+
+    def __init__(self, app=None, get_db_manager: Callable = None, **settings):
+        """Initialize the replica (settings override DEFAULT_SETTINGS)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.get_db_manager = get_db_manager
+        self._state: Optional[ReplicaState] = None
+        self._checked_at = None
+        self._last_error = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._refresher = None
+        # Copy pinned by the read_snapshot() block running in this thread
+        self._pinned = threading.local()
+        if app is not None:
+            self.init_app(app, get_db_manager)
+
+    def init_app(self, app, get_db_manager: Callable = None) -> None:
+        """Read configuration from the app."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        if get_db_manager is not None:
+            self.get_db_manager = get_db_manager
+        if self.settings['REPLICA_SOURCE'] not in REPLICA_SOURCES:
+            raise ValueError(f"REPLICA_SOURCE must be one of {', '.join(REPLICA_SOURCES)}")
+        app.extensions['catalog_replica'] = self
+
+    @property
+    def enabled(self) -> bool:
+        """Whether reads are served from the replica once it is loaded."""
+        return bool(self.settings['REPLICA_ENABLED'])
+
+    def start(self, timeout: Optional[float] = None) -> bool:
+        """
+        Start the refresh thread and wait up to ``timeout`` seconds for the first load (call after forking).
+
+        Returns:
+            Whether the replica is loaded
+        """
+        if not self.enabled:
+            return False
+        self._ensure_refresher()
+        return self._loaded.wait(timeout)
+
+    def reader(self) -> Optional['CatalogReplica']:
+        """Get the replica for reads (None while disabled or not loaded yet; starts the refresh thread)."""
+        if not self.enabled:
+            return None
+        self._ensure_refresher()
+        return self if self._state is not None else None
+
+    def _ensure_refresher(self) -> None:
+        """Start the background refresh thread (once per process)."""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name='catalog-replica', daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Reload the replica whenever the catalog version changes."""
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"Catalog replica refresh failed: {e}")
+            time.sleep(self.settings['REPLICA_REFRESH_SECONDS'])
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the replica if the catalog changed since the last load.
+
+        Returns:
+            Whether a new copy was loaded
+        """
+        db_manager = self.get_db_manager()
+        if db_manager is None or db_manager.engine is None:
+            raise RuntimeError("Database not connected")
+        if self.settings['REPLICA_SOURCE'] == 'mmap':
+            return self._refresh_mapped(db_manager, force)
+        with db_manager.engine.connect() as conn:
+            version = catalog_version(conn)
+            self._checked_at = datetime.utcnow()
+            if not force and self._state is not None and self._state.version == version:
+                return False
+            state = self.load(db_manager, conn, version)
+        previous, self._state = self._state, state
+        self._last_error = None
+        self._loaded.set()
+        logger.info(f"Catalog replica loaded: {state.count} restaurants, version {version}"
+                    + (f" (was {previous.version})" if previous is not None else ""))
+        return True
+
+    def _refresh_mapped(self, db_manager, force: bool = False) -> bool:
+        """Rebuild the mapped catalog file if it is stale (unless another worker is), then remap it if it changed."""
+        from utils.mapped_catalog import MappedState, build_mapped_catalog
+
+        path = self.settings['REPLICA_MMAP_PATH']
+        build_mapped_catalog(db_manager, path, force=force, blocking=self._state is None,
+                             cell_degrees=float(self.settings['REPLICA_GEO_CELL_DEGREES']))
+        self._checked_at = datetime.utcnow()
+        stat = os.stat(path)
+        if not force and self._state is not None and \
+                getattr(self._state, 'file_key', None) == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            return False
+        state = MappedState(db_manager, path)
+        previous, self._state = self._state, state
+        self._last_error = None
+        self._loaded.set()
+        logger.info(f"Catalog replica mapped from {path}: {state.count} restaurants, version {state.version}"
+                    + (f" (was {previous.version})" if previous is not None else ""))
+        return True
+
+    def load(self, db_manager, conn, version: str) -> ReplicaState:
+        """Read the whole catalog into a new ReplicaState."""
+        return ReplicaState(db_manager, load_records(db_manager, conn), version,
+                            float(self.settings['REPLICA_GEO_CELL_DEGREES']))
+
+    @contextmanager
+    def read_snapshot(self):
+        """Serve the reads inside the block from one loaded copy (EnhancedDatabaseManager.read_snapshot)."""
+        if getattr(self._pinned, 'state', None) is not None:
+            yield self
+            return
+        self._pinned.state = self._state
+        try:
+            yield self
+        finally:
+            self._pinned.state = None
+
+    def _current(self) -> ReplicaState:
+        """Get the copy to read: the one pinned by read_snapshot(), else the latest."""
+        state = getattr(self._pinned, 'state', None)
+        return state if state is not None else self._state
+
+    def get_all_places(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get a page of places in id order, sorted by name within the page."""
+        replica = self._current()
+        page = replica.rows(sorted(replica.in_id_order(replica.positions())[offset:offset + limit]))
+        return [replica.manager._restaurant_to_unified_dict(record, record.specials) for record in page]
+
+    def get_places_projected(self, fields: List[str], limit: int = 100, offset: int = 0,
+                             kosher_category: str = None, state: str = None) -> List[Dict[str, Any]]:
+        """Get places with only the requested fields, filtered and in name order."""
+        replica = self._current()
+        page = replica.rows(replica.positions(kosher_category=kosher_category, state=state)[offset:offset + limit])
+        return self._projected(replica, page, fields)
+
+    def get_all_places_encoded(self, limit: int = 100, offset: int = 0,
+                               kosher_category: str = None, state: str = None) -> List[bytes]:
+        """Get a page of places as JSON fragments; the static part is encoded once per loaded copy."""
+        replica = self._current()
+        positions = replica.in_id_order(replica.positions(kosher_category=kosher_category, state=state))
+        encoded = []
+        for record in replica.rows(sorted(positions[offset:offset + limit])):
+            fragment = replica.fragment(record)
+            encoded.append(merge_fragment(fragment, replica.manager._restaurant_status_fields(dict(record), record.name)))
+        return encoded
+
+    def search_places(self, query: str = None, category: str = None, state: str = None,
+                      limit: int = 50, offset: int = 0, is_kosher: bool = None) -> List[Dict[str, Any]]:
+        """Search places by name, listing type and state substrings, in id order."""
+        replica = self._current()
+        page = replica.rows(replica.in_id_order(self._search(replica, query, category, state))[offset:offset + limit])
+        return [replica.manager._restaurant_to_unified_dict(record, record.specials) for record in page]
+
+    def get_facets(self, kosher_category: str = None, state: str = None, query: str = None) -> Dict[str, Dict[str, int]]:
+        """Get facet counts for the records matching the filters."""
+        from database.database_manager_v3 import FACET_COLUMNS
+
+        replica = self._current()
+        positions = replica.positions(kosher_category=kosher_category, state=state)
+        if query:
+            positions = self._search(replica, query, positions=positions)
+        facets = {name: {} for name in FACET_COLUMNS}
+        for name in FACET_COLUMNS:
+            counts = facets[name]
+            for position in positions:
+                value = replica.value(name, position)
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = 'true' if value else 'false'
+                counts[value] = counts.get(value, 0) + 1
+        return facets
+
+    def get_places_nearby(self, latitude: float, longitude: float, radius: float = 10,
+                          fields: List[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get places within ``radius`` miles of a point, nearest first (candidates from the geo cells)."""
+        from database.database_manager_v3 import _MILES_PER_DEGREE, SUMMARY_FIELDS, STATUS_FIELDS
+
+        replica = self._current()
+        fields = list(fields or SUMMARY_FIELDS)
+        lat_delta = radius / _MILES_PER_DEGREE
+        lng_scale = max(math.cos(math.radians(latitude)), 0.01)
+        positions = replica.within_box(latitude, longitude, lat_delta, lat_delta / lng_scale)
+        positions.sort(key=lambda position: (
+            (replica.value('latitude', position) - latitude) ** 2
+            + ((replica.value('longitude', position) - longitude) * lng_scale) ** 2,
+            replica.value('id', position)))
+        candidates = replica.rows(positions[:limit])
+        wants_status = any(field in STATUS_FIELDS for field in fields)
+        specials = {record.id: record.specials for record in candidates} if 'specials' in fields else None
+        return replica.manager._nearby_results(candidates, latitude, longitude, radius, fields, wants_status, specials)
+
+    def get_place_by_id(self, place_id: int) -> Optional[Dict[str, Any]]:
+        """Get a place by id (None if there is none)."""
+        replica = self._current()
+        record = replica.record(place_id)
+        if record is None:
+            return None
+        return replica.manager._restaurant_to_unified_dict(record, record.specials)
+
+    def _search(self, replica: ReplicaState, query: str = None, category: str = None, state: str = None,
+                positions=None) -> List[int]:
+        """Filter positions as search_places does (ILIKE substrings); the state filter scans the state index keys."""
+        if positions is None:
+            positions = range(replica.count)
+            if state:
+                needle = state.lower()
+                positions = sorted(position for value, postings in replica.indexes['state'].items()
+                                   if needle in value.lower() for position in postings)
+        elif state:
+            positions = [position for position in positions if _contains(replica.value('state', position), state.lower())]
+        for column, needle in (('name', query), ('listing_type', category)):
+            if needle:
+                positions = [position for position in positions
+                             if _contains(replica.value(column, position), needle.lower())]
+        return list(positions)
+
+    def _projected(self, replica: ReplicaState, records: List[CatalogRecord], fields: List[str]) -> List[Dict[str, Any]]:
+        """Convert records to dictionaries with only the requested fields."""
+        from database.database_manager_v3 import STATUS_FIELDS
+
+        wants_status = any(field in STATUS_FIELDS for field in fields)
+        specials = {record.id: record.specials for record in records} if 'specials' in fields else None
+        return [replica.manager._row_to_fields(record, fields, wants_status, specials) for record in records]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Get the approximate memory held by the loaded replica (see ReplicaState.memory_report)."""
+        state = self._state
+        if state is None:
+            return {'restaurants': 0, 'total_bytes': 0}
+        return state.memory_report()
+
+    def status(self) -> Dict[str, Any]:
+        """Get whether the replica serves reads, its version and load/check times."""
+        state = self._state
+        return {
+            'enabled': self.enabled,
+            'loaded': state is not None,
+            'version': state.version if state else None,
+            'loaded_at': state.loaded_at.isoformat() if state else None,
+            'checked_at': self._checked_at.isoformat() if self._checked_at else None,
+            'refresh_seconds': self.settings['REPLICA_REFRESH_SECONDS'],
+            'error': self._last_error,
+        }
+
+
+# Global catalog replica (bound to the app in app.py)
+catalog_replica = CatalogReplica()
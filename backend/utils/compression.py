@@ -0,0 +1,134 @@
+"""
+Response Compression Module
+
+This module provides gzip/brotli negotiation for the Flask API. Large JSON
+responses are compressed according to the client's Accept-Encoding header.
+Responses are compressed on every request: listing bodies carry per-request
+status fields (is_open, current_time_local), so no two are byte-identical
+and a cache of compressed bodies would never hit; the static part of each
+restaurant is cached as a JSON fragment instead (utils/json_encoding.py).
+
+Features:
+- Accept-Encoding negotiation with q-values (brotli preferred, gzip fallback)
+- Configurable size threshold, compression levels and mimetypes
+- Streaming and already-encoded responses are left untouched
+"""
+
+import gzip
+import logging
+from typing import Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'COMPRESS_ENABLED': True,
+    'COMPRESS_MIN_SIZE': 1024,  # bytes
+    'COMPRESS_LEVEL': 6,  # gzip level (1-9)
+    'COMPRESS_BR_LEVEL': 5,  # brotli quality (0-11)
+    'COMPRESS_MIMETYPES': ['application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'],
+}
+
+
+class ResponseCompressor:
+    """
+    Flask extension that compresses responses after the view has run.
+
+    Usage:
+        compressor = ResponseCompressor(app)
+    """
+
+    def __init__(self, app=None):
+        """Initialize the compressor (optionally binding an app)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration and register the after_request hook."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        app.extensions['response_compressor'] = self
+        app.after_request(self.compress_response)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """
+        Pick the best supported encoding from an Accept-Encoding header.
+
+        Returns:
+            'br', 'gzip' or None
+        """
+        if not accept_encoding:
+            return None
+
+        weights = {}
+        for part in accept_encoding.split(','):
+            token, _, params = part.strip().partition(';')
+            token = token.strip().lower()
+            q = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            weights[token] = q
+
+        candidates = []
+        if brotli is not None:
+            candidates.append('br')
+        candidates.append('gzip')
+
+        best, best_q = None, 0.0
+        for encoding in candidates:
+            q = weights.get(encoding, weights.get('*', 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """Compress data with the given encoding."""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.settings['COMPRESS_BR_LEVEL'])
+        return gzip.compress(data, compresslevel=self.settings['COMPRESS_LEVEL'], mtime=0)
+
+    def compress_response(self, response):
+        """after_request hook: compress the response if the client accepts it."""
+        try:
+            if not self.settings['COMPRESS_ENABLED']:
+                return response
+            if response.direct_passthrough or response.is_streamed:
+                return response
+            if response.status_code < 200 or response.status_code >= 300 or response.status_code == 204:
+                return response
+            if 'Content-Encoding' in response.headers:
+                return response
+            if response.mimetype not in self.settings['COMPRESS_MIMETYPES']:
+                return response
+
+            response.vary.add('Accept-Encoding')
+
+            data = response.get_data()
+            if len(data) < self.settings['COMPRESS_MIN_SIZE']:
+                return response
+
+            encoding = self.negotiate(request.headers.get('Accept-Encoding', ''))
+            if not encoding:
+                return response
+
+            compressed = self.compress(data, encoding)
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+            response.headers['Content-Length'] = str(len(compressed))
+            return response
+
+        except Exception as e:
+            logger.error(f"Error compressing response: {e}")
+            return response
@@ -0,0 +1,426 @@
+"""
+Duplicate Detection Module
+
+This module finds duplicate restaurants that differ in punctuation, name
+suffixes ("Pizza in Hollywood", "Grill Xpress (Davie)") and address
+formatting, and builds a merge plan for them. It works on plain record
+dictionaries; EnhancedDatabaseManager loads the records and applies plans.
+
+Comparing every pair is quadratic, so records are first grouped into blocks
+that share a blocking key:
+
+- the same phone number (10 digits)
+- a name token within the same geohash cell (about 5 x 5 km)
+- a name token within the same ZIP code
+
+Only records sharing a block are scored, and oversized blocks (very common
+tokens) are skipped, so the work grows roughly linearly with the catalog.
+Matching pairs are clustered, and each cluster keeps its best-enriched
+record; empty fields of the kept record are filled from the others.
+
+Features:
+- Name, phone and address normalization
+- Geohash, phone and ZIP blocking keys with a block size cap
+- Fast string similarity (rapidfuzz when installed, difflib otherwise)
+- Union-find clustering and enrichment-ranked merge plans
+"""
+
+import difflib
+import logging
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # pragma: no cover - optional dependency
+    fuzz = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'DEDUPE_GEOHASH_PRECISION': 5,  # ~4.9 km x 4.9 km cells
+    'DEDUPE_MAX_BLOCK_SIZE': 100,  # larger blocks are skipped
+    'DEDUPE_NAME_THRESHOLD': 0.9,  # name similarity needed with address/location evidence
+    'DEDUPE_PHONE_NAME_THRESHOLD': 0.7,  # name similarity needed when phones match
+    'DEDUPE_ADDRESS_THRESHOLD': 0.85,
+    'DEDUPE_DISTANCE_MILES': 0.1,
+}
+
+# Columns a duplicate detection record needs
+RECORD_COLUMNS = (
+    'id', 'name', 'address', 'city', 'zip_code', 'phone_number', 'latitude', 'longitude', 'updated_at'
+)
+
+# Columns that count towards a record's enrichment and are filled from merged duplicates
+ENRICHMENT_COLUMNS = (
+    'website', 'hours_of_operation', 'hours_json', 'hours_last_updated', 'short_description',
+    'price_range', 'image_url', 'google_listing_url', 'latitude', 'longitude', 'timezone',
+    'is_cholov_yisroel', 'is_pas_yisroel'
+)
+
+# Tokens that never distinguish restaurants
+_STOP_TOKENS = frozenset({
+    'the', 'and', 'a', 'an', 'of', 'at', 'by', 'kosher', 'restaurant', 'inc', 'llc', 'co', 'corp', 'ltd'
+})
+
+# Placeholders written by the ORB loaders for missing values
+_PLACEHOLDERS = frozenset({
+    'address not provided', 'city not provided', 'state not provided', 'zip not provided', 'phone not provided'
+})
+
+_ADDRESS_ABBREVIATIONS = {
+    'street': 'st', 'avenue': 'ave', 'av': 'ave', 'road': 'rd', 'boulevard': 'blvd', 'drive': 'dr',
+    'lane': 'ln', 'court': 'ct', 'place': 'pl', 'parkway': 'pkwy', 'highway': 'hwy', 'terrace': 'ter',
+    'circle': 'cir', 'square': 'sq', 'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
+}
+_UNIT_TOKENS = frozenset({'suite', 'ste', 'unit', 'apt', 'fl', 'floor', 'rm', 'room'})
+
+_PARENTHESES = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+_LOCATION_SUFFIX = re.compile(r'\s+(?:in|of|at|-|–)\s+(.+)$')
+
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+_EARTH_RADIUS_MILES = 3958.8
+
+
+def _ascii_lower(value: str) -> str:
+    """Lowercase and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _clean(value: Optional[str]) -> str:
+    """Normalize a text value, treating loader placeholders as empty."""
+    if not value:
+        return ''
+    value = _ascii_lower(str(value)).strip()
+    return '' if value in _PLACEHOLDERS else value
+
+
+def normalize_name(name: Optional[str], city: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Normalize a restaurant name to its distinguishing tokens.
+
+    Parenthesized notes are dropped, as is a trailing location suffix
+    ("in Hollywood", "- Boca") naming the restaurant's own city.
+    """
+    value = _clean(name).replace('&', ' and ').replace("'", '')
+    value = _PARENTHESES.sub(' ', value)
+
+    city_tokens = set(_NON_ALPHANUMERIC.sub(' ', _clean(city)).split())
+    match = _LOCATION_SUFFIX.search(value)
+    if match and city_tokens and set(_NON_ALPHANUMERIC.sub(' ', match.group(1)).split()) <= city_tokens:
+        value = value[:match.start()]
+
+    tokens = [t for t in _NON_ALPHANUMERIC.sub(' ', value).split() if t not in _STOP_TOKENS]
+    return tuple(tokens)
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Get the 10 digits of a US phone number (None if it has none)."""
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    if len(digits) != 10 or len(set(digits)) == 1:
+        return None
+    return digits
+
+
+def normalize_address(address: Optional[str]) -> str:
+    """Normalize a street address (abbreviated suffixes and directions, no unit numbers)."""
+    tokens = _NON_ALPHANUMERIC.sub(' ', _clean(address).replace('#', ' unit ')).split()
+    normalized = []
+    skip_next = False
+    for token in tokens:
+        if skip_next:
+            skip_next = False
+            continue
+        if token in _UNIT_TOKENS:
+            skip_next = True
+            continue
+        normalized.append(_ADDRESS_ABBREVIATIONS.get(token, token))
+    return ' '.join(normalized)
+
+
+def _house_number(address: str) -> Optional[str]:
+    """Get the leading house number of a normalized address."""
+    first = address.split(' ', 1)[0]
+    return first if first.isdigit() else None
+
+
+def geohash(latitude: float, longitude: float, precision: int = 5) -> str:
+    """Encode a point as a geohash cell of the given precision."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell = []
+    bits, bit_count, even = 0, 0, True
+    while len(cell) < precision:
+        target, value = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            cell.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(cell)
+
+
+def similarity(a: str, b: str, cutoff: float = 0.0) -> float:
+    """String similarity between 0 and 1 (0 when below ``cutoff``, which skips most of the work)."""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return fuzz.ratio(a, b, score_cutoff=cutoff * 100) / 100
+    matcher = difflib.SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio if ratio >= cutoff else 0.0
+
+
+def _distance_miles(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[float]:
+    """Great-circle distance between two prepared records (None without coordinates)."""
+    if a['latitude'] is None or b['latitude'] is None:
+        return None
+    phi1, phi2 = math.radians(a['latitude']), math.radians(b['latitude'])
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(b['longitude'] - a['longitude'])
+    h = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(h)))
+
+
+def enrichment_score(record: Dict[str, Any]) -> int:
+    """Count the enriched fields of a record (plus its Google Places data and specials)."""
+    score = sum(1 for column in ENRICHMENT_COLUMNS if record.get(column) not in (None, ''))
+    return score + 2 * int(bool(record.get('google_places'))) + int(bool(record.get('specials')))
+
+
+class DuplicateDetector:
+    """
+    Blocking-based duplicate finder over restaurant records.
+
+    Usage:
+        detector = DuplicateDetector()
+        groups = detector.find_groups(records)
+        plan = detector.merge_plan(groups)
+    """
+
+    def __init__(self, **settings):
+        """Initialize the detector (settings override DEFAULT_SETTINGS)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.stats = {}
+
+    def prepare(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the normalized values used for blocking and scoring."""
+        tokens = normalize_name(record.get('name'), record.get('city'))
+        latitude, longitude = record.get('latitude'), record.get('longitude')
+        has_location = latitude is not None and longitude is not None and (latitude, longitude) != (0, 0)
+        return {
+            'record': record,
+            'id': record['id'],
+            'tokens': tokens,
+            'name': ' '.join(sorted(tokens)),
+            'phone': normalize_phone(record.get('phone_number')),
+            'address': normalize_address(record.get('address')),
+            'zip': _clean(record.get('zip_code'))[:5],
+            'latitude': latitude if has_location else None,
+            'longitude': longitude if has_location else None,
+        }
+
+    def blocking_keys(self, prepared: Dict[str, Any]) -> set:
+        """Get the blocks a prepared record belongs to."""
+        keys = set()
+        if prepared['phone']:
+            keys.add(f"p:{prepared['phone']}")
+        cell = None
+        if prepared['latitude'] is not None:
+            cell = geohash(prepared['latitude'], prepared['longitude'], self.settings['DEDUPE_GEOHASH_PRECISION'])
+        for token in prepared['tokens']:
+            if len(token) < 2:
+                continue
+            if cell:
+                keys.add(f"g:{cell}:{token}")
+            if prepared['zip']:
+                keys.add(f"z:{prepared['zip']}:{token}")
+        return keys
+
+    def score_pair(self, a: Dict[str, Any], b: Dict[str, Any]) -> Tuple[float, List[str]]:
+        """
+        Score two prepared records.
+
+        Returns:
+            (score between 0 and 1, matching reasons); the score is 0 unless
+            the pair is considered a duplicate
+        """
+        # Numbers in names tell branches apart ("Grill 2")
+        numbers_a = {t for t in a['tokens'] if t.isdigit()}
+        numbers_b = {t for t in b['tokens'] if t.isdigit()}
+        if numbers_a and numbers_b and numbers_a != numbers_b:
+            return 0.0, []
+        name_similarity = similarity(a['name'], b['name'], self.settings['DEDUPE_PHONE_NAME_THRESHOLD'])
+        if not name_similarity:
+            return 0.0, []
+
+        same_phone = bool(a['phone']) and a['phone'] == b['phone']
+        conflicting_phone = bool(a['phone']) and bool(b['phone']) and not same_phone
+        # Different house numbers are different places, however similar the rest
+        house_a, house_b = _house_number(a['address']), _house_number(b['address'])
+        address_threshold = self.settings['DEDUPE_ADDRESS_THRESHOLD']
+        if house_a and house_b and house_a != house_b:
+            address_similarity = 0.0
+        else:
+            address_similarity = similarity(a['address'], b['address'], address_threshold)
+        distance = _distance_miles(a, b)
+        near = distance is not None and distance <= self.settings['DEDUPE_DISTANCE_MILES']
+        same_address = address_similarity >= address_threshold
+        conflicting_address = bool(a['address']) and bool(b['address']) and not same_address
+
+        reasons = [f"name {name_similarity:.2f}"]
+        if same_phone:
+            reasons.append('same phone')
+        if same_address:
+            reasons.append(f"address {address_similarity:.2f}")
+        if near:
+            reasons.append(f"{distance:.2f} mi apart")
+
+        if same_phone:
+            duplicate = True
+        elif name_similarity >= self.settings['DEDUPE_NAME_THRESHOLD'] and (same_address or (near and not conflicting_address)):
+            duplicate = True
+        else:
+            # Same name in the same ZIP and nothing contradicting it (e.g. an ORB listing without
+            # address or phone entered again by hand)
+            conflicting_location = distance is not None and not near
+            duplicate = (name_similarity == 1.0 and bool(a['zip']) and a['zip'] == b['zip']
+                         and not (conflicting_phone or conflicting_address or conflicting_location))
+            if duplicate:
+                reasons.append('same ZIP')
+        if not duplicate:
+            return 0.0, []
+
+        score = 0.6 * name_similarity + 0.2 * same_phone + 0.2 * max(address_similarity, float(near))
+        return round(score, 3), reasons
+
+    def find_groups(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Find groups of duplicate records.
+
+        Returns:
+            Groups as {'members': [records], 'pairs': [(id, id, score, reasons)]}
+        """
+        prepared = {}
+        blocks = defaultdict(list)
+        for record in records:
+            item = self.prepare(record)
+            prepared[item['id']] = item
+            for key in self.blocking_keys(item):
+                blocks[key].append(item['id'])
+
+        max_block = self.settings['DEDUPE_MAX_BLOCK_SIZE']
+        compared = set()
+        pairs = []
+        skipped = 0
+        for ids in blocks.values():
+            if len(ids) < 2:
+                continue
+            if len(ids) > max_block:
+                skipped += 1
+                continue
+            for i, first in enumerate(ids):
+                for second in ids[i + 1:]:
+                    pair = (first, second) if first < second else (second, first)
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    score, reasons = self.score_pair(prepared[pair[0]], prepared[pair[1]])
+                    if score:
+                        pairs.append((pair[0], pair[1], score, reasons))
+
+        self.stats = {
+            'records': len(prepared),
+            'blocks': sum(1 for ids in blocks.values() if len(ids) > 1),
+            'skipped_blocks': skipped,
+            'comparisons': len(compared),
+            'matching_pairs': len(pairs),
+        }
+        logger.info(f"Duplicate detection: {self.stats}")
+        return self._cluster(pairs, prepared)
+
+    def _cluster(self, pairs: List[tuple], prepared: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cluster matching pairs into groups (union-find)."""
+        parent = {}
+
+        def find(item):
+            parent.setdefault(item, item)
+            while parent[item] != item:
+                parent[item] = parent[parent[item]]
+                item = parent[item]
+            return item
+
+        for first, second, _, _ in pairs:
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+
+        groups = defaultdict(lambda: {'members': [], 'pairs': []})
+        for item in parent:
+            groups[find(item)]['members'].append(prepared[item]['record'])
+        for pair in pairs:
+            groups[find(pair[0])]['pairs'].append(pair)
+        return [groups[root] for root in sorted(groups)]
+
+    def merge_plan(self, groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build the merge plan for duplicate groups.
+
+        Each group keeps its best-enriched record (the oldest on ties) and
+        fills its empty enrichment columns from the other members, best first.
+        """
+        plan = []
+        for group in groups:
+            members = sorted(group['members'], key=lambda r: (-enrichment_score(r), r['id']))
+            keep = members[0]
+            fill = {}
+            for column in ENRICHMENT_COLUMNS:
+                if keep.get(column) not in (None, ''):
+                    continue
+                for donor in members[1:]:
+                    if donor.get(column) not in (None, ''):
+                        fill[column] = donor[column]
+                        break
+            # Coordinates are only taken together
+            if ('latitude' in fill) != ('longitude' in fill):
+                fill.pop('latitude', None)
+                fill.pop('longitude', None)
+
+            plan.append({
+                'keep_id': keep['id'],
+                'remove_ids': [r['id'] for r in members[1:]],
+                'score': min(pair[2] for pair in group['pairs']),
+                'reasons': sorted({reason for pair in group['pairs'] for reason in pair[3]}),
+                'members': [
+                    {
+                        'id': r['id'],
+                        'name': r.get('name'),
+                        'address': r.get('address'),
+                        'phone_number': r.get('phone_number'),
+                        'enrichment': enrichment_score(r),
+                    }
+                    for r in members
+                ],
+                'fill': fill,
+            })
+        return plan
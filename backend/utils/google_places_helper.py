@@ -15,6 +15,8 @@ import requests
 import time
 import structlog
 
+from utils.metrics import external_get
+
 logger = structlog.get_logger()
 
 def search_google_places_website(restaurant_name: str, address: str) -> str:
@@ -40,7 +42,7 @@ def search_google_places_website(restaurant_name: str, address: str) -> str:
         }
         
         logger.info(f"Searching Google Places for: {query}")
-        response = requests.get(search_url, params=search_params, timeout=10)
+        response = external_get('google_places', search_url, params=search_params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -57,7 +59,7 @@ def search_google_places_website(restaurant_name: str, address: str) -> str:
             }
             
             logger.info(f"Getting place details for place_id: {place_id}")
-            details_response = requests.get(details_url, params=details_params, timeout=10)
+            details_response = external_get('google_places', details_url, params=details_params, timeout=10)
             details_response.raise_for_status()
             
             details_data = details_response.json()
@@ -120,7 +122,7 @@ def search_google_places_hours(restaurant_name: str, address: str) -> str:
         }
         
         logger.info(f"Searching Google Places for hours: {query}")
-        response = requests.get(search_url, params=search_params, timeout=10)
+        response = external_get('google_places', search_url, params=search_params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -137,7 +139,7 @@ def search_google_places_hours(restaurant_name: str, address: str) -> str:
             }
             
             logger.info(f"Getting place details for hours, place_id: {place_id}")
-            details_response = requests.get(details_url, params=details_params, timeout=10)
+            details_response = external_get('google_places', details_url, params=details_params, timeout=10)
             details_response.raise_for_status()
             
             details_data = details_response.json()
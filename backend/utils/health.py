@@ -0,0 +1,244 @@
+"""
+Health Check Module
+
+This module backs the health endpoints so that probes do not load the
+database:
+
+- /livez: the process is up and serving (no I/O)
+- /readyz: a pooled ``SELECT 1`` with a short timeout, cached for a few
+  seconds so a burst of probes costs one query
+- /health/deep: database latency, connection pool stats, last successful
+  ORB sync job, last Google Places refresh and Places API usage, computed
+  by a background thread and served from its cache
+
+The background refresher starts on first use in each worker process (not at
+import), so application startup stays free of side effects.
+
+Features:
+- No-I/O liveness, cached readiness with a hard timeout
+- Background deep check served from cache
+- Pool statistics for QueuePool engines
+- Places API usage from the request metrics (all workers)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, text
+
+from utils.metrics import external_call_counts
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'HEALTH_READY_TIMEOUT': 2.0,  # seconds
+    'HEALTH_READY_CACHE_SECONDS': 5,
+    'HEALTH_DEEP_INTERVAL': 60,  # seconds between background deep checks
+    'GOOGLE_PLACES_DAILY_QUOTA': None,  # reported alongside Places usage when set
+}
+
+# Scheduler job that ingests ORB listings (<source>_sync, utils/scheduler.py)
+ORB_SYNC_JOB = 'orb_sync'
+
+_STARTED_AT = time.time()
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """Format an optional datetime."""
+    return value.isoformat() if value else None
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Get connection pool statistics (counts only available for QueuePool)."""
+    pool = engine.pool
+    stats = {'class': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            try:
+                stats[name] = method()
+            except Exception:
+                pass
+    return stats
+
+
+class HealthMonitor:
+    """
+    Flask extension holding the cached readiness and deep health results.
+
+    Usage:
+        health = HealthMonitor()
+        health.init_app(app, get_db_manager)
+    """
+
+    def __init__(self, app=None, get_db_manager: Callable = None):
+        """Initialize the monitor (optionally binding an app)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.get_db_manager = get_db_manager
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending_ready = None
+        self._ready: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._deep: Optional[Dict[str, Any]] = None
+        self._deep_ready = threading.Event()
+        self._refresher = None
+        if app is not None:
+            self.init_app(app, get_db_manager)
+
+    def init_app(self, app, get_db_manager: Callable = None) -> None:
+        """Read configuration."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        if get_db_manager is not None:
+            self.get_db_manager = get_db_manager
+        app.extensions['health'] = self
+
+    def liveness(self) -> Dict[str, Any]:
+        """Report that the process is serving (no I/O)."""
+        return {'status': 'alive', 'uptime_seconds': round(time.time() - _STARTED_AT, 1)}
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Check that the database answers ``SELECT 1`` within the timeout.
+
+        Results are cached for HEALTH_READY_CACHE_SECONDS. The query runs on a
+        helper thread; if it is still running from an earlier probe, the
+        database is reported as not ready without queueing another one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._ready and now - self._ready[0] < self.settings['HEALTH_READY_CACHE_SECONDS']:
+                return self._ready[1]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='health')
+            pending = self._pending_ready
+            if pending is None or pending.done():
+                pending = self._pending_ready = self._executor.submit(self._ping)
+
+        timeout = self.settings['HEALTH_READY_TIMEOUT']
+        try:
+            latency_ms = pending.result(timeout=timeout)
+            result = {'status': 'ready', 'database': 'connected', 'latency_ms': latency_ms}
+        except FutureTimeoutError:
+            result = {'status': 'not_ready', 'database': 'timeout', 'error': f'No response within {timeout}s'}
+        except Exception as e:
+            result = {'status': 'not_ready', 'database': 'disconnected', 'error': str(e)}
+
+        with self._lock:
+            self._ready = (time.monotonic(), result)
+        return result
+
+    def _ping(self) -> float:
+        """Run ``SELECT 1`` on a pooled connection; returns the latency in ms."""
+        db_manager = self.get_db_manager()
+        if db_manager is None or db_manager.engine is None:
+            raise RuntimeError('Database not initialized')
+        start = time.perf_counter()
+        with db_manager.engine.connect() as conn:
+            conn.execute(text('SELECT 1')).scalar()
+        return round((time.perf_counter() - start) * 1000, 2)
+
+    def deep(self) -> Dict[str, Any]:
+        """
+        Get the latest deep health report.
+
+        Starts the background refresher on first use and waits (up to the
+        readiness timeout) for its first report.
+        """
+        self._ensure_refresher()
+        self._deep_ready.wait(timeout=self.settings['HEALTH_READY_TIMEOUT'])
+        if self._deep is None:
+            return {'status': 'pending', 'message': 'First deep health check still running'}
+        report = dict(self._deep)
+        report['age_seconds'] = round(time.time() - report['checked_at_epoch'], 1)
+        return report
+
+    def cached_deep(self) -> Optional[Dict[str, Any]]:
+        """Get the last deep report without waiting (None if there is none yet)."""
+        self._ensure_refresher()
+        return self._deep
+
+    def _ensure_refresher(self) -> None:
+        """Start the background deep-check thread (once per process)."""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name='health-deep', daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Recompute the deep report every HEALTH_DEEP_INTERVAL seconds."""
+        while True:
+            try:
+                self._deep = self.compute_deep()
+            except Exception as e:
+                logger.error(f"Deep health check failed: {e}")
+                self._deep = {'status': 'unhealthy', 'error': str(e), 'checked_at_epoch': time.time()}
+            self._deep_ready.set()
+            time.sleep(self.settings['HEALTH_DEEP_INTERVAL'])
+
+    def compute_deep(self) -> Dict[str, Any]:
+        """Compute the deep health report (runs on the background thread)."""
+        from database.database_manager_v3 import JobRun, Restaurant, RestaurantStatistics
+
+        report = {'checked_at': datetime.utcnow().isoformat(), 'checked_at_epoch': time.time()}
+        db_manager = self.get_db_manager()
+        if db_manager is None or db_manager.engine is None:
+            report.update(status='unhealthy', database={'status': 'disconnected'})
+            return report
+
+        engine = db_manager.engine
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1')).scalar()
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+            statistics = conn.execute(
+                select(RestaurantStatistics.total_restaurants, RestaurantStatistics.computed_at)
+            ).first()
+            # The last sync that succeeded: updated_at also moves on link checks, image caching and merges
+            last_orb_sync = conn.execute(
+                select(func.max(JobRun.finished_at))
+                .where(JobRun.job_name == ORB_SYNC_JOB, JobRun.status == 'succeeded')
+            ).scalar()
+            last_hours_refresh = conn.execute(select(func.max(Restaurant.hours_last_updated))).scalar()
+            last_places_refresh = self._last_places_refresh(conn)
+
+        places_calls = external_call_counts().get('google_places', {})
+        places_total = sum(places_calls.values())
+        quota = self.settings['GOOGLE_PLACES_DAILY_QUOTA']
+
+        report.update({
+            'status': 'healthy',
+            'database': {'status': 'connected', 'latency_ms': latency_ms, 'pool': pool_stats(engine)},
+            'restaurants_count': statistics.total_restaurants if statistics else None,
+            'statistics_computed_at': _isoformat(statistics.computed_at) if statistics else None,
+            'last_orb_sync': _isoformat(last_orb_sync),
+            'last_hours_refresh': _isoformat(last_hours_refresh),
+            'last_places_refresh': _isoformat(last_places_refresh),
+            'google_places_api': {
+                'calls_since_start': places_total,
+                'calls_by_status': places_calls,
+                'daily_quota': quota,
+            },
+        })
+        return report
+
+    def _last_places_refresh(self, conn) -> Optional[datetime]:
+        """Get the latest google_places_data update (None if the table does not exist; runs last)."""
+        from database.google_places_manager import GooglePlacesData
+
+        try:
+            return conn.execute(select(func.max(GooglePlacesData.last_updated))).scalar()
+        except Exception:
+            return None
+
+
+# Global health monitor (bound to the app in app.py)
+health = HealthMonitor()
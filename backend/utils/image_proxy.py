@@ -0,0 +1,348 @@
+"""
+Image Proxy Module
+
+This module serves restaurant images from our own content-addressed cache
+instead of hot-linking them. Google Places photo URLs carry our API key and
+are billed per view; ORB image URLs are full-size originals. Each source
+image (a restaurant's image_url, or its Google Places primary photo) is
+fetched once (EnhancedDatabaseManager.cache_images, run by the image_cache
+scheduler job and scripts/cache_images.py), resized to a few fixed widths and stored as WebP
+under the hash of the source bytes:
+
+    <IMAGE_CACHE_DIR>/<hash[:2]>/<hash>/<width>.webp
+
+The API then returns ``/img/<hash>/<width>`` as the image_url, and the
+ImageProxy extension serves those files with a one-year immutable
+Cache-Control (the content of a hash never changes). The cache keeps to
+IMAGE_CACHE_MAX_BYTES by evicting the least recently served images; the next
+cache_images run restores evicted images that are still in use.
+
+Features:
+- One fetch per source image (Places API key added server-side, never sent to browsers)
+- WebP thumbnails at fixed widths (never upscaled), EXIF orientation applied
+- Content-addressed on-disk cache with LRU size limit, shared by all workers
+- /img/<hash>/<width> with long-lived cache headers and ETags
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from flask import jsonify, send_file
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'IMAGE_CACHE_DIR': os.path.join(tempfile.gettempdir(), 'jewgo-image-cache'),
+    'IMAGE_CACHE_MAX_BYTES': 1024 * 1024 * 1024,  # least recently served images are evicted above this
+    'IMAGE_WIDTHS': (160, 320, 640),
+    'IMAGE_DEFAULT_WIDTH': 320,  # width of the image_url returned by the API (cards)
+    'IMAGE_QUALITY': 80,  # WebP quality 0-100
+    'IMAGE_MAX_SOURCE_BYTES': 10 * 1024 * 1024,
+    'IMAGE_FETCH_CONCURRENCY': 16,
+    'IMAGE_FETCH_TIMEOUT': 15.0,  # seconds
+    'IMAGE_REFRESH_DAYS': 30,  # refetch sources after this long
+    'IMAGE_RETRY_HOURS': 24,  # retry failed sources after this long
+    'IMAGE_MAX_AGE': 365 * 24 * 3600,  # Cache-Control max-age of /img responses
+    'GOOGLE_PLACES_API_KEY': None,  # added to Places photo URLs when fetching
+}
+
+_HASH = re.compile(r'^[0-9a-f]{32}$')
+
+# Served files are touched (marked recently used) at most this often
+_TOUCH_INTERVAL = 3600
+
+_PLACES_PHOTO_HOST = 'maps.googleapis.com'
+_PLACES_PHOTO_PATH = '/maps/api/place/photo'
+
+
+def content_hash(data: bytes) -> str:
+    """Hash identifying an image in the cache (first 128 bits of SHA-256, hex)."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def proxy_image_url(image_hash: str, width: int = None, base_url: str = '') -> str:
+    """Get the /img URL of a cached image."""
+    return f"{base_url.rstrip('/')}/img/{image_hash}/{width or DEFAULT_SETTINGS['IMAGE_DEFAULT_WIDTH']}"
+
+
+def source_request_url(url: str, api_key: Optional[str] = None) -> str:
+    """Get the URL to fetch a source image from (adds the API key to Places photo URLs)."""
+    parts = urlsplit(url.strip())
+    if parts.hostname == _PLACES_PHOTO_HOST and parts.path.startswith(_PLACES_PHOTO_PATH) and api_key:
+        query = dict(parse_qsl(parts.query))
+        if 'key' not in query:
+            query['key'] = api_key
+            return urlunsplit(parts._replace(query=urlencode(query)))
+    return url.strip()
+
+
+def make_thumbnails(data: bytes, widths: Iterable[int], quality: int = 80) -> Tuple[Dict[int, bytes], Tuple[int, int]]:
+    """
+    Resize an image to each width (never upscaling) and encode it as WebP.
+
+    Returns:
+        ({width: webp bytes}, (source width, source height))
+    """
+    # Imported here: only the image_cache job makes thumbnails, not the API workers
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # pragma: no cover - optional dependency
+        raise RuntimeError("Pillow is required for image thumbnails") from None
+
+    widths = sorted(set(widths), reverse=True)
+    with Image.open(io.BytesIO(data)) as source:
+        size = source.size
+        # JPEG sources decode straight at a reduced scale when they are much larger
+        source.draft('RGB', (widths[0], widths[0] * 4))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        thumbnails = {}
+        for width in widths:
+            # Each width is resized from the previous (larger) one
+            image.thumbnail((width, width * 4), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, 'WEBP', quality=quality, method=4)
+            thumbnails[width] = buffer.getvalue()
+    return thumbnails, size
+
+
+class ImageStore:
+    """
+    Content-addressed thumbnail cache on disk with an LRU size limit.
+
+    Recency is the modification time of the files, updated when they are
+    served, so every worker (and the cache_images script) shares one LRU.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        """Initialize the store (the directory is created on first write)."""
+        self.root = root
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def path(self, image_hash: str, width: int) -> str:
+        """Path of a thumbnail."""
+        return os.path.join(self.root, image_hash[:2], image_hash, f"{width}.webp")
+
+    def has(self, image_hash: str, widths: Iterable[int]) -> bool:
+        """Whether every width of an image is cached."""
+        return all(os.path.exists(self.path(image_hash, width)) for width in widths)
+
+    def put(self, image_hash: str, thumbnails: Dict[int, bytes]) -> None:
+        """Store the thumbnails of an image, evicting old images if the cache is over its limit."""
+        directory = os.path.dirname(self.path(image_hash, 0))
+        os.makedirs(directory, exist_ok=True)
+        written = 0
+        for width, data in thumbnails.items():
+            # Write to a temporary file first so readers never see a partial thumbnail
+            fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, self.path(image_hash, width))
+            written += len(data)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += written
+            over = self.size() > self.max_bytes
+        if over:
+            self.evict()
+
+    def touch(self, path: str) -> None:
+        """Mark a served thumbnail as recently used."""
+        try:
+            if time.time() - os.stat(path).st_mtime > _TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            pass
+
+    def size(self) -> int:
+        """Total bytes cached (scanned once, then tracked on writes)."""
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        return self._size
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used images until the cache is 10% under its limit.
+
+        Returns:
+            Number of images removed
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            size = sum(entry[2] for entry in entries)
+            target = self.max_bytes * 0.9
+            removed = 0
+            for directory, _, entry_size in entries:
+                if size <= target:
+                    break
+                shutil.rmtree(directory, ignore_errors=True)
+                size -= entry_size
+                removed += 1
+            self._size = size
+        if removed:
+            logger.info(f"Evicted {removed} images from the image cache ({size} bytes left)")
+        return removed
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """(directory, last use, bytes) of every cached image."""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir():
+                continue
+            for image in os.scandir(prefix.path):
+                files = [entry.stat() for entry in os.scandir(image.path) if entry.is_file()]
+                if files:
+                    entries.append((image.path, max(f.st_mtime for f in files), sum(f.st_size for f in files)))
+        return entries
+
+
+class ImagePipeline:
+    """
+    Fetches source images concurrently and stores their thumbnails.
+
+    Usage:
+        pipeline = ImagePipeline()
+        results = asyncio.run(pipeline.cache_urls(urls))
+    """
+
+    def __init__(self, store: ImageStore = None, transport=None, **settings):
+        """
+        Initialize the pipeline (settings override DEFAULT_SETTINGS).
+
+        Args:
+            store: Image store (defaults to one at IMAGE_CACHE_DIR)
+            transport: httpx transport to use instead of the network (benchmarks)
+        """
+        try:
+            import httpx  # noqa: F401
+            from PIL import Image  # noqa: F401
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError(f"{e.name} is required for fetching images") from None
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.store = store or ImageStore(self.settings['IMAGE_CACHE_DIR'], self.settings['IMAGE_CACHE_MAX_BYTES'])
+        self.transport = transport
+
+    async def cache_urls(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch and cache source images (each distinct URL once).
+
+        Returns:
+            One result per URL: url, content_hash, width, height, bytes and
+            error (content_hash is None if the image could not be cached)
+        """
+        urls = list(dict.fromkeys(urls))
+        slots = asyncio.Semaphore(self.settings['IMAGE_FETCH_CONCURRENCY'])
+
+        async def limited(client, url):
+            async with slots:
+                return await self.cache_url(client, url)
+
+        import httpx
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.settings['IMAGE_FETCH_TIMEOUT'],
+                                     transport=self.transport) as client:
+            return await asyncio.gather(*(limited(client, url) for url in urls))
+
+    async def cache_url(self, client, url: str) -> Dict[str, Any]:
+        """Fetch one source image and store its thumbnails (unless its content is already cached)."""
+        from PIL import Image
+
+        result = {'url': url, 'content_hash': None, 'width': None, 'height': None, 'bytes': None, 'error': None}
+        try:
+            data = await self._fetch(client, source_request_url(url, self.settings['GOOGLE_PLACES_API_KEY']))
+            image_hash = content_hash(data)
+            widths = self.settings['IMAGE_WIDTHS']
+            with Image.open(io.BytesIO(data)) as image:
+                result.update(width=image.width, height=image.height)
+            if not self.store.has(image_hash, widths):
+                thumbnails, _ = await asyncio.to_thread(make_thumbnails, data, widths, self.settings['IMAGE_QUALITY'])
+                await asyncio.to_thread(self.store.put, image_hash, thumbnails)
+            result.update(content_hash=image_hash, bytes=len(data))
+        except Exception as e:
+            result['error'] = f"{e.__class__.__name__}: {e}"[:255]
+        return result
+
+    async def _fetch(self, client, url: str) -> bytes:
+        """Download a source image, refusing non-images and oversized bodies."""
+        limit = self.settings['IMAGE_MAX_SOURCE_BYTES']
+        async with client.stream('GET', url) as response:
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and not content_type.startswith('image/'):
+                raise ValueError(f"Not an image ({content_type.split(';')[0]})")
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > limit:
+                    raise ValueError(f"Image larger than {limit} bytes")
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+
+class ImageProxy:
+    """
+    Flask extension serving cached thumbnails at /img/<hash>/<width>.
+
+    Usage:
+        image_proxy = ImageProxy(app)
+    """
+
+    def __init__(self, app=None):
+        """Initialize the proxy (optionally binding an app)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.store = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration, open the store and register the /img route."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        self.store = ImageStore(self.settings['IMAGE_CACHE_DIR'], self.settings['IMAGE_CACHE_MAX_BYTES'])
+
+        app.extensions['image_proxy'] = self
+        app.add_url_rule('/img/<image_hash>/<int:width>', 'image_proxy', self.serve, methods=['GET'])
+
+    def serve(self, image_hash: str, width: int):
+        """Serve a cached thumbnail (404 for unknown hashes, widths and evicted images)."""
+        path = None
+        if _HASH.match(image_hash) and width in self.settings['IMAGE_WIDTHS']:
+            path = self.store.path(image_hash, width)
+        if path is None or not os.path.exists(path):
+            response = jsonify({'error': 'Image not found', 'message': 'The requested image is not cached'})
+            response.status_code = 404
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        response = send_file(path, mimetype='image/webp', conditional=True, etag=f"{image_hash}-{width}",
+                             max_age=self.settings['IMAGE_MAX_AGE'])
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        self.store.touch(path)
+        return response
+
+
+# Global image proxy (bound to the app in app.py)
+image_proxy = ImageProxy()
@@ -0,0 +1,497 @@
+"""
+Certifier Ingestion Module
+
+This module ingests restaurant listings published by kashrus agencies
+through pluggable source adapters. Each agency implements a SourceAdapter
+with three steps:
+
+- fetch: download the agency's pages (through a SourceFetcher, which applies
+  the source's rate limit and sends conditional requests)
+- parse: extract raw records from one page
+- normalize: map a raw record to restaurant fields (agency-specific rules,
+  e.g. which category a section lists)
+
+IngestionRunner runs all adapters concurrently, each with its own request
+rate and concurrency limit, and feeds every record through one shared
+normalization stage (normalize_listing: whitespace, phone, state, ZIP,
+address components, URLs, kosher category, supervision overrides) that also
+computes a stable source_key and a content_hash for change tracking.
+EnhancedDatabaseManager.ingest_sources stores the results: per source,
+unchanged listings only get their last_seen_at touched, so the work of a
+sync grows with what changed rather than with the number of sources and
+listings. Pages answered with 304 Not Modified, or whose body hash did not
+change, are not parsed at all.
+
+Adapters are listed by dotted path in INGESTION_SOURCES. Per-agency
+supervision lists (Chalav Stam exceptions, Pas Yisroel restaurants) live in
+scrapers/data/<source>.json rather than in code.
+
+Features:
+- SourceAdapter interface (fetch, parse, normalize) and a source registry
+- Concurrent sources with per-source rate limits over one connection pool
+- Conditional fetches (ETag / Last-Modified) and page body hashes
+- Shared normalization, stable listing keys and content hashes
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'INGESTION_SOURCES': ('scrapers.orb_source.ORBSource',),  # dotted paths of SourceAdapter classes
+    'INGESTION_TIMEOUT': 30.0,  # seconds per request
+    'INGESTION_MAX_CONNECTIONS': 50,  # shared by all sources
+    'INGESTION_USER_AGENT': 'Mozilla/5.0 (compatible; JewGoIngestion/1.0; +https://jewgo.com)',
+}
+
+# Restaurant columns a source may set (the rest come from enrichment)
+SOURCE_COLUMNS = (
+    'name', 'address', 'city', 'state', 'zip_code', 'phone_number', 'website', 'image_url',
+    'kosher_category', 'listing_type', 'certifying_agency', 'is_cholov_yisroel', 'is_pas_yisroel',
+    'short_description',
+)
+
+KOSHER_CATEGORIES = ('meat', 'dairy', 'pareve')
+
+_KOSHER_CATEGORY_ALIASES = {
+    'meat': 'meat', 'fleishig': 'meat', 'fleishik': 'meat', 'poultry': 'meat', 'deli': 'meat',
+    'dairy': 'dairy', 'milchig': 'dairy', 'milchik': 'dairy', 'cholov yisroel': 'dairy',
+    'pareve': 'pareve', 'parve': 'pareve', 'fish': 'pareve', 'vegan': 'pareve', 'bakery': 'pareve',
+}
+
+_STATES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA', 'colorado': 'CO',
+    'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC', 'florida': 'FL', 'georgia': 'GA',
+    'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
+    'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA',
+    'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT',
+    'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM',
+    'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
+    'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT', 'vermont': 'VT',
+    'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY',
+}
+_STATE_CODES = frozenset(_STATES.values())
+
+_WHITESPACE = re.compile(r'\s+')
+_ZIP = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+# "..., City, ST 12345" or "..., City ST 12345" at the end of a one-line address
+_CITY_STATE_ZIP = re.compile(r',\s*([^,]+?),?\s+([A-Za-z]{2})\.?\s+(\d{5})(?:-\d{4})?\s*$')
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scrapers', 'data')
+
+
+def _text(value: Any) -> str:
+    """Strip and collapse whitespace ('' for None)."""
+    return _WHITESPACE.sub(' ', str(value)).strip() if value is not None else ''
+
+
+def content_hash(value: Any) -> str:
+    """Hash of a JSON-serializable value or of bytes (32 hex characters)."""
+    if not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(value).hexdigest()[:32]
+
+
+def kosher_category(value: Optional[str]) -> Optional[str]:
+    """Map a category label ('Fleishig', 'Restaurants » Dairy', 'Fish') to meat, dairy or pareve."""
+    label = _text(value).lower()
+    if '»' in label:
+        label = label.rsplit('»', 1)[1].strip()
+    if label in _KOSHER_CATEGORY_ALIASES:
+        return _KOSHER_CATEGORY_ALIASES[label]
+    for alias, category in _KOSHER_CATEGORY_ALIASES.items():
+        if alias in label:
+            return category
+    return None
+
+
+def state_code(value: Optional[str]) -> str:
+    """Two-letter state code of a state name or code ('' if unknown)."""
+    label = _text(value).rstrip('.')
+    if label.upper() in _STATE_CODES:
+        return label.upper()
+    return _STATES.get(label.lower(), '')
+
+
+def format_phone(value: Optional[str]) -> str:
+    """Format a US phone number as (954) 555-0100 (other numbers are kept as given)."""
+    from utils.dedupe import normalize_phone
+
+    digits = normalize_phone(value)
+    if digits is None:
+        return _text(value)
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def absolute_url(value: Optional[str], base_url: str = '') -> Optional[str]:
+    """Make a link absolute (https:// for bare hosts); None if empty."""
+    url = _text(value)
+    if not url or url.lower().startswith(('mailto:', 'tel:', 'javascript:')):
+        return None
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/') and base_url:
+        return base_url.rstrip('/') + url
+    if '://' not in url:
+        return 'https://' + url
+    return url
+
+
+def split_address(address: str) -> Dict[str, str]:
+    """Split a one-line "street, City, ST 12345" address into its components."""
+    match = _CITY_STATE_ZIP.search(address)
+    if not match or not state_code(match.group(2)):
+        return {}
+    return {
+        'address': address[:match.start()].strip(' ,'),
+        'city': match.group(1).strip(),
+        'state': state_code(match.group(2)),
+        'zip_code': match.group(3),
+    }
+
+
+def listing_key(fields: Dict[str, Any]) -> str:
+    """Stable key of a listing within its source: normalized name, street address and city."""
+    from utils.dedupe import normalize_address, normalize_name
+
+    name = ' '.join(normalize_name(fields.get('name'), fields.get('city')))
+    address = normalize_address(fields.get('address'))
+    return content_hash([name, address, _text(fields.get('city')).lower()])
+
+
+def normalize_listing(fields: Dict[str, Any], source: 'SourceAdapter',
+                      page_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Shared normalization of an adapter-normalized record.
+
+    Args:
+        fields: Output of the adapter's normalize (restaurant fields, plus an
+            optional 'source_id' the source uses for the listing)
+        source: The adapter (certifying agency, supervision overrides)
+        page_url: Page the record was parsed from
+
+    Returns:
+        {'source_key', 'content_hash', 'page_url', 'fields'}, or None if the
+        record has no name or no known kosher category
+    """
+    values = {column: fields.get(column) for column in SOURCE_COLUMNS}
+    for column in ('name', 'address', 'city', 'zip_code', 'short_description'):
+        values[column] = _text(values[column])
+    if not values['name']:
+        return None
+
+    if values['address'] and not (values['city'] and values['zip_code']):
+        for column, value in split_address(values['address']).items():
+            if column == 'address' or not values[column]:
+                values[column] = value
+    values['state'] = state_code(values['state'])
+    zip_match = _ZIP.search(values['zip_code'])
+    values['zip_code'] = zip_match.group(1) if zip_match else ''
+    values['phone_number'] = format_phone(values['phone_number'])
+    values['website'] = absolute_url(values['website'], source.base_url)
+    values['image_url'] = absolute_url(values['image_url'], source.base_url)
+    values['kosher_category'] = kosher_category(values['kosher_category'])
+    if values['kosher_category'] is None:
+        return None
+    values['listing_type'] = _text(values['listing_type']).lower() or 'restaurant'
+    values['certifying_agency'] = source.agency
+
+    name = values['name'].lower()
+    overrides = source.supervision_overrides()
+    if name in overrides['chalav_stam']:
+        values['is_cholov_yisroel'] = False
+    elif name in overrides['chalav_yisroel']:
+        values['is_cholov_yisroel'] = True
+    if name in overrides['pas_yisroel']:
+        values['is_pas_yisroel'] = True
+
+    source_key = _text(fields.get('source_id')) or listing_key(values)
+    return {
+        'source_key': content_hash(source_key) if len(source_key) > 64 else source_key,
+        'content_hash': content_hash(values),
+        'page_url': page_url,
+        'fields': values,
+    }
+
+
+class SourceAdapter:
+    """
+    Base class of an agency's listings source.
+
+    Subclasses set the class attributes and implement parse and normalize;
+    the default fetch downloads urls(). Settings override the class
+    attributes of the same name in lowercase (e.g. REQUESTS_PER_SECOND).
+    """
+
+    name = ''  # unique source key (provenance, job names, scrapers/data/<name>.json)
+    agency = ''  # certifying_agency of its listings
+    region = ''  # informational
+    base_url = ''  # resolves relative links
+    schedule = '0 4 * * *'  # default sync schedule (overridden by <NAME>_SYNC_CRON)
+    requests_per_second = 1.0  # request starts per second for this source
+    concurrency = 2  # requests in flight for this source
+
+    def __init__(self, **settings):
+        """Initialize the adapter (settings override the class attributes)."""
+        for key, value in settings.items():
+            if value is not None and hasattr(type(self), key.lower()):
+                setattr(self, key.lower(), value)
+        self._overrides = None
+
+    def urls(self) -> List[str]:
+        """Pages fetched by the default fetch."""
+        return []
+
+    async def fetch(self, fetcher: 'SourceFetcher') -> List[Dict[str, Any]]:
+        """Download the source's pages (override for paginated sources)."""
+        return list(await asyncio.gather(*(fetcher.get(url) for url in self.urls())))
+
+    def parse(self, page: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Extract raw records from a fetched page."""
+        raise NotImplementedError
+
+    def normalize(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map a raw record to restaurant fields (None to skip it)."""
+        return record
+
+    def supervision_overrides(self) -> Dict[str, frozenset]:
+        """Lowercased restaurant names per supervision list (scrapers/data/<name>.json)."""
+        if self._overrides is None:
+            data = {}
+            path = os.path.join(_DATA_DIR, f"{self.name}.json")
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            self._overrides = {
+                key: frozenset(name.lower() for name in data.get(key, ()))
+                for key in ('chalav_stam', 'chalav_yisroel', 'pas_yisroel')
+            }
+        return self._overrides
+
+
+def load_sources(paths: Iterable[str], **settings) -> List[SourceAdapter]:
+    """
+    Instantiate the adapters listed by dotted path.
+
+    Raises:
+        ValueError: If a path is not a SourceAdapter class, or two sources share a name
+    """
+    sources = []
+    for path in paths:
+        module_name, _, class_name = path.strip().rpartition('.')
+        try:
+            adapter = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError, ValueError) as e:
+            raise ValueError(f"Invalid ingestion source {path!r}: {e}") from None
+        if not (isinstance(adapter, type) and issubclass(adapter, SourceAdapter)) or not adapter.name:
+            raise ValueError(f"Invalid ingestion source {path!r}: not a named SourceAdapter")
+        sources.append(adapter(**settings))
+    names = [source.name for source in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate ingestion source names: {names}")
+    return sources
+
+
+class RateLimiter:
+    """Spaces request starts at least 1 / rate seconds apart."""
+
+    def __init__(self, rate: float):
+        """Initialize the limiter (rate in requests per second; 0 for no limit)."""
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next request slot."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SourceFetcher:
+    """Rate-limited, conditional page fetches for one source."""
+
+    def __init__(self, client, source: SourceAdapter, validators: Dict[str, Dict[str, Any]] = None):
+        """
+        Initialize the fetcher.
+
+        Args:
+            client: Shared httpx.AsyncClient
+            source: The adapter (rate and concurrency limits)
+            validators: Per URL: etag, last_modified and content_hash of the last fetch
+        """
+        self.client = client
+        self.source = source
+        self.validators = validators or {}
+        self.limiter = RateLimiter(source.requests_per_second)
+        self.slots = asyncio.Semaphore(max(int(source.concurrency), 1))
+        self.requests = 0
+
+    async def get(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch a page, conditionally if it was fetched before.
+
+        Returns:
+            url, status_code, text, etag, last_modified, content_hash,
+            unchanged (304, or the same body as last time) and error
+        """
+        import httpx
+
+        previous = self.validators.get(url) or {}
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+
+        page = {'url': url, 'status_code': None, 'text': None, 'etag': previous.get('etag'),
+                'last_modified': previous.get('last_modified'), 'content_hash': previous.get('content_hash'),
+                'unchanged': False, 'error': None}
+        async with self.slots:
+            await self.limiter.wait()
+            self.requests += 1
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.HTTPError as e:
+                page['error'] = f"{e.__class__.__name__}: {e}"[:255]
+                return page
+
+        page['status_code'] = response.status_code
+        if response.status_code == 304 and previous.get('content_hash'):
+            page['unchanged'] = True
+            return page
+        if response.status_code >= 400:
+            page['error'] = f"HTTP {response.status_code}"
+            return page
+
+        body_hash = content_hash(response.content)
+        page.update(
+            text=response.text,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            content_hash=body_hash,
+            unchanged=body_hash == previous.get('content_hash'),
+        )
+        return page
+
+
+class IngestionRunner:
+    """
+    Runs source adapters concurrently and normalizes their records.
+
+    Usage:
+        runner = IngestionRunner(load_sources(paths))
+        results = asyncio.run(runner.run(validators))
+    """
+
+    def __init__(self, sources: List[SourceAdapter], transport=None, **settings):
+        """
+        Initialize the runner (settings override DEFAULT_SETTINGS).
+
+        Args:
+            sources: Adapters to run
+            transport: httpx transport to use instead of the network (benchmarks)
+        """
+        try:
+            import httpx  # noqa: F401
+        except ImportError:  # pragma: no cover - optional dependency
+            raise RuntimeError("httpx is required for ingestion") from None
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.sources = sources
+        self.transport = transport
+
+    def _client(self):
+        """Create the client shared by all sources."""
+        import httpx
+
+        connections = self.settings['INGESTION_MAX_CONNECTIONS']
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=self.settings['INGESTION_TIMEOUT'],
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            headers={'User-Agent': self.settings['INGESTION_USER_AGENT']},
+            transport=self.transport,
+        )
+
+    async def run(self, validators: Dict[str, Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Run every source.
+
+        Args:
+            validators: Per source, the validators of its pages (see SourceFetcher)
+
+        Returns:
+            One result per source (see run_source)
+        """
+        validators = validators or {}
+        async with self._client() as client:
+            return list(await asyncio.gather(*(
+                self.run_source(client, source, validators.get(source.name)) for source in self.sources
+            )))
+
+    async def run_source(self, client, source: SourceAdapter,
+                         validators: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fetch, parse and normalize one source.
+
+        Returns:
+            source, pages (without their text; parsed is set on pages whose
+            records are complete), records (normalize_listing output of the
+            parsed pages), requests, errors and fetch_seconds
+        """
+        start = time.perf_counter()
+        fetcher = SourceFetcher(client, source, validators)
+        result = {'source': source.name, 'pages': [], 'records': [], 'requests': 0, 'errors': []}
+        try:
+            pages = await source.fetch(fetcher)
+        except Exception as e:
+            logger.error(f"Ingestion source {source.name} failed to fetch: {e}")
+            pages = []
+            result['errors'].append(f"fetch: {e.__class__.__name__}: {e}"[:255])
+
+        for page in pages:
+            page['parsed'] = False
+            if page['text'] is not None and not page['unchanged'] and page['error'] is None:
+                try:
+                    records = await asyncio.to_thread(self._parse_page, source, page)
+                    result['records'].extend(records)
+                    page['parsed'] = True
+                except Exception as e:
+                    logger.error(f"Ingestion source {source.name} failed to parse {page['url']}: {e}")
+                    # Keep the previous validators so the page is parsed again next time
+                    previous = fetcher.validators.get(page['url']) or {}
+                    page.update({key: previous.get(key) for key in ('etag', 'last_modified', 'content_hash')})
+                    page['error'] = f"parse: {e.__class__.__name__}: {e}"[:255]
+            if page['error']:
+                result['errors'].append(f"{page['url']}: {page['error']}")
+            page.pop('text', None)
+            result['pages'].append(page)
+
+        result['requests'] = fetcher.requests
+        result['fetch_seconds'] = round(time.perf_counter() - start, 2)
+        return result
+
+    def _parse_page(self, source: SourceAdapter, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Parse, adapter-normalize and normalize the records of a page (runs on a worker thread)."""
+        records = {}
+        for raw in source.parse(page):
+            fields = source.normalize(raw)
+            listing = normalize_listing(fields, source, page['url']) if fields else None
+            if listing is not None:
+                records[listing['source_key']] = listing  # a listing repeated on a page counts once
+        return list(records.values())
@@ -0,0 +1,187 @@
+"""
+Response Encoding Module
+
+This module provides the JSON encoding layer for the Flask API. It plugs a
+high-performance encoder (orjson, when installed) in as the app's JSON
+provider and keeps a cache of pre-encoded restaurant fragments so listings
+can be assembled by concatenating bytes instead of re-encoding every row.
+
+Features:
+- Flask JSON provider backed by orjson (stdlib json fallback)
+- Native handling of datetimes, dates, Decimals and SQLAlchemy row types
+- Per-restaurant fragment cache keyed by updated_at
+- Byte-level assembly of listing responses
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+from utils.metrics import record_cache_access
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+JSON_MIMETYPE = 'application/json'
+
+
+def _default(obj: Any) -> Any:
+    """Convert types the encoder does not handle natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Mapping):
+        # SQLAlchemy RowMapping
+        return dict(obj)
+    if hasattr(obj, '_asdict'):
+        # SQLAlchemy Row / namedtuples
+        return obj._asdict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using the fast encoder.
+
+    Used by ``jsonify`` and ``return dict`` responses throughout the app.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON text."""
+        if kwargs:
+            # Explicit options (indent, sort_keys, ...) go through the stdlib path
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        """Deserialize data as JSON."""
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the given arguments as JSON and return a response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class FragmentCache:
+    """
+    Thread-safe LRU cache of pre-encoded JSON object fragments.
+
+    Entries are keyed by an identifier and validated against a version
+    (the row's ``updated_at``), so an updated row is re-encoded on next use.
+    """
+
+    def __init__(self, max_entries: int = 10000, name: str = 'fragments'):
+        """Initialize the fragment cache."""
+        self.max_entries = max_entries
+        self.name = name
+        self._entries: 'OrderedDict[Any, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, version: Any) -> Optional[bytes]:
+        """Get a cached fragment if it matches the given version."""
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and entry[0] == version
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache_access(self.name, hit)
+        return entry[1] if hit else None
+
+    def put(self, key: Any, version: Any, fragment: bytes) -> None:
+        """Store a fragment for the given key and version."""
+        with self._lock:
+            self._entries[key] = (version, fragment)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached fragments."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0
+            }
+
+
+def merge_fragment(fragment: bytes, extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Append dynamic fields to a pre-encoded JSON object fragment.
+
+    Args:
+        fragment: Encoded JSON object (``{...}``)
+        extra: Fields to add (must not repeat keys already in the fragment)
+
+    Returns:
+        Encoded JSON object containing both sets of fields
+    """
+    if not extra:
+        return fragment
+    encoded = dumps_bytes(extra)
+    if fragment == b'{}':
+        return encoded
+    return fragment[:-1] + b',' + encoded[1:]
+
+
+def assemble_listing(list_key: str, fragments: Iterable[bytes], **meta: Any) -> bytes:
+    """
+    Assemble a listing response body from pre-encoded item fragments.
+
+    Produces ``{"<list_key>":[...fragments...],<meta>}`` without decoding or
+    re-encoding any item.
+    """
+    body = b'{' + dumps_bytes(list_key) + b':[' + b','.join(fragments) + b']'
+    if meta:
+        body += b',' + dumps_bytes(meta)[1:]
+    else:
+        body += b'}'
+    return body
+
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Wrap an encoded JSON body in a Flask response."""
+    return Response(body, status=status, mimetype=JSON_MIMETYPE)
+
+
+# Global fragment cache for restaurant records
+restaurant_fragment_cache = FragmentCache(name='restaurant_fragments')
@@ -0,0 +1,211 @@
+"""
+Link Health Module
+
+This module checks restaurant websites and image URLs concurrently with an
+async HTTP client and classifies every link, so the API can flag or hide dead
+links without checking anything while serving a request.
+EnhancedDatabaseManager.check_links loads the links that are due, runs the
+checker and stores the results in the link_checks table (the result cache).
+
+Each link is requested with HEAD first; servers that reject HEAD (405, 403,
+404, ...) or break on it get a streamed GET whose body is never read (410
+Gone is final). Redirects are followed and the final URL is recorded.
+Unreachable hosts (DNS failures, refused connections, timeouts) are not
+retried with GET.
+
+Link statuses:
+- ok: 2xx at the same address (http -> https and trailing slashes ignored)
+- redirected: 2xx after redirecting to another address
+- blocked: 401, 403, 429 or 999 on both HEAD and GET (bot protection, not dead)
+- failing: any other error, fewer than LINK_CHECK_DEAD_AFTER times in a row
+- dead: failing on LINK_CHECK_DEAD_AFTER consecutive sweeps
+
+Features:
+- Global and per-host concurrency limits over one connection pool
+- HEAD-then-GET fallback and redirect resolution
+- Status code, final URL and latency per link
+- Result cache with a TTL (longer for healthy links than for failing ones)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'LINK_CHECK_CONCURRENCY': 500,  # requests in flight (sockets open at once)
+    'LINK_CHECK_PER_HOST': 4,  # requests in flight per host
+    'LINK_CHECK_TIMEOUT': 10.0,  # seconds per request
+    'LINK_CHECK_CONNECT_TIMEOUT': 5.0,
+    'LINK_CHECK_MAX_REDIRECTS': 10,
+    'LINK_CHECK_TTL_HOURS': 168,  # recheck healthy links weekly
+    'LINK_CHECK_RETRY_HOURS': 24,  # recheck failing and dead links daily
+    'LINK_CHECK_DEAD_AFTER': 2,  # consecutive failures before a link is dead
+    'LINK_CHECK_USER_AGENT': 'Mozilla/5.0 (compatible; JewGoLinkChecker/1.0; +https://jewgo.com)',
+}
+
+LINK_STATUSES = ('ok', 'redirected', 'blocked', 'failing', 'dead')
+
+# Statuses rechecked after LINK_CHECK_TTL_HOURS (the others after LINK_CHECK_RETRY_HOURS)
+HEALTHY_STATUSES = ('ok', 'redirected', 'blocked')
+
+# Statuses sites answer bots with (the page usually works in a browser)
+_BLOCKED_STATUS_CODES = frozenset({401, 403, 429, 999})
+
+
+def request_url(url: Optional[str]) -> Optional[str]:
+    """Get the URL to request for a stored link (None if it is not an http(s) link)."""
+    url = (url or '').strip()
+    if not url or ' ' in url:
+        return None
+    if '://' not in url:
+        url = 'https://' + url
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or '.' not in (parts.hostname or ''):
+        return None
+    return url
+
+
+def _address(url: str) -> tuple:
+    """Comparable address of a URL (ignores the scheme, 'www.' and trailing slashes)."""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host, parts.path.rstrip('/'), parts.query
+
+
+def classify(result: Dict[str, Any], previous_failures: int = 0, dead_after: int = 2) -> Dict[str, Any]:
+    """
+    Set the status and consecutive failure count of a check result.
+
+    Args:
+        result: Result of LinkChecker.check_url
+        previous_failures: Consecutive failures before this check
+        dead_after: Consecutive failures before a link is dead
+    """
+    code = result.get('status_code')
+    if code is not None and 200 <= code < 300:
+        same = _address(result['final_url']) == _address(result['request_url'])
+        result.update(status='ok' if same else 'redirected', failures=0)
+    elif code in _BLOCKED_STATUS_CODES:
+        result.update(status='blocked', failures=0)
+    else:
+        failures = previous_failures + 1
+        result.update(status='dead' if failures >= dead_after else 'failing', failures=failures)
+    return result
+
+
+class LinkChecker:
+    """
+    Concurrent link checker over a shared httpx connection pool.
+
+    Usage:
+        checker = LinkChecker()
+        results = asyncio.run(checker.check_urls(urls))
+    """
+
+    def __init__(self, transport=None, **settings):
+        """
+        Initialize the checker (settings override DEFAULT_SETTINGS).
+
+        Args:
+            transport: httpx transport to use instead of the network (benchmarks)
+        """
+        if httpx is None:
+            raise RuntimeError("httpx is required for link checking")
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.transport = transport
+
+    def _client(self):
+        """Create the shared async client."""
+        concurrency = self.settings['LINK_CHECK_CONCURRENCY']
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            max_redirects=self.settings['LINK_CHECK_MAX_REDIRECTS'],
+            timeout=httpx.Timeout(self.settings['LINK_CHECK_TIMEOUT'],
+                                  connect=self.settings['LINK_CHECK_CONNECT_TIMEOUT']),
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            headers={'User-Agent': self.settings['LINK_CHECK_USER_AGENT'], 'Accept': '*/*'},
+            transport=self.transport,
+        )
+
+    async def check_urls(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Check links concurrently (each distinct link once).
+
+        Returns:
+            One result per link: url, request_url, status_code, final_url,
+            latency_ms, method, redirects and error (unclassified, see classify)
+        """
+        urls = list(dict.fromkeys(urls))
+        slots = asyncio.Semaphore(self.settings['LINK_CHECK_CONCURRENCY'])
+        hosts = {}
+
+        async def limited(client, url):
+            target = request_url(url)
+            if target is None:
+                return self._result(url, url, error='Invalid URL')
+            host = hosts.setdefault(urlsplit(target).hostname, asyncio.Semaphore(self.settings['LINK_CHECK_PER_HOST']))
+            async with host:
+                async with slots:
+                    return await self.check_url(client, url, target)
+
+        async with self._client() as client:
+            return await asyncio.gather(*(limited(client, url) for url in urls))
+
+    async def check_url(self, client, url: str, target: str) -> Dict[str, Any]:
+        """Check one link with HEAD, falling back to a streamed GET."""
+        start = time.perf_counter()
+        try:
+            response = await client.head(target)
+            if response.status_code < 400 or response.status_code == 410:
+                return self._response_result(url, target, response, 'HEAD', start)
+        except (httpx.ConnectError, httpx.TimeoutException, httpx.TooManyRedirects, httpx.InvalidURL) as e:
+            return self._result(url, target, error=self._error(e), latency_ms=self._elapsed(start), method='HEAD')
+        except httpx.HTTPError:
+            pass  # protocol errors on HEAD; try GET
+
+        try:
+            async with client.stream('GET', target) as response:
+                return self._response_result(url, target, response, 'GET', start)
+        except httpx.HTTPError as e:
+            return self._result(url, target, error=self._error(e), latency_ms=self._elapsed(start), method='GET')
+
+    def _response_result(self, url: str, target: str, response, method: str, start: float) -> Dict[str, Any]:
+        """Build the result for a response."""
+        return self._result(
+            url, target,
+            status_code=response.status_code,
+            final_url=str(response.url),
+            redirects=len(response.history),
+            latency_ms=self._elapsed(start),
+            method=method,
+            error=None if response.status_code < 400 else f"HTTP {response.status_code}",
+        )
+
+    def _result(self, url: str, target: str, **values) -> Dict[str, Any]:
+        """Build a result dictionary with defaults for the missing values."""
+        result = {'url': url, 'request_url': target, 'status_code': None, 'final_url': None,
+                  'redirects': 0, 'latency_ms': None, 'method': None, 'error': None}
+        result.update(values)
+        return result
+
+    def _elapsed(self, start: float) -> int:
+        """Milliseconds since start."""
+        return int((time.perf_counter() - start) * 1000)
+
+    def _error(self, error: Exception) -> str:
+        """Short description of a request error."""
+        message = str(error) or error.__class__.__name__
+        return f"{error.__class__.__name__}: {message}"[:255]
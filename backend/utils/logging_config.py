@@ -0,0 +1,44 @@
+"""
+Logging Configuration Module
+
+This module holds the structlog configuration shared by the API, the
+database managers and the scripts. Configuration used to run at import time
+of several modules; it now happens once, when the first caller (the app
+factory, a database manager or a script) asks for it.
+
+Features:
+- One structlog configuration (JSON output via the stdlib logger)
+- Idempotent: repeated calls are no-ops
+- No side effects at import time
+"""
+
+import structlog
+
+
+def configure_logging(force: bool = False) -> None:
+    """
+    Configure structlog for JSON output through the standard library logger.
+
+    Args:
+        force: Reconfigure even if structlog has already been configured
+    """
+    if structlog.is_configured() and not force:
+        return
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
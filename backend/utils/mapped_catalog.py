@@ -0,0 +1,425 @@
+"""
+Mapped Catalog Module
+
+This module stores the catalog replica (utils/catalog_replica.py) in a flat
+binary file that gunicorn workers memory-map read-only. With preload_app
+and cpu_count * 2 + 1 workers, a per-process replica is loaded and held
+once per worker; a mapped file is built once per host (by the master,
+before it forks) and every worker reads the same page-cache pages, so the
+catalog costs one physical copy and a new worker starts warm.
+
+File layout (native byte order; the file never leaves the host):
+
+- header: magic, format, offset and length of the metadata
+- one section per column: fixed-width values (int64, float64, uint8 for
+  booleans, int64 microseconds since the epoch for timestamps) or, for
+  strings, a uint32 offset table into a UTF-8 blob; plus a uint8 null map
+  for nullable columns. Rows are in name_order_key order; the specials column
+  holds each restaurant's specials as JSON and the fragment column its
+  pre-encoded static JSON (see EnhancedDatabaseManager.get_all_places_encoded)
+- an id index: the ids in ascending order and their row positions
+- secondary and geo cell indexes: the distinct values (as strings) with
+  their ranges in one uint32 array of row positions
+- the metadata: JSON with the catalog version and every section's offset
+
+Files are written to a temporary name and renamed into place. Workers check
+the file every REPLICA_REFRESH_SECONDS and remap it when it was replaced;
+requests in flight keep reading the previous mapping, which stays valid
+until its last reader is done.
+
+Features:
+- Columnar fixed-width and offset-table string sections
+- Shared, read-only mapping across forked workers
+- Pre-encoded listing fragments in the file
+- Host-wide build lock and atomic file swap
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.catalog_replica import CatalogRecord, ReplicaState, catalog_version, load_records
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'JGCATMAP'
+
+# Bumped when the layout changes; older files are rebuilt
+MAPPED_FORMAT = 1
+
+# magic, format, metadata offset, metadata length
+_HEADER = struct.Struct('=8sIQQ')
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Column kind -> array typecode of its values ('str', 'json' and 'bytes' use offset tables)
+_FIXED_KINDS = {'i64': 'q', 'f64': 'd', 'bool': 'B', 'ts': 'q'}
+
+
+def _column_kinds() -> Dict[str, str]:
+    """Storage kind of every restaurants column, plus the specials and fragment columns."""
+    from database.database_manager_v3 import Restaurant
+    from sqlalchemy import Boolean, DateTime, Float, Integer
+
+    kinds = {}
+    for column in Restaurant.__table__.columns:
+        if isinstance(column.type, Boolean):
+            kinds[column.name] = 'bool'
+        elif isinstance(column.type, Integer):
+            kinds[column.name] = 'i64'
+        elif isinstance(column.type, Float):
+            kinds[column.name] = 'f64'
+        elif isinstance(column.type, DateTime):
+            kinds[column.name] = 'ts'
+        else:
+            kinds[column.name] = 'str'
+    kinds['specials'] = 'json'
+    kinds['fragment'] = 'bytes'
+    return kinds
+
+
+def _timestamp(value: datetime) -> int:
+    """Microseconds since the epoch of a naive (UTC) or aware datetime."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+class _Writer:
+    """Appends 8-byte aligned sections to the file and records their offsets."""
+
+    def __init__(self, f):
+        self.f = f
+        self.f.write(b'\0' * _HEADER.size)
+
+    def write(self, data: bytes) -> int:
+        """Write a section; returns its offset."""
+        offset = self.f.tell()
+        self.f.write(data)
+        self.f.write(b'\0' * (-len(data) % 8))
+        return offset
+
+    def strings(self, values: List[Optional[bytes]]) -> Dict[str, int]:
+        """Write an offset table and blob for byte strings (None as empty)."""
+        offsets = array('I', [0])
+        blob = bytearray()
+        for value in values:
+            blob += value or b''
+            offsets.append(len(blob))
+        return {'offsets': self.write(offsets.tobytes()), 'blob': self.write(bytes(blob))}
+
+
+def _encode(kind: str, value) -> Any:
+    """Convert a record value to its stored form."""
+    if kind == 'ts':
+        return _timestamp(value)
+    if kind == 'bool':
+        return 1 if value else 0
+    if kind == 'str':
+        return value.encode('utf-8')
+    if kind == 'json':
+        return json.dumps(value).encode('utf-8')
+    return value
+
+
+def write_mapped_catalog(state: ReplicaState, path: str) -> Dict[str, Any]:
+    """
+    Write a loaded replica to a mapped catalog file.
+
+    Args:
+        state: Loaded replica (records in name order, indexes, fragments)
+        path: Target file (written directly; build_mapped_catalog renames it into place)
+
+    Returns:
+        The file metadata
+    """
+    kinds = _column_kinds()
+    records = state.records
+    meta = {
+        'format': MAPPED_FORMAT,
+        'catalog_version': state.version,
+        'built_at': datetime.utcnow().isoformat(),
+        'rows': len(records),
+        'cell_degrees': state.cell_degrees,
+        'columns': {},
+        'indexes': {},
+    }
+    with open(path, 'wb') as f:
+        writer = _Writer(f)
+        for name, kind in kinds.items():
+            if name == 'fragment':
+                values = [state.fragment(record) for record in records]
+            else:
+                values = [getattr(record, name) for record in records]
+            section = {'kind': kind}
+            if any(value is None for value in values):
+                section['nulls'] = writer.write(array('B', [value is None for value in values]).tobytes())
+            if kind in _FIXED_KINDS:
+                default = 0.0 if kind == 'f64' else 0
+                encoded = array(_FIXED_KINDS[kind], [default if value is None else _encode(kind, value)
+                                                     for value in values])
+                section['data'] = writer.write(encoded.tobytes())
+            else:
+                section.update(writer.strings([None if value is None else _encode(kind, value) for value in values]))
+            meta['columns'][name] = section
+
+        meta['ids'] = writer.write(array('q', [records[position].id for position in state.id_positions]).tobytes())
+        meta['id_positions'] = writer.write(array('I', state.id_positions).tobytes())
+
+        named_indexes = dict(state.indexes, geo_cell={f"{lat},{lng}": postings
+                                                      for (lat, lng), postings in state.cells.items()})
+        for name, index in named_indexes.items():
+            keys = sorted(index)
+            starts = array('I', [0])
+            postings = array('I')
+            for key in keys:
+                postings.extend(index[key])
+                starts.append(len(postings))
+            section = writer.strings([key.encode('utf-8') for key in keys])
+            section.update(count=len(keys), starts=writer.write(starts.tobytes()),
+                           positions=writer.write(postings.tobytes()))
+            meta['indexes'][name] = section
+
+        encoded_meta = json.dumps(meta).encode('utf-8')
+        meta_offset = writer.write(encoded_meta)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, MAPPED_FORMAT, meta_offset, len(encoded_meta)))
+        f.flush()
+        os.fsync(f.fileno())
+    return meta
+
+
+def read_mapped_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Read the metadata of a mapped catalog file (None if it is missing, unreadable or another format)."""
+    try:
+        with open(path, 'rb') as f:
+            magic, file_format, meta_offset, meta_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or file_format != MAPPED_FORMAT:
+                return None
+            f.seek(meta_offset)
+            return json.loads(f.read(meta_length))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def build_mapped_catalog(db_manager, path: str, force: bool = False, blocking: bool = True,
+                         cell_degrees: float = 0.5) -> Optional[Dict[str, Any]]:
+    """
+    Build the mapped catalog file if the catalog changed since it was written.
+
+    Builds on one host are serialized with a lock file next to it; the new
+    file is renamed over the old one, so readers see either file complete.
+
+    Args:
+        db_manager: Connected database manager to read the catalog from
+        path: Mapped catalog file
+        force: Rebuild even if the file has the current catalog version
+        blocking: Wait for another process building the file (else return None)
+        cell_degrees: Geo cell size of the replica
+
+    Returns:
+        The file metadata, with 'skipped' set when the file was current
+        (None if another process holds the build lock and blocking is False)
+    """
+    start = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        with db_manager.engine.connect() as conn:
+            version = catalog_version(conn)
+            existing = read_mapped_meta(path)
+            if not force and existing and existing['catalog_version'] == version:
+                return dict(existing, skipped=True)
+            records = load_records(db_manager, conn)
+
+        state = ReplicaState(db_manager, records, version, cell_degrees)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            meta = write_mapped_catalog(state, temporary)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        directory_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+    meta.update(bytes=os.path.getsize(path), elapsed_seconds=round(time.perf_counter() - start, 2), skipped=False)
+    logger.info(f"Mapped catalog written to {path}: {meta['rows']} restaurants ({meta['bytes']:,} bytes)")
+    return meta
+
+
+def build_catalog_file(path: str, cell_degrees: float = 0.5) -> Optional[Dict[str, Any]]:
+    """Connect to DATABASE_URL, build the mapped catalog file and disconnect (gunicorn master)."""
+    from database.database_manager_v3 import EnhancedDatabaseManager
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        logger.error("Mapped catalog not built: database connection failed")
+        return None
+    try:
+        return build_mapped_catalog(db_manager, path, cell_degrees=cell_degrees)
+    except Exception as e:
+        logger.error(f"Mapped catalog not built: {e}")
+        return None
+    finally:
+        db_manager.disconnect()
+
+
+class MappedRecord(CatalogRecord):
+    """
+    A row of a mapped catalog; column values are decoded from the mapping on
+    first access and kept for the life of the record (one request).
+    """
+
+    __slots__ = ('_state', '_row', '_values')
+
+    def __init__(self, state: 'MappedState', row: int):
+        self._state = state
+        self._row = row
+        self._values = {}
+
+    def __getattr__(self, name: str):
+        values = self._values
+        if name in values:
+            return values[name]
+        value = values[name] = self._state.value(name, self._row)
+        return value
+
+    __getitem__ = __getattr__
+
+    @property
+    def columns(self):
+        return self._state.columns
+
+
+class MappedState(ReplicaState):
+    """
+    A catalog replica read from a memory-mapped catalog file.
+
+    Has the attributes and methods of ReplicaState that CatalogReplica
+    reads; only the small index key tables are held per process.
+    """
+
+    def __init__(self, manager, path: str):
+        """Map the file read-only and read its metadata."""
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        self.file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        magic, file_format, meta_offset, meta_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or file_format != MAPPED_FORMAT:
+            raise ValueError(f"{path} is not a mapped catalog of format {MAPPED_FORMAT}")
+        self.meta = json.loads(self._mmap[meta_offset:meta_offset + meta_length])
+
+        self.manager = manager
+        self.path = path
+        self.version = self.meta['catalog_version']
+        self.loaded_at = datetime.utcnow()
+        self.cell_degrees = self.meta['cell_degrees']
+        self.count = self.meta['rows']
+        self._view = memoryview(self._mmap)
+        self._getters = {name: self._getter(section) for name, section in self.meta['columns'].items()}
+        self.columns = tuple(name for name in self._getters if name != 'fragment')
+
+        self._ids = self._array(self.meta['ids'], 'q', self.count)
+        self.id_positions = self._array(self.meta['id_positions'], 'I', self.count)
+        self.indexes = {name: self._index(section) for name, section in self.meta['indexes'].items()}
+        self.cells = {tuple(int(part) for part in key.split(',')): postings
+                      for key, postings in self.indexes.pop('geo_cell').items()}
+        self.fragments = {}
+
+    def _array(self, offset: int, typecode: str, count: int) -> memoryview:
+        """View a fixed-width section as an array."""
+        return self._view[offset:offset + count * array(typecode).itemsize].cast(typecode)
+
+    def _getter(self, section: Dict[str, Any]) -> Callable[[int], Any]:
+        """Build the function decoding a column value from its row number."""
+        kind = section['kind']
+        if kind in _FIXED_KINDS:
+            values = self._array(section['data'], _FIXED_KINDS[kind], self.count)
+            if kind == 'bool':
+                get = lambda row: values[row] == 1
+            elif kind == 'ts':
+                get = lambda row: _EPOCH + timedelta(microseconds=values[row])
+            else:
+                get = values.__getitem__
+        else:
+            data, offsets, blob = self._mmap, self._array(section['offsets'], 'I', self.count + 1), section['blob']
+            if kind == 'bytes':
+                get = lambda row: data[blob + offsets[row]:blob + offsets[row + 1]]
+            elif kind == 'json':
+                get = lambda row: json.loads(data[blob + offsets[row]:blob + offsets[row + 1]])
+            else:
+                get = lambda row: data[blob + offsets[row]:blob + offsets[row + 1]].decode('utf-8')
+        if 'nulls' not in section:
+            return get
+        nulls = self._array(section['nulls'], 'B', self.count)
+        return lambda row: None if nulls[row] else get(row)
+
+    def _index(self, section: Dict[str, Any]) -> Dict[str, memoryview]:
+        """Map each value of a secondary index to its row positions."""
+        count = section['count']
+        offsets = self._array(section['offsets'], 'I', count + 1)
+        starts = self._array(section['starts'], 'I', count + 1)
+        positions = self._array(section['positions'], 'I', starts[count] if count else 0)
+        blob = section['blob']
+        index = {}
+        for i in range(count):
+            key = sys.intern(bytes(self._view[blob + offsets[i]:blob + offsets[i + 1]]).decode('utf-8'))
+            index[key] = positions[starts[i]:starts[i + 1]]
+        return index
+
+    def value(self, name: str, row: int):
+        """Decode one value of a column."""
+        try:
+            get = self._getters[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return get(row)
+
+    def rows(self, positions) -> List[MappedRecord]:
+        """Get the records at some positions (decoded lazily)."""
+        return [MappedRecord(self, position) for position in positions]
+
+    def record(self, place_id: int) -> Optional[MappedRecord]:
+        """Get the record of a restaurant id (binary search of the id index)."""
+        index = bisect_left(self._ids, place_id)
+        if index < self.count and self._ids[index] == place_id:
+            return MappedRecord(self, self.id_positions[index])
+        return None
+
+    def fragment(self, record: MappedRecord) -> bytes:
+        """Get the pre-encoded static part of a record."""
+        return self.value('fragment', record._row)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Get the mapped file size (shared by the workers of the host) and the per-process index tables."""
+        index_bytes = sum(sys.getsizeof(index) + sum(sys.getsizeof(key) for key in index)
+                          for index in list(self.indexes.values()) + [self.cells])
+        return {
+            'source': 'mmap',
+            'path': self.path,
+            'restaurants': self.count,
+            'mapped_bytes': len(self._mmap),
+            'process_bytes': index_bytes,
+            'total_bytes': len(self._mmap) + index_bytes,
+            'bytes_per_restaurant': round(len(self._mmap) / self.count) if self.count else 0,
+        }
@@ -0,0 +1,244 @@
+"""
+Request Metrics Module
+
+This module instruments the Flask API for Prometheus. It records per-route
+latency and response size, in-flight requests, database time and query count
+per request (via SQLAlchemy engine events), external API calls and cache
+hit/miss counts, and serves them at /metrics in the Prometheus text format.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (config/gunicorn.conf.py does
+this) so every worker writes its samples to a shared directory and /metrics
+aggregates across all workers.
+
+Features:
+- Per-route latency and response size histograms, in-flight gauge
+- Per-request database time and query count histograms
+- External API call counts and latency (Google Places)
+- Cache hit/miss counters (hit ratio = hits / (hits + misses))
+- Multiprocess aggregation across gunicorn workers
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional
+
+from flask import Response, g, has_request_context, request
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+                                   Histogram, generate_latest, multiprocess)
+except ImportError:  # pragma: no cover - optional dependency
+    CONTENT_TYPE_LATEST = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+if CONTENT_TYPE_LATEST is not None:
+    REQUEST_LATENCY = Histogram(
+        'jewgo_http_request_duration_seconds', 'HTTP request latency',
+        ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS
+    )
+    RESPONSE_SIZE = Histogram(
+        'jewgo_http_response_size_bytes', 'HTTP response body size',
+        ['endpoint'], buckets=SIZE_BUCKETS
+    )
+    REQUESTS_IN_PROGRESS = Gauge(
+        'jewgo_http_requests_in_progress', 'HTTP requests currently being served',
+        ['method', 'endpoint'], multiprocess_mode='livesum'
+    )
+    DB_REQUEST_TIME = Histogram(
+        'jewgo_db_time_per_request_seconds', 'Database time spent per HTTP request',
+        ['endpoint'], buckets=LATENCY_BUCKETS
+    )
+    DB_REQUEST_QUERIES = Histogram(
+        'jewgo_db_queries_per_request', 'Database queries executed per HTTP request',
+        ['endpoint'], buckets=QUERY_COUNT_BUCKETS
+    )
+    DB_QUERY_LATENCY = Histogram(
+        'jewgo_db_query_duration_seconds', 'Database query latency', buckets=LATENCY_BUCKETS
+    )
+    EXTERNAL_REQUESTS = Counter(
+        'jewgo_external_api_requests_total', 'External API calls', ['service', 'status']
+    )
+    EXTERNAL_LATENCY = Histogram(
+        'jewgo_external_api_request_duration_seconds', 'External API call latency',
+        ['service'], buckets=LATENCY_BUCKETS
+    )
+    CACHE_REQUESTS = Counter(
+        'jewgo_cache_requests_total', 'Cache lookups', ['cache', 'result']
+    )
+
+
+def metrics_available() -> bool:
+    """Check whether prometheus_client is installed."""
+    return CONTENT_TYPE_LATEST is not None
+
+
+def _endpoint_label() -> str:
+    """Get the route template for the current request (bounded label cardinality)."""
+    if request.url_rule is not None:
+        return request.url_rule.rule
+    return 'unmatched'
+
+
+def observe_request(method: str, endpoint: str, status: int, elapsed: float, size: Optional[int] = None) -> None:
+    """Record a request served outside Flask (the ASGI read endpoints)."""
+    if not metrics_available():
+        return
+    REQUEST_LATENCY.labels(method=method, endpoint=endpoint, status=str(status)).observe(elapsed)
+    if size is not None:
+        RESPONSE_SIZE.labels(endpoint=endpoint).observe(size)
+
+
+def _collector_registry():
+    """Get the registry to read from (aggregated across workers in multiprocess mode)."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def external_call_counts() -> dict:
+    """Get external API calls per service and status since the server started (all workers)."""
+    counts = {}
+    if not metrics_available():
+        return counts
+    for metric in _collector_registry().collect():
+        if metric.name != 'jewgo_external_api_requests':
+            continue
+        for sample in metric.samples:
+            if sample.name.endswith('_total'):
+                service = counts.setdefault(sample.labels['service'], {})
+                service[sample.labels['status']] = service.get(sample.labels['status'], 0) + int(sample.value)
+    return counts
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    if metrics_available():
+        CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def track_external_call(service: str):
+    """Time an external API call; the status label is set from the yielded dict."""
+    outcome = {'status': 'error'}
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        if metrics_available():
+            EXTERNAL_LATENCY.labels(service=service).observe(time.perf_counter() - start)
+            EXTERNAL_REQUESTS.labels(service=service, status=outcome['status']).inc()
+
+
+def external_get(service: str, url: str, **kwargs) -> 'requests.Response':
+    """``requests.get`` wrapper that records call count and latency for a service."""
+    # Imported on first call: only the admin endpoints reach external APIs
+    import requests
+
+    with track_external_call(service) as outcome:
+        response = requests.get(url, **kwargs)
+        outcome['status'] = str(response.status_code)
+        return response
+
+
+def instrument_engine(engine) -> None:
+    """Register SQLAlchemy events that time every query and attribute it to the current request."""
+    if not metrics_available():
+        return
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+        DB_QUERY_LATENCY.observe(elapsed)
+        if has_request_context() and 'metrics_db_time' in g:
+            g.metrics_db_time += elapsed
+            g.metrics_db_queries += 1
+
+
+class RequestMetrics:
+    """
+    Flask extension that records request metrics and serves /metrics.
+
+    Usage:
+        metrics = RequestMetrics(app)
+        metrics.instrument_engine(db_manager.engine)
+    """
+
+    def __init__(self, app=None):
+        """Initialize the extension (optionally binding an app)."""
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Register request hooks and the /metrics endpoint."""
+        self.enabled = app.config.get('METRICS_ENABLED', True) and metrics_available()
+        if not self.enabled:
+            if not metrics_available():
+                logger.warning("prometheus_client not installed; request metrics disabled")
+            return
+
+        app.extensions['request_metrics'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view, methods=['GET'])
+
+    def instrument_engine(self, engine) -> None:
+        """Track database time and query count for an engine."""
+        if self.enabled and engine is not None:
+            instrument_engine(engine)
+
+    def _before_request(self) -> None:
+        """Start timing the request."""
+        if request.path == '/metrics':
+            return
+        g.metrics_start_time = time.perf_counter()
+        g.metrics_db_time = 0.0
+        g.metrics_db_queries = 0
+        g.metrics_endpoint = _endpoint_label()
+        REQUESTS_IN_PROGRESS.labels(method=request.method, endpoint=g.metrics_endpoint).inc()
+
+    def _after_request(self, response):
+        """Record latency, response size and database usage for the request."""
+        if 'metrics_start_time' not in g:
+            return response
+        try:
+            endpoint = g.metrics_endpoint
+            REQUEST_LATENCY.labels(
+                method=request.method, endpoint=endpoint, status=str(response.status_code)
+            ).observe(time.perf_counter() - g.metrics_start_time)
+            if not response.is_streamed:
+                RESPONSE_SIZE.labels(endpoint=endpoint).observe(response.calculate_content_length() or 0)
+            DB_REQUEST_TIME.labels(endpoint=endpoint).observe(g.metrics_db_time)
+            DB_REQUEST_QUERIES.labels(endpoint=endpoint).observe(g.metrics_db_queries)
+        except Exception as e:
+            logger.error(f"Error recording request metrics: {e}")
+        return response
+
+    def _teardown_request(self, exc: Optional[BaseException]) -> None:
+        """Release the in-flight gauge (runs even when the view raised)."""
+        if 'metrics_start_time' in g:
+            REQUESTS_IN_PROGRESS.labels(method=request.method, endpoint=g.metrics_endpoint).dec()
+
+    def metrics_view(self):
+        """Serve all metrics in the Prometheus text format."""
+        return Response(generate_latest(_collector_registry()), headers={'Content-Type': CONTENT_TYPE_LATEST})
@@ -0,0 +1,265 @@
+"""
+SQL Query Profiler Module
+
+This module profiles the SQL issued by the API using SQLAlchemy cursor
+events. Profiling is off by default and is switched on per request with a
+header (guarded by a token), so it is safe to use in production:
+
+    curl -H "X-Profile-SQL: <SQL_PROFILER_TOKEN>" https://.../api/kosher-types
+
+For a profiled request, every statement is recorded under a normalized
+fingerprint (literals and IN-list arity removed) with its timing. The
+response carries X-SQL-Query-Count / X-SQL-Time-Ms and a Server-Timing entry,
+and a summary is logged. Statements repeated within one request are flagged
+as N+1 candidates, and statements slower than the threshold are logged with
+their EXPLAIN plan.
+
+Scripts can profile a block of code directly:
+
+    with query_profiler.profile('orb-import') as profile:
+        scraper.save_businesses_to_database(businesses)
+
+Features:
+- Normalized statement fingerprints with counts and timings
+- N+1 detection (identical fingerprints repeated within one request)
+- Slow-query logging with EXPLAIN plans (PostgreSQL and SQLite)
+- Per-request toggle via header, or always-on for development
+"""
+
+import hmac
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from flask import g, request
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'SQL_PROFILER_ALWAYS': False,  # profile every request (development only)
+    'SQL_PROFILER_HEADER': 'X-Profile-SQL',
+    'SQL_PROFILER_TOKEN': None,  # required header value; None only allows ALWAYS mode
+    'SQL_PROFILER_SLOW_MS': 100,
+    'SQL_PROFILER_N_PLUS_ONE': 5,  # repetitions of one fingerprint that get flagged
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_BIND_PARAMETER = re.compile(r'%\(\w+\)s|:\w+|\?|%s')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# The profile collecting statements for the current request/block
+_active_profile: ContextVar[Optional['QueryProfile']] = ContextVar('sql_profile', default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions differing only in values match.
+
+    Literals and bind parameters become ``?`` and IN lists collapse to
+    ``IN (...)`` regardless of their length.
+    """
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _BIND_PARAMETER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+class QueryProfile:
+    """Statements recorded for one request or profiled block."""
+
+    def __init__(self, label: str):
+        """Initialize an empty profile."""
+        self.label = label
+        self.statements: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.query_count = 0
+        self.total_time = 0.0
+        self.slow_queries: List[Dict[str, Any]] = []
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Record one execution."""
+        key = fingerprint(statement)
+        entry = self.statements.get(key)
+        if entry is None:
+            entry = self.statements[key] = {'fingerprint': key, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        elapsed_ms = elapsed * 1000
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+        self.query_count += 1
+        self.total_time += elapsed
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Get fingerprints executed at least ``threshold`` times (N+1 candidates)."""
+        return [entry for entry in self.statements.values() if entry['count'] >= threshold]
+
+    def summary(self, n_plus_one_threshold: int = DEFAULT_SETTINGS['SQL_PROFILER_N_PLUS_ONE']) -> Dict[str, Any]:
+        """Get a JSON-serializable summary of the profile."""
+        statements = sorted(self.statements.values(), key=lambda e: e['total_ms'], reverse=True)
+        return {
+            'label': self.label,
+            'query_count': self.query_count,
+            'distinct_statements': len(self.statements),
+            'total_ms': round(self.total_time * 1000, 3),
+            'n_plus_one': [
+                {'fingerprint': e['fingerprint'], 'count': e['count']}
+                for e in self.repeated(n_plus_one_threshold)
+            ],
+            'slow_queries': self.slow_queries,
+            'statements': [
+                dict(e, total_ms=round(e['total_ms'], 3), max_ms=round(e['max_ms'], 3))
+                for e in statements
+            ],
+        }
+
+
+class QueryProfiler:
+    """
+    Flask extension that profiles SQL per request.
+
+    Usage:
+        query_profiler = QueryProfiler(app)
+        query_profiler.instrument_engine(db_manager.engine)
+    """
+
+    def __init__(self, app=None):
+        """Initialize the profiler (optionally binding an app)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self._engines = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration and register request hooks."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        app.extensions['query_profiler'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def instrument_engine(self, engine) -> None:
+        """Register the cursor events on an engine (once per engine)."""
+        if engine is None or id(engine) in self._engines:
+            return
+        self._engines.add(id(engine))
+
+        from sqlalchemy import event
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if _active_profile.get() is not None:
+                conn.info.setdefault('profiler_start_time', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            profile = _active_profile.get()
+            if profile is None or not conn.info.get('profiler_start_time'):
+                return
+            elapsed = time.perf_counter() - conn.info['profiler_start_time'].pop()
+            profile.record(statement, elapsed)
+            if elapsed * 1000 >= self.settings['SQL_PROFILER_SLOW_MS']:
+                self._log_slow_query(profile, conn, statement, parameters, elapsed, executemany)
+
+    @contextmanager
+    def profile(self, label: str):
+        """Profile every statement executed inside the block and log the summary."""
+        profile = QueryProfile(label)
+        token = _active_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _active_profile.reset(token)
+            self._log_summary(profile)
+
+    def _is_requested(self) -> bool:
+        """Check whether the current request asked to be profiled."""
+        if self.settings['SQL_PROFILER_ALWAYS']:
+            return True
+        token = self.settings['SQL_PROFILER_TOKEN']
+        value = request.headers.get(self.settings['SQL_PROFILER_HEADER'])
+        return bool(token and value) and hmac.compare_digest(value, token)
+
+    def _before_request(self) -> None:
+        """Start a profile if requested."""
+        if not self._is_requested():
+            return
+        profile = QueryProfile(f"{request.method} {request.path}")
+        g.sql_profile_token = _active_profile.set(profile)
+        g.sql_profile = profile
+
+    def _after_request(self, response):
+        """Attach the profile summary headers to the response."""
+        profile = g.get('sql_profile')
+        if profile is None:
+            return response
+        total_ms = profile.total_time * 1000
+        response.headers['X-SQL-Query-Count'] = str(profile.query_count)
+        response.headers['X-SQL-Time-Ms'] = f"{total_ms:.2f}"
+        response.headers.add('Server-Timing', f'db;desc="SQL ({profile.query_count} queries)";dur={total_ms:.2f}')
+        repeated = profile.repeated(self.settings['SQL_PROFILER_N_PLUS_ONE'])
+        if repeated:
+            response.headers['X-SQL-N-Plus-One'] = str(len(repeated))
+        return response
+
+    def _teardown_request(self, exc: Optional[BaseException]) -> None:
+        """Close the profile and log its summary."""
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return
+        token = g.pop('sql_profile_token')
+        try:
+            _active_profile.reset(token)
+        except ValueError:
+            # Teardown ran in a different context (e.g. after a streamed response)
+            _active_profile.set(None)
+        self._log_summary(profile)
+
+    def _log_summary(self, profile: QueryProfile) -> None:
+        """Log the profile summary, with a warning for N+1 candidates."""
+        summary = profile.summary(self.settings['SQL_PROFILER_N_PLUS_ONE'])
+        logger.info(f"SQL profile for {profile.label}: {summary['query_count']} queries, "
+                    f"{summary['total_ms']} ms", extra={'sql_profile': summary})
+        for entry in summary['n_plus_one']:
+            logger.warning(f"Possible N+1 in {profile.label}: {entry['count']}x {entry['fingerprint']}")
+
+    def _log_slow_query(self, profile: QueryProfile, conn, statement: str, parameters,
+                        elapsed: float, executemany: bool) -> None:
+        """Log a slow statement together with its EXPLAIN plan."""
+        plan = None
+        if not executemany and statement.lstrip().upper().startswith('SELECT'):
+            plan = self.explain(conn, statement, parameters)
+        slow_query = {'statement': fingerprint(statement), 'ms': round(elapsed * 1000, 3), 'plan': plan}
+        profile.slow_queries.append(slow_query)
+        logger.warning(f"Slow query in {profile.label} ({slow_query['ms']} ms): {statement}\nPlan:\n{plan}")
+
+    def explain(self, conn, statement: str, parameters) -> Optional[str]:
+        """
+        Get the query plan for a statement.
+
+        Runs on a separate DBAPI cursor of the same connection, so it does not
+        re-enter the SQLAlchemy events or disturb the open result.
+        """
+        prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+        cursor = None
+        try:
+            cursor = conn.connection.cursor()
+            cursor.execute(prefix + statement, parameters)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error explaining slow query: {e}")
+            return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+
+# Global profiler instance (bound to the app in app.py)
+query_profiler = QueryProfiler()
@@ -0,0 +1,328 @@
+"""
+API Rate Limiting Module
+
+This module enforces per-client token buckets on the API. Each client (a
+configured API key, or otherwise the client IP) has one bucket per rate in
+RATELIMIT_DEFAULT (e.g. "60 per minute;1000 per hour"): a bucket holds up to
+N tokens and refills at N per period. Every request spends tokens according
+to its route: listings cost more than a detail page, and listing cost grows
+with the requested ``limit``, so ``/api/restaurants?limit=1000`` drains a
+bucket much faster than browsing does.
+
+The check runs in a before_request hook, ahead of any database work; a
+client out of tokens gets 429 with Retry-After. With ``redis://`` storage
+URLs the buckets live in Redis (atomic Lua script), so all workers and hosts
+enforce one budget. ``memory://`` keeps them in the worker process (tests and
+single-process development): each of N workers enforces the limits on its
+own, so a client gets up to N times the configured rates.
+
+Features:
+- Token buckets per API key or client IP, several rates per client
+- Per-route cost weights, scaled by the requested page size
+- Redis or in-memory bucket storage
+- 429 + Retry-After before any database access; fails open if the store is down
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, jsonify, request
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'RATELIMIT_ENABLED': True,
+    'RATELIMIT_DEFAULT': '60 per minute;1000 per hour',
+    'RATELIMIT_API_KEY_LIMIT': '600 per minute;20000 per hour',  # for keys in RATELIMIT_API_KEYS
+    'RATELIMIT_API_KEYS': (),
+    'RATELIMIT_API_KEY_HEADER': 'X-API-Key',
+    'RATELIMIT_STORAGE_URL': 'memory://',
+    'RATELIMIT_PROXY_COUNT': 1,  # trusted proxies appending to X-Forwarded-For (Render: 1)
+    'RATELIMIT_ROUTE_COSTS': {
+        'api.get_restaurants': 4,
+        'api.search_restaurants': 3,
+        'api.get_nearby_restaurants': 3,
+        'api.get_specials': 3,
+        'api.export_catalog': 50,
+        'api.remove_duplicates': 50,
+        'api.get_restaurant': 1,
+        'api.get_statistics': 1,
+        'api.get_kosher_types': 1,
+    },
+    'RATELIMIT_DEFAULT_COST': 1,
+    'RATELIMIT_PAGE_SIZE': 100,  # listing cost is multiplied per started page of this size
+    'RATELIMIT_EXEMPT': ('/livez', '/readyz', '/health', '/health/deep', '/metrics', '/img/'),  # entries ending in '/' are prefixes
+}
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+_RATE = re.compile(r'^\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*$', re.IGNORECASE)
+
+# Rates as (capacity, refill tokens per second, period seconds)
+Rate = Tuple[int, float, int]
+
+
+def parse_rates(spec: str) -> List[Rate]:
+    """
+    Parse a rate string such as ``"60 per minute;1000 per hour"``.
+
+    Raises:
+        ValueError: If a rate is malformed
+    """
+    rates = []
+    for part in filter(None, (p.strip() for p in spec.split(';'))):
+        match = _RATE.match(part)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {part!r}")
+        capacity = int(match.group(1))
+        period = _PERIODS[match.group(2).lower()]
+        rates.append((capacity, capacity / period, period))
+    return rates
+
+
+class MemoryBucketStore:
+    """In-process token buckets (one process only; for tests and development)."""
+
+    def __init__(self, max_keys: int = 100000):
+        """Initialize an empty store."""
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, keys: List[str], rates: List[Rate], cost: float) -> Tuple[bool, float, float]:
+        """
+        Take ``cost`` tokens from every bucket, or from none if any is short.
+
+        Returns:
+            (allowed, seconds until the request would be allowed, tokens left in the tightest bucket)
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, (capacity, refill, _) in zip(keys, rates):
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + (now - updated) * refill))
+
+            wait = max(
+                ((cost - tokens) / refill if tokens < cost else 0.0)
+                for tokens, (_, refill, _) in zip(levels, rates)
+            )
+            if wait > 0:
+                return False, wait, min(levels)
+
+            for key, tokens in zip(keys, levels):
+                self._buckets[key] = (tokens - cost, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now, rates)
+            return True, 0.0, min(levels) - cost
+
+    def _prune(self, now: float, rates: List[Rate]) -> None:
+        """Drop buckets that have not been touched for the longest rate period (they are full again)."""
+        horizon = max(period for _, _, period in rates)
+        self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < horizon}
+
+
+# KEYS: bucket keys; ARGV: cost, then capacity/refill/period per key.
+# Uses the Redis server clock so every worker sees the same time.
+_CONSUME_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local levels = {}
+local wait = 0
+local lowest = nil
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 1])
+    local refill = tonumber(ARGV[i * 3])
+    local state = redis.call('HMGET', key, 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+    levels[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) / refill)
+    end
+    if lowest == nil or tokens < lowest then
+        lowest = tokens
+    end
+end
+if wait > 0 then
+    return {0, tostring(wait), tostring(lowest)}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'tokens', levels[i] - cost, 'updated', now)
+    redis.call('EXPIRE', key, tonumber(ARGV[i * 3 + 1]))
+end
+return {1, '0', tostring(lowest - cost)}
+"""
+
+
+class RedisBucketStore:
+    """Token buckets in Redis, shared by every worker and instance."""
+
+    def __init__(self, url: str = None, client=None, prefix: str = 'jewgo:ratelimit:'):
+        """Initialize the store from a redis:// URL (or an existing client)."""
+        if client is None:
+            # Imported here: memory:// deployments never load the client
+            try:
+                import redis
+            except ImportError:  # pragma: no cover - optional dependency
+                raise RuntimeError("redis is not installed; use a memory:// RATELIMIT_STORAGE_URL") from None
+            client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_CONSUME_SCRIPT)
+
+    def consume(self, keys: List[str], rates: List[Rate], cost: float) -> Tuple[bool, float, float]:
+        """Atomically take ``cost`` tokens from every bucket (see MemoryBucketStore.consume)."""
+        args = [cost]
+        for capacity, refill, period in rates:
+            args += [capacity, refill, period]
+        allowed, wait, remaining = self._script(keys=[self.prefix + key for key in keys], args=args)
+        return bool(int(allowed)), float(wait), float(remaining)
+
+
+def create_store(url: str):
+    """Create the bucket store for a RATELIMIT_STORAGE_URL."""
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBucketStore(url)
+    if url.startswith('memory://'):
+        return MemoryBucketStore()
+    raise ValueError(f"Unsupported RATELIMIT_STORAGE_URL: {url}")
+
+
+class RateLimiter:
+    """
+    Flask extension enforcing per-client token buckets.
+
+    Usage:
+        rate_limiter = RateLimiter(app)
+
+    Register it before extensions whose before_request hooks do real work, so
+    rejected requests cost nothing.
+    """
+
+    def __init__(self, app=None, store=None):
+        """Initialize the limiter (optionally binding an app)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.store = store
+        self.enabled = False
+        self.rates: List[Rate] = []
+        self.api_key_rates: List[Rate] = []
+        self.api_keys = frozenset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration, create the store and register the request hooks."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        self.enabled = bool(self.settings['RATELIMIT_ENABLED'])
+        if not self.enabled:
+            return
+
+        self.rates = parse_rates(self.settings['RATELIMIT_DEFAULT'])
+        self.api_key_rates = parse_rates(self.settings['RATELIMIT_API_KEY_LIMIT'])
+        self.api_keys = frozenset(k for k in self.settings['RATELIMIT_API_KEYS'] if k)
+        if self.store is None:
+            self.store = create_store(self.settings['RATELIMIT_STORAGE_URL'])
+
+        app.extensions['rate_limiter'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def client_identity(self, headers, remote_addr: Optional[str]) -> Tuple[str, List[Rate]]:
+        """Get the bucket identity and rates for a client (API key if valid, else IP)."""
+        api_key = headers.get(self.settings['RATELIMIT_API_KEY_HEADER'])
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}", self.api_key_rates
+
+        ip = remote_addr or 'unknown'
+        proxy_count = self.settings['RATELIMIT_PROXY_COUNT']
+        forwarded = [part.strip() for part in headers.get('X-Forwarded-For', '').split(',') if part.strip()]
+        if proxy_count and len(forwarded) >= proxy_count:
+            # Entries left of the ones our proxies appended are client-controlled
+            ip = forwarded[-proxy_count]
+        return f"ip:{ip}", self.rates
+
+    def request_cost(self, endpoint: Optional[str], args) -> float:
+        """Get the token cost of a request: route weight times started pages of ``limit``."""
+        weight = self.settings['RATELIMIT_ROUTE_COSTS'].get(endpoint, self.settings['RATELIMIT_DEFAULT_COST'])
+        try:
+            limit = int(args.get('limit', 0))
+        except (TypeError, ValueError):
+            limit = 0
+        pages = max(1, math.ceil(limit / self.settings['RATELIMIT_PAGE_SIZE'])) if limit > 0 else 1
+        return weight * pages
+
+    def is_exempt(self, path: str) -> bool:
+        """Whether a path is exempt from rate limiting (exact paths, or prefixes ending in '/')."""
+        exempt = self.settings['RATELIMIT_EXEMPT']
+        return path in exempt or any(prefix.endswith('/') and path.startswith(prefix) for prefix in exempt)
+
+    def check(self, method: str, path: str, endpoint: Optional[str], headers, remote_addr: Optional[str],
+              args) -> Optional[Tuple[float, float, int]]:
+        """
+        Spend the tokens for a request.
+
+        Returns:
+            None if the request is not limited (disabled, exempt or preflight),
+            else (seconds to wait or 0 if allowed, tokens remaining, capacity)
+        """
+        if not self.enabled or method == 'OPTIONS' or self.is_exempt(path):
+            return None
+
+        identity, rates = self.client_identity(headers, remote_addr)
+        capacity = min(capacity for capacity, _, _ in rates)
+        # A request dearer than a full bucket is still allowed once the bucket is full
+        cost = min(self.request_cost(endpoint, args), capacity)
+        keys = [f"{identity}:{period}" for _, _, period in rates]
+        try:
+            allowed, wait, remaining = self.store.consume(keys, rates, cost)
+        except Exception as e:
+            # Fail open: an unavailable store must not take the API down
+            logger.error(f"Rate limit store error: {e}")
+            return None
+        return (0.0 if allowed else max(wait, 0.001)), max(remaining, 0.0), capacity
+
+    def too_many_requests(self, wait: float):
+        """Build the 429 response body and Retry-After value."""
+        retry_after = max(1, math.ceil(wait))
+        body = {
+            'error': 'Rate limit exceeded',
+            'message': f'Too many requests; retry in {retry_after} seconds',
+            'retry_after': retry_after,
+        }
+        return body, retry_after
+
+    def _before_request(self):
+        """Reject the request with 429 if the client is out of tokens."""
+        result = self.check(request.method, request.path, request.endpoint, request.headers,
+                            request.remote_addr, request.args)
+        if result is None:
+            return None
+        wait, remaining, capacity = result
+        g.rate_limit = (remaining, capacity)
+        if wait:
+            body, retry_after = self.too_many_requests(wait)
+            response = jsonify(body)
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return None
+
+    def _after_request(self, response):
+        """Advertise the remaining budget of the tightest bucket."""
+        rate_limit = g.get('rate_limit')
+        if rate_limit is not None:
+            response.headers['X-RateLimit-Limit'] = str(rate_limit[1])
+            response.headers['X-RateLimit-Remaining'] = str(int(rate_limit[0]))
+        return response
+
+
+# Global rate limiter (bound to the app in app.py)
+rate_limiter = RateLimiter()
@@ -21,9 +21,35 @@ import pytz
 from dateutil import parser as date_parser
 from dateutil.relativedelta import relativedelta
 
+from utils.timezone_resolver import resolve_timezone
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_DAY_PREFIXES = tuple(day[:3] for day in _WEEKDAYS)
+
+# Google separates ranges with en dashes and thin spaces, and puts a narrow no-break space before AM/PM
+_DASHES = str.maketrans({'\u2013': '-', '\u2014': '-', '\u2012': '-', '\u2212': '-'})
+_SPACES = re.compile(r'[\u00a0\u2009\u202f\u2007\u200a]')
+
+_DAY = r'(?:mon(?:day)?|tue(?:sday|s)?|wed(?:nesday)?|thu(?:rsday|rs|r)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b'
+_DAYS = rf'(?:daily|every\s*day|{_DAY}(?:\s*-\s*{_DAY})?)'
+
+# A day segment: its days, then everything up to the next segment
+_SEGMENT_PATTERN = re.compile(rf'\b(?P<days>{_DAYS})\s*:?\s*(?P<spec>.*?)(?=[,;\n]\s*{_DAYS}|$)',
+                              re.IGNORECASE | re.DOTALL)
+_TIME = r'(\d{1,2})(?::(\d{2}))?\s*(AM|PM)?'
+_RANGE_PATTERN = re.compile(rf'{_TIME}\s*(?:-|to)\s*{_TIME}', re.IGNORECASE)
+_CLOSED_PATTERN = re.compile(r'\bclosed\b', re.IGNORECASE)
+_ALL_DAY_PATTERN = re.compile(r'24\s*hours?', re.IGNORECASE)
+
+
+def _normalize_hours_text(hours_data: str) -> str:
+    """Replace typographic dashes and spaces with ASCII ones."""
+    return _SPACES.sub(' ', hours_data.translate(_DASHES)).replace('a.m.', 'AM').replace('p.m.', 'PM')
+
+
 class RestaurantStatusCalculator:
     """
     Calculates restaurant open/closed status based on business hours and current time.
@@ -46,7 +72,8 @@ class RestaurantStatusCalculator:
         
         Args:
             restaurant_data: Dictionary containing restaurant information including
-                           hours_open, hours, latitude, longitude, city, state
+                           hours_of_operation (or legacy hours_open/hours), latitude,
+                           longitude, city, state
         
         Returns:
             Dictionary with status information:
@@ -62,14 +89,16 @@ class RestaurantStatusCalculator:
         """
         try:
             # Extract restaurant information
-            hours_data = restaurant_data.get('hours_open') or restaurant_data.get('hours')
+            hours_data = (restaurant_data.get('hours_of_operation') or restaurant_data.get('hours_open')
+                          or restaurant_data.get('hours'))
             latitude = restaurant_data.get('latitude')
             longitude = restaurant_data.get('longitude')
             city = restaurant_data.get('city')
             state = restaurant_data.get('state')
+            stored_timezone = restaurant_data.get('timezone')
             
             # Determine timezone
-            timezone_str = self._get_timezone(latitude, longitude, city, state)
+            timezone_str = self._get_timezone(latitude, longitude, city, state, stored_timezone)
             
             # Get current time in restaurant's timezone
             current_time_local = self._get_current_time_in_timezone(timezone_str)
@@ -118,83 +147,33 @@ class RestaurantStatusCalculator:
             }
     
     def _get_timezone(self, latitude: Optional[float], longitude: Optional[float], 
-                     city: Optional[str], state: Optional[str]) -> str:
+                     city: Optional[str], state: Optional[str],
+                     stored_timezone: Optional[str] = None) -> str:
         """
         Determine the timezone for a restaurant based on location.
         
+        The timezone persisted on the restaurant at write time is used when
+        present; otherwise it is resolved offline from the coordinates, with
+        the state as a fallback.
+        
         Args:
             latitude: Restaurant latitude
             longitude: Restaurant longitude
             city: Restaurant city
             state: Restaurant state
+            stored_timezone: Timezone persisted on the restaurant record
             
         Returns:
             Timezone string (e.g., 'America/New_York')
         """
-        # If we have coordinates, we could use a geocoding service to get timezone
-        # For now, we'll use a simple mapping based on state
-        if state and state.strip():
-            state_timezones = {
-                'NY': 'America/New_York',
-                'CA': 'America/Los_Angeles',
-                'TX': 'America/Chicago',
-                'FL': 'America/New_York',  # Most of Florida is Eastern Time
-                'IL': 'America/Chicago',
-                'PA': 'America/New_York',
-                'OH': 'America/New_York',
-                'GA': 'America/New_York',
-                'NC': 'America/New_York',
-                'MI': 'America/New_York',
-                'NJ': 'America/New_York',
-                'VA': 'America/New_York',
-                'WA': 'America/Los_Angeles',
-                'AZ': 'America/Phoenix',
-                'CO': 'America/Denver',
-                'TN': 'America/Chicago',
-                'IN': 'America/New_York',
-                'MA': 'America/New_York',
-                'MO': 'America/Chicago',
-                'MD': 'America/New_York',
-                'MN': 'America/Chicago',
-                'WI': 'America/Chicago',
-                'LA': 'America/Chicago',
-                'AL': 'America/Chicago',
-                'SC': 'America/New_York',
-                'KY': 'America/New_York',
-                'OR': 'America/Los_Angeles',
-                'CT': 'America/New_York',
-                'IA': 'America/Chicago',
-                'OK': 'America/Chicago',
-                'UT': 'America/Denver',
-                'NV': 'America/Los_Angeles',
-                'AR': 'America/Chicago',
-                'MS': 'America/Chicago',
-                'KS': 'America/Chicago',
-                'NE': 'America/Chicago',
-                'ID': 'America/Boise',
-                'NM': 'America/Denver',
-                'WV': 'America/New_York',
-                'NH': 'America/New_York',
-                'ME': 'America/New_York',
-                'HI': 'Pacific/Honolulu',
-                'RI': 'America/New_York',
-                'MT': 'America/Denver',
-                'DE': 'America/New_York',
-                'SD': 'America/Chicago',
-                'ND': 'America/Chicago',
-                'AK': 'America/Anchorage',
-                'VT': 'America/New_York',
-                'WY': 'America/Denver'
-            }
-            
-            timezone = state_timezones.get(state.upper().strip())
-            if timezone:
-                return timezone
+        if stored_timezone and stored_timezone != 'UTC':
+            return stored_timezone
+        
+        timezone = resolve_timezone(latitude, longitude, state)
         
-        # Default to UTC if we can't determine timezone
-        if city or state:
+        if timezone == 'UTC' and (city or state):
             logger.warning(f"Could not determine timezone for location: {city or 'unknown'}, {state or 'unknown'}")
-        return 'UTC'
+        return timezone
     
     def _get_current_time_in_timezone(self, timezone_str: str) -> datetime:
         """
@@ -217,102 +196,111 @@ class RestaurantStatusCalculator:
         """
         Parse business hours from various formats.
         
+        The text is read as day segments ("Monday: 9:00 AM – 10:00 PM",
+        "Sun-Thu 11AM-10PM", "Sat Closed", "Daily: 24 hours"), each with one
+        or more time ranges or "Closed". Text with no recognizable day
+        segments is only accepted when it says the place is open 24 hours;
+        anything else is reported as unparsed rather than guessed.
+        
         Args:
             hours_data: String containing business hours information
             
         Returns:
-            Tuple of (success, parsed_hours_list)
+            Tuple of (success, parsed_hours_list); every entry names one
+            weekday, days listed as closed have no entry
         """
         if not hours_data:
             return False, []
         
         try:
-            # Common patterns for business hours
-            patterns = [
-                # Pattern: "Daily: 24 hours" or "24 hours" (check this first)
-                r'(Daily|24\s*hours?|Open\s*24\s*hours?)',
-                # Pattern: "Monday: 9:00 AM - 10:00 PM"
-                r'(\w+):\s*(\d{1,2}):(\d{2})\s*(AM|PM)\s*-\s*(\d{1,2}):(\d{2})\s*(AM|PM)',
-                # Pattern: "Mon 9AM-10PM"
-                r'(\w{3})\s*(\d{1,2})(AM|PM)-(\d{1,2})(AM|PM)',
-                # Pattern: "Monday 9:00-22:00"
-                r'(\w+)\s*(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})',
-                # Pattern: "Mon-Fri 9AM-5PM"
-                r'(\w{3})-(\w{3})\s*(\d{1,2})(AM|PM)-(\d{1,2})(AM|PM)',
-            ]
+            text = _normalize_hours_text(hours_data)
+            hours_by_day = {}
+            closed_days = set()
+            
+            for segment in _SEGMENT_PATTERN.finditer(text):
+                days = self._segment_days(segment.group('days'))
+                spec = segment.group('spec')
+                if _CLOSED_PATTERN.search(spec):
+                    closed_days.update(days)
+                    continue
+                if _ALL_DAY_PATTERN.search(spec):
+                    ranges = [(time(0, 0), time(23, 59))]
+                else:
+                    ranges = self._parse_time_ranges(spec)
+                for day in days:
+                    hours_by_day.setdefault(day, []).extend(ranges)
             
-            parsed_hours = []
+            if not hours_by_day and not closed_days and _ALL_DAY_PATTERN.search(text):
+                # "Open 24 hours" with no days listed
+                hours_by_day = {'daily': [(time(0, 0), time(23, 59))]}
             
-            for i, pattern in enumerate(patterns):
-                matches = re.findall(pattern, hours_data, re.IGNORECASE)
-                if matches:
-                    for match in matches:
-                        # Handle 24-hour pattern separately
-                        if i == 0:  # First pattern is 24-hour pattern
-                            day_info = [{'day': 'daily', 'start': time(0, 0), 'end': time(23, 59)}]
-                        else:
-                            day_info = self._parse_day_hours(match, pattern)
-                        
-                        if day_info:
-                            parsed_hours.extend(day_info)
+            # Expand "daily" to the days not listed as closed
+            daily = hours_by_day.pop('daily', [])
+            parsed_hours = []
+            for day in _WEEKDAYS:
+                if day in closed_days and day not in hours_by_day:
+                    continue
+                for start, end in sorted(hours_by_day.get(day, daily)):
+                    parsed_hours.append({'day': day, 'start': start, 'end': end})
             
             if parsed_hours:
                 return True, parsed_hours
-            
-            # If no patterns matched, try to extract any time-like information
-            return self._fallback_hours_parsing(hours_data)
+            if closed_days:
+                # Closed every day that was listed
+                return True, []
+            return False, []
             
         except Exception as e:
             logger.error(f"Error parsing business hours: {e}")
             return False, []
     
-    def _parse_day_hours(self, match: tuple, pattern: str) -> List[Dict]:
+    def _segment_days(self, days_text: str) -> List[str]:
         """
-        Parse hours for specific day(s) from regex match.
+        Get the weekdays of a day segment ("Monday", "Sun-Thu", "Daily").
         
         Args:
-            match: Regex match tuple
-            pattern: Pattern that was matched
+            days_text: Day part of a segment
             
         Returns:
-            List of day-hour dictionaries
+            List of day names, or ['daily']
         """
-        try:
-            if len(match) == 7:  # Pattern 1: "Monday: 9:00 AM - 10:00 PM"
-                day, start_hour, start_min, start_ampm, end_hour, end_min, end_ampm = match
-                start_time = self._time_from_components(start_hour, start_min, start_ampm)
-                end_time = self._time_from_components(end_hour, end_min, end_ampm)
-                return [{'day': day.lower(), 'start': start_time, 'end': end_time}]
-                
-            elif len(match) == 5:  # Pattern 2: "Mon 9AM-10PM"
-                day, start_hour, start_ampm, end_hour, end_ampm = match
-                start_time = self._time_from_components(start_hour, '00', start_ampm)
-                end_time = self._time_from_components(end_hour, '00', end_ampm)
-                return [{'day': day.lower(), 'start': start_time, 'end': end_time}]
-                
-            elif len(match) == 5:  # Pattern 3: "Monday 9:00-22:00"
-                day, start_hour, start_min, end_hour, end_min = match
-                start_time = time(int(start_hour), int(start_min))
-                end_time = time(int(end_hour), int(end_min))
-                return [{'day': day.lower(), 'start': start_time, 'end': end_time}]
-                
-            elif len(match) == 6:  # Pattern 4: "Mon-Fri 9AM-5PM"
-                start_day, end_day, start_hour, start_ampm, end_hour, end_ampm = match
-                start_time = self._time_from_components(start_hour, '00', start_ampm)
-                end_time = self._time_from_components(end_hour, '00', end_ampm)
-                
-                # Generate days between start_day and end_day
-                days = self._get_days_between(start_day, end_day)
-                return [{'day': day, 'start': start_time, 'end': end_time} for day in days]
-                
-            elif len(match) == 1:  # Pattern 5: "Daily: 24 hours"
-                # 24-hour restaurant
-                return [{'day': 'daily', 'start': time(0, 0), 'end': time(23, 59)}]
-                
-        except Exception as e:
-            logger.error(f"Error parsing day hours: {e}")
+        days_text = days_text.lower()
+        if days_text.startswith(('daily', 'every')):
+            return ['daily']
+        if '-' in days_text:
+            start_day, end_day = (part.strip()[:3] for part in days_text.split('-', 1))
+            return self._get_days_between(start_day, end_day)
+        return [_WEEKDAYS[_DAY_PREFIXES.index(days_text[:3])]]
+    
+    def _parse_time_ranges(self, spec: str) -> List[Tuple[time, time]]:
+        """
+        Parse the time ranges of a day segment ("11:30 AM - 2:30 PM, 5:00 - 10:00 PM").
+        
+        A start without AM/PM takes the meridiem of its end, as Google
+        writes ranges within the same half of the day; ranges with neither
+        are read as a 24-hour clock.
+        
+        Args:
+            spec: Hours part of a segment
             
-        return []
+        Returns:
+            List of (start, end) times
+        """
+        ranges = []
+        for start_hour, start_min, start_ampm, end_hour, end_min, end_ampm in _RANGE_PATTERN.findall(spec):
+            start_ampm = start_ampm or end_ampm
+            end_ampm = end_ampm or start_ampm
+            try:
+                if start_ampm:
+                    start_time = self._time_from_components(start_hour, start_min or '00', start_ampm)
+                    end_time = self._time_from_components(end_hour, end_min or '00', end_ampm)
+                else:
+                    start_time = time(int(start_hour) % 24, int(start_min or 0))
+                    end_time = time(23, 59) if int(end_hour) == 24 else time(int(end_hour), int(end_min or 0))
+            except ValueError:
+                continue
+            ranges.append((start_time, end_time))
+        return ranges
     
     def _time_from_components(self, hour: str, minute: str, ampm: str) -> time:
         """
@@ -367,41 +355,13 @@ class RestaurantStatusCalculator:
         except ValueError:
             return []
     
-    def _fallback_hours_parsing(self, hours_data: str) -> Tuple[bool, List[Dict]]:
-        """
-        Fallback method for parsing hours when standard patterns don't match.
-        
-        Args:
-            hours_data: Raw hours string
-            
-        Returns:
-            Tuple of (success, parsed_hours_list)
-        """
-        try:
-            # Look for any time-like patterns
-            time_pattern = r'(\d{1,2}):(\d{2})\s*(AM|PM)'
-            times = re.findall(time_pattern, hours_data, re.IGNORECASE)
-            
-            if len(times) >= 2:
-                # Assume first time is opening, second is closing
-                start_hour, start_min, start_ampm = times[0]
-                end_hour, end_min, end_ampm = times[1]
-                
-                start_time = self._time_from_components(start_hour, start_min, start_ampm)
-                end_time = self._time_from_components(end_hour, end_min, end_ampm)
-                
-                # Assume daily hours if we can't determine specific days
-                return True, [{'day': 'daily', 'start': start_time, 'end': end_time}]
-                
-        except Exception as e:
-            logger.error(f"Error in fallback hours parsing: {e}")
-            
-        return False, []
-    
     def _check_if_open(self, parsed_hours: List[Dict], current_time: datetime) -> Tuple[bool, Optional[datetime], str]:
         """
         Check if restaurant is currently open based on parsed hours.
         
+        Every range of the current day is checked, as well as ranges of the
+        previous day that run past midnight.
+        
         Args:
             parsed_hours: List of parsed hour dictionaries
             current_time: Current time in restaurant's timezone
@@ -411,40 +371,35 @@ class RestaurantStatusCalculator:
         """
         try:
             current_weekday = current_time.strftime('%A').lower()
+            previous_weekday = (current_time - timedelta(days=1)).strftime('%A').lower()
             current_time_only = current_time.time()
             
             # Find today's hours
-            today_hours = None
+            today_hours = [hours for hours in parsed_hours if hours['day'] in (current_weekday, 'daily')]
+            for hours in today_hours:
+                start_time = hours['start']
+                end_time = hours['end']
+                if end_time < start_time:
+                    # Overnight hours (e.g., 10 PM - 2 AM) open tonight
+                    if current_time_only >= start_time:
+                        return True, None, "Currently open (overnight hours)"
+                elif start_time <= current_time_only <= end_time:
+                    return True, None, "Currently open"
+            
+            # Overnight hours that started yesterday
             for hours in parsed_hours:
-                if hours['day'] in [current_weekday, 'daily']:
-                    today_hours = hours
-                    break
+                if hours['day'] in (previous_weekday, 'daily') and hours['end'] < hours['start'] \
+                        and current_time_only <= hours['end']:
+                    return True, None, "Currently open (overnight hours)"
             
+            next_open = self._calculate_next_open_time(parsed_hours, current_time)
             if not today_hours:
-                return False, None, f"Closed on {current_weekday}"
-            
-            start_time = today_hours['start']
-            end_time = today_hours['end']
-            
-            # Handle overnight hours (e.g., 10 PM - 2 AM)
-            if end_time < start_time:
-                # Restaurant is open if current time is after start OR before end
-                if current_time_only >= start_time or current_time_only <= end_time:
-                    return True, None, "Currently open (overnight hours)"
-                else:
-                    # Calculate next open time
-                    next_open = self._calculate_next_open_time(parsed_hours, current_time)
-                    return False, next_open, "Currently closed (overnight hours)"
-            else:
-                # Normal hours
-                if start_time <= current_time_only <= end_time:
-                    return True, None, "Currently open"
-                else:
-                    next_open = self._calculate_next_open_time(parsed_hours, current_time)
-                    if current_time_only < start_time:
-                        return False, next_open, f"Opens at {start_time.strftime('%I:%M %p')}"
-                    else:
-                        return False, next_open, f"Closed at {end_time.strftime('%I:%M %p')}"
+                return False, next_open, f"Closed on {current_weekday}"
+            later_starts = [hours['start'] for hours in today_hours if current_time_only < hours['start']]
+            if later_starts:
+                return False, next_open, f"Opens at {min(later_starts).strftime('%I:%M %p')}"
+            last_end = max(today_hours, key=lambda hours: hours['start'])['end']
+            return False, next_open, f"Closed at {last_end.strftime('%I:%M %p')}"
                         
         except Exception as e:
             logger.error(f"Error checking if open: {e}")
@@ -462,38 +417,22 @@ class RestaurantStatusCalculator:
             Next open datetime or None
         """
         try:
-            # Check remaining hours today
-            current_weekday = current_time.strftime('%A').lower()
             current_time_only = current_time.time()
             
-            for hours in parsed_hours:
-                if hours['day'] in [current_weekday, 'daily']:
-                    start_time = hours['start']
-                    if current_time_only < start_time:
-                        # Restaurant opens later today
-                        next_open = current_time.replace(
-                            hour=start_time.hour,
-                            minute=start_time.minute,
-                            second=0,
-                            microsecond=0
-                        )
-                        return next_open
-            
-            # Check next days
-            for i in range(1, 8):  # Check next 7 days
+            # Check remaining hours today, then the next 7 days
+            for i in range(8):
                 next_date = current_time + timedelta(days=i)
                 next_weekday = next_date.strftime('%A').lower()
-                
-                for hours in parsed_hours:
-                    if hours['day'] in [next_weekday, 'daily']:
-                        start_time = hours['start']
-                        next_open = next_date.replace(
-                            hour=start_time.hour,
-                            minute=start_time.minute,
-                            second=0,
-                            microsecond=0
-                        )
-                        return next_open
+                starts = [hours['start'] for hours in parsed_hours
+                          if hours['day'] in (next_weekday, 'daily') and (i or current_time_only < hours['start'])]
+                if starts:
+                    start_time = min(starts)
+                    return next_date.replace(
+                        hour=start_time.hour,
+                        minute=start_time.minute,
+                        second=0,
+                        microsecond=0
+                    )
             
             return None
             
@@ -0,0 +1,725 @@
+"""
+Job Scheduler Module
+
+This module runs the periodic maintenance jobs (the Google Places refresh,
+one sync per certifier source, see utils/ingestion.py, the image cache
+refresh, see utils/image_proxy.py, the statistics summary rebuild and the
+catalog snapshot build, see utils/snapshot.py) inside the API processes on
+cron-style schedules, instead of from cron entries that nothing coordinated. Every worker starts a
+scheduler thread (gunicorn post_fork hook), but only the leader runs jobs:
+the process holding a Postgres advisory lock on a dedicated connection. When
+the leader exits, its connection closes, the lock is released and a worker
+on any host takes over within SCHEDULER_ELECTION_INTERVAL seconds.
+
+Every run is recorded in the job_runs table with the schedule slot it is
+for. A unique (job_name, scheduled_for) constraint lets each slot run once,
+and each run holds a per-job advisory lock, so a manual run
+(scripts/run_scheduler.py) never overlaps a scheduled one. Without Postgres
+(SQLite in development) there are no advisory locks: every scheduler acts as
+the leader and the unique slot alone prevents double runs.
+
+Slots that pass without a run (no leader during a deploy, a long job holding
+the thread) are caught up: the job runs once for the latest missed slot, or
+the slot is recorded as missed for jobs with catch_up=False. A run that was
+cut off (the leader exited mid-job) is recorded as interrupted and retried
+by the next leader. Each slot starts after a stable jitter of up to the
+job's ``jitter`` seconds, so jobs do not all call out at the top of the hour.
+
+Features:
+- Cron expressions (minute hour day-of-month month day-of-week, @daily, ...)
+  in SCHEDULER_TIMEZONE
+- Advisory-lock leader election across workers and hosts
+- Per-slot jitter and missed-run catch-up
+- Run history with trigger, status, duration, result and error
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import NullPool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'SCHEDULER_ENABLED': True,
+    'SCHEDULER_TIMEZONE': 'America/New_York',  # cron expressions are wall-clock times here
+    'SCHEDULER_TICK': 30,  # max seconds between due checks on the leader
+    'SCHEDULER_ELECTION_INTERVAL': 30,  # seconds between leadership attempts
+    'SCHEDULER_HISTORY_DAYS': 90,  # run history kept
+    'GOOGLE_PLACES_REFRESH_CRON': '15 * * * *',  # empty to disable
+    'GOOGLE_PLACES_REFRESH_BATCH_SIZE': 10,
+    'GOOGLE_PLACES_CLEANUP_DAYS': 30,  # deactivate Places data not refreshed for this long
+    'INGESTION_SOURCES': ('scrapers.orb_source.ORBSource',),  # one <name>_sync job per source
+    'ORB_SYNC_CRON': '0 4 * * 1',  # Mondays 04:00; empty to disable (other sources: <NAME>_SYNC_CRON)
+    'IMAGE_CACHE_CRON': '45 */6 * * *',  # empty to disable; run where IMAGE_CACHE_DIR is served from
+    'IMAGE_CACHE_DIR': None,  # image settings default to utils/image_proxy.py
+    'IMAGE_CACHE_MAX_BYTES': None,
+    'STATISTICS_REFRESH_CRON': '30 * * * *',  # rebuild the statistics row (raw-SQL loaders bypass it); empty to disable
+    'SNAPSHOT_PATH': '',  # rebuild the catalog snapshot here (empty to disable)
+    'SNAPSHOT_MODE': 'off',  # no snapshot builds on 'always' (edge) instances
+    'SNAPSHOT_BUILD_CRON': '*/10 * * * *',
+    'GOOGLE_PLACES_API_KEY': None,
+}
+
+RUN_STATUSES = ('running', 'succeeded', 'failed', 'missed', 'interrupted')
+
+# Advisory lock name of the scheduler leader (jobs lock 'job:<name>')
+LEADER_LOCK = 'scheduler:leader'
+
+# Missed slots scanned per job before giving up on finding the latest one
+_MAX_MISSED_SLOTS = 100000
+
+_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day of month', 1, 31), ('month', 1, 12), ('day of week', 0, 7))
+
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+
+def _parse_field(spec: str, name: str, low: int, high: int) -> frozenset:
+    """Parse one cron field (``*``, lists, ranges and steps) into its values."""
+    values = set()
+    for part in spec.split(','):
+        base, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if base == '*':
+                start, end = low, high
+            elif '-' in base:
+                start, end = (int(value) for value in base.split('-', 1))
+            else:
+                start = int(base)
+                end = high if '/' in part else start
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} field: {spec!r}") from None
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron {name} field: {spec!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def lock_key(name: str) -> int:
+    """Postgres advisory lock key (signed 64-bit) for a lock name."""
+    return int.from_bytes(hashlib.sha256(f"jewgo:{name}".encode()).digest()[:8], 'big', signed=True)
+
+
+class CronSchedule:
+    """
+    A cron expression (``minute hour day-of-month month day-of-week``).
+
+    Supports ``*``, lists, ranges, steps and the @hourly/@daily/@weekly/
+    @monthly aliases; day of week 0 and 7 are Sunday. As in cron, when both
+    day fields are restricted a day matching either one matches. Times are
+    wall-clock times in ``tz_name``; slots are returned as naive UTC.
+    """
+
+    def __init__(self, expression: str, tz_name: str = 'UTC'):
+        """
+        Parse an expression.
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression.strip()
+        fields = _ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression: {expression!r} (expected 5 fields)")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(spec, *field) for spec, field in zip(fields, _FIELDS)
+        )
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2].startswith('*') or fields[4].startswith('*')
+        self.tz = ZoneInfo(tz_name)
+
+    def _day_matches(self, day: datetime) -> bool:
+        """Check the day-of-month and day-of-week fields."""
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        return (in_days and in_weekdays) if self._any_day else (in_days or in_weekdays)
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        Get the first slot strictly after a time.
+
+        Args:
+            after: Naive UTC datetime
+
+        Returns:
+            Naive UTC datetime of the slot
+        """
+        local = after.replace(tzinfo=timezone.utc).astimezone(self.tz).replace(tzinfo=None)
+        candidate = local.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 8)  # covers Feb 29 on a given weekday
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                # Times skipped by a DST change run after it; repeated ones run once
+                slot = candidate.replace(tzinfo=self.tz).astimezone(timezone.utc).replace(tzinfo=None)
+                if slot > after:
+                    return slot
+                candidate += timedelta(minutes=1)
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+
+class Job:
+    """A periodic job: a callable run on a cron schedule."""
+
+    def __init__(self, name: str, schedule: CronSchedule, func: Callable[[], Any], jitter: int = 0,
+                 catch_up: bool = True, description: str = ''):
+        """
+        Initialize a job.
+
+        Args:
+            name: Unique job name (recorded in the run history)
+            schedule: When the job runs
+            func: Callable run by the job; its return value is recorded as the result
+            jitter: Max seconds after each slot before the run starts
+            catch_up: Run once for missed slots (otherwise record them as missed)
+            description: Shown in the job list
+        """
+        self.name = name
+        self.schedule = schedule
+        self.func = func
+        self.jitter = jitter
+        self.catch_up = catch_up
+        self.description = description
+
+    def start_time(self, slot: datetime) -> datetime:
+        """When the run for a slot starts: the slot plus a jitter that is the same on every host."""
+        if not self.jitter:
+            return slot
+        digest = hashlib.sha256(f"{self.name}:{slot.isoformat()}".encode()).digest()
+        return slot + timedelta(seconds=int.from_bytes(digest[:4], 'big') % (self.jitter + 1))
+
+
+class Scheduler:
+    """
+    Leader-elected runner for periodic jobs.
+
+    Usage:
+        scheduler = Scheduler()
+        scheduler.init_app(app)
+        scheduler.start()  # in each worker, after the fork
+    """
+
+    def __init__(self, app=None, **settings):
+        """Initialize the scheduler (settings override DEFAULT_SETTINGS)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self.jobs: Dict[str, Job] = {}
+        self.database_url = None
+        self.engine = None
+        self.identity = None
+        self.is_leader = False
+        self._leader_conn = None
+        self._baselines: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration and register the default jobs."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        self.settings.update({key: value for key, value in app.config.items() if key.endswith('_SYNC_CRON')})
+        self.database_url = app.config.get('DATABASE_URL')
+        self.add_default_jobs()
+        app.extensions['scheduler'] = self
+
+    def add_job(self, name: str, cron: str, func: Callable[[], Any], jitter: int = 0,
+                catch_up: bool = True, description: str = '') -> Optional[Job]:
+        """
+        Register (or replace) a job; an empty cron expression disables it.
+
+        Raises:
+            ValueError: If the cron expression is malformed
+        """
+        if not cron:
+            self.jobs.pop(name, None)
+            return None
+        schedule = CronSchedule(cron, self.settings['SCHEDULER_TIMEZONE'])
+        job = self.jobs[name] = Job(name, schedule, func, jitter=jitter, catch_up=catch_up,
+                                    description=description)
+        return job
+
+    def add_default_jobs(self) -> None:
+        """Register the Google Places refresh, a sync job per ingestion source, the image cache, the statistics and snapshot builds."""
+        settings = self.settings
+        if settings['GOOGLE_PLACES_API_KEY'] or os.environ.get('GOOGLE_PLACES_API_KEY'):
+            self.add_job(
+                'google_places_refresh', settings['GOOGLE_PLACES_REFRESH_CRON'],
+                lambda: refresh_google_places(settings['GOOGLE_PLACES_REFRESH_BATCH_SIZE'],
+                                              settings['GOOGLE_PLACES_CLEANUP_DAYS']),
+                jitter=300, description='Refresh stored Google Places data that is due',
+            )
+        else:
+            logger.info("GOOGLE_PLACES_API_KEY not set; the Google Places refresh job is disabled")
+        # Adapters are instantiated here for their name and schedule; they import
+        # their HTTP client and parser only when a sync job runs
+        from utils.ingestion import load_sources
+
+        try:
+            sources = load_sources(settings['INGESTION_SOURCES'])
+        except ValueError as e:
+            logger.error(f"Ingestion sources not loaded; no sync jobs: {e}")
+            sources = []
+        for source in sources:
+            key = f"{source.name.upper()}_SYNC_CRON"
+            cron = settings[key] if key in settings else os.environ.get(key, source.schedule)
+            self.add_job(
+                f"{source.name}_sync", cron,
+                functools.partial(sync_source, source.name, settings['INGESTION_SOURCES']),
+                jitter=1800, description=f"Ingest {source.agency} listings and apply the changes",
+            )
+        self.add_job(
+            'image_cache', settings['IMAGE_CACHE_CRON'],
+            functools.partial(cache_restaurant_images, IMAGE_CACHE_DIR=settings['IMAGE_CACHE_DIR'],
+                              IMAGE_CACHE_MAX_BYTES=settings['IMAGE_CACHE_MAX_BYTES'],
+                              GOOGLE_PLACES_API_KEY=settings['GOOGLE_PLACES_API_KEY']
+                              or os.environ.get('GOOGLE_PLACES_API_KEY')),
+            jitter=600, description='Fetch new, changed and evicted restaurant images and Places photos',
+        )
+        self.add_job(
+            'statistics_refresh', settings['STATISTICS_REFRESH_CRON'], refresh_statistics,
+            catch_up=False, description='Rebuild the catalog statistics summary row',
+        )
+        if settings['SNAPSHOT_PATH'] and settings['SNAPSHOT_MODE'] != 'always':
+            self.add_job(
+                'catalog_snapshot', settings['SNAPSHOT_BUILD_CRON'],
+                functools.partial(build_catalog_snapshot, settings['SNAPSHOT_PATH']),
+                catch_up=False, description='Rebuild the read-only catalog snapshot if the catalog changed',
+            )
+
+    def connect(self, database_url: Optional[str] = None):
+        """Create the scheduler's engine (unpooled, so closing a connection releases its locks)."""
+        if self.engine is None:
+            url = database_url or self.database_url or os.environ.get('DATABASE_URL')
+            if not url:
+                raise RuntimeError("DATABASE_URL is required for the scheduler")
+            self.engine = create_engine(url, poolclass=NullPool, isolation_level='AUTOCOMMIT')
+            self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        return self.engine
+
+    @property
+    def uses_advisory_locks(self) -> bool:
+        """Whether the database supports advisory locks (Postgres)."""
+        return self.connect().dialect.name == 'postgresql'
+
+    def start(self, database_url: Optional[str] = None) -> bool:
+        """
+        Start the scheduler thread in this process (call after forking).
+
+        Returns:
+            False if the scheduler is disabled, has no jobs or no database
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            if not self.settings['SCHEDULER_ENABLED'] or not self.jobs:
+                return False
+            try:
+                self.connect(database_url)
+            except Exception as e:
+                logger.error(f"Scheduler not started: {e}")
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='scheduler', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the scheduler thread, waiting up to ``timeout`` seconds for a running job."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if thread is None or not thread.is_alive():
+            self._release_leadership()
+
+    def run_forever(self) -> None:
+        """Elect a leader and run due jobs until stop() (the scheduler thread)."""
+        self.connect()
+        while not self._stop.is_set():
+            wait = self.settings['SCHEDULER_ELECTION_INTERVAL']
+            try:
+                if self._hold_leadership():
+                    next_start = self.run_pending()
+                    wait = self.settings['SCHEDULER_TICK']
+                    if next_start is not None:
+                        wait = min(wait, max((next_start - datetime.utcnow()).total_seconds(), 1))
+            except Exception as e:
+                logger.error(f"Scheduler check failed: {e}")
+                self._release_leadership()
+            self._stop.wait(wait)
+        self._release_leadership()
+
+    def _hold_leadership(self) -> bool:
+        """Become or stay the leader; True while this process holds the leader lock."""
+        if not self.uses_advisory_locks:
+            if not self.is_leader:
+                self._become_leader()
+            return True
+        if self._leader_conn is not None:
+            # Fails if the connection, and with it the lock, is gone
+            self._leader_conn.execute(text('SELECT 1'))
+            return True
+
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text('SELECT pg_try_advisory_lock(:key)'),
+                                    {'key': lock_key(LEADER_LOCK)}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._leader_conn = conn
+        self._become_leader()
+        return True
+
+    def _become_leader(self) -> None:
+        """Start leading: recover interrupted runs and prune old history."""
+        self.is_leader = True
+        self._baselines.clear()
+        logger.info(f"Scheduler leader: {self.identity} ({', '.join(self.jobs)})")
+        runs = self._runs()
+        now = datetime.utcnow()
+        for name in self.jobs:
+            with self._job_lock(name) as acquired:
+                if not acquired:
+                    continue
+                with self.engine.begin() as conn:
+                    conn.execute(runs.update()
+                                 .where(runs.c.job_name == name, runs.c.status == 'running')
+                                 .values(status='interrupted', finished_at=now))
+                    interrupted = conn.execute(select(func.min(runs.c.scheduled_for)).where(
+                        runs.c.job_name == name, runs.c.status == 'interrupted')).scalar()
+                if interrupted is not None:
+                    # Due again even if the job has no completed run to count slots from
+                    self._baselines[name] = interrupted - timedelta(seconds=1)
+        with self.engine.begin() as conn:
+            conn.execute(runs.delete().where(
+                runs.c.started_at < now - timedelta(days=self.settings['SCHEDULER_HISTORY_DAYS'])))
+
+    def _release_leadership(self) -> None:
+        """Stop leading (closing the connection releases the leader lock)."""
+        conn, self._leader_conn = self._leader_conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        if self.is_leader:
+            logger.info(f"Scheduler leadership released: {self.identity}")
+        self.is_leader = False
+
+    @contextmanager
+    def _job_lock(self, name: str):
+        """Hold the advisory lock of a job; yields whether it was acquired (always without Postgres)."""
+        if not self.uses_advisory_locks:
+            yield True
+            return
+        with self.engine.connect() as conn:
+            acquired = conn.execute(text('SELECT pg_try_advisory_lock(:key)'),
+                                    {'key': lock_key(f"job:{name}")}).scalar()
+            yield acquired
+
+    def _runs(self):
+        """The job_runs table."""
+        from database.database_manager_v3 import JobRun
+
+        self.connect()
+        return JobRun.__table__
+
+    def _last_slots(self) -> Dict[str, datetime]:
+        """Latest recorded slot per job (interrupted runs are due again)."""
+        runs = self._runs()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(runs.c.job_name, func.max(runs.c.scheduled_for))
+                .where(runs.c.status != 'interrupted')
+                .group_by(runs.c.job_name)
+            )
+            return dict(rows.all())
+
+    def due_slot(self, job: Job, last_slot: Optional[datetime], now: datetime) -> Tuple[Optional[datetime], datetime, int]:
+        """
+        Find the slot a job should run for now.
+
+        Args:
+            job: The job
+            last_slot: Latest recorded slot (None: never run; the first slot after the
+                scheduler first saw the job is the first one due)
+            now: Current naive UTC time
+
+        Returns:
+            (slot to run now or None, when the next run starts, slots skipped before the slot)
+        """
+        base = last_slot or self._baselines.setdefault(job.name, now)
+        slot = job.schedule.next_after(base)
+        skipped = 0
+        for _ in range(_MAX_MISSED_SLOTS):
+            following = job.schedule.next_after(slot)
+            if following > now:
+                break
+            slot, skipped = following, skipped + 1
+        start = job.start_time(slot)
+        if start > now:
+            return None, start, skipped
+        return slot, start, skipped
+
+    def run_pending(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Run the jobs that are due, one at a time.
+
+        Returns:
+            When the next run starts (None if there are no jobs)
+        """
+        now = now or datetime.utcnow()
+        last_slots = self._last_slots()
+        late_after = timedelta(seconds=self.settings['SCHEDULER_TICK'] * 2)
+        next_start = None
+        for job in list(self.jobs.values()):
+            if self._stop.is_set():
+                break
+            slot, start, skipped = self.due_slot(job, last_slots.get(job.name), now)
+            if slot is not None:
+                late = skipped > 0 or now - start > late_after
+                if late and not job.catch_up:
+                    self._record_missed(job.name, slot)
+                    logger.warning(f"Job {job.name} missed its run for {slot.isoformat()}")
+                else:
+                    if late:
+                        logger.info(f"Job {job.name} catching up on {skipped + 1} missed slot(s)")
+                    self.run_job(job.name, slot, trigger='catch_up' if late else 'schedule')
+                now = max(now, datetime.utcnow())
+                _, start, _ = self.due_slot(job, slot, now)
+            next_start = start if next_start is None else min(next_start, start)
+        return next_start
+
+    def run_job(self, name: str, scheduled_for: Optional[datetime] = None,
+                trigger: str = 'manual') -> Optional[Dict[str, Any]]:
+        """
+        Run a job now under its lock, recording the run.
+
+        Args:
+            name: Job name
+            scheduled_for: Slot the run is for (manual runs: now)
+            trigger: 'schedule', 'catch_up' or 'manual'
+
+        Returns:
+            The run record, or None if the job is running elsewhere or the slot already ran
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        job = self.jobs.get(name)
+        if job is None:
+            raise ValueError(f"Unknown job: {name}")
+        scheduled_for = scheduled_for or datetime.utcnow().replace(microsecond=0)
+
+        with self._job_lock(name) as acquired:
+            if not acquired:
+                logger.info(f"Job {name} is already running elsewhere; skipping")
+                return None
+            run_id = self._claim(name, scheduled_for, trigger)
+            if run_id is None:
+                logger.info(f"Job {name} already ran for {scheduled_for.isoformat()}; skipping")
+                return None
+
+            logger.info(f"Job {name} started ({trigger}, slot {scheduled_for.isoformat()})")
+            start = time.perf_counter()
+            status, result, error = 'succeeded', None, None
+            try:
+                result = job.func()
+            except Exception as e:
+                status, error = 'failed', f"{e.__class__.__name__}: {e}"
+                logger.error(f"Job {name} failed: {e}")
+            duration_ms = int((time.perf_counter() - start) * 1000)
+
+            runs = self._runs()
+            with self.engine.begin() as conn:
+                conn.execute(runs.update().where(runs.c.id == run_id).values(
+                    status=status,
+                    finished_at=datetime.utcnow(),
+                    duration_ms=duration_ms,
+                    result=json.dumps(result, default=str) if result is not None else None,
+                    error=error,
+                ))
+            logger.info(f"Job {name} {status} in {duration_ms} ms")
+        return self.history(limit=1, job_name=name)[0]
+
+    def _claim(self, name: str, scheduled_for: datetime, trigger: str) -> Optional[int]:
+        """Record a run as started; None if the slot already has a (not interrupted) run."""
+        runs = self._runs()
+        values = {'status': 'running', 'trigger': trigger, 'host': self.identity,
+                  'started_at': datetime.utcnow(), 'finished_at': None, 'duration_ms': None,
+                  'result': None, 'error': None}
+        try:
+            with self.engine.begin() as conn:
+                return conn.execute(runs.insert().values(job_name=name, scheduled_for=scheduled_for,
+                                                         **values)).inserted_primary_key[0]
+        except IntegrityError:
+            pass
+        with self.engine.begin() as conn:
+            retried = conn.execute(runs.update().where(
+                runs.c.job_name == name, runs.c.scheduled_for == scheduled_for, runs.c.status == 'interrupted',
+            ).values(**values))
+            if retried.rowcount != 1:
+                return None
+            return conn.execute(select(runs.c.id).where(
+                runs.c.job_name == name, runs.c.scheduled_for == scheduled_for)).scalar()
+
+    def _record_missed(self, name: str, slot: datetime) -> None:
+        """Record a slot that passed without a run (catch_up=False jobs)."""
+        runs = self._runs()
+        now = datetime.utcnow()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(runs.insert().values(job_name=name, scheduled_for=slot, trigger='schedule',
+                                                  status='missed', host=self.identity,
+                                                  started_at=now, finished_at=now))
+        except IntegrityError:
+            pass
+
+    def history(self, limit: int = 50, job_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the latest runs, newest first."""
+        runs = self._runs()
+        query = select(runs).order_by(runs.c.started_at.desc(), runs.c.id.desc()).limit(limit)
+        if job_name:
+            query = query.where(runs.c.job_name == job_name)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).mappings().all()
+        return [self._run_dict(row) for row in rows]
+
+    def _run_dict(self, row) -> Dict[str, Any]:
+        """Convert a job_runs row."""
+        run = dict(row)
+        for key in ('scheduled_for', 'started_at', 'finished_at'):
+            run[key] = run[key].isoformat() if run[key] else None
+        run['result'] = json.loads(run['result']) if run['result'] else None
+        return run
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Get every job with its schedule, next start and last run."""
+        last_slots = self._last_slots()
+        now = datetime.utcnow()
+        jobs = []
+        for job in self.jobs.values():
+            last_runs = self.history(limit=1, job_name=job.name)
+            _, next_start, _ = self.due_slot(job, last_slots.get(job.name), now)
+            jobs.append({
+                'name': job.name,
+                'description': job.description,
+                'schedule': job.schedule.expression,
+                'timezone': self.settings['SCHEDULER_TIMEZONE'],
+                'jitter_seconds': job.jitter,
+                'catch_up': job.catch_up,
+                'next_run': next_start.isoformat(),
+                'last_run': last_runs[0] if last_runs else None,
+            })
+        return jobs
+
+
+def refresh_google_places(batch_size: int = 10, cleanup_days: int = 30) -> Dict[str, Any]:
+    """Refresh the stored Google Places data that is due (GooglePlacesManager.run_periodic_updates)."""
+    from database.google_places_manager import GooglePlacesManager
+
+    manager = GooglePlacesManager()
+    try:
+        stats = manager.run_periodic_updates(batch_size)
+        if cleanup_days:
+            stats['deactivated'] = manager.cleanup_old_data(cleanup_days)
+        return stats
+    finally:
+        manager.disconnect()
+
+
+def sync_source(name: str, sources=DEFAULT_SETTINGS['INGESTION_SOURCES']) -> Dict[str, Any]:
+    """Ingest one certifier source (EnhancedDatabaseManager.ingest_sources)."""
+    from database.database_manager_v3 import EnhancedDatabaseManager
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        raise RuntimeError("Database connection failed")
+    try:
+        summary = db_manager.ingest_sources([name], INGESTION_SOURCES=sources)['sources'][0]
+    finally:
+        db_manager.disconnect()
+    if summary['errors'] and not summary['listings'] and not summary['pages_unchanged']:
+        raise RuntimeError(f"{name} sync failed: {summary['errors'][0]}")
+    return summary
+
+
+def cache_restaurant_images(**settings) -> Dict[str, Any]:
+    """Fetch the restaurant images that are due into the image cache (EnhancedDatabaseManager.cache_images)."""
+    from database.database_manager_v3 import EnhancedDatabaseManager
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        raise RuntimeError("Database connection failed")
+    try:
+        return db_manager.cache_images(**settings)
+    finally:
+        db_manager.disconnect()
+
+
+def refresh_statistics() -> Dict[str, Any]:
+    """Rebuild the statistics summary row (EnhancedDatabaseManager.refresh_statistics)."""
+    from database.database_manager_v3 import EnhancedDatabaseManager
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        raise RuntimeError("Database connection failed")
+    try:
+        summary = db_manager.refresh_statistics()
+    finally:
+        db_manager.disconnect()
+    if not summary:
+        raise RuntimeError("Statistics refresh failed")
+    return {key: summary[key] for key in ('total_restaurants', 'last_updated')}
+
+
+def build_catalog_snapshot(path: str) -> Dict[str, Any]:
+    """Rebuild the catalog snapshot (utils/snapshot.py) if the catalog changed."""
+    from database.database_manager_v3 import EnhancedDatabaseManager
+    from utils.snapshot import build_snapshot
+
+    db_manager = EnhancedDatabaseManager()
+    if not db_manager.connect(create_tables=False):
+        raise RuntimeError("Database connection failed")
+    try:
+        return build_snapshot(db_manager.engine, path)
+    finally:
+        db_manager.disconnect()
+
+
+# Global scheduler (bound to the app in app.py, started per worker in gunicorn.conf.py)
+scheduler = Scheduler()
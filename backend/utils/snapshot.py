@@ -0,0 +1,384 @@
+"""
+Catalog Snapshot Module
+
+This module builds and serves a read-only SQLite snapshot of the catalog,
+so the read endpoints keep working while Postgres is unreachable (a Neon
+cold start, an outage) and edge instances can serve from local disk without
+a database at all.
+
+The snapshot has the same restaurants, specials, restaurant_statistics and
+catalog_changes tables as the main database (created from the same models,
+without the change-log triggers), so an
+EnhancedDatabaseManager pointed at it answers every read endpoint
+unchanged. It adds indexes for the read paths (name, category,
+state/city, coordinates) and an opening_hours table: the weekly schedule
+parsed from hours_of_operation, indexed by weekday and time, for
+open-at-a-time queries against the file (e.g. when it is shipped to
+clients for offline use).
+
+The snapshot is built into a temporary file and renamed over the previous
+one, so readers always see a complete file. Serving workers open it
+read-only and immutable with memory-mapped I/O, check every
+SNAPSHOT_CHECK_SECONDS whether a new file landed, and switch to it
+atomically (requests in flight finish on the old file).
+
+SNAPSHOT_MODE selects when reads are served from the snapshot:
+- off: never (default)
+- fallback: while the database is unreachable; a connection failure routes
+  reads to the snapshot for SNAPSHOT_RETRY_SECONDS before the database is
+  tried again
+- always: edge instances without a database
+
+Features:
+- Same-schema SQLite snapshot with read-path indexes and an hours schedule
+- Skips rebuilding when the catalog did not change (catalog_changes version)
+- Atomic publish (rename) and hot swap in serving workers
+- Read-only, immutable, memory-mapped serving connections
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'SNAPSHOT_MODE': 'off',  # off, fallback or always
+    'SNAPSHOT_PATH': '',  # snapshot file (empty: no snapshot)
+    'SNAPSHOT_CHECK_SECONDS': 2,  # min seconds between checks for a new file
+    'SNAPSHOT_RETRY_SECONDS': 30,  # seconds reads stay on the snapshot after a database failure
+    'SNAPSHOT_MMAP_BYTES': 256 * 1024 * 1024,  # memory-mapped size per connection
+    'SNAPSHOT_POOL_SIZE': 5,  # read connections per worker
+}
+
+SNAPSHOT_MODES = ('off', 'fallback', 'always')
+
+# Bumped when the snapshot layout changes; older files are rebuilt
+SNAPSHOT_FORMAT = 1
+
+# Tables of snapshot-only data (the catalog tables come from database_manager_v3)
+snapshot_metadata = MetaData()
+
+snapshot_meta = Table(
+    'snapshot_meta', snapshot_metadata,
+    Column('key', String(50), primary_key=True),
+    Column('value', String(255), nullable=False),
+)
+
+opening_hours = Table(
+    'opening_hours', snapshot_metadata,
+    Column('restaurant_id', Integer, nullable=False, index=True),
+    Column('weekday', Integer, nullable=False),  # 0 = Monday
+    Column('opens', Integer, nullable=False),  # minutes after local midnight
+    Column('closes', Integer, nullable=False),  # > 1440 when open past midnight
+)
+
+_SNAPSHOT_INDEXES = (
+    'CREATE INDEX ix_snapshot_restaurants_name ON restaurants (lower(name), id)',  # name_order
+    'CREATE INDEX ix_snapshot_restaurants_kosher_category ON restaurants (kosher_category, name)',
+    'CREATE INDEX ix_snapshot_restaurants_state_city ON restaurants (state, city)',
+    'CREATE INDEX ix_snapshot_restaurants_geo ON restaurants (latitude, longitude)',
+    'CREATE INDEX ix_snapshot_opening_hours_weekday ON opening_hours (weekday, opens, closes)',
+)
+
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+_COPY_BATCH_SIZE = 2000
+
+
+def _catalog_tables(conn):
+    """The main database tables copied into the snapshot."""
+    from database.database_manager_v3 import CatalogChange, Restaurant, RestaurantSpecial, RestaurantStatistics
+
+    tables = [Restaurant.__table__, RestaurantSpecial.__table__, RestaurantStatistics.__table__]
+    if conn.dialect.has_table(conn, CatalogChange.__tablename__):
+        # Copied without the change-log triggers: the snapshot is never written to
+        tables.append(CatalogChange.__table__.to_metadata(MetaData()))
+    return tables
+
+
+def weekly_schedule(hours_of_operation: Optional[str]) -> List[Tuple[int, int, int]]:
+    """
+    Parse hours into (weekday, opens, closes) minutes, as the status calculation reads them.
+
+    Every range of a weekday is returned (split shifts give several rows);
+    hours ending before they start run past midnight (closes > 1440).
+    """
+    from utils.restaurant_status import _status_calculator
+
+    parsed, entries = _status_calculator._parse_business_hours(hours_of_operation)
+    if not parsed:
+        return []
+    schedule = []
+    for weekday, day_name in enumerate(_WEEKDAYS):
+        for entry in entries:
+            if entry['day'] not in (day_name, 'daily'):
+                continue
+            opens = entry['start'].hour * 60 + entry['start'].minute
+            closes = entry['end'].hour * 60 + entry['end'].minute
+            if closes < opens:
+                closes += 24 * 60
+            schedule.append((weekday, opens, closes))
+    return schedule
+
+
+def catalog_version(conn) -> str:
+    """Version of the catalog: the latest catalog_changes version (row count and last update without it)."""
+    from database.database_manager_v3 import CatalogChange, Restaurant
+
+    if conn.dialect.has_table(conn, CatalogChange.__tablename__):
+        return str(conn.execute(select(func.max(CatalogChange.version))).scalar() or 0)
+    count, updated = conn.execute(select(func.count(), func.max(Restaurant.updated_at))).one()
+    return f"{count}:{updated.isoformat() if updated else ''}"
+
+
+def read_snapshot_meta(path: str) -> Optional[Dict[str, str]]:
+    """Read the metadata of a snapshot file (None if it is missing or unreadable)."""
+    if not path or not os.path.exists(path):
+        return None
+    engine = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true", poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            return dict(conn.execute(select(snapshot_meta.c.key, snapshot_meta.c.value)).all())
+    except Exception:
+        return None
+    finally:
+        engine.dispose()
+
+
+def build_snapshot(source_engine, path: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Build the snapshot of a catalog database and publish it at path.
+
+    Args:
+        source_engine: Engine of the main database
+        path: Snapshot file (replaced atomically)
+        force: Rebuild even if the catalog did not change since the last snapshot
+
+    Returns:
+        The snapshot metadata, with 'skipped' set when the existing file was current
+    """
+    start = time.perf_counter()
+
+    with source_engine.connect() as source:
+        tables = _catalog_tables(source)
+        restaurants = tables[0]
+        version = catalog_version(source)
+        existing = read_snapshot_meta(path)
+        if not force and existing and existing.get('catalog_version') == version \
+                and existing.get('format') == str(SNAPSHOT_FORMAT):
+            return dict(existing, skipped=True)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        target_engine = create_engine(f"sqlite:///{temporary}", poolclass=NullPool)
+        counts = {}
+        try:
+            with target_engine.connect() as target:
+                target.exec_driver_sql('PRAGMA journal_mode=OFF')
+                target.exec_driver_sql('PRAGMA synchronous=OFF')
+                with target.begin():
+                    for table in tables:
+                        table.create(target)
+                    snapshot_metadata.create_all(target)
+
+                    for table in tables:
+                        counts[table.name] = 0
+                        result = source.execution_options(stream_results=True).execute(select(table))
+                        for rows in result.partitions(_COPY_BATCH_SIZE):
+                            target.execute(table.insert(), [dict(row._mapping) for row in rows])
+                            counts[table.name] += len(rows)
+
+                    schedule = []
+                    for row in source.execute(select(restaurants.c.id, restaurants.c.hours_of_operation)
+                                              .where(restaurants.c.hours_of_operation.isnot(None))):
+                        schedule.extend({'restaurant_id': row.id, 'weekday': weekday, 'opens': opens,
+                                         'closes': closes}
+                                        for weekday, opens, closes in weekly_schedule(row.hours_of_operation))
+                    if schedule:
+                        target.execute(opening_hours.insert(), schedule)
+                    counts[opening_hours.name] = len(schedule)
+
+                    for statement in _SNAPSHOT_INDEXES:
+                        target.exec_driver_sql(statement)
+
+                    meta = {
+                        'format': str(SNAPSHOT_FORMAT),
+                        'catalog_version': version,
+                        'built_at': datetime.utcnow().isoformat(),
+                        'counts': json.dumps(counts),
+                    }
+                    target.execute(snapshot_meta.insert(), [{'key': k, 'value': v} for k, v in meta.items()])
+                target.exec_driver_sql('ANALYZE')
+        except Exception:
+            target_engine.dispose()
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        target_engine.dispose()
+
+    with open(temporary, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    directory_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+    meta.update(
+        bytes=os.path.getsize(path),
+        elapsed_seconds=round(time.perf_counter() - start, 2),
+        skipped=False,
+    )
+    logger.info(f"Catalog snapshot published at {path}: {counts} ({meta['bytes']:,} bytes)")
+    return meta
+
+
+class CatalogSnapshot:
+    """
+    Flask extension serving reads from the catalog snapshot.
+
+    Usage:
+        catalog_snapshot = CatalogSnapshot()
+        catalog_snapshot.init_app(app)
+        db_manager = catalog_snapshot.manager()  # None without a snapshot file
+    """
+
+    def __init__(self, app=None, **settings):
+        """Initialize the extension (settings override DEFAULT_SETTINGS)."""
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+        self._manager = None
+        self._file_key = None
+        self._next_check = 0.0
+        self._primary_down_until = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Read configuration from the app."""
+        for key, default in DEFAULT_SETTINGS.items():
+            self.settings[key] = app.config.get(key, default)
+        if self.settings['SNAPSHOT_MODE'] not in SNAPSHOT_MODES:
+            raise ValueError(f"SNAPSHOT_MODE must be one of {', '.join(SNAPSHOT_MODES)}")
+        if self.mode != 'off' and not self.settings['SNAPSHOT_PATH']:
+            raise ValueError(f"SNAPSHOT_MODE={self.mode} requires SNAPSHOT_PATH")
+        app.extensions['catalog_snapshot'] = self
+
+    @property
+    def mode(self) -> str:
+        """Configured serving mode."""
+        return self.settings['SNAPSHOT_MODE']
+
+    def primary_available(self) -> bool:
+        """Whether reads should try the database (no recent connection failure)."""
+        return time.monotonic() >= self._primary_down_until
+
+    def primary_failed(self) -> None:
+        """Route reads to the snapshot for SNAPSHOT_RETRY_SECONDS (fallback mode only)."""
+        if self.mode == 'fallback':
+            if self.primary_available():
+                logger.warning(f"Database unreachable; serving reads from the catalog snapshot "
+                               f"for {self.settings['SNAPSHOT_RETRY_SECONDS']}s")
+            self._primary_down_until = time.monotonic() + self.settings['SNAPSHOT_RETRY_SECONDS']
+
+    def instrument_engine(self, engine) -> None:
+        """Switch to the snapshot when the database connection fails (fallback mode only)."""
+        if self.mode != 'fallback':
+            return
+
+        @event.listens_for(engine, 'handle_error')
+        def _on_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self.primary_failed()
+
+    def manager(self):
+        """Get a database manager reading the current snapshot (None if there is no snapshot file)."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._manager
+        with self._lock:
+            if now >= self._next_check:
+                self._next_check = now + self.settings['SNAPSHOT_CHECK_SECONDS']
+                self._swap_if_changed()
+        return self._manager
+
+    def _swap_if_changed(self) -> None:
+        """Open the snapshot file if a new one landed since the last check."""
+        path = self.settings['SNAPSHOT_PATH']
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_key == self._file_key:
+            return
+        try:
+            manager = self._open(path)
+        except Exception as e:
+            logger.error(f"Failed to open the catalog snapshot {path}: {e}")
+            return
+        previous, self._manager, self._file_key = self._manager, manager, file_key
+        logger.info(f"Serving reads from catalog snapshot {path} (built {manager.snapshot_meta.get('built_at')})")
+        if previous is not None:
+            # Connections checked out by requests in flight close on return
+            previous.engine.dispose()
+
+    def _open(self, path: str):
+        """Create a database manager on a read-only, memory-mapped connection pool to the file."""
+        from database.database_manager_v3 import EnhancedDatabaseManager
+
+        mmap_bytes = int(self.settings['SNAPSHOT_MMAP_BYTES'])
+        # immutable: the file is replaced, never modified, so SQLite skips locking
+        engine = create_engine(
+            f"sqlite:///file:{path}?mode=ro&immutable=1&uri=true",
+            poolclass=QueuePool,
+            pool_size=self.settings['SNAPSHOT_POOL_SIZE'],
+            connect_args={'check_same_thread': False},
+        )
+
+        @event.listens_for(engine, 'connect')
+        def _configure(dbapi_connection, connection_record):
+            dbapi_connection.execute(f'PRAGMA mmap_size={mmap_bytes}')
+
+        with engine.connect() as conn:
+            meta = dict(conn.execute(select(snapshot_meta.c.key, snapshot_meta.c.value)).all())
+        if meta.get('format') != str(SNAPSHOT_FORMAT):
+            engine.dispose()
+            raise ValueError(f"unsupported snapshot format {meta.get('format')}")
+
+        manager = EnhancedDatabaseManager(database_url=f"sqlite:///{path}")
+        manager.engine = engine
+        manager.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        manager.snapshot_meta = meta
+        return manager
+
+    def status(self) -> Dict[str, Any]:
+        """Get the mode, the snapshot being served and whether reads currently use it."""
+        meta = self._manager.snapshot_meta if self._manager is not None else None
+        return {
+            'mode': self.mode,
+            'path': self.settings['SNAPSHOT_PATH'] or None,
+            'serving_snapshot': self.mode == 'always' or (self.mode == 'fallback' and not self.primary_available()),
+            'built_at': meta.get('built_at') if meta else None,
+            'catalog_version': meta.get('catalog_version') if meta else None,
+        }
+
+
+# Global catalog snapshot (bound to the app in app.py)
+catalog_snapshot = CatalogSnapshot()
@@ -0,0 +1,273 @@
+"""
+Timezone Resolution Module
+
+This module maps restaurant coordinates to IANA timezone names without any
+network calls. It reads a bundled, preprocessed boundary index
+(utils/data/timezone_index.json, built by scripts/build_timezone_index.py) in
+which every polygon is registered in the grid cells its bounding box touches,
+so a lookup only runs point-in-polygon tests against the few polygons near
+the point.
+
+Features:
+- Offline coordinate-to-timezone lookup from a grid-bucketed polygon index
+- LRU cache in front of polygon lookups (microsecond repeat lookups)
+- State and UTC offset fallbacks when coordinates are missing or unmatched
+- Lazy loading of the index on first use
+"""
+
+import os
+import json
+import math
+import logging
+import threading
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'timezone_index.json')
+
+# Fallback mapping used when a restaurant has no usable coordinates
+STATE_TIMEZONES = {
+    'NY': 'America/New_York',
+    'CA': 'America/Los_Angeles',
+    'TX': 'America/Chicago',
+    'FL': 'America/New_York',  # Most of Florida is Eastern Time
+    'IL': 'America/Chicago',
+    'PA': 'America/New_York',
+    'OH': 'America/New_York',
+    'GA': 'America/New_York',
+    'NC': 'America/New_York',
+    'MI': 'America/New_York',
+    'NJ': 'America/New_York',
+    'VA': 'America/New_York',
+    'WA': 'America/Los_Angeles',
+    'AZ': 'America/Phoenix',
+    'CO': 'America/Denver',
+    'TN': 'America/Chicago',
+    'IN': 'America/New_York',
+    'MA': 'America/New_York',
+    'MO': 'America/Chicago',
+    'MD': 'America/New_York',
+    'MN': 'America/Chicago',
+    'WI': 'America/Chicago',
+    'LA': 'America/Chicago',
+    'AL': 'America/Chicago',
+    'SC': 'America/New_York',
+    'KY': 'America/New_York',
+    'OR': 'America/Los_Angeles',
+    'CT': 'America/New_York',
+    'IA': 'America/Chicago',
+    'OK': 'America/Chicago',
+    'UT': 'America/Denver',
+    'NV': 'America/Los_Angeles',
+    'AR': 'America/Chicago',
+    'MS': 'America/Chicago',
+    'KS': 'America/Chicago',
+    'NE': 'America/Chicago',
+    'ID': 'America/Boise',
+    'NM': 'America/Denver',
+    'WV': 'America/New_York',
+    'NH': 'America/New_York',
+    'ME': 'America/New_York',
+    'HI': 'Pacific/Honolulu',
+    'RI': 'America/New_York',
+    'MT': 'America/Denver',
+    'DE': 'America/New_York',
+    'SD': 'America/Chicago',
+    'ND': 'America/Chicago',
+    'AK': 'America/Anchorage',
+    'VT': 'America/New_York',
+    'WY': 'America/Denver',
+    'DC': 'America/New_York'
+}
+
+# Zones a reported UTC offset is matched against: each zone's offset at the
+# given instant, daylight saving included. Most likely first when several
+# share an offset at that moment (e.g. -420: Los Angeles in summer, Denver
+# in winter; Phoenix never observes DST)
+OFFSET_TIMEZONES = (
+    'America/New_York',
+    'America/Chicago',
+    'America/Los_Angeles',
+    'America/Denver',
+    'America/Phoenix',
+    'America/Anchorage',
+    'Pacific/Honolulu',
+    'America/Puerto_Rico',
+)
+
+
+class TimezoneResolver:
+    """
+    Resolves IANA timezone names from coordinates using the bundled boundary index.
+
+    The index is loaded lazily on the first lookup and shared by all threads.
+    Coordinates are rounded to 4 decimal places (~11 m) before caching so
+    repeated lookups for the same restaurant hit the LRU cache.
+    """
+
+    def __init__(self, index_path: str = None, cache_size: int = 4096):
+        """Initialize the resolver."""
+        self.index_path = index_path or DEFAULT_INDEX_PATH
+        self._index = None
+        self._lock = threading.Lock()
+        self._cached_lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+
+    def _load_index(self) -> Dict:
+        """Load the boundary index from disk (once)."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    try:
+                        with open(self.index_path, 'r', encoding='utf-8') as f:
+                            self._index = json.load(f)
+                        logger.info(f"Loaded timezone index with {len(self._index['polygons'])} polygons")
+                    except Exception as e:
+                        logger.error(f"Error loading timezone index {self.index_path}: {e}")
+                        self._index = {'cell_size': 1.0, 'zones': [], 'polygons': [], 'grid': {}}
+        return self._index
+
+    @staticmethod
+    def _point_in_ring(x: float, y: float, ring: List[List[float]]) -> bool:
+        """Ray-casting point-in-polygon test for a single ring."""
+        inside = False
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i]
+            xj, yj = ring[j]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        return inside
+
+    def _lookup_uncached(self, latitude: float, longitude: float) -> Optional[str]:
+        """Find the timezone polygon containing the point, if any."""
+        index = self._load_index()
+        cell_size = index['cell_size']
+        cell = f"{math.floor(longitude / cell_size)},{math.floor(latitude / cell_size)}"
+
+        for polygon_id in index['grid'].get(cell, ()):
+            polygon = index['polygons'][polygon_id]
+            min_x, min_y, max_x, max_y = polygon['bbox']
+            if not (min_x <= longitude <= max_x and min_y <= latitude <= max_y):
+                continue
+
+            outer, holes = polygon['rings'][0], polygon['rings'][1:]
+            if self._point_in_ring(longitude, latitude, outer) and not any(
+                self._point_in_ring(longitude, latitude, hole) for hole in holes
+            ):
+                return index['zones'][polygon['zone']]
+
+        return None
+
+    def lookup(self, latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+        """
+        Look up the timezone for a coordinate pair.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+
+        Returns:
+            IANA timezone name, or None if the point is outside every polygon
+        """
+        if latitude is None or longitude is None:
+            return None
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            return None
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return None
+        return self._cached_lookup(round(latitude, 4), round(longitude, 4))
+
+    def resolve(self, latitude: Optional[float] = None, longitude: Optional[float] = None,
+                state: Optional[str] = None, utc_offset_minutes: Optional[int] = None) -> str:
+        """
+        Resolve the best available timezone for a restaurant.
+
+        Coordinates are preferred, then the state, then a UTC offset reported by
+        an external source (e.g. Google Places ``utc_offset_minutes``).
+
+        Returns:
+            IANA timezone name ('UTC' if nothing could be determined)
+        """
+        timezone = self.lookup(latitude, longitude)
+        if timezone:
+            return timezone
+
+        timezone = timezone_for_state(state)
+        if timezone:
+            return timezone
+
+        if utc_offset_minutes is not None:
+            timezone = timezone_for_offset(utc_offset_minutes)
+            if timezone:
+                return timezone
+
+        return 'UTC'
+
+    def cache_info(self):
+        """Return LRU cache statistics for the polygon lookup."""
+        return self._cached_lookup.cache_info()
+
+
+def timezone_for_state(state: Optional[str]) -> Optional[str]:
+    """Map a US state abbreviation to its (primary) timezone."""
+    if not state or not state.strip():
+        return None
+    return STATE_TIMEZONES.get(state.upper().strip())
+
+
+def timezone_for_offset(offset_minutes: int, at: Optional[datetime] = None) -> Optional[str]:
+    """
+    Convert a UTC offset observed at a moment to a timezone name.
+
+    A reported offset (e.g. Google Places ``utc_offset_minutes``) is the
+    offset in effect now, daylight saving included: -240 is New York in
+    summer, and -300 is New York in winter but Chicago in summer. The offset
+    is matched against the OFFSET_TIMEZONES offsets at that moment.
+
+    Args:
+        offset_minutes: Offset from UTC in minutes
+        at: When the offset was observed (default: now)
+
+    Returns:
+        IANA timezone name, or None if no known zone has that offset then
+        (a fixed Etc/GMT zone would be wrong for half the year, so none is
+        guessed)
+    """
+    at = at or datetime.now(dt_timezone.utc)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=dt_timezone.utc)
+    for name in OFFSET_TIMEZONES:
+        if at.astimezone(ZoneInfo(name)).utcoffset().total_seconds() == offset_minutes * 60:
+            return name
+    return None
+
+
+# Global instance for caching
+_timezone_resolver = TimezoneResolver()
+
+
+def resolve_timezone(latitude: Optional[float] = None, longitude: Optional[float] = None,
+                     state: Optional[str] = None, utc_offset_minutes: Optional[int] = None) -> str:
+    """
+    Resolve the timezone for a restaurant location.
+
+    This is the main function to be used by the application.
+
+    Args:
+        latitude: Restaurant latitude
+        longitude: Restaurant longitude
+        state: Restaurant state abbreviation (fallback)
+        utc_offset_minutes: UTC offset from an external source (last resort)
+
+    Returns:
+        IANA timezone name
+    """
+    return _timezone_resolver.resolve(latitude, longitude, state, utc_offset_minutes)